@@ -324,7 +324,7 @@ function getEventStatus(event) {
         if (s === 'start') return 'start';
         if (s === 'end' || s === 'complete' || s === 'completed') return 'end';
         if (s === 'progress') return 'progress';
-        if (s === 'error' || s === 'failed') return 'error';
+        if (s === 'error' || s === 'failed' || s === 'timeout') return 'error';
         return 'system';
     }
     // Handle WebSocket event format (has 'type' field)
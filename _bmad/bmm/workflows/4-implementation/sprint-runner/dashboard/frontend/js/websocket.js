@@ -344,7 +344,7 @@ function handleWebSocketEvent(event) {
             stopCommandTimer(payload.task_id);
             const opElement = document.querySelector(`[data-operation-task="${CSS.escape(payload.task_id)}"]`);
             if (opElement) {
-                if (payload.status === 'error' || payload.status === 'failed') {
+                if (payload.status === 'error' || payload.status === 'failed' || payload.status === 'timeout') {
                     triggerErrorAnimation(opElement);
                 } else {
                     triggerCompletionAnimation(opElement);
@@ -363,11 +363,11 @@ function handleWebSocketEvent(event) {
                 updateCurrentOperation();
             }
             // Trigger error animation if command failed
-            if (payload.status === 'error' || payload.status === 'failed') {
+            if (payload.status === 'error' || payload.status === 'failed' || payload.status === 'timeout') {
                 const opCard = document.getElementById('sprintCurrentOp')?.closest('.card, .active-operation-card');
                 if (opCard) triggerErrorAnimation(opCard);
             }
-            addLogEntry({ type, payload, timestamp }, (payload.status === 'error' || payload.status === 'failed') ? 'error' : 'end');
+            addLogEntry({ type, payload, timestamp }, (payload.status === 'error' || payload.status === 'failed' || payload.status === 'timeout') ? 'error' : 'end');
             break;
 
         case 'story:status':
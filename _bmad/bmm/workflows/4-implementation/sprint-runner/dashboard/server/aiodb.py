@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Async facade over db.py.
+
+Runs every SQLite call off the event loop so queries never block WebSocket
+fan-out or NDJSON stream reading:
+
+- Writes go through a single dedicated writer thread (serialized, so WAL
+  writers never contend for the lock)
+- Reads go through a small bounded pool of reader threads
+
+Each thread reuses its own pooled connection from db.get_connection().
+
+Usage:
+    from . import aiodb
+
+    batch = await aiodb.get_batch(batch_id)
+    story_id = await aiodb.create_story(batch_id, "2a-1", "2a")
+    await aiodb.run_write(some_sync_db_function, arg)  # Arbitrary callables
+
+    await aiodb.shutdown()  # Call once at shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from . import db
+
+T = TypeVar("T")
+
+# Reader threads (WAL allows concurrent readers alongside the single writer)
+READER_THREADS = 4
+
+_executor_lock = threading.Lock()
+_writer: Optional[ThreadPoolExecutor] = None
+_readers: Optional[ThreadPoolExecutor] = None
+
+
+def _get_writer() -> ThreadPoolExecutor:
+    """Return the single-thread write executor, creating it on first use."""
+    global _writer
+    with _executor_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        return _writer
+
+
+def _get_readers() -> ThreadPoolExecutor:
+    """Return the bounded read executor, creating it on first use."""
+    global _readers
+    with _executor_lock:
+        if _readers is None:
+            _readers = ThreadPoolExecutor(
+                max_workers=READER_THREADS, thread_name_prefix="db-reader"
+            )
+        return _readers
+
+
+async def run_write(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database callable on the writer thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_writer(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_read(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking read-only database callable on a reader thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_readers(), functools.partial(fn, *args, **kwargs))
+
+
+async def shutdown() -> None:
+    """
+    Drain both executors, then close their pooled connections.
+
+    Safe to call multiple times; executors are recreated on next use.
+    """
+    global _writer, _readers
+    with _executor_lock:
+        executors = [e for e in (_writer, _readers) if e is not None]
+        _writer = None
+        _readers = None
+
+    for executor in executors:
+        # Wait for queued writes without blocking the loop
+        await asyncio.to_thread(executor.shutdown, True)
+    db.close_connections()
+
+
+def _read_op(name: str) -> Callable[..., Awaitable[Any]]:
+    """Build an awaitable wrapper that runs db.<name> on a reader thread."""
+    @functools.wraps(getattr(db, name))
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Resolve at call time so patching db.<name> is honoured
+        return await run_read(getattr(db, name), *args, **kwargs)
+    return wrapper
+
+
+def _write_op(name: str) -> Callable[..., Awaitable[Any]]:
+    """Build an awaitable wrapper that runs db.<name> on the writer thread."""
+    @functools.wraps(getattr(db, name))
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Resolve at call time so patching db.<name> is honoured
+        return await run_write(getattr(db, name), *args, **kwargs)
+    return wrapper
+
+
+# =============================================================================
+# Awaitable db.py API
+# =============================================================================
+
+# Schema and maintenance
+init_db = _write_op("init_db")
+migrate_db = _write_op("migrate_db")
+checkpoint_wal = _write_op("checkpoint_wal")
+
+# Batches
+create_batch = _write_op("create_batch")
+update_batch = _write_op("update_batch")
+get_batch = _read_op("get_batch")
+get_active_batch = _read_op("get_active_batch")
+list_batches = _read_op("list_batches")
+
+# Stories
+create_story = _write_op("create_story")
+update_story = _write_op("update_story")
+get_story = _read_op("get_story")
+get_story_by_key = _read_op("get_story_by_key")
+get_stories_by_batch = _read_op("get_stories_by_batch")
+
+# Commands
+create_command = _write_op("create_command")
+update_command = _write_op("update_command")
+get_commands_by_story = _read_op("get_commands_by_story")
+
+# Bulk queries
+get_batch_tree = _read_op("get_batch_tree")
+
+# Events
+create_event = _write_op("create_event")
+create_events = _write_op("create_events")
+get_events = _read_op("get_events")
+get_events_by_batch = _read_op("get_events_by_batch")
+get_recent_events_by_batch = _read_op("get_recent_events_by_batch")
+
+# Background tasks
+create_background_task = _write_op("create_background_task")
+update_background_task = _write_op("update_background_task")
+get_pending_background_tasks = _read_op("get_pending_background_tasks")
+
+# Helper queries
+get_current_batch_status = _read_op("get_current_batch_status")
+count_completed_cycles = _read_op("count_completed_cycles")
+check_story_blocked = _read_op("check_story_blocked")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Index of story artifacts in implementation-artifacts/.
+
+build_prompt_system_append() runs several times per cycle (once per
+code-review attempt) and used to iterate the whole directory once per story
+key, with an is_file() stat per entry. ArtifactIndex scans the directory
+once, classifies each file by kind, and answers story lookups from memory.
+
+Staleness is detected with one stat of the directory: its mtime changes
+whenever a file is created, deleted or renamed in it. File contents are not
+indexed; callers read them fresh. A scan taken while the directory mtime is
+very recent is treated as provisional and repeated on the next lookup, so
+changes within the filesystem's timestamp granularity are never missed.
+
+Matching keeps the original rule: a file belongs to a story if the story
+key occurs in its name (case-insensitive). Per-key results are memoized
+until the directory changes, so repeated lookups cost O(1) per story.
+
+Usage:
+    from .artifacts import ArtifactIndex
+
+    index = ArtifactIndex(project_root / "_bmad-output/implementation-artifacts")
+    found = index.lookup(["2a-1", "2a-2"])
+    found.story, found.discovery, found.tech_spec   # Sorted by file name
+    found.all()                                     # Every matching file
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Artifact kinds, classified from the file name
+KIND_STORY = "story"
+KIND_DISCOVERY = "discovery"
+KIND_TECH_SPEC = "tech-spec"
+
+# A scan within this many seconds of the directory's mtime is provisional
+RACY_WINDOW_SECONDS = 2.0
+
+
+def classify(filename: str) -> str:
+    """Artifact kind of a file name (discovery wins over tech-spec)."""
+    name = filename.lower()
+    if "discovery" in name:
+        return KIND_DISCOVERY
+    if "tech-spec" in name:
+        return KIND_TECH_SPEC
+    return KIND_STORY
+
+
+@dataclass(frozen=True)
+class StoryArtifacts:
+    """Files matching a set of story keys, by kind, each sorted by lowercase name."""
+
+    story: tuple[Path, ...] = ()
+    discovery: tuple[Path, ...] = ()
+    tech_spec: tuple[Path, ...] = ()
+
+    def all(self) -> list[Path]:
+        """Every matching file, sorted by lowercase name."""
+        return sorted((*self.story, *self.discovery, *self.tech_spec), key=lambda p: p.name.lower())
+
+
+class ArtifactIndex:
+    """In-memory index of one artifacts directory, refreshed on directory mtime change."""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the index (the first lookup scans the directory).
+
+        Args:
+            directory: The implementation-artifacts directory (may not exist yet)
+        """
+        self.directory = directory
+        self.scans = 0
+        self._entries: list[tuple[str, str, Path]] = []  # (lowercase name, kind, path)
+        self._by_key: dict[str, dict[str, tuple[Path, ...]]] = {}
+        self._mtime_ns: Optional[int] = None
+        self._provisional = True
+
+    def invalidate(self) -> None:
+        """Force a rescan on the next lookup (e.g. after moving files out)."""
+        self._provisional = True
+
+    def refresh(self) -> bool:
+        """Rescan if the directory changed since the last scan; True if it rescanned."""
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns == self._mtime_ns and not self._provisional:
+            return False
+        self._scan(mtime_ns)
+        return True
+
+    def _scan(self, mtime_ns: Optional[int]) -> None:
+        """Read the directory listing and classify every regular file."""
+        entries = []
+        if mtime_ns is not None:
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        # DirEntry.is_file() uses the d_type from the listing, no stat
+                        if entry.is_file():
+                            entries.append((entry.name.lower(), classify(entry.name), Path(entry.path)))
+            except OSError:
+                entries = []
+
+        self._entries = entries
+        self._by_key = {}
+        self._mtime_ns = mtime_ns
+        self._provisional = (
+            mtime_ns is not None and time.time() - mtime_ns / 1e9 < RACY_WINDOW_SECONDS
+        )
+        self.scans += 1
+
+    def _files_for_key(self, story_key: str) -> dict[str, tuple[Path, ...]]:
+        """Files whose name contains the key, by kind (memoized per scan)."""
+        key = story_key.lower()
+        found = self._by_key.get(key)
+        if found is None:
+            by_kind: dict[str, list[Path]] = {KIND_STORY: [], KIND_DISCOVERY: [], KIND_TECH_SPEC: []}
+            for name, kind, path in self._entries:
+                if key in name:
+                    by_kind[kind].append(path)
+            found = self._by_key[key] = {kind: tuple(paths) for kind, paths in by_kind.items()}
+        return found
+
+    def lookup(self, story_keys: Iterable[str]) -> StoryArtifacts:
+        """Files matching any of the story keys, deduplicated, by kind."""
+        self.refresh()
+        by_kind: dict[str, set[Path]] = {KIND_STORY: set(), KIND_DISCOVERY: set(), KIND_TECH_SPEC: set()}
+        for story_key in story_keys:
+            for kind, paths in self._files_for_key(story_key).items():
+                by_kind[kind].update(paths)
+
+        def ordered(kind: str) -> tuple[Path, ...]:
+            return tuple(sorted(by_kind[kind], key=lambda p: p.name.lower()))
+
+        return StoryArtifacts(
+            story=ordered(KIND_STORY),
+            discovery=ordered(KIND_DISCOVERY),
+            tech_spec=ordered(KIND_TECH_SPEC),
+        )
@@ -0,0 +1,806 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for sprint-runner hot paths.
+
+Each benchmark builds its own fixtures in a temporary directory, so it never
+touches sprint-runner.db, and returns a list of result rows that are printed
+as a table.
+
+Usage:
+    cd dashboard
+    python -m server.benchmarks              # Run all benchmarks
+    python -m server.benchmarks batch-tree   # Run selected benchmarks
+    python -m server.benchmarks --list       # Show available benchmarks
+
+batch-e2e runs whole Orchestrator.start() batches against the claude
+simulator (fake_claude.py), so it measures the pipeline end to end offline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from . import aiodb, codec, db
+from .artifacts import ArtifactIndex
+from .event_writer import EventWriter
+from .injection_cache import InjectionCache, render_xml
+from .ndjson import iter_lines
+from .orchestrator import CLAUDE_COMMAND_ENV_VAR, Orchestrator
+from .selection import SELECTION_STRATEGIES, extract_epic, get_selector, story_sort_key
+from .settings import get_settings
+from .stream_consumers import SubagentOutput
+
+# Registered benchmarks: name -> callable returning result rows
+BENCHMARKS: dict[str, Callable[..., list[dict]]] = {}
+
+
+def benchmark(name: str) -> Callable[[Callable[..., list[dict]]], Callable[..., list[dict]]]:
+    """Register a benchmark function under a CLI name."""
+    def register(fn: Callable[..., list[dict]]) -> Callable[..., list[dict]]:
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 5) -> float:
+    """Return the median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def format_table(rows: list[dict]) -> str:
+    """Render result rows as a fixed-width text table."""
+    if not rows:
+        return "(no results)"
+    columns = list(rows[0].keys())
+    cells = [[_format_cell(row.get(col)) for col in columns] for row in rows]
+    widths = [max(len(col), *(len(r[i]) for r in cells)) for i, col in enumerate(columns)]
+    lines = ["  ".join(col.rjust(w) for col, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(cell.rjust(w) for cell, w in zip(r, widths)) for r in cells)
+    return "\n".join(lines)
+
+
+def _format_cell(value: Any) -> str:
+    """Format one table cell."""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+@contextmanager
+def temporary_database() -> Iterator[Path]:
+    """Point db.py at a fresh database in a temp directory for the duration."""
+    original = db.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "benchmark.db"
+        try:
+            db.init_db()
+            yield db.DB_PATH
+        finally:
+            db.close_connections()
+            db.DB_PATH = original
+
+
+# =============================================================================
+# Batch detail: per-story queries vs get_batch_tree
+# =============================================================================
+
+
+def _populate_batch(story_count: int, commands_per_story: int) -> int:
+    """Insert one batch with story_count stories and their commands."""
+    batch_id = db.create_batch(max_cycles=story_count)
+    now = int(time.time() * 1000)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO stories (batch_id, story_key, epic_id, started_at) VALUES (?, ?, ?, ?)",
+            [(batch_id, f"1-{n}", "1", now) for n in range(story_count)],
+        )
+        story_ids = [
+            row["id"] for row in conn.execute(
+                "SELECT id FROM stories WHERE batch_id = ?", (batch_id,)
+            )
+        ]
+        conn.executemany(
+            "INSERT INTO commands (story_id, command, task_id, started_at) VALUES (?, ?, ?, ?)",
+            [
+                (story_id, f"command-{m}", "task", now)
+                for story_id in story_ids
+                for m in range(commands_per_story)
+            ],
+        )
+    return batch_id
+
+
+def _fetch_per_story(batch_id: int) -> int:
+    """The old batch_detail_handler access pattern (1 + N queries)."""
+    db.get_batch(batch_id)
+    return sum(
+        len(db.get_commands_by_story(story["id"]))
+        for story in db.get_stories_by_batch(batch_id)
+    )
+
+
+def _fetch_tree(batch_id: int) -> int:
+    """The get_batch_tree access pattern (set-based)."""
+    tree = db.get_batch_tree(batch_id)
+    return sum(len(story["commands"]) for story in tree["stories"])  # type: ignore[index]
+
+
+@benchmark("batch-tree")
+def bench_batch_tree(
+    story_counts: tuple[int, ...] = (10, 100, 1000),
+    commands_per_story: int = 5,
+    repeat: int = 5,
+) -> list[dict]:
+    """Latency of loading a batch detail with per-story queries vs get_batch_tree()."""
+    rows = []
+    with temporary_database():
+        for story_count in story_counts:
+            batch_id = _populate_batch(story_count, commands_per_story)
+            assert _fetch_per_story(batch_id) == _fetch_tree(batch_id)
+
+            per_story_ms = time_call(lambda: _fetch_per_story(batch_id), repeat)
+            tree_ms = time_call(lambda: _fetch_tree(batch_id), repeat)
+            rows.append({
+                "stories": story_count,
+                "commands": story_count * commands_per_story,
+                "per_story_ms": per_story_ms,
+                "batch_tree_ms": tree_ms,
+                "speedup": per_story_ms / tree_ms if tree_ms else float("inf"),
+            })
+    return rows
+
+
+# =============================================================================
+# Connections: open per call vs per-thread pool
+# =============================================================================
+
+
+@contextmanager
+def _unpooled_connection() -> Iterator[sqlite3.Connection]:
+    """The previous get_connection(): connect, configure and close on every call."""
+    conn = sqlite3.connect(db.DB_PATH, check_same_thread=False, timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+CONNECTION_OPERATIONS: dict[str, str] = {
+    "read": "SELECT * FROM batches WHERE id = ?",
+    "write": "UPDATE batches SET cycles_completed = cycles_completed + 1 WHERE id = ?",
+}
+
+
+def _run_operations(connect: Callable[[], Any], sql: str, batch_id: int, calls: int) -> None:
+    """Run sql calls times, one connection context per call like the db.py helpers."""
+    for _ in range(calls):
+        with connect() as conn:
+            conn.execute(sql, (batch_id,)).fetchall()
+
+
+@benchmark("db-connection")
+def bench_db_connection(calls: int = 1000, repeat: int = 5) -> list[dict]:
+    """Per-call cost of a db.py helper with a fresh connection each time vs the pooled one."""
+    rows = []
+    with temporary_database():
+        batch_id = db.create_batch(max_cycles=1)
+        for operation, sql in CONNECTION_OPERATIONS.items():
+            unpooled_ms = time_call(lambda: _run_operations(_unpooled_connection, sql, batch_id, calls), repeat)
+            pooled_ms = time_call(lambda: _run_operations(db.get_connection, sql, batch_id, calls), repeat)
+            rows.append({
+                "operation": operation,
+                "calls": calls,
+                "unpooled_us": unpooled_ms * 1000 / calls,
+                "pooled_us": pooled_ms * 1000 / calls,
+                "speedup": unpooled_ms / pooled_ms if pooled_ms else float("inf"),
+            })
+    return rows
+
+
+# =============================================================================
+# Event logging: one transaction per event vs write-behind EventWriter
+# =============================================================================
+
+
+def _stream_events(batch_id: int, count: int) -> list[dict]:
+    """command:start/end rows shaped like the orchestrator's parsed log lines."""
+    events = []
+    for n in range(count):
+        status = "start" if n % 2 == 0 else "end"
+        payload = {"story_key": f"1-{n // 2}", "command": "dev-story", "task_id": "implement", "message": f"step {n}"}
+        events.append({
+            "batch_id": batch_id,
+            "story_id": None,
+            "command_id": None,
+            "event_type": f"command:{status}",
+            "epic_id": "1",
+            "story_key": payload["story_key"],
+            "command": "dev-story",
+            "task_id": "implement",
+            "status": status,
+            "message": payload["message"],
+            "payload": payload,
+        })
+    return events
+
+
+def _write_per_event(events: list[dict]) -> None:
+    """The previous _handle_stream_event path: create_event() per log line."""
+    for event in events:
+        db.create_event(**event)
+
+
+async def _write_behind(events: list[dict]) -> EventWriter:
+    """Queue every event on an EventWriter and wait until all are on disk."""
+    writer = EventWriter(db.create_events)
+    for event in events:
+        writer.write(**event)
+        await asyncio.sleep(0)  # Yield like the stream reader does between lines
+    await writer.stop()
+    return writer
+
+
+@benchmark("event-writes")
+def bench_event_writes(event_counts: tuple[int, ...] = (1000, 10000), repeat: int = 3) -> list[dict]:
+    """Events/s logged per create_event() transaction vs the batched EventWriter."""
+    rows = []
+    with temporary_database():
+        batch_id = db.create_batch(max_cycles=1)
+        try:
+            for count in event_counts:
+                events = _stream_events(batch_id, count)
+                writer = asyncio.run(_write_behind(events))
+                assert writer.events_written == count
+
+                per_event_ms = time_call(lambda: _write_per_event(events), repeat)
+                writer_ms = time_call(lambda: asyncio.run(_write_behind(events)), repeat)
+                rows.append({
+                    "events": count,
+                    "per_event_ev_s": count / per_event_ms * 1000,
+                    "event_writer_ev_s": count / writer_ms * 1000,
+                    "flushes": writer.flush_count,
+                    "speedup": per_event_ms / writer_ms if writer_ms else float("inf"),
+                })
+        finally:
+            asyncio.run(aiodb.shutdown())
+    return rows
+
+
+# =============================================================================
+# JSON codec backends on claude stream-json lines
+# =============================================================================
+
+
+def stream_json_samples(tool_result_kb: int = 8) -> list[bytes]:
+    """
+    One subagent turn as NDJSON lines, shaped like `claude -p --output-format stream-json`.
+
+    Covers the init line, assistant text and tool_use blocks, a tool_result
+    carrying a file read plus a sprint-log CSV line, and the final result.
+    """
+    now = int(time.time())
+    file_body = "".join(
+        f"    {n:4d}  def handler_{n}(request):  # lorem ipsum dolor sit amet\n"
+        for n in range(tool_result_kb * 1024 // 64)
+    )
+    session = "3f9c2a1e-5b7d-4c1a-9e8f-0a1b2c3d4e5f"
+    events: list[dict[str, Any]] = [
+        {"type": "system", "subtype": "init", "session_id": session, "cwd": "/project",
+         "model": "claude-sonnet", "tools": ["Bash", "Read", "Edit", "Write", "Glob", "Grep"]},
+        {"type": "assistant", "session_id": session, "message": {
+            "id": "msg_01", "role": "assistant", "content": [
+                {"type": "text", "text": "I'll start by reading the story file and the current implementation."},
+                {"type": "tool_use", "id": "toolu_01", "name": "Read",
+                 "input": {"file_path": "/project/src/handlers.py"}},
+            ], "usage": {"input_tokens": 5120, "output_tokens": 87}}},
+        {"type": "user", "session_id": session, "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": "toolu_01", "content": file_body},
+        ]}},
+        {"type": "tool_result", "tool_use_id": "toolu_02",
+         "content": f'{now},2a,2a-1,dev-story,implement,start,"Implementing handlers"\n'},
+        {"type": "assistant", "session_id": session, "message": {
+            "id": "msg_02", "role": "assistant", "content": [
+                {"type": "text", "text": "The handler is missing validation. Adding it now. " * 8},
+                {"type": "tool_use", "id": "toolu_03", "name": "Edit", "input": {
+                    "file_path": "/project/src/handlers.py",
+                    "old_string": "def handler_1(request):",
+                    "new_string": "def handler_1(request):\n    validate(request)",
+                }},
+            ], "usage": {"input_tokens": 9216, "output_tokens": 412}}},
+        {"type": "result", "subtype": "success", "session_id": session, "is_error": False,
+         "duration_ms": 48211, "num_turns": 6, "result": "Story 2a-1 implemented.",
+         "total_cost_usd": 0.1842},
+    ]
+    return [json.dumps(event).encode() + b"\n" for event in events]
+
+
+@benchmark("json-codec")
+def bench_json_codec(tool_result_kb: int = 8, rounds: int = 200, repeat: int = 5) -> list[dict]:
+    """Decode/encode throughput of each installed JSON backend on stream-json lines."""
+    lines = stream_json_samples(tool_result_kb)
+    decoded = [json.loads(line) for line in lines]
+    payload_mb = sum(len(line) for line in lines) * rounds / (1024 * 1024)
+
+    rows = []
+    for name, backend in codec.available_backends().items():
+        def decode() -> None:
+            for _ in range(rounds):
+                for line in lines:
+                    backend.loads(line)
+
+        def encode() -> None:
+            for _ in range(rounds):
+                for event in decoded:
+                    backend.dumpb(event)
+
+        assert [backend.loads(line) for line in lines] == decoded
+        decode_ms = time_call(decode, repeat)
+        encode_ms = time_call(encode, repeat)
+        rows.append({
+            "backend": name + (" (active)" if name == codec.BACKEND else ""),
+            "decode_mb_s": payload_mb / (decode_ms / 1000),
+            "encode_mb_s": payload_mb / (encode_ms / 1000),
+            "decode_ms": decode_ms,
+            "encode_ms": encode_ms,
+        })
+    return rows
+
+
+# =============================================================================
+# NDJSON stream parsing: readline() vs chunked reader
+# =============================================================================
+
+
+def _stream_of(data: bytes) -> asyncio.StreamReader:
+    """A StreamReader (default 64 KiB limit) holding data, then EOF."""
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+async def _parse_readline(data: bytes) -> int:
+    """The previous _parse_ndjson_stream: readline(), decode(), strip(), json.loads()."""
+    stream = _stream_of(data)
+    count = 0
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        line_str = line.decode().strip()
+        if line_str:
+            json.loads(line_str)
+            count += 1
+    return count
+
+
+async def _parse_chunked(data: bytes) -> int:
+    """The current _parse_ndjson_stream: iter_lines() views into codec.loads()."""
+    count = 0
+    async for line in iter_lines(_stream_of(data)):
+        codec.loads(line)
+        count += 1
+    return count
+
+
+@benchmark("ndjson-stream")
+def bench_ndjson_stream(
+    tool_result_kbs: tuple[int, ...] = (1, 16, 256),
+    stream_mb: int = 16,
+    repeat: int = 5,
+) -> list[dict]:
+    """Subagent stdout parse throughput (MB/s): readline()+json vs chunked reader+codec."""
+    rows = []
+    for tool_result_kb in tool_result_kbs:
+        turn = b"".join(stream_json_samples(tool_result_kb))
+        data = turn * max(1, stream_mb * 1024 * 1024 // len(turn))
+        size_mb = len(data) / (1024 * 1024)
+        longest_kb = max(len(line) for line in data.splitlines()) / 1024
+
+        try:
+            lines = asyncio.run(_parse_readline(data))
+            readline_ms = time_call(lambda: asyncio.run(_parse_readline(data)), repeat)
+            readline_mb_s: Any = size_mb / (readline_ms / 1000)
+        except ValueError as e:  # LimitOverrunError surfaces as ValueError
+            lines, readline_mb_s = None, type(e).__name__
+
+        assert lines is None or asyncio.run(_parse_chunked(data)) == lines
+        chunked_ms = time_call(lambda: asyncio.run(_parse_chunked(data)), repeat)
+        rows.append({
+            "longest_line_kb": longest_kb,
+            "stream_mb": size_mb,
+            "readline_mb_s": readline_mb_s,
+            "chunked_mb_s": size_mb / (chunked_ms / 1000),
+            "codec": codec.BACKEND,
+        })
+    return rows
+
+
+# =============================================================================
+# Subagent output: event list + string concatenation vs streaming consumers
+# =============================================================================
+
+
+def _assistant_events(count: int, text_chars: int) -> Iterator[dict]:
+    """Generate assistant events, freshly decoded like the NDJSON parser would."""
+    for n in range(count):
+        text = f"Step {n}: " + "x" * text_chars
+        if n == count - 1:
+            text += "\nHIGHEST SEVERITY: LOW"
+        yield json.loads(json.dumps(
+            {"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}}
+        ))
+
+
+def _consume_list(events: Iterator[dict]) -> str:
+    """The previous spawn_subagent: keep every event, concatenate all text."""
+    results: list[dict] = []
+    stdout_content = ""
+    for event in events:
+        results.append(event)
+        for block in event["message"]["content"]:
+            stdout_content += block["text"]
+    return "LOW" if "HIGHEST SEVERITY: LOW" in stdout_content else "UNKNOWN"
+
+
+def _consume_streaming(events: Iterator[dict], max_text_chars: int) -> str:
+    """The current spawn_subagent: SubagentOutput with a bounded text buffer."""
+    output = SubagentOutput(max_text_chars=max_text_chars)
+    for event in events:
+        output.feed_event(event)
+    return output.highest_severity
+
+
+def _peak_mb(fn: Callable[[], Any]) -> float:
+    """Peak Python heap allocated while running fn(), in MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+@benchmark("subagent-output")
+def bench_subagent_output(
+    event_counts: tuple[int, ...] = (1000, 5000, 20000),
+    text_chars: int = 1024,
+    max_text_chars: int = 1024 * 1024,
+) -> list[dict]:
+    """Peak memory (MB) of consuming one subagent run: event list + concat vs streaming."""
+    rows = []
+    for count in event_counts:
+        assert _consume_list(_assistant_events(count, text_chars)) == "LOW"
+        assert _consume_streaming(_assistant_events(count, text_chars), max_text_chars) == "LOW"
+        rows.append({
+            "events": count,
+            "text_mb": count * text_chars / (1024 * 1024),
+            "list_concat_peak_mb": _peak_mb(lambda: _consume_list(_assistant_events(count, text_chars))),
+            "streaming_peak_mb": _peak_mb(
+                lambda: _consume_streaming(_assistant_events(count, text_chars), max_text_chars)
+            ),
+        })
+    return rows
+
+
+# =============================================================================
+# Story selection on a large development_status
+# =============================================================================
+
+
+def synthetic_sprint_status(entries: int = 5000, epics: int = 50, dependencies: bool = False) -> dict:
+    """
+    A parsed sprint-status.yaml with `entries` stories spread over `epics` epics.
+
+    The first 60% of each epic is done, the next story is in review, then
+    ready-for-dev, then backlog. With dependencies, every story depends on the
+    previous story of its epic.
+    """
+    per_epic = max(1, entries // epics)
+    dev_status: dict[str, str] = {}
+    depends_on: dict[str, list[str]] = {}
+    for epic in range(1, epics + 1):
+        dev_status[f"epic-{epic}"] = "in-progress"
+        for n in range(1, per_epic + 1):
+            progress = n / per_epic
+            key = f"{epic}-{n}-story-{epic}-{n}"
+            dev_status[key] = (
+                "done" if progress <= 0.6 else
+                "review" if progress <= 0.62 else
+                "ready-for-dev" if progress <= 0.8 else
+                "backlog"
+            )
+            if dependencies and n > 1:
+                depends_on[key] = [f"{epic}-{n - 1}-story-{epic}-{n - 1}"]
+        dev_status[f"epic-{epic}-retrospective"] = "optional"
+
+    status: dict[str, Any] = {"development_status": dev_status}
+    if dependencies:
+        status["story_dependencies"] = depends_on
+    return status
+
+
+def _select_previous(status: dict) -> list[str]:
+    """The previous select_stories: filter, sort, then pair within the first epic."""
+    dev_status = status.get("development_status", {})
+    stories = [
+        key for key in dev_status.keys()
+        if not key.startswith("epic-") and not key.endswith("-retrospective")
+    ]
+    available = [key for key in stories if dev_status[key] not in ("done", "blocked")]
+    available.sort(key=story_sort_key)
+    if not available:
+        return []
+    first = available[0]
+    for story in available[1:]:
+        if extract_epic(story) == extract_epic(first):
+            return [first, story]
+    return [first]
+
+
+@benchmark("story-selection")
+def bench_story_selection(
+    entries: int = 5000, epics: int = 50, max_stories: int = 8, repeat: int = 5
+) -> list[dict]:
+    """Latency of picking one cycle's stories from a large development_status, per strategy."""
+    rows = []
+    for dependencies in (False, True):
+        status = synthetic_sprint_status(entries, epics, dependencies)
+        candidates: list[tuple[str, Callable[[dict], list[str]]]] = [("previous", _select_previous)]
+        candidates += [(name, get_selector(name, max_stories).select) for name in SELECTION_STRATEGIES]
+
+        for name, select in candidates:
+            selected = select(status)
+            rows.append({
+                "strategy": name,
+                "entries": len(status["development_status"]),
+                "dependencies": dependencies,
+                "selected": len(selected),
+                "epics": len({extract_epic(key) for key in selected}),
+                "ms": time_call(lambda: select(status), repeat),
+            })
+    return rows
+
+
+# =============================================================================
+# Benchmark: artifact lookup
+# =============================================================================
+
+
+def _populate_artifacts(directory: Path, stories: int) -> list[str]:
+    """Story, discovery and tech-spec files per story; returns the story keys."""
+    keys = [f"{n // 10 + 1}-{n % 10 + 1}" for n in range(stories)]
+    for key in keys:
+        for suffix in ("story", "discovery-story", "tech-spec"):
+            (directory / f"sprint-{key}-{suffix}.md").write_text(key)
+    # An old directory mtime, as between cycles: the index's scan is not provisional
+    os.utime(directory, (time.time() - 60, time.time() - 60))
+    return keys
+
+
+def _scan_per_key(directory: Path, story_keys: list[str]) -> int:
+    """Previous lookup: list the directory once per story key."""
+    found: set[Path] = set()
+    for story_key in story_keys:
+        for file_path in directory.iterdir():
+            if file_path.is_file() and story_key.lower() in file_path.name.lower():
+                found.add(file_path)
+    return len(found)
+
+
+@benchmark("artifact-index")
+def bench_artifact_index(stories: tuple[int, ...] = (100, 1000), lookups: int = 20, repeat: int = 5) -> list[dict]:
+    """Repeated story artifact lookups: directory scan per key vs ArtifactIndex."""
+    rows = []
+    for count in stories:
+        with tempfile.TemporaryDirectory(prefix="sprint-runner-bench-") as tmp:
+            directory = Path(tmp)
+            keys = _populate_artifacts(directory, count)
+            cycle_keys = keys[-2:]
+            index = ArtifactIndex(directory)
+
+            scan_ms = time_call(lambda: [_scan_per_key(directory, cycle_keys) for _ in range(lookups)], repeat)
+            index_ms = time_call(lambda: [index.lookup(cycle_keys) for _ in range(lookups)], repeat)
+            rows.append({
+                "files": count * 3,
+                "lookups": lookups,
+                "matched": len(index.lookup(cycle_keys).all()),
+                "scan_ms": scan_ms,
+                "index_ms": index_ms,
+                "index_scans": index.scans,
+            })
+    return rows
+
+
+# =============================================================================
+# Benchmark: injection cache
+# =============================================================================
+
+
+def _build_uncached(paths: list[Path]) -> int:
+    """Previous build: read every file and render and encode the XML."""
+    xml = render_xml([(path.name, path.read_text()) for path in paths])
+    return len(xml.encode("utf-8"))
+
+
+def _build_cached(cache: InjectionCache, paths: list[Path]) -> int:
+    """Cached build: stat every file, reuse contents and XML while unchanged."""
+    files = [(path.name, cache.read(path)) for path in paths]
+    return cache.render(files).size_bytes  # type: ignore[arg-type]
+
+
+@benchmark("injection-cache")
+def bench_injection_cache(file_kb: tuple[int, ...] = (4, 32), files: int = 4, builds: int = 10, repeat: int = 5) -> list[dict]:
+    """Repeated identical injections (code-review loop): read + render each time vs cache."""
+    rows = []
+    for kb in file_kb:
+        with tempfile.TemporaryDirectory(prefix="sprint-runner-bench-") as tmp:
+            paths = []
+            for n in range(files):
+                path = Path(tmp) / f"sprint-1-{n}-story.md"
+                path.write_text(("- [ ] task line for the story file\n" * (kb * 1024 // 36 + 1))[: kb * 1024])
+                os.utime(path, (time.time() - 60, time.time() - 60))
+                paths.append(path)
+            cache = InjectionCache()
+
+            uncached_ms = time_call(lambda: [_build_uncached(paths) for _ in range(builds)], repeat)
+            cached_ms = time_call(lambda: [_build_cached(cache, paths) for _ in range(builds)], repeat)
+            stats = cache.stats()
+            rows.append({
+                "file_kb": kb,
+                "files": files,
+                "builds": builds,
+                "uncached_ms": uncached_ms,
+                "cached_ms": cached_ms,
+                "file_reads": stats["file_misses"],
+                "renders": stats["misses"],
+            })
+    return rows
+
+
+# =============================================================================
+# End to end: Orchestrator.start() against the claude simulator
+# =============================================================================
+
+FAKE_CLAUDE = Path(__file__).parent / "fake_claude.py"
+
+
+@contextmanager
+def overridden_settings(**values: Any) -> Iterator[None]:
+    """Change settings in memory (never saved) for the duration."""
+    settings = get_settings()
+    original = {key: getattr(settings, key) for key in values}
+    for key, value in values.items():
+        setattr(settings, key, value)
+    try:
+        yield
+    finally:
+        for key, value in original.items():
+            setattr(settings, key, value)
+
+
+def simulated_project(root: Path, stories: int) -> list[str]:
+    """A project with `stories` backlog stories and a fresh project context."""
+    artifacts = root / "_bmad-output/implementation-artifacts"
+    planning = root / "_bmad-output/planning-artifacts"
+    artifacts.mkdir(parents=True)
+    planning.mkdir(parents=True)
+    story_keys = [f"1-{n}-story-{n}" for n in range(1, stories + 1)]
+    lines = ["development_status:", "  epic-1: in-progress"]
+    lines.extend(f"  {key}: backlog" for key in story_keys)
+    (artifacts / "sprint-status.yaml").write_text("\n".join(lines) + "\n")
+    (planning / "project-context.md").write_text("# Project Context\n\n" + "- convention line\n" * 200)
+    # A repository, so the commit phase captures a real `git status`
+    if shutil.which("git"):
+        subprocess.run(["git", "init", "-q", str(root)], check=False)
+    return story_keys
+
+
+async def _run_batch(root: Path) -> tuple[Orchestrator, list[dict]]:
+    """Run one batch to completion and return it with its stored events."""
+    orchestrator = Orchestrator(batch_mode="all", project_root=root)
+    try:
+        await orchestrator.start()
+        events = await aiodb.run_read(db.get_events_by_batch, orchestrator.current_batch_id)
+    finally:
+        await aiodb.shutdown()
+    return orchestrator, events
+
+
+@benchmark("batch-e2e")
+def bench_batch_e2e(
+    stories: tuple[int, ...] = (2, 4),
+    warm_pool: tuple[int, ...] = (0, 1),
+    speed: float = 100.0,
+    simulator_args: tuple[str, ...] = (),
+) -> list[dict]:
+    """Whole batches (all stories) through Orchestrator.start() with fake_claude.py at `speed`x."""
+    command = [sys.executable, str(FAKE_CLAUDE), "--sim-speed", str(speed), *simulator_args]
+    original = os.environ.get(CLAUDE_COMMAND_ENV_VAR)
+    os.environ[CLAUDE_COMMAND_ENV_VAR] = " ".join(shlex.quote(arg) for arg in command)
+    rows = []
+    try:
+        for count in stories:
+            for pool_size in warm_pool:
+                with temporary_database(), tempfile.TemporaryDirectory(prefix="sprint-runner-bench-") as tmp, \
+                        overridden_settings(warm_pool_size=pool_size):
+                    story_keys = simulated_project(Path(tmp), count)
+                    start = time.perf_counter()
+                    orchestrator, events = asyncio.run(_run_batch(Path(tmp)))
+                    wall = time.perf_counter() - start
+                    status = orchestrator.read_sprint_status()["development_status"]
+                    done = sum(1 for key in story_keys if status.get(key) == "done")
+                    rows.append({
+                        "stories": count,
+                        "warm_pool": pool_size,
+                        "cycles": orchestrator.cycles_completed,
+                        "subagents": sum(1 for e in events if e["event_type"] == "command:start"),
+                        "events": len(events),
+                        "done": done,
+                        "wall_s": wall,
+                        "stories_per_min": done / wall * 60,
+                    })
+    finally:
+        if original is None:
+            os.environ.pop(CLAUDE_COMMAND_ENV_VAR, None)
+        else:
+            os.environ[CLAUDE_COMMAND_ENV_VAR] = original
+    return rows
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the selected benchmarks and print their result tables."""
+    parser = argparse.ArgumentParser(description="Sprint-runner micro-benchmarks")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="List available benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, fn in BENCHMARKS.items():
+            print(f"{name:20} {(fn.__doc__ or '').strip()}")
+        return 0
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or list(BENCHMARKS):
+        print(f"\n== {name} ==")
+        print(format_table(BENCHMARKS[name]()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Child process I/O management for claude subagents.
+
+A child that writes to a pipe nobody reads blocks once the pipe buffer
+(64 KiB on Linux) is full. spawn_subagent() parses stdout, but stderr was
+never read, so a verbose or failing child could hang the batch. ChildIO
+drains stderr concurrently into a bounded ring buffer, keeping only the
+most recent output for failure reports, and counts the bytes each child
+writes on both streams.
+
+Usage:
+    from .child_io import ChildIO
+
+    child = ChildIO(process, "sprint-dev-story", stderr_limit=64 * 1024)
+    child.start()                        # Before writing stdin
+    async for line in iter_lines(child.stdout):
+        ...
+    await process.wait()
+    await child.close()
+    child.stderr_tail()                  # Most recent stderr, decoded
+    child.stats()                        # {"stdout_bytes": ..., "stderr_bytes": ..., ...}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default stderr bytes retained per child
+DEFAULT_STDERR_LIMIT = 64 * 1024
+
+# Bytes requested per stderr read()
+STDERR_CHUNK_SIZE = 64 * 1024
+
+# How long close() waits for stderr EOF after the child exits. Grandchildren
+# that inherited the pipe can keep it open after the child itself is gone.
+CLOSE_TIMEOUT_SECONDS = 5.0
+
+
+class ByteRing:
+    """Keeps the most recent max_bytes written, as a deque of chunks."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the ring.
+
+        Args:
+            max_bytes: Bytes retained; older bytes are dropped
+        """
+        self.max_bytes = max_bytes
+        self.dropped_bytes = 0
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> None:
+        """Append data, dropping the oldest bytes beyond max_bytes."""
+        if not data:
+            return
+        self._chunks.append(data)
+        self._size += len(data)
+
+        while self._size > self.max_bytes:
+            excess = self._size - self.max_bytes
+            head = self._chunks[0]
+            if len(head) <= excess:
+                self._chunks.popleft()
+                self._size -= len(head)
+                self.dropped_bytes += len(head)
+            else:
+                self._chunks[0] = head[excess:]
+                self._size -= excess
+                self.dropped_bytes += excess
+
+    def getvalue(self) -> bytes:
+        """The retained bytes."""
+        return b"".join(self._chunks)
+
+
+class CountingReader:
+    """Wraps a StreamReader's read() to count the bytes it returns."""
+
+    def __init__(self, stream: asyncio.StreamReader):
+        """Initialize with the stream to wrap."""
+        self._stream = stream
+        self.bytes_read = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to n bytes from the wrapped stream."""
+        data = await self._stream.read(n)
+        self.bytes_read += len(data)
+        return data
+
+
+class ChildIO:
+    """Concurrent stderr drain, stderr ring buffer and byte counters for one child."""
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        name: str,
+        stderr_limit: int = DEFAULT_STDERR_LIMIT,
+    ):
+        """
+        Initialize for a spawned process.
+
+        Args:
+            process: Child created with stdout/stderr pipes
+            name: Name for logging (e.g. the prompt name)
+            stderr_limit: Most recent stderr bytes to retain
+        """
+        self.process = process
+        self.name = name
+        self.stdout = CountingReader(process.stdout) if process.stdout else None
+        self.stderr = ByteRing(stderr_limit)
+        self.stderr_bytes = 0
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start draining stderr (call before blocking on stdin or stdout)."""
+        if self._drain_task is None and self.process.stderr is not None:
+            self._drain_task = asyncio.create_task(self._drain_stderr())
+
+    async def _drain_stderr(self) -> None:
+        """Read stderr until EOF into the ring buffer."""
+        stream = self.process.stderr
+        assert stream is not None
+        while True:
+            chunk = await stream.read(STDERR_CHUNK_SIZE)
+            if not chunk:
+                break
+            self.stderr_bytes += len(chunk)
+            self.stderr.write(chunk)
+
+    async def close(self, timeout: float = CLOSE_TIMEOUT_SECONDS) -> None:
+        """Wait for the stderr drain to reach EOF, cancelling it after timeout."""
+        if self._drain_task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._drain_task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self.name}: stderr still open {timeout}s after exit, abandoning drain")
+            self.cancel()
+        except Exception as e:
+            logger.warning(f"{self.name}: stderr drain failed: {e}")
+
+    def cancel(self) -> None:
+        """Stop draining immediately (e.g. when the child is killed)."""
+        if self._drain_task is not None and not self._drain_task.done():
+            self._drain_task.cancel()
+
+    def stderr_tail(self) -> str:
+        """The retained stderr, decoded (invalid UTF-8 replaced)."""
+        return self.stderr.getvalue().decode("utf-8", errors="replace")
+
+    def stats(self) -> dict[str, Any]:
+        """Per-child byte counters."""
+        return {
+            "stdout_bytes": self.stdout.bytes_read if self.stdout else 0,
+            "stderr_bytes": self.stderr_bytes,
+            "stderr_dropped_bytes": self.stderr.dropped_bytes,
+        }
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Per-client bounded send queues for WebSocket fan-out.
+
+The server hands each serialized event to every client's ClientOutbox and
+returns immediately. Each outbox drains its own queue with its own writer
+task, so a slow browser tab only ever delays itself.
+
+When a queue is full the overflow policy decides what gives:
+
+- drop-oldest: drop the oldest queued command event
+- coalesce: replace a queued command event for the same story/command/task
+  with the newer one (a task's end supersedes its start), else drop the
+  oldest command event
+- disconnect: close the client (it resyncs from init on reconnect)
+
+Command events (command:start/progress/end, one per sprint-log line of a
+running subagent) are the high-volume stream and the only lossy ones. If
+nothing in the queue may be dropped, the client is disconnected under any
+policy; losing batch/cycle/story events would leave its view wrong.
+
+Usage:
+    from .client_outbox import ClientOutbox, OutboxStats
+
+    totals = OutboxStats()
+    outbox = ClientOutbox(ws, maxsize=1000, policy="drop-oldest", stats=totals)
+    outbox.put("command:end", message, coalesce_key(event_type, payload))
+    await outbox.join()  # Wait until everything queued has been sent
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_DISCONNECT)
+
+# Event types that may be dropped or coalesced under backpressure: the
+# per-task stream from Orchestrator._handle_stream_event()
+LOSSY_EVENT_TYPES = frozenset({"command:start", "command:progress", "command:end"})
+
+# Queue wait after which a delivered message counts as delayed
+DELAYED_THRESHOLD_SECONDS = 1.0
+
+
+def coalesce_key(event_type: Optional[str], payload: dict[str, Any]) -> Optional[Hashable]:
+    """
+    Get the key under which an event may be coalesced, or None.
+
+    Command events for the same story/command/task supersede each other, so
+    a queued start is replaced in place by its end.
+    """
+    if event_type not in LOSSY_EVENT_TYPES:
+        return None
+    return (payload.get("story_key"), payload.get("command"), payload.get("task_id"))
+
+
+@dataclass
+class OutboxStats:
+    """Delivery counters for one client or summed over all clients."""
+
+    sent: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    delayed: int = 0
+    disconnected: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert counters to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class _Message:
+    """A queued, already-serialized frame."""
+
+    event_type: Optional[str]
+    data: str
+    key: Optional[Hashable]
+    enqueued_at: float
+
+
+class ClientOutbox:
+    """Bounded outbound queue and writer task for one WebSocket client."""
+
+    def __init__(
+        self,
+        ws: Any,
+        maxsize: int = 1000,
+        policy: str = OVERFLOW_DROP_OLDEST,
+        stats: Optional[OutboxStats] = None,
+        on_close: Optional[Callable[["ClientOutbox"], None]] = None,
+        paused: bool = False,
+    ):
+        """
+        Initialize the outbox.
+
+        Args:
+            ws: The WebSocket (anything with async send_str() and close())
+            maxsize: Maximum queued messages before the overflow policy applies
+            policy: One of OVERFLOW_POLICIES
+            stats: Shared counters to update alongside this client's own
+            on_close: Called once when the outbox closes (send failure,
+                overflow disconnect, or close())
+            paused: Queue messages without sending them until resume()
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+
+        self.ws = ws
+        self.maxsize = maxsize
+        self.policy = policy
+        self.stats = OutboxStats()
+        self._totals = stats
+        self._on_close = on_close
+
+        self._queue: deque[_Message] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.paused = paused
+
+    @property
+    def pending_count(self) -> int:
+        """Number of messages waiting to be sent."""
+        return len(self._queue)
+
+    def put(self, event_type: Optional[str], data: str, key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a serialized message without waiting for it to be sent.
+
+        Args:
+            event_type: Event type (decides whether it may be dropped)
+            data: Serialized frame
+            key: Coalescing key from coalesce_key()
+
+        Returns:
+            False if the outbox is (now) closed and the message was not queued
+        """
+        if self.closed:
+            return False
+
+        if len(self._queue) >= self.maxsize:
+            if self.policy == OVERFLOW_COALESCE and key is not None and self._coalesce(key, data):
+                return True
+            if self.policy == OVERFLOW_DISCONNECT or not self._drop_oldest_lossy():
+                self._count("disconnected")
+                self._disconnect()
+                return False
+
+        self._queue.append(_Message(event_type, data, key, time.monotonic()))
+        self._start_drain()
+        return True
+
+    def resume(self, skip: Iterable[str] = ()) -> None:
+        """
+        Start sending messages queued while paused.
+
+        Args:
+            skip: Frames the client already has (e.g. in its init snapshot);
+                queued copies are discarded instead of sent twice
+        """
+        skip = set(skip)
+        if skip:
+            self._queue = deque(message for message in self._queue if message.data not in skip)
+        self.paused = False
+        self._start_drain()
+
+    def _start_drain(self) -> None:
+        """Start the writer task unless paused, closed or already running."""
+        if self.paused or self.closed or not self._queue:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def join(self) -> None:
+        """Wait until every queued message has been sent (or the outbox closed)."""
+        task = self._task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Writer cancelled by close() - only propagate our own cancellation
+            if not task.cancelled():
+                raise
+
+    def close(self) -> None:
+        """Stop the writer and discard queued messages."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    async def _drain(self) -> None:
+        """Writer task: send queued messages in order until the queue is empty."""
+        while self._queue:
+            message = self._queue.popleft()
+            try:
+                await self.ws.send_str(message.data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"WebSocket send failed, removing client: {e}", file=sys.stderr)
+                self.close()
+                return
+            self._count("sent")
+            if time.monotonic() - message.enqueued_at > DELAYED_THRESHOLD_SECONDS:
+                self._count("delayed")
+
+    def _coalesce(self, key: Hashable, data: str) -> bool:
+        """Replace the queued message with the same key, keeping its position."""
+        for message in self._queue:
+            if message.key == key:
+                message.data = data
+                self._count("coalesced")
+                return True
+        return False
+
+    def _drop_oldest_lossy(self) -> bool:
+        """Drop the oldest queued message that may be lost."""
+        for index, message in enumerate(self._queue):
+            if message.event_type in LOSSY_EVENT_TYPES:
+                del self._queue[index]
+                self._count("dropped")
+                return True
+        return False
+
+    def _disconnect(self) -> None:
+        """Close the outbox and the WebSocket so the client reconnects."""
+        self.close()
+        try:
+            asyncio.ensure_future(self.ws.close())
+        except Exception:
+            pass
+
+    def _count(self, field: str) -> None:
+        """Increment a counter for this client and in the shared totals."""
+        setattr(self.stats, field, getattr(self.stats, field) + 1)
+        if self._totals is not None:
+            setattr(self._totals, field, getattr(self._totals, field) + 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Pluggable JSON codec.
+
+Picks the fastest available backend at import time - orjson, then ujson,
+then the stdlib json module - so the hot paths (NDJSON stream parsing,
+event payloads, WebSocket frames, HTTP responses) share one encoder.
+Set SPRINT_RUNNER_JSON=orjson|ujson|json to force a backend.
+
+Output is compact (no spaces after separators) with every backend.
+
+Usage:
+    from . import codec
+
+    codec.loads(b'{"type": "assistant"}\\n')   # bytes, bytearray, memoryview or str
+    codec.dumps({"a": 1})                       # -> str (aiohttp dumps= hook)
+    codec.dumpb({"a": 1})                       # -> bytes
+    web.json_response(data, dumps=codec.dumps)
+
+    try:
+        codec.loads(line)
+    except codec.DecodeError:                   # Subclass of ValueError
+        ...
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+# Environment variable forcing a backend by name
+BACKEND_ENV_VAR = "SPRINT_RUNNER_JSON"
+
+# Backends in order of preference
+PREFERENCE = ("orjson", "ujson", "json")
+
+
+@dataclass(frozen=True)
+class Backend:
+    """One JSON implementation behind the codec interface."""
+
+    name: str
+    dumps: Callable[..., str]
+    dumpb: Callable[..., bytes]
+    loads: Callable[[Any], Any]
+    decode_error: type[ValueError]
+
+
+def _orjson_backend() -> Backend:
+    """orjson: Rust, bytes-native."""
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumpb(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return orjson.dumps(obj, default=default, option=option)
+
+    def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+    return Backend("orjson", dumps, dumpb, orjson.loads, orjson.JSONDecodeError)
+
+
+def _ujson_backend() -> Backend:
+    """ujson: C, str-native."""
+    import ujson
+
+    def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=default)
+
+    def dumpb(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return dumps(obj, default).encode()
+
+    def loads(data: Any) -> Any:
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        return ujson.loads(data)
+
+    # ujson raises plain ValueError subclasses (including for bad UTF-8)
+    return Backend("ujson", dumps, dumpb, loads, ValueError)
+
+
+def _stdlib_backend() -> Backend:
+    """The json module; always available."""
+    separators = (",", ":")
+
+    def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=separators, default=default)
+
+    def dumpb(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return dumps(obj, default).encode()
+
+    def loads(data: Any) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    # ValueError also covers UnicodeDecodeError from invalid UTF-8 bytes
+    return Backend("json", dumps, dumpb, loads, ValueError)
+
+
+_FACTORIES: dict[str, Callable[[], Backend]] = {
+    "orjson": _orjson_backend,
+    "ujson": _ujson_backend,
+    "json": _stdlib_backend,
+}
+
+
+def available_backends() -> dict[str, Backend]:
+    """Get every importable backend, in order of preference."""
+    backends = {}
+    for name in PREFERENCE:
+        try:
+            backends[name] = _FACTORIES[name]()
+        except ImportError:
+            continue
+    return backends
+
+
+def select_backend(name: Optional[str] = None) -> Backend:
+    """
+    Get a backend by name, or the fastest available one.
+
+    Raises:
+        ValueError: If name is unknown
+        ImportError: If the named backend is not installed
+    """
+    if name:
+        if name not in _FACTORIES:
+            raise ValueError(f"Unknown JSON backend: {name} (expected one of {', '.join(PREFERENCE)})")
+        return _FACTORIES[name]()
+    return next(iter(available_backends().values()))
+
+
+_backend = select_backend(os.environ.get(BACKEND_ENV_VAR))
+
+BACKEND: str = _backend.name
+dumps = _backend.dumps
+dumpb = _backend.dumpb
+loads = _backend.loads
+DecodeError = _backend.decode_error
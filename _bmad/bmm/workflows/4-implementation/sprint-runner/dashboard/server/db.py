@@ -10,16 +10,18 @@ Usage:
 
     init_db()  # Call once at startup
     batch_id = create_batch(max_cycles=3)
+    close_connections()  # Call once at shutdown
 """
 
 from __future__ import annotations
-import json
 import sqlite3
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Any, Generator, List
 
+from . import codec
 from .shared import DB_PATH
 
 # =============================================================================
@@ -42,36 +44,150 @@ VALID_STORY_STATUSES = {
 }
 
 
+# =============================================================================
+# Connection Pool
+# =============================================================================
+
+# One long-lived connection per thread, opened lazily and configured once.
+# Connections are keyed by database path so that re-pointing DB_PATH (tests,
+# alternate databases) transparently opens a fresh connection.
+_local = threading.local()
+
+# Registry of every pooled connection so close_connections() can shut them
+# all down from on_cleanup, regardless of which thread opened them.
+_pool_lock = threading.Lock()
+_pooled_connections: set[sqlite3.Connection] = set()
+
+
+# WAL storage profile. journal_mode is persistent in the database file and is
+# set by init_db(); the remaining pragmas are per-connection and applied when
+# a pooled connection is opened.
+JOURNAL_MODE = 'WAL'
+CONNECTION_PRAGMAS = (
+    ('foreign_keys', 'ON'),
+    ('synchronous', 'NORMAL'),             # Durable at checkpoints, no fsync per commit in WAL
+    ('cache_size', -16000),                # 16 MB page cache (negative = KiB)
+    ('temp_store', 'MEMORY'),
+    ('mmap_size', 64 * 1024 * 1024),       # 64 MB memory-mapped reads
+    ('journal_size_limit', 32 * 1024 * 1024),  # Truncate -wal to 32 MB after checkpoints
+)
+
+# Checkpoint with TRUNCATE (instead of PASSIVE) once the -wal file passes this size
+WAL_TRUNCATE_THRESHOLD_BYTES = 32 * 1024 * 1024
+
+
+def _open_connection(db_path: Path) -> sqlite3.Connection:
+    """Open and configure a new pooled connection."""
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        timeout=30.0
+    )
+    conn.row_factory = sqlite3.Row  # Enable dict-like access
+    for pragma, value in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    with _pool_lock:
+        _pooled_connections.add(conn)
+    return conn
+
+
+def _discard_connection(conn: sqlite3.Connection) -> None:
+    """Close a pooled connection and drop it from the registry."""
+    with _pool_lock:
+        _pooled_connections.discard(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def _acquire_connection() -> sqlite3.Connection:
+    """Return this thread's pooled connection for the current DB_PATH."""
+    db_path = Path(DB_PATH)
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'depth', 0) > 0:
+        # Nested block: always the outer block's connection and transaction
+        return conn
+    if conn is not None and _local.path == db_path and conn in _pooled_connections:
+        return conn
+
+    # Stale (closed by close_connections) or pointing at another database
+    if conn is not None:
+        _discard_connection(conn)
+
+    conn = _open_connection(db_path)
+    _local.conn = conn
+    _local.path = db_path
+    _local.depth = 0
+    return conn
+
+
 @contextmanager
 def get_connection() -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager for database connections.
 
+    Connections are pooled per thread and reused across calls instead of
+    being opened and closed every time.
+
     Ensures:
-    - Foreign keys are enabled
-    - Connection is properly closed
+    - Foreign keys are enabled (once, when the connection is opened)
+    - Transaction is committed on success, rolled back on error
     - Row factory returns dicts
+    - Nested use on the same thread runs inside the outermost transaction as a
+      SAVEPOINT: an error in the inner block undoes only its own writes, and
+      nothing is committed until the outermost block succeeds
 
     Usage:
         with get_connection() as conn:
             cursor = conn.execute("SELECT * FROM batches")
             rows = cursor.fetchall()
     """
-    conn = sqlite3.connect(
-        DB_PATH,
-        check_same_thread=False,
-        timeout=30.0
-    )
-    conn.row_factory = sqlite3.Row  # Enable dict-like access
-    conn.execute("PRAGMA foreign_keys = ON")
+    conn = _acquire_connection()
+    depth = _local.depth
+    savepoint = f"nested_{depth}"
+    if depth:
+        # A SAVEPOINT outside a transaction would commit on RELEASE; open the outer one
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute(f"SAVEPOINT {savepoint}")
+    _local.depth = depth + 1
     try:
         yield conn
-        conn.commit()
+        if depth:
+            conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+        else:
+            conn.commit()
     except Exception:
-        conn.rollback()
+        if depth:
+            conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+        else:
+            conn.rollback()
         raise
     finally:
-        conn.close()
+        _local.depth = depth
+
+
+def close_connections() -> int:
+    """
+    Close every pooled connection (call once at shutdown).
+
+    Safe to call multiple times; threads that use the database afterwards
+    transparently open a new connection.
+
+    Returns:
+        Number of connections closed
+    """
+    with _pool_lock:
+        connections = list(_pooled_connections)
+        _pooled_connections.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    return len(connections)
 
 
 SCHEMA = """
@@ -150,6 +266,7 @@ CREATE INDEX IF NOT EXISTS idx_stories_batch_key ON stories(batch_id, story_key)
 CREATE INDEX IF NOT EXISTS idx_commands_story_id ON commands(story_id);
 CREATE INDEX IF NOT EXISTS idx_events_batch_id ON events(batch_id);
 CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_batch_recent ON events(batch_id, timestamp DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_background_tasks_batch_id ON background_tasks(batch_id);
 CREATE INDEX IF NOT EXISTS idx_background_tasks_status ON background_tasks(status);
 """
@@ -160,9 +277,11 @@ def init_db() -> None:
     Initialize the database with all tables and indexes.
 
     Idempotent - safe to call multiple times.
-    Creates sprint-runner.db in the dashboard folder if it doesn't exist.
+    Creates sprint-runner.db in the dashboard folder if it doesn't exist
+    and switches it to WAL journal mode so readers don't block on writes.
     """
     with get_connection() as conn:
+        conn.execute(f"PRAGMA journal_mode = {JOURNAL_MODE}")
         conn.executescript(SCHEMA)
 
     # Run migrations for existing databases
@@ -269,6 +388,50 @@ def get_active_batch() -> Optional[dict]:
         return dict(row) if row else None
 
 
+def list_batches(limit: int, offset: int = 0) -> dict:
+    """
+    List batches newest first, with story counts and durations.
+
+    Args:
+        limit: Maximum number of batches to return
+        offset: Number of batches to skip
+
+    Returns:
+        Dict with 'batches' (list of batch dicts) and 'total' (all batches)
+    """
+    with get_connection() as conn:
+        total = conn.execute("SELECT COUNT(*) FROM batches").fetchone()[0]
+
+        cursor = conn.execute(
+            """
+            SELECT
+                b.id,
+                b.started_at,
+                b.ended_at,
+                b.max_cycles,
+                b.cycles_completed,
+                b.status,
+                (SELECT COUNT(*) FROM stories WHERE batch_id = b.id) as story_count
+            FROM batches b
+            ORDER BY b.id DESC
+            LIMIT ? OFFSET ?
+            """,
+            (limit, offset)
+        )
+
+        batches = []
+        for row in cursor.fetchall():
+            batch = dict(row)
+            # Calculate duration if ended
+            if batch["ended_at"] and batch["started_at"]:
+                batch["duration_seconds"] = (batch["ended_at"] - batch["started_at"]) / 1000
+            else:
+                batch["duration_seconds"] = None
+            batches.append(batch)
+
+        return {"batches": batches, "total": total}
+
+
 # =============================================================================
 # Story Operations (AC: #3)
 # =============================================================================
@@ -462,10 +625,65 @@ def get_commands_by_story(story_id: int) -> List[dict]:
         return [dict(row) for row in cursor.fetchall()]
 
 
+# =============================================================================
+# Bulk Queries
+# =============================================================================
+
+
+def get_batch_tree(batch_id: int) -> Optional[dict]:
+    """
+    Get a batch with all its stories and their commands in one round trip.
+
+    Uses three set-based queries on a single connection (batch, stories,
+    commands) and nests commands under stories in memory, instead of one
+    get_commands_by_story() call per story.
+
+    Returns:
+        Dict with 'batch' and 'stories' (each story dict has a 'commands'
+        list ordered by ID), or None if the batch does not exist
+    """
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT * FROM batches WHERE id = ?",
+            (batch_id,)
+        ).fetchone()
+        if not row:
+            return None
+
+        stories = [
+            dict(story, commands=[])
+            for story in conn.execute(
+                "SELECT * FROM stories WHERE batch_id = ? ORDER BY id",
+                (batch_id,)
+            ).fetchall()
+        ]
+        stories_by_id = {story['id']: story for story in stories}
+
+        cursor = conn.execute(
+            """
+            SELECT c.* FROM commands c
+            JOIN stories s ON s.id = c.story_id
+            WHERE s.batch_id = ?
+            ORDER BY c.story_id, c.id
+            """,
+            (batch_id,)
+        )
+        for command in cursor.fetchall():
+            stories_by_id[command['story_id']]['commands'].append(dict(command))
+
+        return {'batch': dict(row), 'stories': stories}
+
+
 # =============================================================================
 # Event Logging Operations (AC: #5)
 # =============================================================================
 
+INSERT_EVENT_SQL = """
+    INSERT INTO events
+    (batch_id, story_id, command_id, timestamp, event_type, epic_id, story_key, command, task_id, status, message, payload_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 def create_event(
     batch_id: int,
@@ -499,20 +717,52 @@ def create_event(
     Returns:
         The new event ID
     """
-    payload_json = json.dumps(payload) if payload else None
+    payload_json = codec.dumps(payload) if payload else None
 
     with get_connection() as conn:
         cursor = conn.execute(
-            """
-            INSERT INTO events
-            (batch_id, story_id, command_id, timestamp, event_type, epic_id, story_key, command, task_id, status, message, payload_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            INSERT_EVENT_SQL,
             (batch_id, story_id, command_id, int(time.time() * 1000), event_type, epic_id, story_key, command, task_id, status, message, payload_json)
         )
         return cursor.lastrowid  # type: ignore
 
 
+def create_events(events: List[dict]) -> int:
+    """
+    Log multiple events in a single transaction.
+
+    Used by the write-behind EventWriter to flush buffered events with one
+    executemany() instead of one transaction per event.
+
+    Args:
+        events: Event dicts keyed like create_event() arguments, plus an
+            optional 'timestamp' (defaults to now). An already-encoded
+            'payload_json' string is stored as-is instead of 'payload'.
+
+    Returns:
+        Number of events inserted
+    """
+    if not events:
+        return 0
+
+    now = int(time.time() * 1000)
+    rows = [
+        (
+            e['batch_id'], e.get('story_id'), e.get('command_id'),
+            e.get('timestamp', now), e['event_type'], e['epic_id'],
+            e['story_key'], e['command'], e['task_id'], e['status'],
+            e.get('message'),
+            e['payload_json'] if 'payload_json' in e
+            else codec.dumps(e['payload']) if e.get('payload') else None,
+        )
+        for e in events
+    ]
+
+    with get_connection() as conn:
+        conn.executemany(INSERT_EVENT_SQL, rows)
+    return len(rows)
+
+
 def get_events(limit: int = 100, offset: int = 0) -> List[dict]:
     """
     Get recent events, newest first.
@@ -555,6 +805,33 @@ def get_events_by_batch(batch_id: int) -> List[dict]:
         return [dict(row) for row in cursor.fetchall()]
 
 
+def get_recent_events_by_batch(batch_id: int, limit: int = 50) -> List[dict]:
+    """
+    Get the most recent events for a batch.
+
+    Served by idx_events_batch_recent, so cost depends on limit rather than
+    on how many events the batch has accumulated.
+
+    Args:
+        batch_id: The batch to read
+        limit: Maximum number of events to return
+
+    Returns:
+        List of event records as dicts, newest first
+    """
+    with get_connection() as conn:
+        cursor = conn.execute(
+            """
+            SELECT * FROM events
+            WHERE batch_id = ?
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+            """,
+            (batch_id, limit)
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
 # =============================================================================
 # Background Task Operations (AC: #6)
 # =============================================================================
@@ -690,3 +967,45 @@ def check_story_blocked(story_id: int) -> bool:
 
         # Check if all 3 most recent are failed
         return all(row['status'] == 'failed' for row in rows)
+
+
+# =============================================================================
+# WAL Maintenance
+# =============================================================================
+
+
+def checkpoint_wal(mode: Optional[str] = None) -> dict:
+    """
+    Checkpoint the write-ahead log back into the main database file.
+
+    Args:
+        mode: 'PASSIVE', 'FULL', 'RESTART' or 'TRUNCATE'. Defaults to PASSIVE,
+            escalating to TRUNCATE once the -wal file exceeds
+            WAL_TRUNCATE_THRESHOLD_BYTES.
+
+    Returns:
+        Dict with 'mode', 'busy', 'log_frames' and 'checkpointed_frames'
+
+    Raises:
+        ValueError: If an invalid checkpoint mode is provided
+    """
+    if mode is None:
+        wal_path = Path(f"{DB_PATH}-wal")
+        try:
+            wal_size = wal_path.stat().st_size
+        except OSError:
+            wal_size = 0
+        mode = 'TRUNCATE' if wal_size > WAL_TRUNCATE_THRESHOLD_BYTES else 'PASSIVE'
+
+    mode = mode.upper()
+    if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+        raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+    with get_connection() as conn:
+        row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        return {
+            'mode': mode,
+            'busy': row[0],
+            'log_frames': row[1],
+            'checkpointed_frames': row[2],
+        }
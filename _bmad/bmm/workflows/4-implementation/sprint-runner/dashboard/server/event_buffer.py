@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+In-memory ring buffer of recent WebSocket events.
+
+Holds the last N already-normalized events of the current batch so a new
+WebSocket client can be sent its init payload without reading the events
+table or re-parsing payload_json.
+
+Usage:
+    from .event_buffer import RecentEventBuffer
+
+    buffer = RecentEventBuffer(maxlen=50)
+    buffer.append({"type": "batch:start", "payload": {"batch_id": 3}, ...})
+    buffer.recent(3)  # Newest first, or None if batch 3 is not buffered
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Iterable, Optional
+
+DEFAULT_MAXLEN = 50
+
+# Events that are never replayed to new clients
+UNBUFFERED_EVENT_TYPES = frozenset({"pong"})
+
+
+class RecentEventBuffer:
+    """
+    Bounded, per-batch buffer of WebSocket events.
+
+    A "batch:start" event opens a new buffer for its batch_id and drops the
+    previous one (only the current batch is ever sent on init). Events that
+    arrive while no batch is known are not buffered.
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_MAXLEN):
+        """
+        Initialize the buffer.
+
+        Args:
+            maxlen: Events retained per batch
+        """
+        self.maxlen = maxlen
+        self.current_batch_id: Optional[int] = None
+        self._events: dict[int, deque[dict[str, Any]]] = {}
+
+    def append(self, event: dict[str, Any]) -> None:
+        """Record a WebSocket event (type/payload/timestamp dict)."""
+        event_type = event.get("type")
+        if event_type in UNBUFFERED_EVENT_TYPES:
+            return
+
+        if event_type == "batch:start":
+            batch_id = (event.get("payload") or {}).get("batch_id")
+            if batch_id is not None:
+                self.start_batch(batch_id)
+
+        if self.current_batch_id is None:
+            return
+        self._events[self.current_batch_id].append(event)
+
+    def start_batch(self, batch_id: int, events: Iterable[dict[str, Any]] = ()) -> None:
+        """
+        Make batch_id the current batch, replacing any buffered batch.
+
+        Args:
+            batch_id: The batch now receiving events
+            events: Initial events, oldest first (e.g. warmed from the DB)
+        """
+        self.current_batch_id = batch_id
+        self._events = {batch_id: deque(events, maxlen=self.maxlen)}
+
+    def seed(self, batch_id: int, events: Iterable[dict[str, Any]]) -> bool:
+        """
+        Warm the buffer for batch_id unless it is already being buffered.
+
+        Live events always win over a DB snapshot taken concurrently.
+
+        Returns:
+            True if the buffer was seeded
+        """
+        if batch_id in self._events:
+            return False
+        self.start_batch(batch_id, events)
+        return True
+
+    def recent(self, batch_id: int) -> Optional[list[dict[str, Any]]]:
+        """
+        Get buffered events for a batch, newest first.
+
+        Returns:
+            List of events, or None if the batch is not buffered (the caller
+            should fall back to the database)
+        """
+        events = self._events.get(batch_id)
+        if events is None:
+            return None
+        return list(reversed(events))
+
+    def resize(self, maxlen: int) -> None:
+        """Change the per-batch capacity, keeping the newest events."""
+        self.maxlen = maxlen
+        self._events = {
+            batch_id: deque(events, maxlen=maxlen)
+            for batch_id, events in self._events.items()
+        }
+
+    def clear(self) -> None:
+        """Drop all buffered events."""
+        self.current_batch_id = None
+        self._events = {}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+In-process event bus between the orchestrator and the server.
+
+Publishers hand structured BusEvent objects to subscribers directly, with
+no JSON round trip in between. Each event encodes its payload at most once;
+the same encoded text is stored in events.payload_json and spliced into the
+WebSocket frame.
+
+Usage:
+    from .event_bus import BusEvent, event_bus
+
+    unsubscribe = event_bus.subscribe(handler)  # handler(event: BusEvent)
+    event_bus.publish(BusEvent("batch:start", {"batch_id": 1}))
+    event.payload_json  # Encoded payload (DB column)
+    event.frame         # Encoded {"type", "payload", "timestamp"} (WebSocket)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from . import codec
+
+logger = logging.getLogger(__name__)
+
+
+class BusEvent:
+    """A WebSocket-shaped event with lazily cached encodings."""
+
+    __slots__ = ("type", "payload", "timestamp", "_payload_json", "_frame")
+
+    def __init__(self, type: str, payload: dict[str, Any], timestamp: Optional[int] = None):
+        """
+        Initialize the event.
+
+        Args:
+            type: Event type (e.g. "command:start")
+            payload: Event payload; treated as immutable once published
+            timestamp: Milliseconds since epoch (defaults to now)
+        """
+        self.type = type
+        self.payload = payload
+        self.timestamp = int(time.time() * 1000) if timestamp is None else timestamp
+        self._payload_json: Optional[str] = None
+        self._frame: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, event: dict[str, Any]) -> "BusEvent":
+        """Create from a {"type", "payload", "timestamp"} dict."""
+        return cls(event.get("type", ""), event.get("payload") or {}, event.get("timestamp"))
+
+    @property
+    def payload_json(self) -> str:
+        """The payload encoded as JSON (computed once)."""
+        if self._payload_json is None:
+            self._payload_json = codec.dumps(self.payload)
+        return self._payload_json
+
+    @property
+    def frame(self) -> str:
+        """The full WebSocket message, reusing payload_json (computed once)."""
+        if self._frame is None:
+            self._frame = (
+                f'{{"type":{codec.dumps(self.type)},"payload":{self.payload_json},'
+                f'"timestamp":{self.timestamp}}}'
+            )
+        return self._frame
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a {"type", "payload", "timestamp"} dict."""
+        return {"type": self.type, "payload": self.payload, "timestamp": self.timestamp}
+
+
+class EventBus:
+    """Synchronous publish/subscribe for BusEvents."""
+
+    def __init__(self) -> None:
+        """Initialize with no subscribers."""
+        self._subscribers: list[Callable[[BusEvent], None]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of subscribed handlers."""
+        return len(self._subscribers)
+
+    def subscribe(self, handler: Callable[[BusEvent], None]) -> Callable[[], None]:
+        """
+        Register a handler called with every published event.
+
+        Handlers run synchronously in publish() and must not block.
+
+        Returns:
+            A function that unsubscribes the handler
+        """
+        self._subscribers.append(handler)
+
+        def unsubscribe() -> None:
+            if handler in self._subscribers:
+                self._subscribers.remove(handler)
+
+        return unsubscribe
+
+    def publish(self, event: BusEvent) -> None:
+        """Deliver an event to every subscriber; handler errors are logged, not raised."""
+        for handler in list(self._subscribers):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.warning(f"Event handler failed for {event.type}: {e}")
+
+
+# Process-wide bus (orchestrator publishes, server subscribes on startup)
+event_bus = EventBus()
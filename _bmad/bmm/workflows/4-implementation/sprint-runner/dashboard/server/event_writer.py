@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Write-behind event sink for the events table.
+
+Buffers event rows in memory and writes them with one executemany()
+transaction per flush window on the aiodb writer thread, so the
+orchestrator's event loop never waits on SQLite for every parsed log line.
+
+Usage:
+    from .db import create_events
+    from .event_writer import EventWriter
+
+    writer = EventWriter(create_events)
+    writer.write(batch_id=1, event_type="command:start", ...)  # Non-blocking
+    await writer.flush()  # Force pending events to disk
+    await writer.stop()   # Flush and stop the background writer
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import time
+import weakref
+from typing import Any, Callable, Optional
+
+from .aiodb import run_write
+
+logger = logging.getLogger(__name__)
+
+# Flush window: whichever comes first
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.05
+DEFAULT_MAX_BATCH_SIZE = 500
+
+# Live writers, flushed at interpreter exit (flush-on-crash guarantee)
+_live_writers: "weakref.WeakSet[EventWriter]" = weakref.WeakSet()
+
+
+class EventWriter:
+    """
+    Buffered, batched writer for event rows.
+
+    Events are queued with write() and persisted by a background task once
+    max_batch_size events are pending or flush_interval seconds have passed
+    since the first pending event. Without a running event loop, write()
+    falls back to writing synchronously.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[list[dict]], int],
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            write_fn: Bulk insert function taking a list of event dicts
+                (normally db.create_events)
+            flush_interval: Seconds to wait for more events before flushing
+            max_batch_size: Pending event count that triggers an immediate flush
+        """
+        self._write_fn = write_fn
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+
+        self._pending: list[dict] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.events_written = 0
+        self.events_dropped = 0
+        self.flush_count = 0
+
+        _live_writers.add(self)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of events waiting to be written."""
+        return len(self._pending)
+
+    def write(self, **event: Any) -> None:
+        """
+        Queue an event for writing.
+
+        Accepts the same keyword arguments as db.create_event(). The
+        timestamp is captured now, not when the event is flushed.
+        """
+        event.setdefault("timestamp", int(time.time() * 1000))
+        self._pending.append(event)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop - write through synchronously
+            self.flush_sync()
+            return
+
+        self._ensure_started()
+        self._wakeup.set()  # type: ignore[union-attr]
+
+    async def flush(self) -> int:
+        """
+        Write all pending events now.
+
+        Returns:
+            Number of events written
+        """
+        self._bind_loop()
+        async with self._flush_lock:  # type: ignore[union-attr]
+            rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            # Shielded: cancelling the caller must not cancel a write still queued
+            # behind a busy writer thread, which would lose the swapped-out rows
+            return await asyncio.shield(run_write(self._write_rows, rows))
+
+    def flush_sync(self) -> int:
+        """
+        Write all pending events on the calling thread.
+
+        Used when no event loop is running and at interpreter exit.
+
+        Returns:
+            Number of events written
+        """
+        rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        return self._write_rows(rows)
+
+    async def stop(self) -> None:
+        """Stop the background writer after flushing pending events."""
+        task, self._task = self._task, None
+        if task is not None:
+            # Let the writer finish an in-flight flush and exit; never cancel it mid-write
+            self._stopping.set()  # type: ignore[union-attr]
+            self._wakeup.set()  # type: ignore[union-attr]
+            try:
+                await task
+            finally:
+                self._stopping.clear()  # type: ignore[union-attr]
+        await self.flush()
+
+    def _bind_loop(self) -> None:
+        """(Re)create loop-bound primitives when the running loop changes."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._stopping = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = None
+
+    def _ensure_started(self) -> None:
+        """Start the background writer on the running loop if needed."""
+        self._bind_loop()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Background loop: wait for events, gather a flush window, write; exit on stop()."""
+        stopping = self._stopping
+        while not stopping.is_set():  # type: ignore[union-attr]
+            await self._wakeup.wait()  # type: ignore[union-attr]
+            self._wakeup.clear()  # type: ignore[union-attr]
+            if len(self._pending) < self.max_batch_size:
+                # The flush window ends early when stop() is called
+                try:
+                    await asyncio.wait_for(stopping.wait(), self.flush_interval)  # type: ignore[union-attr]
+                except asyncio.TimeoutError:
+                    pass
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Event flush failed: {e}")
+
+    def _write_rows(self, rows: list[dict]) -> int:
+        """Write rows in one transaction, falling back to row-by-row on error."""
+        try:
+            written = self._write_fn(rows)
+        except Exception as e:
+            # One bad row (e.g. FK violation) fails the whole transaction -
+            # retry individually so the rest of the window is not lost
+            logger.warning(f"Batched event write failed ({e}); retrying {len(rows)} rows individually")
+            written = 0
+            for row in rows:
+                try:
+                    written += self._write_fn([row])
+                except Exception as row_error:
+                    self.events_dropped += 1
+                    logger.warning(f"Dropped event {row.get('event_type')}: {row_error}")
+
+        self.events_written += written
+        self.flush_count += 1
+        return written
+
+
+@atexit.register
+def _flush_live_writers() -> None:
+    """Flush any events still buffered when the interpreter exits."""
+    for writer in list(_live_writers):
+        try:
+            writer.flush_sync()
+        except Exception as e:
+            logger.warning(f"Event flush at exit failed: {e}")
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Fake claude CLI for offline load tests and benchmarks.
+
+Stands in for `claude -p --output-format stream-json`: it boots (startup
+latency), reads the prompt from stdin, and writes stream-json events to
+stdout at a configurable token rate. Nothing is sent to a model, so a whole
+Orchestrator.start() batch runs offline and repeatably.
+
+The orchestrator does not pass the command name, so the phase is inferred
+from the prompt (see classify_prompt()). Output is either:
+
+- synthetic: assistant text of --sim-tokens tokens, --sim-tool-results
+  tool_result events of --sim-line-kb each (the first and last carry
+  sprint-log CSV lines, so command:start / command:end events flow), and
+  the markers the orchestrator acts on: one tech-spec decision per story,
+  a critical-issues marker for story reviews, and a code-review severity per
+  review attempt (--sim-severity HIGH,LOW,ZERO: attempt 1 HIGH, 2 LOW, 3+ ZERO)
+- replayed: a recorded stream-json transcript (--sim-replay FILE), or per
+  phase from a directory holding <phase>-<attempt>.ndjson, <phase>.ndjson or
+  default.ndjson. {{story_key}}, {{story_keys}}, {{epic_id}} and
+  {{timestamp}} in recorded lines are replaced, so recorded CSV lines stay
+  inside the orchestrator's timestamp window.
+
+All delays are divided by --sim-speed (100 runs a batch 100x faster).
+Unknown arguments (-p, --output-format, ...) are ignored. The script only
+uses the standard library, so it runs without the server package.
+
+Usage:
+    # Point the orchestrator at the simulator (or set the claude_command setting);
+    # children run in the project root, so use an absolute path
+    export SPRINT_RUNNER_CLAUDE="python $PWD/server/fake_claude.py --sim-speed 100"
+
+    printf 'Story key: 2a-1-parser\\nEpic ID: 2a\\nReview attempt: 1' | \\
+        python server/fake_claude.py -p --output-format stream-json --sim-severity LOW
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, TextIO
+
+PHASE_CONTEXT = "project-context"
+PHASE_CODE_REVIEW = "code-review"
+PHASE_DEV = "dev-story"
+# Story review and tech-spec review (attempt 1 and the background chain)
+PHASE_REVIEW = "review"
+# create-story, discovery, tech-spec and commit share one prompt shape
+PHASE_STORY = "story"
+
+# Command logged in the sprint-log CSV lines, per phase
+PHASE_COMMANDS = {
+    PHASE_CONTEXT: "generate-project-context",
+    PHASE_CODE_REVIEW: "sprint-code-review",
+    PHASE_DEV: "sprint-dev-story",
+    PHASE_REVIEW: "sprint-story-review",
+    PHASE_STORY: "sprint-create-story",
+}
+
+SEVERITIES = ("ZERO", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+# Filler vocabulary: no word can form part of a marker the orchestrator scans for
+WORDS = (
+    "the", "story", "file", "test", "update", "parser", "module", "review", "task",
+    "check", "handler", "config", "value", "return", "input", "output", "list",
+    "read", "write", "step", "done", "next", "data", "field", "schema", "route",
+)
+CHARS_PER_TOKEN = 4
+
+
+class Prompt(NamedTuple):
+    """What the orchestrator asked for, read from the prompt text."""
+
+    phase: str
+    story_keys: list[str]
+    epic_id: str
+    attempt: int
+
+
+def _field(prompt: str, name: str) -> Optional[str]:
+    """Value of a 'Name: value' prompt line."""
+    match = re.search(rf"^{re.escape(name)}:\s*(.*)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else None
+
+
+def classify_prompt(prompt: str) -> Prompt:
+    """Infer the phase, story keys, epic and review attempt from a prompt."""
+    attempt = int(_field(prompt, "Review attempt") or 0)
+    epic_id = _field(prompt, "Epic ID") or ""
+    single = _field(prompt, "Story key")
+    if single is not None:
+        phase = PHASE_CODE_REVIEW if attempt else PHASE_DEV
+        return Prompt(phase, [single], epic_id, attempt)
+    keys = _field(prompt, "Story keys")
+    if keys is not None:
+        story_keys = [key.strip() for key in keys.split(",") if key.strip()]
+        return Prompt(PHASE_REVIEW if attempt else PHASE_STORY, story_keys, epic_id, attempt)
+    return Prompt(PHASE_CONTEXT, [], epic_id, attempt)
+
+
+def severity_for(schedule: list[str], attempt: int) -> str:
+    """Severity reported at a code-review attempt; the last entry repeats."""
+    return schedule[min(max(attempt, 1), len(schedule)) - 1]
+
+
+def csv_line(prompt: Prompt, task_id: str, status: str, message: str) -> str:
+    """A sprint-log line: timestamp,epicID,storyID,command,task-id,status,"message"."""
+    story_id = prompt.story_keys[0] if prompt.story_keys else ""
+    message = message.replace('"', '""')
+    return (
+        f'{int(time.time())},{prompt.epic_id},{story_id},'
+        f'{PHASE_COMMANDS[prompt.phase]},{task_id},{status},"{message}"'
+    )
+
+
+def markers(prompt: Prompt, args: argparse.Namespace) -> str:
+    """The marker text the orchestrator parses for this phase."""
+    if prompt.phase == PHASE_STORY:
+        return "\n".join(f"[TECH-SPEC-DECISION: {args.sim_tech_spec}]" for _ in prompt.story_keys)
+    if prompt.phase == PHASE_REVIEW:
+        critical = "YES" if args.sim_critical and prompt.attempt == 1 else "NO"
+        return f"[CRITICAL-ISSUES-FOUND: {critical}]"
+    if prompt.phase == PHASE_CODE_REVIEW:
+        severity = severity_for(args.sim_severity, prompt.attempt)
+        return "ZERO ISSUES" if severity == "ZERO" else f"HIGHEST SEVERITY: {severity}"
+    return ""
+
+
+class Simulator:
+    """Writes paced stream-json events for one run."""
+
+    def __init__(self, args: argparse.Namespace, out: TextIO):
+        """
+        Initialize from parsed --sim-* options.
+
+        Args:
+            args: Parsed command line
+            out: Stream the events are written to
+        """
+        self.args = args
+        self.out = out
+        self.rng = random.Random(args.sim_seed)
+        self.output_tokens = 0
+
+    def sleep(self, seconds: float) -> None:
+        """Simulated latency, scaled by --sim-speed."""
+        if seconds > 0:
+            time.sleep(seconds / self.args.sim_speed)
+
+    def emit(self, event: dict) -> None:
+        """Write one event line and flush, so the reader sees it now."""
+        self.out.write(json.dumps(event) + "\n")
+        self.out.flush()
+
+    def filler(self, tokens: int) -> str:
+        """Deterministic text of about `tokens` tokens."""
+        words: list[str] = []
+        chars = 0
+        while chars < tokens * CHARS_PER_TOKEN:
+            word = self.rng.choice(WORDS)
+            words.append(word)
+            chars += len(word) + 1
+        return " ".join(words)
+
+    def assistant(self, text: str) -> None:
+        """Stream text as assistant events of --sim-chunk-tokens, at the token rate."""
+        step = self.args.sim_chunk_tokens * CHARS_PER_TOKEN
+        for start in range(0, len(text), step):
+            chunk = text[start:start + step]
+            tokens = -(-len(chunk) // CHARS_PER_TOKEN)
+            self.sleep(tokens / self.args.sim_tokens_per_second)
+            self.output_tokens += tokens
+            self.emit({
+                "type": "assistant",
+                "message": {"role": "assistant", "content": [{"type": "text", "text": chunk}]},
+            })
+
+    def tool_result(self, content: str) -> None:
+        """A tool_result event padded to --sim-line-kb, after the tool latency."""
+        self.sleep(self.args.sim_tool_ms / 1000)
+        size = int(self.args.sim_line_kb * 1024)
+        if len(content) < size:
+            padding = self.filler(-(-(size - len(content)) // CHARS_PER_TOKEN))
+            content = f"{content}\n{padding}"[:size]
+        self.emit({
+            "type": "tool_result",
+            "tool_use_id": f"toolu_{self.rng.getrandbits(64):016x}",
+            "content": content,
+        })
+
+    def synthetic(self, prompt: Prompt) -> None:
+        """Generate a run: text and tool results interleaved, markers last."""
+        tool_results = self.args.sim_tool_results
+        segment = self.args.sim_tokens // (tool_results + 1)
+        for n in range(tool_results):
+            self.assistant(self.filler(segment))
+            if n == 0:
+                content = csv_line(prompt, "setup", "start", "Simulated run started")
+            elif n == tool_results - 1:
+                content = csv_line(prompt, "finish", "end", "Simulated run finished")
+            else:
+                content = self.filler(16)
+            self.tool_result(content)
+        final = self.filler(segment)
+        marker_text = markers(prompt, self.args)
+        self.assistant(f"{final}\n{marker_text}" if marker_text else final)
+
+    def replay(self, lines: Iterator[str], prompt: Prompt) -> None:
+        """Re-emit recorded events with placeholders filled, paced like a live run."""
+        values = {
+            "{{story_key}}": prompt.story_keys[0] if prompt.story_keys else "",
+            "{{story_keys}}": ",".join(prompt.story_keys),
+            "{{epic_id}}": prompt.epic_id,
+            "{{timestamp}}": str(int(time.time())),
+        }
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            for placeholder, value in values.items():
+                line = line.replace(placeholder, value)
+            try:
+                event = json.loads(line)
+            except ValueError:
+                event = {}
+            if event.get("type") == "assistant":
+                content = event.get("message", {}).get("content", [])
+                chars = sum(len(block.get("text", "")) for block in content if isinstance(block, dict))
+                tokens = -(-chars // CHARS_PER_TOKEN)
+                self.sleep(tokens / self.args.sim_tokens_per_second)
+                self.output_tokens += tokens
+            elif event.get("type") == "tool_result":
+                self.sleep(self.args.sim_tool_ms / 1000)
+            self.out.write(line + "\n")
+            self.out.flush()
+
+
+def find_transcript(replay: Path, prompt: Prompt) -> Optional[Path]:
+    """The transcript for a prompt: the file itself, or the best match in a directory."""
+    if not replay.is_dir():
+        return replay
+    names = [f"{prompt.phase}-{prompt.attempt}.ndjson", f"{prompt.phase}.ndjson", "default.ndjson"]
+    return next((replay / name for name in names if (replay / name).is_file()), None)
+
+
+def _severity_schedule(value: str) -> list[str]:
+    """Parse --sim-severity (comma-separated severities)."""
+    schedule = [item.strip().upper() for item in value.split(",") if item.strip()]
+    unknown = [item for item in schedule if item not in SEVERITIES]
+    if not schedule or unknown:
+        raise argparse.ArgumentTypeError(f"expected severities from {', '.join(SEVERITIES)}, got {value!r}")
+    return schedule
+
+
+def _positive(value: str) -> float:
+    """Parse a float that must be greater than zero."""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """The simulator's own options; everything else on the command line is ignored."""
+    parser = argparse.ArgumentParser(description="Fake claude CLI for offline runs", allow_abbrev=False)
+    parser.add_argument("--model", default=None, help="Reported in the init event")
+    parser.add_argument("--prompt-system-append-file", default=None, help="Injection file (must be readable)")
+    parser.add_argument("--sim-speed", type=_positive, default=1.0, help="Divide every delay by this")
+    parser.add_argument("--sim-startup-ms", type=float, default=1500, help="Boot latency before reading stdin")
+    parser.add_argument("--sim-tokens", type=int, default=600, help="Assistant tokens per run")
+    parser.add_argument("--sim-tokens-per-second", type=_positive, default=60, help="Output token rate")
+    parser.add_argument("--sim-chunk-tokens", type=int, default=50, help="Tokens per assistant event")
+    parser.add_argument("--sim-tool-results", type=int, default=4, help="tool_result events per run (min 2)")
+    parser.add_argument("--sim-tool-ms", type=float, default=500, help="Latency before each tool_result")
+    parser.add_argument("--sim-line-kb", type=float, default=2, help="Size of each tool_result")
+    parser.add_argument("--sim-severity", type=_severity_schedule, default=["ZERO"],
+                        help="Code-review severity per attempt, e.g. HIGH,LOW,ZERO")
+    parser.add_argument("--sim-tech-spec", choices=("SKIP", "REQUIRED"), default="SKIP",
+                        help="Tech-spec decision reported per story")
+    parser.add_argument("--sim-critical", action="store_true", help="Story reviews report critical issues")
+    parser.add_argument("--sim-replay", type=Path, default=None, help="Transcript file or directory to replay")
+    parser.add_argument("--sim-seed", type=int, default=0, help="Seed for the filler text")
+    parser.add_argument("--sim-exit-code", type=int, default=0, help="Exit status after the run")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run one simulated claude invocation."""
+    args, _ = build_parser().parse_known_args(argv)
+    args.sim_tool_results = max(2, args.sim_tool_results)
+    args.sim_chunk_tokens = max(1, args.sim_chunk_tokens)
+    simulator = Simulator(args, sys.stdout)
+    started = time.monotonic()
+
+    # Boot before reading the prompt, like the real CLI (a warm child has paid this already)
+    simulator.sleep(args.sim_startup_ms / 1000)
+    injection_bytes = 0
+    if args.prompt_system_append_file:
+        try:
+            injection_bytes = len(Path(args.prompt_system_append_file).read_bytes())
+        except OSError as e:
+            print(f"Error: cannot read --prompt-system-append-file: {e}", file=sys.stderr)
+            return 1
+    prompt = classify_prompt(sys.stdin.read())
+
+    try:
+        simulator.emit({
+            "type": "system",
+            "subtype": "init",
+            "session_id": str(uuid.UUID(int=simulator.rng.getrandbits(128))),
+            "model": args.model or "simulated",
+            "phase": prompt.phase,
+            "injection_bytes": injection_bytes,
+        })
+        if args.sim_replay is not None:
+            transcript = find_transcript(args.sim_replay, prompt)
+            if transcript is None:
+                print(f"Error: no transcript for phase {prompt.phase} in {args.sim_replay}", file=sys.stderr)
+                return 2
+            with open(transcript, encoding="utf-8") as f:
+                simulator.replay(f, prompt)
+        else:
+            simulator.synthetic(prompt)
+        simulator.emit({
+            "type": "result",
+            "subtype": "success" if args.sim_exit_code == 0 else "error",
+            "is_error": args.sim_exit_code != 0,
+            "duration_ms": int((time.monotonic() - started) * 1000),
+            "usage": {"output_tokens": simulator.output_tokens},
+        })
+    except BrokenPipeError:
+        # The orchestrator stopped reading (killed or timed out)
+        return 1
+    return args.sim_exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
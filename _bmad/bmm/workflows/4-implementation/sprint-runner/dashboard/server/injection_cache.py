@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for --prompt-system-append injections.
+
+A cycle builds the same injection many times: the story-review and
+tech-spec-review chains repeat their first review's injection, and the
+code-review loop rebuilds its injection on every attempt. Most of the files
+in it (project context, story, discovery, tech-spec) do not change between
+those calls.
+
+Two LRU layers avoid the repeated work:
+
+- Files are keyed by path and fingerprinted by (mtime_ns, size, inode). A
+  file whose fingerprint is unchanged is not read again. A file read while
+  its mtime is very recent is re-read on the next call (a write within the
+  same timestamp tick would not change the fingerprint).
+- Rendered XML is keyed by the ordered (path, content digest) list, which
+  already reflects the include_* flags. An identical file set with identical
+  contents returns the same string without rebuilding or re-encoding it.
+
+Because the XML key is the content digests, a stale XML entry can never be
+returned: a changed file changes the key.
+
+Usage:
+    from .injection_cache import InjectionCache
+
+    cache = InjectionCache(max_injections=32, max_files=256)
+    file = cache.read(path)                          # CachedFile or None
+    injection = cache.render([(rel_path, file), ...])
+    injection.xml, injection.size_bytes
+    cache.stats()                                    # Hit/miss counters
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .artifacts import RACY_WINDOW_SECONDS
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    """Content of one file and the fingerprint it was read at."""
+
+    fingerprint: tuple[int, int, int]  # (mtime_ns, size, inode)
+    content: str
+    digest: str
+    size_bytes: int = 0  # UTF-8 size of content
+    provisional: bool = False  # Read within the racy window: re-read next time
+
+
+@dataclass(frozen=True)
+class Injection:
+    """A rendered <file_injections> block."""
+
+    xml: str
+    size_bytes: int
+    file_count: int
+
+
+def render_xml(files: list[tuple[str, str]]) -> str:
+    """Render (relative path, content) pairs as the <file_injections> XML block."""
+    xml_parts: list[str] = [
+        '<file_injections rule="DO NOT read these files - content already provided">'
+    ]
+    for rel_path, content in files:
+        # Escape quotes in path attribute to prevent XML breakage (Issue #5)
+        safe_path = rel_path.replace('"', '&quot;')
+        xml_parts.append(f'  <file path="{safe_path}">')
+        xml_parts.append(content)
+        xml_parts.append('  </file>')
+    xml_parts.append('</file_injections>')
+    return '\n'.join(xml_parts)
+
+
+class InjectionCache:
+    """LRU caches of file contents and rendered injections, with hit/miss counters."""
+
+    def __init__(self, max_injections: int = 32, max_files: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_injections: Rendered injections kept (least recently used evicted)
+            max_files: File contents kept (least recently used evicted)
+        """
+        self.max_injections = max(1, max_injections)
+        self.max_files = max(1, max_files)
+        self._files: OrderedDict[Path, CachedFile] = OrderedDict()
+        self._injections: OrderedDict[tuple[tuple[str, str], ...], Injection] = OrderedDict()
+        self.file_hits = 0
+        self.file_misses = 0
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, path: Path) -> Optional[CachedFile]:
+        """
+        Content of a regular file, read from disk only if it changed.
+
+        Returns None for missing, non-regular and unreadable files (binary,
+        locked, encoding issues), which are skipped from injections.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._files.pop(path, None)
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        fingerprint = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._files.get(path)
+        if cached is not None and cached.fingerprint == fingerprint and not cached.provisional:
+            self._files.move_to_end(path)
+            self.file_hits += 1
+            return cached
+
+        self.file_misses += 1
+        try:
+            content = path.read_text()
+        except (OSError, UnicodeDecodeError, PermissionError):
+            self._files.pop(path, None)
+            return None
+
+        data = content.encode()
+        cached = CachedFile(
+            fingerprint=fingerprint,
+            content=content,
+            digest=hashlib.blake2b(data, digest_size=16).hexdigest(),
+            size_bytes=len(data),
+            provisional=time.time() - st.st_mtime_ns / 1e9 < RACY_WINDOW_SECONDS,
+        )
+        self._files[path] = cached
+        self._files.move_to_end(path)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        return cached
+
+    def render(self, files: list[tuple[str, CachedFile]]) -> Injection:
+        """The injection for (relative path, file) pairs, rendered once per distinct content."""
+        key = tuple((rel_path, file.digest) for rel_path, file in files)
+        injection = self._injections.get(key)
+        if injection is not None:
+            self._injections.move_to_end(key)
+            self.hits += 1
+            return injection
+
+        self.misses += 1
+        xml = render_xml([(rel_path, file.content) for rel_path, file in files])
+        injection = Injection(xml=xml, size_bytes=len(xml.encode("utf-8")), file_count=len(files))
+        self._injections[key] = injection
+        while len(self._injections) > self.max_injections:
+            self._injections.popitem(last=False)
+        return injection
+
+    def clear(self) -> None:
+        """Drop every cached file and injection (counters are kept)."""
+        self._files.clear()
+        self._injections.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current sizes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "file_hits": self.file_hits,
+            "file_misses": self.file_misses,
+            "injections": len(self._injections),
+            "files": len(self._files),
+        }
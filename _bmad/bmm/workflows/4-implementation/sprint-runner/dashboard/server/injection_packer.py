@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Token-budget packer for prompt injections.
+
+build_prompt_system_append() collects files in AC9 priority order: project
+context, story, discovery, tech-spec, additional files. When they do not fit
+the token budget, the packer degrades files from the lowest priority up,
+one level at a time, until the injection fits:
+
+- full: the file as is
+- summary: headings plus the first paragraph of each section
+- outline: headings only
+- omitted: a note that the file was left out
+
+Trimmed files keep their <file> element with a note asking the agent to
+read the file itself if it needs the rest, so nothing disappears silently.
+
+Tokens are estimated as UTF-8 bytes / 4 (no tokenizer is available; English
+Markdown averages about 4 bytes per token, and non-ASCII text costs more
+tokens per character, which bytes capture). A budget derived from
+injection_error_kb therefore keeps packed injections under the byte limit.
+
+Usage:
+    from .injection_packer import pack
+
+    result = pack([(rel_path, content, size_bytes), ...], budget_tokens=30000)
+    result.files      # [PackedFile(path, level, content, tokens, original_tokens), ...]
+    result.trimmed    # Files not packed in full
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+BYTES_PER_TOKEN = 4
+
+LEVEL_FULL = "full"
+LEVEL_SUMMARY = "summary"
+LEVEL_OUTLINE = "outline"
+LEVEL_OMITTED = "omitted"
+# Degradation order, richest first
+LEVELS = (LEVEL_FULL, LEVEL_SUMMARY, LEVEL_OUTLINE, LEVEL_OMITTED)
+
+# Bytes of the <file_injections> wrapper and of one <file> element around its content
+WRAPPER_BYTES = len('<file_injections rule="DO NOT read these files - content already provided">\n</file_injections>')
+ELEMENT_BYTES = len('  <file path="">\n\n  </file>\n')
+
+# Files without headings keep this many leading lines as their summary
+SUMMARY_LINES = 20
+
+_HEADING_RE = re.compile(r"^#{1,6}\s")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+_NOTES = {
+    LEVEL_SUMMARY: "<!-- Trimmed to section summaries to fit the token budget; read this file for full content. -->",
+    LEVEL_OUTLINE: "<!-- Trimmed to headings to fit the token budget; read this file for full content. -->",
+    LEVEL_OMITTED: "<!-- Omitted to fit the token budget; read this file if needed. -->",
+}
+
+
+def estimate_tokens(size_bytes: int) -> int:
+    """Estimated tokens for a UTF-8 byte count (rounded up)."""
+    return -(-size_bytes // BYTES_PER_TOKEN)
+
+
+def _lines_outside_fences(text: str) -> list[tuple[str, bool]]:
+    """(line, inside code fence) pairs; fence delimiters count as inside."""
+    lines = []
+    in_fence = False
+    for line in text.splitlines():
+        if _FENCE_RE.match(line):
+            lines.append((line, True))
+            in_fence = not in_fence
+            continue
+        lines.append((line, in_fence))
+    return lines
+
+
+def outline(text: str) -> str:
+    """Markdown headings only (headings inside code fences are ignored)."""
+    return "\n".join(
+        line for line, fenced in _lines_outside_fences(text) if not fenced and _HEADING_RE.match(line)
+    )
+
+
+def summarize(text: str) -> str:
+    """
+    Headings plus the first paragraph of each section.
+
+    Files without Markdown headings (e.g. YAML) keep their first lines.
+    """
+    lines = _lines_outside_fences(text)
+    if not any(not fenced and _HEADING_RE.match(line) for line, fenced in lines):
+        return "\n".join(text.splitlines()[:SUMMARY_LINES])
+
+    kept: list[str] = []
+    paragraph = "done"  # "wanted" after a heading, "open" while copying, "done" after it ends
+    for line, fenced in lines:
+        if not fenced and _HEADING_RE.match(line):
+            kept.append(line)
+            paragraph = "wanted"
+        elif paragraph == "wanted" and line.strip() and not fenced:
+            kept.append(line)
+            paragraph = "open"
+        elif paragraph == "open":
+            if line.strip() and not fenced:
+                kept.append(line)
+            else:
+                paragraph = "done"
+    return "\n".join(kept)
+
+
+def degrade(content: str, level: str) -> str:
+    """Content of a file at a packing level, with the trimming note."""
+    if level == LEVEL_FULL:
+        return content
+    if level == LEVEL_OMITTED:
+        return _NOTES[level]
+    body = summarize(content) if level == LEVEL_SUMMARY else outline(content)
+    return f"{_NOTES[level]}\n{body}" if body else _NOTES[level]
+
+
+@dataclass
+class PackedFile:
+    """One file of a packed injection."""
+
+    path: str
+    level: str
+    content: str
+    tokens: int
+    original_tokens: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary for the injection:packed event."""
+        return {
+            "path": self.path,
+            "level": self.level,
+            "tokens": self.tokens,
+            "original_tokens": self.original_tokens,
+        }
+
+
+@dataclass
+class PackResult:
+    """Files of a packed injection, in priority order."""
+
+    budget_tokens: int
+    files: list[PackedFile] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the packed injection."""
+        return estimate_tokens(WRAPPER_BYTES) + sum(f.tokens for f in self.files)
+
+    @property
+    def original_tokens(self) -> int:
+        """Estimated tokens before packing."""
+        return estimate_tokens(WRAPPER_BYTES) + sum(f.original_tokens for f in self.files)
+
+    @property
+    def trimmed(self) -> list[PackedFile]:
+        """Files not packed in full."""
+        return [f for f in self.files if f.level != LEVEL_FULL]
+
+
+def _element_tokens(path: str, size_bytes: int) -> int:
+    """Estimated tokens of a <file> element with content of size_bytes."""
+    safe_path = path.replace('"', '&quot;')
+    return estimate_tokens(ELEMENT_BYTES + len(safe_path.encode("utf-8")) + size_bytes)
+
+
+def pack(
+    files: Sequence[tuple[str, str, Optional[int]]],
+    budget_tokens: int,
+) -> PackResult:
+    """
+    Fit files into the token budget, trimming from the lowest priority up.
+
+    Args:
+        files: (relative path, content, UTF-8 size or None) in priority order
+        budget_tokens: Estimated token budget for the whole injection
+
+    Returns:
+        PackResult; files are unchanged when everything fits. If even omitting
+        every file does not fit (a tiny budget), the result is over budget.
+    """
+    result = PackResult(budget_tokens=budget_tokens)
+    for path, content, size_bytes in files:
+        if size_bytes is None:
+            size_bytes = len(content.encode("utf-8"))
+        tokens = _element_tokens(path, size_bytes)
+        result.files.append(PackedFile(path, LEVEL_FULL, content, tokens, tokens))
+
+    total = result.tokens
+    for packed in reversed(result.files):
+        if total <= budget_tokens:
+            break
+        original = packed.content
+        for level in LEVELS[1:]:
+            content = degrade(original, level)
+            tokens = _element_tokens(packed.path, len(content.encode("utf-8")))
+            if tokens >= packed.tokens:
+                continue
+            total -= packed.tokens - tokens
+            packed.level, packed.content, packed.tokens = level, content, tokens
+            if total <= budget_tokens:
+                break
+    return result
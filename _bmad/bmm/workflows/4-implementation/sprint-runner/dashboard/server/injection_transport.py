@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Transport of prompt injections to claude subagents.
+
+Injections used to be passed inline as the --prompt-system-append argument.
+Linux caps a single argument at 128 KiB (MAX_ARG_STRLEN) and all arguments
+plus the environment at ARG_MAX, so a large injection made exec fail with
+E2BIG. Inline arguments are also copied into the child's stack at exec.
+
+With the file transport enabled (injection_file_transport), injections up
+to inline_max_bytes are still passed inline. Larger ones are written once
+to a content-addressed file in a private temporary directory
+(0700, files 0600) and passed as --prompt-system-append-file <path>. The
+file name is the injection's SHA-256, so review chains and code-review
+retries that send the same injection reuse one file. The directory is
+removed at batch end.
+
+FILE_FLAG is an assumption: it mirrors INLINE_FLAG and has not been
+checked against a released claude CLI. If the CLI does not accept it, the
+child will fail. fake_claude.py accepts it, so the tests cannot catch this.
+The file transport is therefore off by default (inline_max_bytes=None):
+every injection goes through argv as before. Enable it only once the flag
+is confirmed against the CLI in use.
+
+Usage:
+    from .injection_transport import InjectionFiles
+
+    files = InjectionFiles(inline_max_bytes=120 * 1024)  # None: always inline
+    args.extend(files.args(injection))   # Inline flag or file flag + path
+    files.cleanup()                      # At batch end
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+INLINE_FLAG = "--prompt-system-append"
+FILE_FLAG = "--prompt-system-append-file"  # Unverified against the real CLI (see module docstring)
+
+# Linux limit on a single exec argument (32 pages)
+MAX_ARG_STRLEN = 128 * 1024
+
+
+class InjectionFiles:
+    """Chooses inline or file transport per injection and owns the injection files."""
+
+    def __init__(self, inline_max_bytes: Optional[int], directory: Optional[Path] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            inline_max_bytes: Largest injection passed inline (0: always use a
+                file; None: never use a file)
+            directory: Directory for injection files (default: a private temp dir,
+                created on first use)
+        """
+        self.inline_max_bytes = inline_max_bytes
+        self._directory = directory
+        self._owns_directory = directory is None
+        self._paths: dict[str, Path] = {}  # SHA-256 -> written file
+        self.written = 0
+        self.reused = 0
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding injection files (created on first access)."""
+        if self._directory is None:
+            self._directory = Path(tempfile.mkdtemp(prefix="sprint-runner-injections-"))
+        return self._directory
+
+    def args(self, injection: str) -> list[str]:
+        """CLI arguments that pass the injection to claude."""
+        if self.inline_max_bytes is None:
+            return [INLINE_FLAG, injection]
+        # Characters never outnumber UTF-8 bytes, so long strings skip the encode
+        if len(injection) <= self.inline_max_bytes:
+            data = injection.encode("utf-8")
+            if len(data) <= self.inline_max_bytes:
+                return [INLINE_FLAG, injection]
+        else:
+            data = injection.encode("utf-8")
+        return [FILE_FLAG, str(self._write(data))]
+
+    def path_for(self, injection: str) -> Path:
+        """Content-addressed file holding the injection (written if needed)."""
+        return self._write(injection.encode("utf-8"))
+
+    def _write(self, data: bytes) -> Path:
+        """Write data under its digest unless already written; return the path."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._paths.get(digest)
+        if path is not None and path.exists():
+            self.reused += 1
+            return path
+
+        path = self.directory / f"injection-{digest[:32]}.xml"
+        # Write to a temporary name and rename, so a reader never sees a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._paths[digest] = path
+        self.written += 1
+        return path
+
+    def cleanup(self) -> int:
+        """Remove every injection file (and the temp dir if owned); return files removed."""
+        removed = 0
+        for path in self._paths.values():
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove injection file {path}: {e}")
+        self._paths.clear()
+        if self._owns_directory and self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        return removed
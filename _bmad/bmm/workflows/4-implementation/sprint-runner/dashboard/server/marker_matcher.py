@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Streaming multi-marker matcher (Aho-Corasick).
+
+Finds any number of fixed markers in text that arrives in pieces, in a
+single pass over each piece. The automaton state carries over between
+feed() calls, so a marker split across two text blocks is matched without
+re-scanning earlier text.
+
+Markers can be matched case-insensitively (ASCII letters only), e.g. the
+tech-spec decision markers, while the rest stay exact.
+
+Usage:
+    from .marker_matcher import MarkerMatcher
+
+    matcher = MarkerMatcher(["ZERO ISSUES", "HIGHEST SEVERITY: HIGH"])
+    matcher.feed("... HIGHEST SEV")   # -> []
+    matcher.feed("ERITY: HIGH ...")   # -> ["HIGHEST SEVERITY: HIGH"]
+"""
+
+from __future__ import annotations
+
+import string
+from collections import deque
+from typing import Iterable
+
+# Length-preserving ASCII lowercase mapping (str.lower() can change length)
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class MarkerMatcher:
+    """Aho-Corasick automaton over a fixed set of markers, fed incrementally."""
+
+    def __init__(self, markers: Iterable[str], ignore_case: Iterable[str] = ()):
+        """
+        Build the automaton.
+
+        Args:
+            markers: Non-empty strings to find
+            ignore_case: Markers (from markers) matched regardless of ASCII case
+        """
+        self.markers: tuple[str, ...] = tuple(dict.fromkeys(markers))
+        if not self.markers or not all(self.markers):
+            raise ValueError("MarkerMatcher needs at least one non-empty marker")
+
+        ignore = set(ignore_case)
+        # Exact markers are matched on folded text, then verified on the original
+        self._exact = tuple(marker not in ignore for marker in self.markers)
+        self._max_len = max(len(marker) for marker in self.markers)
+        self._delta, self._output = self._build(
+            [marker.translate(_ASCII_LOWER) for marker in self.markers]
+        )
+        self._state = 0
+        self._tail = ""  # Last max_len - 1 original characters
+
+    @staticmethod
+    def _build(patterns: list[str]) -> tuple[list[dict[str, int]], list[tuple[int, ...]]]:
+        """Build the trie, failure links and the full transition table (DFA)."""
+        goto: list[dict[str, int]] = [{}]
+        output: list[tuple[int, ...]] = [()]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in goto[state]:
+                    goto.append({})
+                    output.append(())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            output[state] += (index,)
+
+        # Breadth-first: a state's failure target is always resolved before it
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            output[state] += output[fail[state]]
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(child)
+        return delta, output
+
+    def feed(self, text: str) -> list[str]:
+        """
+        Scan the next piece of text.
+
+        Returns:
+            Markers whose last character is in this piece, in order of their end
+        """
+        found: list[str] = []
+        if not text:
+            return found
+
+        delta, output = self._delta, self._output
+        window = self._tail + text
+        offset = len(self._tail)
+        state = self._state
+        for i, ch in enumerate(text.translate(_ASCII_LOWER)):
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                end = offset + i + 1
+                for index in output[state]:
+                    marker = self.markers[index]
+                    if self._exact[index] and window[end - len(marker):end] != marker:
+                        continue
+                    found.append(marker)
+
+        self._state = state
+        self._tail = window[-(self._max_len - 1):] if self._max_len > 1 else ""
+        return found
+
+    def reset(self) -> None:
+        """Forget any partial match (start of a new text)."""
+        self._state = 0
+        self._tail = ""
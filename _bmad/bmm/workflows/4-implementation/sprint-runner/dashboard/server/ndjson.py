@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Chunked NDJSON line reader for subprocess output.
+
+StreamReader.readline() fails with LimitOverrunError on lines longer than
+the stream limit (64 KiB by default), and claude's stream-json lines that
+carry large tool_results regularly exceed it. This reader pulls large blocks
+with read(), appends them to one reusable bytearray, and yields each line as
+a memoryview slice of that buffer, so no per-line bytes object is created
+before the JSON decoder sees it. Lines of any length are supported; the
+buffer grows to fit the longest line seen.
+
+Yielded views are only valid until the generator is resumed: the buffer is
+compacted on the next read and the view is released. Decode (or copy) each
+line before asking for the next one.
+
+Usage:
+    from .ndjson import iter_lines
+
+    async for line in iter_lines(process.stdout):
+        event = codec.loads(line)   # memoryview without the trailing newline
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator
+
+# Bytes requested from the stream per read()
+READ_CHUNK_SIZE = 256 * 1024
+
+
+async def iter_lines(
+    stream: asyncio.StreamReader, chunk_size: int = READ_CHUNK_SIZE
+) -> AsyncIterator[memoryview]:
+    """
+    Yield newline-delimited lines from a stream as memoryview slices.
+
+    Empty lines are skipped. A final line without a trailing newline is
+    still yielded at EOF.
+
+    Args:
+        stream: Stream to read until EOF (only read() is used)
+        chunk_size: Maximum bytes per read() call
+
+    Yields:
+        A view of each line, excluding the newline, valid until the next iteration
+    """
+    buffer = bytearray()
+    start = 0  # Offset of the first unconsumed byte
+
+    while True:
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            break
+
+        # Drop consumed lines before growing the buffer (no views are alive here)
+        if start:
+            del buffer[:start]
+            start = 0
+
+        # Only scan the new bytes; the unconsumed prefix has no newline
+        scan_from = len(buffer)
+        buffer += chunk
+        end = buffer.find(b"\n", scan_from)
+        if end == -1:
+            continue
+
+        with memoryview(buffer) as view:
+            while end != -1:
+                if end > start:
+                    with view[start:end] as line:
+                        yield line
+                start = end + 1
+                end = buffer.find(b"\n", start)
+
+    if start < len(buffer):
+        with memoryview(buffer)[start:] as line:
+            yield line
@@ -16,16 +16,17 @@ from __future__ import annotations
 import argparse
 import asyncio
 import csv
+import functools
 import io
-import json
 import os
-import re
+import shlex
 import time
-from dataclasses import dataclass, field
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Callable, Optional
 
 import logging
 import subprocess
@@ -37,7 +38,25 @@ import yaml
 logger = logging.getLogger(__name__)
 
 # Imports from sibling modules (Story 5-SR-2 and 5-SR-5)
+from . import codec
+from .child_io import ChildIO
+from .artifacts import ArtifactIndex
+from .injection_cache import CachedFile, InjectionCache
+from .injection_packer import LEVEL_FULL, estimate_tokens, pack
+from .injection_transport import InjectionFiles
+from .ndjson import iter_lines
+from .scheduler import Phase, PhaseGraph, ScheduleReport, Scheduler
+from .selection import StorySelector, extract_epic, get_selector, story_sort_key
 from .settings import get_settings
+from .stream_consumers import (
+    CRITICAL_MARKERS,
+    SEVERITY_MARKERS,
+    MarkerScanner,
+    StreamConsumer,
+    SubagentOutput,
+)
+from .warm_pool import WarmPool
+from .watchdog import Watchdog, WatchdogLimits, apply_rlimits
 
 try:
     from .db import (
@@ -52,9 +71,11 @@ try:
         create_command,
         update_command,
         create_event,
+        create_events,
         create_background_task,
         update_background_task,
     )
+    from .aiodb import run_write
 except ImportError:
     # Stubs for development before dependencies are complete
     def init_db() -> None:
@@ -90,33 +111,24 @@ except ImportError:
     def create_event(**kwargs: Any) -> int:
         return 1
 
+    def create_events(events: list[dict]) -> int:
+        return len(events)
+
     def create_background_task(**kwargs: Any) -> int:
         return 1
 
     def update_background_task(**kwargs: Any) -> None:
         pass
 
+    async def run_write(fn: Any, *args: Any, **kwargs: Any) -> Any:
+        return fn(*args, **kwargs)
 
-# WebSocket broadcast - import from server module (Story 5-SR-5)
-try:
-    from .server import broadcast, emit_event as server_emit_event, EventType
-    _websocket_available = True
-except ImportError:
-    _websocket_available = False
 
-    async def broadcast(event: dict) -> None:
-        """Broadcast stub when server module not available."""
-        pass
+from .event_writer import EventWriter
 
-
-async def broadcast_websocket(message: str) -> None:
-    """Broadcast message to all connected WebSocket clients."""
-    if _websocket_available:
-        try:
-            event = json.loads(message)
-            await broadcast(event)
-        except (json.JSONDecodeError, Exception):
-            pass
+# WebSocket events go over the in-process event bus; the server subscribes
+# to it on startup (Story 5-SR-5)
+from .event_bus import BusEvent, event_bus
 
 
 class OrchestratorState(Enum):
@@ -129,6 +141,30 @@ class OrchestratorState(Enum):
     STOPPING = "stopping"  # Graceful shutdown in progress
 
 
+# Environment variable overriding the claude_command setting (e.g. server/fake_claude.py)
+CLAUDE_COMMAND_ENV_VAR = "SPRINT_RUNNER_CLAUDE"
+
+
+# Story keys of the dev phase running in the current task. Set per story by
+# the dev phase so concurrent stories each see their own current_story_keys.
+_story_scope: ContextVar[Optional[list[str]]] = ContextVar("story_scope", default=None)
+
+
+@dataclass
+class PreparedStories:
+    """Next-cycle stories whose create-story + discovery ran ahead (pipelined mode)."""
+
+    story_keys: list[str]
+    tech_spec_decisions: dict[str, str] = field(default_factory=dict)
+
+    def restrict(self, story_keys: list[str]) -> "PreparedStories":
+        """The prepared state for a subset of the stories."""
+        return PreparedStories(
+            story_keys=list(story_keys),
+            tech_spec_decisions={k: v for k, v in self.tech_spec_decisions.items() if k in story_keys},
+        )
+
+
 class Orchestrator:
     """
     Main orchestrator for sprint-runner workflow automation.
@@ -170,28 +206,76 @@ class Orchestrator:
         self.state = OrchestratorState.IDLE
         self.stop_requested = False
         self.cycles_completed = 0
+        # Children being awaited; several run at once in the parallel dev phase
+        self._waiting_children = 0
 
         # Current execution context
         self.current_batch_id: Optional[int] = None
-        self.current_story_keys: list[str] = []
+        self._cycle_story_keys: list[str] = []
         self.tech_spec_needed = False
         self.tech_spec_decisions: dict[str, str] = {}
 
-        # Error tracking for code-review loop
+        # Stories prepared during the previous cycle's dev phase (pipeline_cycles)
+        self._prepared: Optional[PreparedStories] = None
+
+        # Story selector, kept for the batch so stateful strategies (fair) see every cycle
+        self._selector: Optional[StorySelector] = None
+
+        # Error tracking for code-review loop (severity history per story)
         self.error_history: dict[str, list[str]] = {}
 
         # Background tasks for graceful shutdown (HIGH #2)
         self._background_tasks: list[asyncio.Task] = []
 
+        # Write-behind sink for high-volume stream events
+        self.event_writer = EventWriter(create_events)
+
+        # Listing of implementation-artifacts/, rescanned only when it changes
+        self._artifact_index: Optional[ArtifactIndex] = None
+
+        # File contents and rendered injections, reused while files are unchanged
+        settings = get_settings()
+        self.injection_cache = InjectionCache(
+            max_injections=settings.injection_cache_entries,
+            max_files=settings.injection_cache_files,
+        )
+        # Opt-in: injections too large for argv go to content-addressed files, removed
+        # at batch end (the file flag is unverified against the CLI, see injection_transport.py)
+        self.injection_files = InjectionFiles(
+            settings.injection_inline_max_kb * 1024 if settings.injection_file_transport else None
+        )
+
+        # Pre-started claude children, per batch (warm_pool_size > 0)
+        self.warm_pool: Optional[WarmPool] = None
+
+    @property
+    def artifact_index(self) -> ArtifactIndex:
+        """Index of implementation-artifacts/ under the current project root."""
+        directory = self.project_root / "_bmad-output/implementation-artifacts"
+        if self._artifact_index is None or self._artifact_index.directory != directory:
+            self._artifact_index = ArtifactIndex(directory)
+        return self._artifact_index
+
+    @property
+    def current_story_keys(self) -> list[str]:
+        """Story keys being worked on: the current story inside a dev phase, else the cycle's."""
+        scoped = _story_scope.get()
+        return self._cycle_story_keys if scoped is None else scoped
+
+    @current_story_keys.setter
+    def current_story_keys(self, story_keys: list[str]) -> None:
+        self._cycle_story_keys = story_keys
+
     async def start(self) -> None:
         """Start the orchestrator main loop."""
         self.state = OrchestratorState.STARTING
 
-        # Initialize database
-        init_db()
+        # Initialize database (all DB calls run off the event loop)
+        await run_write(init_db)
 
         # Create new batch
-        self.current_batch_id = create_batch(
+        self.current_batch_id = await run_write(
+            create_batch,
             max_cycles=self.max_cycles if self.batch_mode == "fixed" else 999
         )
 
@@ -204,6 +288,14 @@ class Orchestrator:
             },
         )
 
+        settings = get_settings()
+        if settings.warm_pool_size:
+            self.warm_pool = WarmPool(
+                size=settings.warm_pool_size,
+                max_age_seconds=settings.warm_pool_max_age_seconds,
+                max_variants=settings.warm_pool_max_variants,
+            )
+
         # Step 0: Project context check
         await self.check_project_context()
 
@@ -223,26 +315,36 @@ class Orchestrator:
         self.state = OrchestratorState.RUNNING_CYCLE
 
         # Main loop
-        while not self.stop_requested:
-            success = await self.run_cycle()
-
-            if not success:
-                # All stories done or blocked
-                break
-
-            if self.batch_mode == "fixed" and self.cycles_completed >= self.max_cycles:
-                self.emit_event(
-                    "batch:end",
-                    {
-                        "batch_id": self.current_batch_id,
-                        "cycles_completed": self.cycles_completed,
-                        "status": "completed",
-                    },
-                )
-                break
+        try:
+            while not self.stop_requested:
+                success = await self.run_cycle()
+
+                if not success:
+                    # All stories done or blocked
+                    break
+
+                if self.batch_mode == "fixed" and self.cycles_completed >= self.max_cycles:
+                    self.emit_event(
+                        "batch:end",
+                        {
+                            "batch_id": self.current_batch_id,
+                            "cycles_completed": self.cycles_completed,
+                            "status": "completed",
+                        },
+                    )
+                    break
+        finally:
+            # Persist buffered events even if a cycle raised
+            await self.event_writer.stop()
+            if self.warm_pool is not None:
+                await self.warm_pool.close()
+                logger.info(f"Warm pool: {self.warm_pool.stats()}")
+                self.warm_pool = None
+            self.injection_files.cleanup()
 
         # Finalize batch
-        update_batch(
+        await run_write(
+            update_batch,
             batch_id=self.current_batch_id,
             ended_at=int(time.time() * 1000),
             cycles_completed=self.cycles_completed,
@@ -257,6 +359,8 @@ class Orchestrator:
         # Terminate any active child processes
         for task in self._background_tasks:
             task.cancel()
+        # Persist buffered stream events before reporting the stop
+        await self.event_writer.flush()
         self.emit_event("batch:end", {"batch_id": self.current_batch_id, "status": "stopped"})
 
     # =========================================================================
@@ -275,6 +379,11 @@ class Orchestrator:
         """Get injection error threshold in bytes from settings."""
         return get_settings().injection_error_kb * 1024
 
+    def _get_injection_token_budget(self) -> int:
+        """Get the injection token budget (0 in settings: the error threshold in tokens)."""
+        budget = get_settings().injection_token_budget
+        return budget or estimate_tokens(self._get_injection_error_threshold())
+
     def copy_project_context(self) -> bool:
         """
         Copy project-context.md to sprint-project-context.md for injection.
@@ -354,7 +463,7 @@ class Orchestrator:
         """
         Move completed story artifacts to archived-artifacts folder.
 
-        Scans implementation-artifacts/ for files matching any of the provided
+        Looks up files in the implementation-artifacts/ index matching any of the provided
         story keys and moves them to archived-artifacts/. Creates the archive
         directory if it doesn't exist.
 
@@ -413,17 +522,12 @@ class Orchestrator:
             )
             return 0
 
-        # Collect files to move (using set to deduplicate)
-        files_to_move: set[Path] = set()
-        for story_key in story_keys:
-            story_key_lower = story_key.lower()
-            for file_path in impl_artifacts.iterdir():
-                if file_path.is_file() and story_key_lower in file_path.name.lower():
-                    files_to_move.add(file_path)
+        # Files matching any story key (deduplicated, sorted by name)
+        files_to_move = self.artifact_index.lookup(story_keys).all()
 
         # Move files
         files_moved = 0
-        for file_path in sorted(files_to_move, key=lambda p: p.name.lower()):
+        for file_path in files_to_move:
             dest = archive_dir / file_path.name
             try:
                 shutil.move(str(file_path), str(dest))
@@ -446,6 +550,8 @@ class Orchestrator:
                     },
                 )
                 # Continue processing other files
+        if files_moved:
+            self.artifact_index.invalidate()
 
         self.emit_event(
             "cleanup:complete",
@@ -517,7 +623,8 @@ class Orchestrator:
         self.emit_event("context:create", {"status": "starting"})
 
         # Log event to database
-        create_event(
+        await run_write(
+            create_event,
             batch_id=self.current_batch_id,
             story_id=None,
             command_id=None,
@@ -543,14 +650,16 @@ class Orchestrator:
         continues immediately while the refresh happens in the background.
         """
         # Create background task record in database
-        task_id = create_background_task(
+        task_id = await run_write(
+            create_background_task,
             batch_id=self.current_batch_id,
             story_key="system",
             task_type="project-context-refresh",
         )
 
         # Log event to database
-        create_event(
+        await run_write(
+            create_event,
             batch_id=self.current_batch_id,
             story_id=None,
             command_id=None,
@@ -585,7 +694,8 @@ class Orchestrator:
             await self.spawn_subagent(prompt, "generate-project-context", wait=True)
 
             # Update background task record
-            update_background_task(
+            await run_write(
+                update_background_task,
                 task_id,
                 status="completed",
                 completed_at=int(time.time() * 1000),
@@ -599,7 +709,8 @@ class Orchestrator:
 
         except Exception as e:
             # Update background task with error status
-            update_background_task(
+            await run_write(
+                update_background_task,
                 task_id,
                 status="error",
                 completed_at=int(time.time() * 1000),
@@ -615,7 +726,8 @@ class Orchestrator:
     ) -> None:
         """Run a background task and track completion."""
         try:
-            task_id = create_background_task(
+            task_id = await run_write(
+                create_background_task,
                 batch_id=self.current_batch_id,
                 story_key=",".join(self.current_story_keys),
                 task_type=task_type,
@@ -623,7 +735,8 @@ class Orchestrator:
 
             await self.spawn_subagent(prompt, task_type, wait=True)
 
-            update_background_task(
+            await run_write(
+                update_background_task,
                 task_id,
                 status="completed",
                 completed_at=int(time.time() * 1000),
@@ -669,68 +782,33 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         with open(status_path, "r") as f:
             return yaml.safe_load(f)
 
-    def select_stories(self, status: dict) -> list[str]:
-        """Select next 1-2 stories for processing (Step 1)."""
-        dev_status = status.get("development_status", {})
-
-        # Filter: exclude epic-* and *-retrospective
-        stories = [
-            key
-            for key in dev_status.keys()
-            if not key.startswith("epic-") and not key.endswith("-retrospective")
-        ]
-
-        # Filter: exclude done and blocked
-        available = [
-            key for key in stories if dev_status[key] not in ("done", "blocked")
-        ]
-
-        # Sort numerically
-        available.sort(key=self._story_sort_key)
-
-        if not available:
-            return []
-
-        # Pairing logic: try to pair 2 stories from same epic
-        first = available[0]
-        first_epic = self._extract_epic(first)
+    def select_stories(self, status: dict, record: bool = True) -> list[str]:
+        """Select the stories for the next cycle (Step 1).
 
-        for story in available[1:]:
-            if self._extract_epic(story) == first_epic:
-                return [first, story]
-
-        return [first]
+        Uses the story_selection_strategy setting, picking up to
+        max_stories_per_cycle stories (see selection.py). The selector lives
+        for the batch (rebuilt if those settings change); record=False
+        leaves its per-epic counts alone for speculative selections.
+        """
+        settings = get_settings()
+        selector = self._selector
+        if (
+            selector is None
+            or selector.name != settings.story_selection_strategy
+            or selector.max_stories != max(1, settings.max_stories_per_cycle)
+        ):
+            selector = self._selector = get_selector(
+                settings.story_selection_strategy, settings.max_stories_per_cycle
+            )
+        return selector.select(status, record=record)
 
     def _extract_epic(self, story_key: str) -> str:
-        """
-        Extract epic prefix from story key.
-
-        Examples:
-            "2a-1" -> "2a"
-            "2a-1-first" -> "2a"
-            "3b-2" -> "3b"
-            "5-sr-3" -> "5-sr"
-            "5-sr-3-python-orchestrator" -> "5-sr"
-        """
-        # Match pattern: digit + optional letter + optional letter-suffix, then dash + story number
-        # Examples: "2a-1", "5-sr-3", "2a-1-some-name"
-        match = re.match(r"^(\d+[a-z]?(?:-[a-z]+)?)-\d+", story_key)
-        if match:
-            return match.group(1)
-        # Fallback: split on last dash
-        parts = story_key.rsplit("-", 1)
-        return parts[0] if len(parts) > 1 else story_key
+        """Extract epic prefix from story key (e.g. "2a-1-first" -> "2a", "5-sr-3" -> "5-sr")."""
+        return extract_epic(story_key)
 
     def _story_sort_key(self, key: str) -> tuple:
         """Sort key for numeric story ordering."""
-        # Patterns: 1-1, 2-3, 2a-1, 3b-2, 5-sr-3
-        match = re.match(r"^(\d+)([a-z]?(?:-[a-z]+)?)-(\d+)", key)
-        if match:
-            major = int(match.group(1))
-            suffix = match.group(2) or ""
-            story_num = int(match.group(3))
-            return (major, suffix, story_num)
-        return (999, "", 999)
+        return story_sort_key(key)
 
     # =========================================================================
     # Claude CLI Spawning (AC: #2)
@@ -744,6 +822,7 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         is_background: bool = False,
         model: Optional[str] = None,
         prompt_system_append: Optional[str] = None,
+        consumers: Optional[list[StreamConsumer]] = None,
     ) -> dict[str, Any]:
         """
         Spawn Claude CLI subagent.
@@ -755,12 +834,19 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
             is_background: If True, track in background_tasks table
             model: Optional model override (e.g., 'haiku')
             prompt_system_append: Optional content to append to system prompt via
-                --prompt-system-append flag. Used for context injection (default: None).
+                --prompt-system-append flag (with injection_file_transport, via a file and
+                --prompt-system-append-file above injection_inline_max_kb). Used for
+                context injection (default: None).
+            consumers: Extra stream consumers fed with every event (wait=True only)
 
         Returns:
-            Dict with 'events' list, 'exit_code', 'stdout' (only if wait=True)
+            Dict with 'output' (SubagentOutput), 'exit_code', 'status' ("completed",
+            "failed" or "timeout"), 'timed_out' (None, "total" or "idle"), 'stdout' (most recent
+            assistant text, bounded), 'stderr' (most recent stderr, bounded), 'io'
+            (byte counters) and 'events' (raw events, only kept when debug logging
+            is enabled) (only if wait=True)
         """
-        args = ["claude", "-p", "--output-format", "stream-json"]
+        args = [*self._claude_command(), "-p", "--output-format", "stream-json"]
 
         # Model override for review-2+ (uses Haiku)
         if model:
@@ -768,18 +854,39 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
 
         # Prompt system append for context injection (Story A-2)
         if prompt_system_append:
-            args.extend(["--prompt-system-append", prompt_system_append])
+            args.extend(self.injection_files.args(prompt_system_append))
 
-        self.state = OrchestratorState.WAITING_CHILD
+        self._enter_child()
 
-        process = await asyncio.subprocess.create_subprocess_exec(
-            *args,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=os.environ.copy(),
-            cwd=str(self.project_root),
+        limits = WatchdogLimits.for_command(prompt_name)
+
+        async def spawn() -> asyncio.subprocess.Process:
+            # Limits are set from here (prlimit), not in a preexec_fn: forking with
+            # the aiodb threads running makes preexec_fn unsafe
+            spawned = await asyncio.subprocess.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=os.environ.copy(),
+                cwd=str(self.project_root),
+            )
+            apply_rlimits(spawned.pid, limits)
+            return spawned
+
+        # A pre-started child with this exact command line and limits skips CLI startup
+        process = None
+        if self.warm_pool is not None:
+            variant = (tuple(args), limits.memory_limit_mb, limits.cpu_limit_seconds)
+            process = self.warm_pool.acquire(variant, spawn)
+        if process is None:
+            process = await spawn()
+
+        # Drain stderr concurrently so a verbose child never blocks on a full pipe
+        child = ChildIO(
+            process, prompt_name, stderr_limit=get_settings().subagent_stderr_buffer_kb * 1024
         )
+        child.start()
 
         # Send prompt via stdin with error handling (CRITICAL #2)
         try:
@@ -789,32 +896,76 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
                 process.stdin.close()
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
             print(f"Error sending prompt to Claude CLI: {e}")
+            child.cancel()
             if process.returncode is None:
                 process.kill()
+            self._leave_child()
             raise
 
         if wait:
+            # Consume the stream incrementally so memory stays flat on long runs
+            output = SubagentOutput(
+                max_text_chars=get_settings().subagent_output_buffer_kb * 1024,
+                consumers=consumers,
+            )
+            keep_events = logger.isEnabledFor(logging.DEBUG)
             results: list[dict] = []
-            stdout_content = ""
-
-            async for event in self._parse_ndjson_stream(process):
-                results.append(event)
-                self._handle_stream_event(event)
+            # Sprint-log tasks started but not ended, closed as "timeout" if the watchdog fires
+            open_tasks: dict[tuple[str, str, str], dict] = {}
 
-                # Accumulate stdout for tech-spec decision parsing
-                if event.get("type") == "assistant":
-                    content = event.get("message", {}).get("content", [])
-                    for block in content:
-                        if block.get("type") == "text":
-                            stdout_content += block.get("text", "")
-
-            await process.wait()
-            self.state = OrchestratorState.RUNNING_CYCLE
+            # Wall-clock and idle limits: a wedged child must not stall the cycle
+            watchdog = Watchdog(process, prompt_name, limits)
+            watchdog.start()
+            try:
+                async for event in self._parse_ndjson_stream(child.stdout):
+                    watchdog.touch()
+                    if keep_events:
+                        results.append(event)
+                    task_info = self._handle_stream_event(event)
+                    if task_info:
+                        task_key = (task_info["story_id"], task_info["command"], task_info["task_id"])
+                        if task_info["status"] == "start":
+                            open_tasks[task_key] = task_info
+                        else:
+                            open_tasks.pop(task_key, None)
+                    output.feed_event(event)
+
+                await watchdog.wait()
+            except BaseException:
+                # Stream handling raised or we were cancelled: never leave the child running
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                child.cancel()
+                raise
+            finally:
+                await watchdog.stop()
+                self._leave_child()
+            await child.close()
+
+            stderr = child.stderr_tail()
+            if watchdog.timed_out:
+                self._record_child_timeout(prompt_name, watchdog, stderr, list(open_tasks.values()))
+            elif process.returncode:
+                self._report_child_failure(prompt_name, process.returncode, stderr, child.stats())
+
+            if output.text.truncated:
+                logger.debug(
+                    f"{prompt_name}: kept last {len(output.text)} chars of assistant text "
+                    f"({output.text.dropped_chars} dropped)"
+                )
 
             return {
                 "events": results,
                 "exit_code": process.returncode,
-                "stdout": stdout_content,
+                "status": "timeout" if watchdog.timed_out else (
+                    "failed" if process.returncode else "completed"
+                ),
+                "timed_out": watchdog.timed_out,
+                "stdout": output.stdout,
+                "stderr": stderr,
+                "io": child.stats(),
+                "output": output,
             }
         else:
             # Fire and forget
@@ -824,35 +975,125 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
                 )
                 self._background_tasks.append(task)
                 task.add_done_callback(self._background_tasks.remove)
-            self.state = OrchestratorState.RUNNING_CYCLE  # Reset state (MEDIUM #1)
+            self._leave_child()  # Reset state (MEDIUM #1)
             return {}
 
+    def _claude_command(self) -> list[str]:
+        """Command line that runs claude: SPRINT_RUNNER_CLAUDE, else the claude_command setting."""
+        return shlex.split(os.environ.get(CLAUDE_COMMAND_ENV_VAR) or get_settings().claude_command)
+
+    def _enter_child(self) -> None:
+        """Mark a child as running (state WAITING_CHILD)."""
+        self._waiting_children += 1
+        self.state = OrchestratorState.WAITING_CHILD
+
+    def _leave_child(self) -> None:
+        """Mark a child as done; back to RUNNING_CYCLE once no child is running."""
+        self._waiting_children = max(0, self._waiting_children - 1)
+        if self._waiting_children == 0:
+            self.state = OrchestratorState.RUNNING_CYCLE
+
+    def _report_child_failure(
+        self, prompt_name: str, exit_code: int, stderr: str, io_stats: dict
+    ) -> None:
+        """Log and surface a subagent that exited with an error, with its stderr tail."""
+        logger.warning(
+            f"{prompt_name} exited with code {exit_code} "
+            f"({io_stats['stderr_bytes']} stderr bytes): {stderr[-2000:]}"
+        )
+        self.emit_event(
+            "error",
+            {
+                "type": "subagent",
+                "command": prompt_name,
+                "exit_code": exit_code,
+                "message": f"{prompt_name} exited with code {exit_code}",
+                "stderr": stderr,
+                **io_stats,
+            },
+        )
+
+    def _record_child_timeout(
+        self, prompt_name: str, watchdog: Watchdog, stderr: str, open_tasks: list[dict]
+    ) -> None:
+        """
+        Record a watchdog-terminated subagent.
+
+        Each task it had started but not ended gets a command:end with status
+        'timeout' under its own task_id, which closes it on the dashboard. If
+        no task was in flight there is nothing to close, so an error event is
+        emitted instead.
+        """
+        limit = (
+            watchdog.limits.total_seconds if watchdog.timed_out == "total"
+            else watchdog.limits.idle_seconds
+        )
+        message = (
+            f"{prompt_name} killed after {watchdog.elapsed:.0f}s "
+            f"({watchdog.timed_out} timeout, limit {limit}s)"
+        )
+        logger.warning(f"{message}: {stderr[-2000:]}")
+
+        if not open_tasks:
+            self.emit_event(
+                "error",
+                {
+                    "type": "subagent_timeout",
+                    "command": prompt_name,
+                    "timeout": watchdog.timed_out,
+                    "message": message,
+                    "stderr": stderr,
+                },
+            )
+            return
+
+        for task_info in open_tasks:
+            ws_event = BusEvent(
+                "command:end",
+                {
+                    "story_key": task_info["story_id"],
+                    "command": task_info["command"],
+                    "task_id": task_info["task_id"],
+                    "message": message,
+                    "status": "timeout",
+                    "timeout": watchdog.timed_out,
+                    "stderr": stderr,
+                },
+            )
+            if self.current_batch_id is not None:
+                self.event_writer.write(
+                    batch_id=self.current_batch_id,
+                    story_id=None,
+                    command_id=None,
+                    event_type="command:end",
+                    epic_id=task_info["epic_id"],
+                    story_key=task_info["story_id"],
+                    command=task_info["command"],
+                    task_id=task_info["task_id"],
+                    status="timeout",
+                    message=message,
+                    timestamp=ws_event.timestamp,
+                    payload_json=ws_event.payload_json,
+                )
+            event_bus.publish(ws_event)
+
     # =========================================================================
     # NDJSON Stream Parsing (AC: #3)
     # =========================================================================
 
-    async def _parse_ndjson_stream(
-        self, process: asyncio.subprocess.Process
-    ) -> AsyncGenerator[dict, None]:
-        """Parse NDJSON from subprocess stdout."""
-        if not process.stdout:
+    async def _parse_ndjson_stream(self, stdout: Any) -> AsyncGenerator[dict, None]:
+        """Parse NDJSON from subprocess stdout (lines of any length)."""
+        if not stdout:
             return
 
-        while True:
-            line = await process.stdout.readline()
-            if not line:
-                break
-
-            line_str = line.decode().strip()
-            if not line_str:
-                continue
-
+        async for line in iter_lines(stdout):
+            # The memoryview goes straight to the decoder (no bytes/str copies)
             try:
-                event = json.loads(line_str)
-                yield event
-            except json.JSONDecodeError:
+                event = codec.loads(line)
+            except codec.DecodeError:
                 # Skip malformed lines
-                pass
+                continue
+            yield event
 
     def _extract_task_event(self, event: dict) -> Optional[dict]:
         """Extract task-id event from tool_result content."""
@@ -899,8 +1140,8 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
     # Database Event Logging (AC: #3, #4)
     # =========================================================================
 
-    def _handle_stream_event(self, event: dict) -> None:
-        """Handle stream event: log to database and emit WebSocket."""
+    def _handle_stream_event(self, event: dict) -> Optional[dict]:
+        """Handle stream event: log to database and emit WebSocket; return its task info."""
         task_info = self._extract_task_event(event)
 
         if task_info:
@@ -917,7 +1158,11 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
             if event_type == "command:end":
                 ws_payload["status"] = task_info["status"]
 
-            create_event(
+            # Encoded once: payload_json is reused for the WebSocket frame
+            ws_event = BusEvent(event_type, ws_payload)
+
+            # Buffered: written in batches by the EventWriter, off the hot path
+            self.event_writer.write(
                 batch_id=self.current_batch_id,
                 story_id=None,  # Would need DB lookup for story record ID
                 command_id=None,
@@ -928,37 +1173,33 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
                 task_id=task_info["task_id"],
                 status=task_info["status"],
                 message=task_info["message"],
-                payload=ws_payload,
+                timestamp=ws_event.timestamp,
+                payload_json=ws_event.payload_json,
             )
 
             # Emit WebSocket event
-            ws_type = "command:start" if task_info["status"] == "start" else "command:end"
-            self.emit_event(ws_type, ws_payload)
+            event_bus.publish(ws_event)
+
+        return task_info
 
     # =========================================================================
     # WebSocket Event Emission (AC: #3, #4)
     # =========================================================================
 
     def emit_event(self, event_type: str, payload: dict) -> None:
-        """Emit WebSocket event to all connected clients."""
-        event = {
-            "type": event_type,
-            "payload": payload,
-            "timestamp": int(time.time() * 1000),
-        }
-
+        """Emit WebSocket event to all connected clients (via the event bus)."""
         try:
-            asyncio.create_task(broadcast_websocket(json.dumps(event)))
+            event_bus.publish(BusEvent(event_type, payload))
         except Exception:
-            # No connected clients or broadcast failed - continue anyway
+            # No connected clients or delivery failed - continue anyway
             pass
 
     # =========================================================================
     # Sprint Status Updates (AC: #4)
     # =========================================================================
 
-    def update_sprint_status(self, story_key: str, new_status: str) -> None:
-        """Update story status in sprint-status.yaml."""
+    async def update_sprint_status(self, story_key: str, new_status: str) -> None:
+        """Update story status in sprint-status.yaml and the database."""
         status_path = (
             self.project_root / "_bmad-output/implementation-artifacts/sprint-status.yaml"
         )
@@ -985,11 +1226,20 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
             },
         )
 
-        # Update database
+        # Update database (lookup and update in one writer-thread call, off the loop)
         ended_at = int(time.time() * 1000) if new_status in ("done", "blocked") else None
-        story_record = get_story_by_key(story_key=story_key, batch_id=self.current_batch_id)
+        await run_write(
+            self._update_story_record, self.current_batch_id, story_key, new_status, ended_at
+        )
+
+    @staticmethod
+    def _update_story_record(
+        batch_id: Optional[int], story_key: str, status: str, ended_at: Optional[int]
+    ) -> None:
+        """Set a story row's status by key (runs on the aiodb writer thread)."""
+        story_record = get_story_by_key(story_key=story_key, batch_id=batch_id)
         if story_record:
-            update_story(story_id=story_record["id"], status=new_status, ended_at=ended_at)
+            update_story(story_id=story_record["id"], status=status, ended_at=ended_at)
 
     def _get_story_status(self, story_key: str) -> str:
         """Get current status of a story from sprint-status.yaml."""
@@ -1008,12 +1258,18 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         include_discovery: bool = False,
         include_tech_spec: bool = False,
         additional_files: Optional[list[str]] = None,
+        reserve_bytes: int = 0,
     ) -> str:
         """
         Build the --prompt-system-append content for a subagent.
 
-        Scans for files matching story IDs, deduplicates, and generates
-        XML injection format. Files are read fresh at each call (no caching).
+        Looks up files matching story IDs in the artifact index (the directory
+        listing is rescanned only when it changes), deduplicates, and generates
+        XML injection format. Files are read again only when their mtime, size
+        or inode changed, and an identical file set with identical contents
+        reuses the XML rendered for it (see injection_cache.py). Over the token
+        budget, the lowest-priority files are trimmed to summaries, outlines or
+        omitted (see injection_packer.py) and injection:packed is emitted.
 
         Args:
             command_name: Name of the command being executed (for logging)
@@ -1022,35 +1278,34 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
             include_discovery: Include discovery files for the stories
             include_tech_spec: Include tech-spec files for the stories
             additional_files: Explicit additional file paths to include
+            reserve_bytes: Bytes the caller will append (e.g. git status); taken
+                off the token budget so the combined injection still fits
 
         Returns:
             Complete XML string ready for --prompt-system-append.
             Returns valid XML with empty file_injections if no files match.
 
         Raises:
-            ValueError: If injection size exceeds 150KB
+            ValueError: If injection size exceeds 150KB even after packing
         """
-        files_to_inject: list[tuple[str, str]] = []  # (relative_path, content)
+        files_to_inject: list[tuple[str, CachedFile]] = []  # (relative_path, file)
         seen_paths: set[str] = set()
 
         def add_file(path: Path) -> None:
             """Add file to injection list if not already seen. Silently skips unreadable files."""
-            if not path.exists() or not path.is_file():
-                return
             # Convert to relative path for XML
             try:
                 rel_path = str(path.relative_to(self.project_root))
             except ValueError:
                 rel_path = str(path)
-            if rel_path not in seen_paths:
+            if rel_path in seen_paths:
+                return
+            # CRITICAL FIX: Handle file read errors gracefully (Issue #1)
+            # Missing, non-regular and unreadable files come back as None and are skipped
+            cached = self.injection_cache.read(path)
+            if cached is not None:
                 seen_paths.add(rel_path)
-                # CRITICAL FIX: Handle file read errors gracefully (Issue #1)
-                try:
-                    content = path.read_text()
-                    files_to_inject.append((rel_path, content))
-                except (OSError, UnicodeDecodeError, PermissionError):
-                    # Silently skip unreadable files (binary, locked, encoding issues)
-                    pass
+                files_to_inject.append((rel_path, cached))
 
         # AC9: File ordering - collect files in specific order:
         # 1. Project context, 2. Story files, 3. Discovery files, 4. Tech-spec files, 5. Additional files
@@ -1060,46 +1315,21 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
             ctx_path = self.project_root / "_bmad-output/planning-artifacts/sprint-project-context.md"
             add_file(ctx_path)
 
-        # Scan and categorize files from implementation-artifacts
-        # Use sets during collection to prevent duplicate file reads (Issue #2)
-        impl_artifacts = self.project_root / "_bmad-output/implementation-artifacts"
-        story_file_paths: set[Path] = set()
-        discovery_file_paths: set[Path] = set()
-        tech_spec_file_paths: set[Path] = set()
-
-        if impl_artifacts.exists():
-            for story_key in story_keys:
-                story_key_lower = story_key.lower()
-                for file_path in impl_artifacts.iterdir():
-                    if not file_path.is_file():
-                        continue
-                    filename_lower = file_path.name.lower()
-                    if story_key_lower not in filename_lower:
-                        continue
-
-                    # Categorize by type (using sets prevents duplicates from multi-story matching)
-                    is_discovery = "discovery" in filename_lower
-                    is_tech_spec = "tech-spec" in filename_lower
-
-                    if is_discovery:
-                        discovery_file_paths.add(file_path)
-                    elif is_tech_spec:
-                        tech_spec_file_paths.add(file_path)
-                    else:
-                        story_file_paths.add(file_path)
+        # Categorized files from implementation-artifacts (indexed, deduplicated, sorted - Issue #2, #4)
+        artifacts = self.artifact_index.lookup(story_keys)
 
         # Step 2: Add story files (sorted for deterministic output - Issue #4)
-        for file_path in sorted(story_file_paths, key=lambda p: p.name.lower()):
+        for file_path in artifacts.story:
             add_file(file_path)
 
         # Step 3: Add discovery files (when include_discovery=True)
         if include_discovery:
-            for file_path in sorted(discovery_file_paths, key=lambda p: p.name.lower()):
+            for file_path in artifacts.discovery:
                 add_file(file_path)
 
         # Step 4: Add tech-spec files (when include_tech_spec=True)
         if include_tech_spec:
-            for file_path in sorted(tech_spec_file_paths, key=lambda p: p.name.lower()):
+            for file_path in artifacts.tech_spec:
                 add_file(file_path)
 
         # Step 5: Additional explicit files
@@ -1121,22 +1351,42 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
                 },
             )
 
-        # Generate XML output
-        xml_parts: list[str] = [
-            '<file_injections rule="DO NOT read these files - content already provided">'
-        ]
-        for rel_path, content in files_to_inject:
-            # Escape quotes in path attribute to prevent XML breakage (Issue #5)
-            safe_path = rel_path.replace('"', '&quot;')
-            xml_parts.append(f'  <file path="{safe_path}">')
-            xml_parts.append(content)
-            xml_parts.append('  </file>')
-        xml_parts.append('</file_injections>')
+        # Fit the token budget, trimming in reverse AC9 order
+        budget = max(0, self._get_injection_token_budget() - estimate_tokens(reserve_bytes))
+        packed = pack([(rel_path, f.content, f.size_bytes) for rel_path, f in files_to_inject], budget)
+        trimmed = packed.trimmed
+        if trimmed:
+            files_to_inject = [
+                (rel_path, f) if p.level == LEVEL_FULL else (
+                    rel_path,
+                    replace(
+                        f,
+                        content=p.content,
+                        digest=f"{f.digest}:{p.level}",
+                        size_bytes=len(p.content.encode("utf-8")),
+                    ),
+                )
+                for (rel_path, f), p in zip(files_to_inject, packed.files)
+            ]
+            self.emit_event(
+                "injection:packed",
+                {
+                    "command": command_name,
+                    "story_keys": story_keys,
+                    "budget_tokens": budget,
+                    "tokens": packed.tokens,
+                    "original_tokens": packed.original_tokens,
+                    "trimmed": [p.to_dict() for p in trimmed],
+                    "message": f"Trimmed {len(trimmed)} file(s) to fit the {budget}-token budget",
+                },
+            )
 
-        result = '\n'.join(xml_parts)
+        # Generate XML output (cached per distinct file set and contents)
+        injection = self.injection_cache.render(files_to_inject)
+        result = injection.xml
 
         # Size monitoring with threshold checks
-        size_bytes = len(result.encode('utf-8'))
+        size_bytes = injection.size_bytes
         error_threshold = self._get_injection_error_threshold()
         warning_threshold = self._get_injection_warning_threshold()
         if size_bytes > error_threshold:
@@ -1208,50 +1458,52 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
             )
             return False
 
+        prepared = self._take_prepared(story_keys)
+
         self.current_story_keys = story_keys
         self.emit_event(
             "cycle:start",
-            {"cycle_number": self.cycles_completed + 1, "story_keys": story_keys},
+            {
+                "cycle_number": self.cycles_completed + 1,
+                "story_keys": story_keys,
+                "prepared": prepared is not None,
+            },
         )
 
         # Register stories in database
         for story_key in story_keys:
             epic_id = self._extract_epic(story_key)
-            create_story(
+            await run_write(
+                create_story,
                 batch_id=self.current_batch_id,
                 story_key=story_key,
                 epic_id=epic_id,
             )
 
         current_status = status["development_status"].get(story_keys[0], "backlog")
+        if prepared is not None:
+            # create-story already moved them on; the rest of the backlog path still runs
+            current_status = "backlog"
+
+        # Steps 2-4c: every phase starts as soon as its inputs exist
+        report = await self._run_cycle_phases(story_keys, current_status, prepared)
+        critical_path = [timing.to_dict() for timing in report.critical_path()]
+        logger.info(
+            f"Cycle {self.cycles_completed + 1} took {report.wall_seconds:.1f}s, critical path: "
+            + " -> ".join(f"{t['phase']} ({t['seconds']:.1f}s)" for t in critical_path)
+        )
 
-        # Step 2: CREATE-STORY phase
-        if current_status == "backlog":
-            await self._execute_create_story_phase(story_keys)
-            await self._execute_story_review_phase(story_keys)
-
-            if self.tech_spec_needed:
-                await self._execute_tech_spec_phase(story_keys)
-                await self._execute_tech_spec_review_phase(story_keys)
-        elif current_status == "review":
-            # Skip directly to code-review (don't re-run dev-story) (HIGH #1)
-            pass
-
-        # Step 4: DEV + CODE-REVIEW (handles both ready-for-dev AND review statuses)
-        for story_key in story_keys:
-            if self.stop_requested:
-                break
-            await self._execute_dev_phase(story_key)
-
-        # Step 4c: Batch commit
-        completed = [k for k in story_keys if self._get_story_status(k) == "done"]
-        if completed:
-            await self._execute_batch_commit(completed)
-
+        completed = self._completed_stories(story_keys)
         self.cycles_completed += 1
         self.emit_event(
             "cycle:end",
-            {"cycle_number": self.cycles_completed, "completed_stories": completed},
+            {
+                "cycle_number": self.cycles_completed,
+                "completed_stories": completed,
+                "wall_seconds": round(report.wall_seconds, 3),
+                "critical_path": critical_path,
+                "injection_cache": self.injection_cache.stats(),
+            },
         )
 
         return True
@@ -1306,9 +1558,9 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         # Parse tech-spec decisions per story (CRITICAL #1)
         self.tech_spec_needed = False
         self.tech_spec_decisions = {}
-        stdout = create_result.get("stdout", "")
+        output = self._subagent_output(create_result)
 
-        self.tech_spec_decisions = self._parse_tech_spec_decisions(stdout, story_keys)
+        self.tech_spec_decisions = output.tech_spec_decisions(story_keys)
         for decision in self.tech_spec_decisions.values():
             if decision == "REQUIRED":
                 self.tech_spec_needed = True
@@ -1342,33 +1594,21 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         # Build prompt with story keys, epic id, and review attempt
         prompt = f"Story keys: {story_keys_str}\nEpic ID: {epic_id}\nReview attempt: 1"
 
+        # Start the background review chain as soon as critical issues are reported
+        chain_prompt = f"Story keys: {story_keys_str}\nEpic ID: {epic_id}\nReview attempt: 2\nBackground chain: true"
+        start_chain = self._review_chain_starter(
+            "sprint-story-review", story_keys, chain_prompt, include_tech_spec=False
+        )
+
         result = await self.spawn_subagent(
             prompt,
             "sprint-story-review",
             prompt_system_append=injection,
+            consumers=[MarkerScanner(CRITICAL_MARKERS, on_match=start_chain)],
         )
 
-        has_critical = self._check_for_critical_issues(result.get("stdout", ""))
-
-        if has_critical:
-            # Spawn background review chain with same injection
-            chain_injection = self.build_prompt_system_append(
-                command_name="sprint-story-review",
-                story_keys=story_keys,
-                include_project_context=True,
-                include_discovery=True,
-                include_tech_spec=False,
-            )
-            chain_prompt = f"Story keys: {story_keys_str}\nEpic ID: {epic_id}\nReview attempt: 2\nBackground chain: true"
-            asyncio.create_task(
-                self.spawn_subagent(
-                    chain_prompt,
-                    "sprint-story-review-chain",
-                    is_background=True,
-                    model="haiku",
-                    prompt_system_append=chain_injection,
-                )
-            )
+        if self._subagent_output(result).has_critical_issues:
+            start_chain()
 
     async def _execute_tech_spec_phase(self, story_keys: list[str]) -> None:
         """Step 3: Create tech-spec using sprint-create-tech-spec command."""
@@ -1410,38 +1650,252 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         # Build prompt with story keys, epic id, and review attempt
         prompt = f"Story keys: {story_keys_str}\nEpic ID: {epic_id}\nReview attempt: 1"
 
+        # Start the background review chain as soon as critical issues are reported
+        chain_prompt = f"Story keys: {story_keys_str}\nEpic ID: {epic_id}\nReview attempt: 2\nBackground chain: true"
+        start_chain = self._review_chain_starter(
+            "sprint-tech-spec-review", story_keys, chain_prompt, include_tech_spec=True
+        )
+
         result = await self.spawn_subagent(
             prompt,
             "sprint-tech-spec-review",
             prompt_system_append=injection,
+            consumers=[MarkerScanner(CRITICAL_MARKERS, on_match=start_chain)],
         )
 
-        has_critical = self._check_for_critical_issues(result.get("stdout", ""))
+        if self._subagent_output(result).has_critical_issues:
+            start_chain()
+
+    def _review_chain_starter(
+        self,
+        command_name: str,
+        story_keys: list[str],
+        chain_prompt: str,
+        include_tech_spec: bool,
+    ) -> Callable[..., None]:
+        """Get a callback that spawns the background review chain at most once.
+
+        Used as a MarkerScanner on_match callback, so the chain can start while
+        the first review is still streaming, and again after it exits for results
+        that were not streamed.
+        """
+        started = False
+
+        def start_chain(marker: Optional[str] = None) -> None:
+            nonlocal started
+            if started:
+                return
+            if marker is not None:
+                logger.info(f"{command_name}: {marker} seen mid-stream, starting review chain early")
 
-        if has_critical:
             # Spawn background review chain with same injection
             chain_injection = self.build_prompt_system_append(
-                command_name="sprint-tech-spec-review",
+                command_name=command_name,
                 story_keys=story_keys,
                 include_project_context=True,
                 include_discovery=True,
-                include_tech_spec=True,
+                include_tech_spec=include_tech_spec,
             )
-            chain_prompt = f"Story keys: {story_keys_str}\nEpic ID: {epic_id}\nReview attempt: 2\nBackground chain: true"
             asyncio.create_task(
                 self.spawn_subagent(
                     chain_prompt,
-                    "sprint-tech-spec-review-chain",
+                    f"{command_name}-chain",
                     is_background=True,
                     model="haiku",
                     prompt_system_append=chain_injection,
                 )
             )
+            # Only now: a mid-stream failure (e.g. injection too large) is retried after the stream
+            started = True
+
+        return start_chain
+
+    def _build_cycle_graph(
+        self,
+        story_keys: list[str],
+        current_status: str,
+        prepared: Optional[PreparedStories] = None,
+    ) -> PhaseGraph:
+        """Steps 2-4c of a cycle as phases linked by the artifacts they produce.
+
+        Dev phases share the "dev" slot (max_parallel_stories at a time); with
+        one slot stories run in order and a failure stops the rest. With
+        pipeline_cycles, the next cycle's create-story runs alongside dev
+        ("prepare-next"); a prepared cycle only restores its results. The
+        batch commit waits for prepare-next so it never commits story files
+        that are still being written.
+        """
+        graph = PhaseGraph()
+        dev_requires: tuple[str, ...] = ()
+
+        # Step 2: CREATE-STORY phase
+        if current_status == "backlog":
+            def tech_spec_needed() -> bool:
+                return self.tech_spec_needed
+
+            graph.add(Phase(
+                "create-story",
+                lambda: (
+                    self._restore_prepared(prepared) if prepared is not None
+                    else self._execute_create_story_phase(story_keys)
+                ),
+                provides=("story-files", "discovery-files", "tech-spec-decision"),
+            ))
+            graph.add(Phase(
+                "story-review",
+                lambda: self._execute_story_review_phase(story_keys),
+                requires=("story-files",),
+                provides=("reviewed-stories",),
+            ))
+            graph.add(Phase(
+                "tech-spec",
+                lambda: self._execute_tech_spec_phase(story_keys),
+                requires=("reviewed-stories", "tech-spec-decision"),
+                provides=("tech-spec-files",),
+                when=tech_spec_needed,
+            ))
+            graph.add(Phase(
+                "tech-spec-review",
+                lambda: self._execute_tech_spec_review_phase(story_keys),
+                requires=("tech-spec-files",),
+                provides=("reviewed-tech-spec",),
+                when=tech_spec_needed,
+            ))
+            dev_requires = ("reviewed-stories", "discovery-files", "reviewed-tech-spec")
+        # "review" status: skip directly to code-review (don't re-run create-story) (HIGH #1)
+
+        # Step 4: DEV + CODE-REVIEW (handles both ready-for-dev AND review statuses)
+        for story_key in story_keys:
+            graph.add(Phase(
+                f"dev:{story_key}",
+                functools.partial(self._run_story_dev_phase, story_key),
+                requires=dev_requires,
+                provides=(f"dev:{story_key}",),
+                slot="dev",
+                when=lambda: not self.stop_requested,
+            ))
+
+        # Pipelined: next cycle's create-story + discovery while this one is in dev
+        graph.add(Phase(
+            "prepare-next",
+            lambda: self._prepare_next_cycle(story_keys),
+            requires=dev_requires,
+            provides=("prepared-next",),
+            when=self._should_prepare_next_cycle,
+        ))
+
+        # Step 4c: Batch commit
+        graph.add(Phase(
+            "batch-commit",
+            lambda: self._execute_batch_commit(self._completed_stories(story_keys)),
+            requires=(*(f"dev:{key}" for key in story_keys), "prepared-next"),
+            when=lambda: bool(self._completed_stories(story_keys)),
+        ))
+        return graph
+
+    async def _run_cycle_phases(
+        self,
+        story_keys: list[str],
+        current_status: str,
+        prepared: Optional[PreparedStories] = None,
+    ) -> ScheduleReport:
+        """Run the cycle's phase graph (see _build_cycle_graph())."""
+        graph = self._build_cycle_graph(story_keys, current_status, prepared)
+        slots = {"dev": get_settings().max_parallel_stories}
+        return await Scheduler(graph, slots=slots).run()
+
+    def _should_prepare_next_cycle(self) -> bool:
+        """Pipelining is on and another cycle will follow this one."""
+        if not get_settings().pipeline_cycles or self.stop_requested:
+            return False
+        return self.batch_mode != "fixed" or self.cycles_completed + 1 < self.max_cycles
+
+    def _select_next_stories(self, story_keys: list[str]) -> list[str]:
+        """Speculatively select the next cycle's stories while story_keys are in flight.
+
+        In-flight stories are treated as blocked: not selectable, and stories
+        depending on them wait. Only a backlog selection is worth preparing.
+        """
+        status = self.read_sprint_status()
+        dev_status = dict(status.get("development_status") or {})
+        for key in story_keys:
+            dev_status[key] = "blocked"
+        next_keys = self.select_stories({**status, "development_status": dev_status}, record=False)
+        if not next_keys or dev_status.get(next_keys[0]) != "backlog":
+            return []
+        return next_keys
+
+    async def _prepare_next_cycle(self, story_keys: list[str]) -> None:
+        """Run create-story + discovery for the next cycle's stories ahead of time.
+
+        Speculative work: a failure is logged and the next cycle runs normally.
+        The current cycle's tech-spec state is left untouched.
+        """
+        next_keys = self._select_next_stories(story_keys)
+        if not next_keys:
+            return
+
+        logger.info(f"Preparing next cycle during dev: {', '.join(next_keys)}")
+        saved = (self.tech_spec_needed, self.tech_spec_decisions)
+        token = _story_scope.set(next_keys)
+        try:
+            await self._execute_create_story_phase(next_keys)
+            self._prepared = PreparedStories(next_keys, dict(self.tech_spec_decisions))
+        except Exception as e:
+            logger.warning(f"Preparing {', '.join(next_keys)} failed, will run unprepared: {e!r}")
+        finally:
+            _story_scope.reset(token)
+            self.tech_spec_needed, self.tech_spec_decisions = saved
+
+    def _take_prepared(self, story_keys: list[str]) -> Optional[PreparedStories]:
+        """Reconcile a prepared cycle with the actual selection.
+
+        Used if every selected story was prepared (the selection may shrink,
+        e.g. when a prepared story became blocked). Otherwise the previous
+        cycle's outcome changed the selection and the preparation is dropped,
+        with a batch:warning so the wasted work is visible.
+        """
+        prepared, self._prepared = self._prepared, None
+        if prepared is None:
+            return None
+        if set(story_keys) <= set(prepared.story_keys):
+            return prepared.restrict(story_keys)
+        message = (
+            f"Selection changed from prepared {', '.join(prepared.story_keys)} "
+            f"to {', '.join(story_keys)}; discarding preparation"
+        )
+        logger.warning(message)
+        self.emit_event(
+            "batch:warning",
+            {
+                "batch_id": self.current_batch_id,
+                "message": message,
+                "warning_type": "preparation_discarded",
+            },
+        )
+        return None
+
+    async def _restore_prepared(self, prepared: PreparedStories) -> None:
+        """Stand-in for create-story: restore the decisions made when preparing."""
+        self.tech_spec_decisions = dict(prepared.tech_spec_decisions)
+        self.tech_spec_needed = "REQUIRED" in self.tech_spec_decisions.values()
+
+    def _completed_stories(self, story_keys: list[str]) -> list[str]:
+        """Stories marked done in sprint-status.yaml."""
+        return [key for key in story_keys if self._get_story_status(key) == "done"]
+
+    async def _run_story_dev_phase(self, story_key: str) -> None:
+        """Run the dev phase with current_story_keys scoped to the story."""
+        token = _story_scope.set([story_key])
+        try:
+            await self._execute_dev_phase(story_key)
+        finally:
+            _story_scope.reset(token)
 
     async def _execute_dev_phase(self, story_key: str) -> None:
         """Step 4: Dev-story + code-review loop using sprint-dev-story command."""
         # Update status to in-progress
-        self.update_sprint_status(story_key, "in-progress")
+        await self.update_sprint_status(story_key, "in-progress")
         epic_id = self._extract_epic(story_key)
 
         # Build injection with project_context, discovery, and tech_spec files
@@ -1468,7 +1922,7 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
     async def _execute_code_review_loop(self, story_key: str) -> str:
         """Execute code-review loop until done or blocked using sprint-code-review command."""
         review_attempt = 1
-        error_history: list[str] = []
+        error_history = self.error_history[story_key] = []
         epic_id = self._extract_epic(story_key)
         settings = get_settings()
 
@@ -1494,28 +1948,26 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
                 model=model,
                 prompt_system_append=injection,
             )
-            stdout = result.get("stdout", "")
-
-            severity = self._parse_highest_severity(stdout)
+            severity = self._subagent_output(result).highest_severity
             error_history.append(severity)
 
             # Exit conditions
             if severity == "ZERO":
-                self.update_sprint_status(story_key, "done")
+                await self.update_sprint_status(story_key, "done")
                 return "done"
 
             if review_attempt >= 3:
                 if self._same_errors_3x(error_history):
-                    self.update_sprint_status(story_key, "blocked")
+                    await self.update_sprint_status(story_key, "blocked")
                     return "blocked"
                 if severity not in ("CRITICAL",):
-                    self.update_sprint_status(story_key, "done")
+                    await self.update_sprint_status(story_key, "done")
                     return "done"
 
             review_attempt += 1
 
         # Hard limit reached
-        self.update_sprint_status(story_key, "blocked")
+        await self.update_sprint_status(story_key, "blocked")
         return "blocked"
 
     async def _execute_batch_commit(self, completed_stories: list[str]) -> None:
@@ -1531,18 +1983,21 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
 {git_status_output}
   </output>
 </git_status>"""
+        git_status_part = "\n" + git_status_xml
 
-        # Build injection with story files for File List extraction
+        # Build injection with story files for File List extraction, packed to
+        # leave room for the git status appended below
         injection = self.build_prompt_system_append(
             command_name="sprint-commit",
             story_keys=completed_stories,
             include_project_context=False,
             include_discovery=False,
             include_tech_spec=False,
+            reserve_bytes=len(git_status_part.encode("utf-8")),
         )
 
         # Append git status to injection
-        full_injection = injection + "\n" + git_status_xml
+        full_injection = injection + git_status_part
 
         # Validate combined injection size
         size_bytes = len(full_injection.encode('utf-8'))
@@ -1577,6 +2032,16 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
     # Helper Methods
     # =========================================================================
 
+    def _subagent_output(self, result: dict) -> SubagentOutput:
+        """Get the scanned output of a spawn_subagent() result.
+
+        Results without a streamed 'output' (e.g. stubs) are scanned from 'stdout'.
+        """
+        output = result.get("output")
+        if output is None:
+            output = SubagentOutput.from_text(result.get("stdout", ""))
+        return output
+
     def _check_for_critical_issues(self, stdout: str) -> bool:
         """Check if output indicates critical issues.
 
@@ -1584,21 +2049,14 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
         - 'HIGHEST SEVERITY: CRITICAL' (used by code-review)
         - '[CRITICAL-ISSUES-FOUND: YES]' (used by story-review, tech-spec-review)
         """
-        return ("HIGHEST SEVERITY: CRITICAL" in stdout or
-                "[CRITICAL-ISSUES-FOUND: YES]" in stdout)
+        # Whole text at hand: C-level substring checks beat the streaming matcher
+        return any(marker in stdout for marker in CRITICAL_MARKERS)
 
     def _parse_highest_severity(self, stdout: str) -> str:
         """Parse highest severity from code-review output."""
-        if "ZERO ISSUES" in stdout:
-            return "ZERO"
-        if "HIGHEST SEVERITY: CRITICAL" in stdout:
-            return "CRITICAL"
-        if "HIGHEST SEVERITY: HIGH" in stdout:
-            return "HIGH"
-        if "HIGHEST SEVERITY: MEDIUM" in stdout:
-            return "MEDIUM"
-        if "HIGHEST SEVERITY: LOW" in stdout:
-            return "LOW"
+        for marker, severity in SEVERITY_MARKERS:
+            if marker in stdout:
+                return severity
         return "UNKNOWN"
 
     def _same_errors_3x(self, history: list[str]) -> bool:
@@ -1609,14 +2067,7 @@ Output the file to: {self.project_root}/_bmad-output/planning-artifacts/project-
 
     def _parse_tech_spec_decisions(self, stdout: str, story_keys: list) -> dict:
         """Parse tech-spec decisions for each story from stdout (CRITICAL #1)."""
-        decisions = re.findall(r'\[TECH-SPEC-DECISION: (REQUIRED|SKIP)\]', stdout, re.IGNORECASE)
-        result = {}
-        for i, story_key in enumerate(story_keys):
-            if i < len(decisions):
-                result[story_key] = decisions[i].upper()
-            else:
-                result[story_key] = "REQUIRED"  # Default
-        return result
+        return SubagentOutput.from_text(stdout).tech_spec_decisions(story_keys)
 
     def _parse_tech_spec_decision(self, stdout: str) -> str:
         """Parse tech-spec decision from output (legacy single-story)."""
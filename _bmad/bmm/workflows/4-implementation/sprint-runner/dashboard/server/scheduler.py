@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Declarative phase graph and scheduler for orchestration cycles.
+
+A cycle is described as phases that declare the artifacts they require and
+provide (e.g. "story-files", "reviewed-tech-spec", "dev:2a-1"). The
+scheduler starts every phase whose requirements are met as soon as they are
+met, concurrently, bounded by named resource slots (e.g. at most
+max_parallel_stories phases in the "dev" slot). A phase with a `when`
+predicate that is false when its turn comes (ready and holding its slot) is
+skipped; its outputs still count as provided, so downstream phases proceed.
+
+After a phase fails no new phase is started, including phases queued for a
+slot. Phases already running are allowed to finish, then the first error is
+raised.
+
+The report records when each phase became ready, started and ended, and
+which phase it waited on last: the last provider of a requirement, or the
+previous holder of its slot if it then queued for one. Walking that chain back from the last phase
+to finish gives the critical path: the phases that determined the cycle's
+wall-clock time.
+
+Usage:
+    from .scheduler import Phase, PhaseGraph, Scheduler
+
+    graph = PhaseGraph([
+        Phase("create-story", create, provides=("story-files",)),
+        Phase("dev:2a-1", dev_a, requires=("story-files",), provides=("dev:2a-1",), slot="dev"),
+        Phase("dev:2a-2", dev_b, requires=("story-files",), provides=("dev:2a-2",), slot="dev"),
+    ])
+    report = await Scheduler(graph, slots={"dev": 2}).run()
+    report.critical_path()    # [PhaseTiming(name="create-story", ...), PhaseTiming(name="dev:2a-2", ...)]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# PhaseTiming.status values
+PHASE_COMPLETED = "completed"
+PHASE_SKIPPED = "skipped"
+PHASE_FAILED = "failed"
+PHASE_NOT_RUN = "not-run"  # Queued for a slot when another phase failed
+
+
+@dataclass
+class Phase:
+    """One unit of work in a cycle."""
+
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    requires: tuple[str, ...] = ()
+    provides: tuple[str, ...] = ()
+    slot: Optional[str] = None  # Resource slot bounding concurrency (None: unbounded)
+    when: Optional[Callable[[], bool]] = None  # Evaluated just before the phase starts
+
+
+@dataclass
+class PhaseTiming:
+    """Schedule of one phase (monotonic seconds)."""
+
+    name: str
+    ready_at: float
+    started_at: Optional[float] = None
+    ended_at: Optional[float] = None
+    status: str = PHASE_COMPLETED
+    blocked_by: Optional[str] = None  # Phase it waited on last (requirement or slot)
+
+    @property
+    def seconds(self) -> float:
+        """Run time (0 for skipped phases)."""
+        if self.started_at is None or self.ended_at is None:
+            return 0.0
+        return self.ended_at - self.started_at
+
+    @property
+    def waited(self) -> float:
+        """Time between becoming ready and starting (slot contention)."""
+        if self.started_at is None:
+            return 0.0
+        return self.started_at - self.ready_at
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary for events and logs."""
+        return {
+            "phase": self.name,
+            "status": self.status,
+            "seconds": round(self.seconds, 3),
+            "waited_seconds": round(self.waited, 3),
+        }
+
+
+@dataclass
+class ScheduleReport:
+    """Timings of one scheduler run."""
+
+    started_at: float
+    ended_at: float = 0.0
+    timings: dict[str, PhaseTiming] = field(default_factory=dict)
+
+    @property
+    def wall_seconds(self) -> float:
+        """Elapsed time of the whole run."""
+        return self.ended_at - self.started_at
+
+    def critical_path(self) -> list[PhaseTiming]:
+        """
+        The chain of phases that determined the wall-clock time, in order.
+
+        Starts from the last phase to finish and follows blocked_by links.
+        Phases that did not run are passed through but not listed.
+        """
+        finished = [t for t in self.timings.values() if t.ended_at is not None]
+        if not finished:
+            return []
+
+        path = []
+        timing: Optional[PhaseTiming] = max(finished, key=lambda t: t.ended_at)  # type: ignore[arg-type, return-value]
+        while timing is not None:
+            if timing.status in (PHASE_COMPLETED, PHASE_FAILED):
+                path.append(timing)
+            timing = self.timings.get(timing.blocked_by) if timing.blocked_by else None
+        path.reverse()
+        return path
+
+
+class PhaseGraph:
+    """Phases of a cycle, linked by the artifacts they require and provide."""
+
+    def __init__(self, phases: Iterable[Phase] = ()):
+        """Initialize with optional phases (see add())."""
+        self.phases: dict[str, Phase] = {}
+        self.providers: dict[str, str] = {}  # Artifact -> phase name
+        for phase in phases:
+            self.add(phase)
+
+    def __len__(self) -> int:
+        return len(self.phases)
+
+    def add(self, phase: Phase) -> Phase:
+        """Add a phase; names and provided artifacts must be unique."""
+        if phase.name in self.phases:
+            raise ValueError(f"Duplicate phase {phase.name!r}")
+        for artifact in phase.provides:
+            if artifact in self.providers:
+                raise ValueError(
+                    f"Artifact {artifact!r} provided by both "
+                    f"{self.providers[artifact]!r} and {phase.name!r}"
+                )
+        self.phases[phase.name] = phase
+        for artifact in phase.provides:
+            self.providers[artifact] = phase.name
+        return phase
+
+    def validate(self) -> None:
+        """Raise ValueError if a requirement has no provider or phases form a cycle."""
+        for phase in self.phases.values():
+            missing = [a for a in phase.requires if a not in self.providers]
+            if missing:
+                raise ValueError(f"Phase {phase.name!r} requires unknown artifact(s): {', '.join(missing)}")
+
+        # Kahn's algorithm over phase -> provider edges
+        remaining = {
+            name: {self.providers[a] for a in phase.requires}
+            for name, phase in self.phases.items()
+        }
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps & remaining.keys()]
+            if not ready:
+                raise ValueError(f"Phase dependency cycle among: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+
+
+class Scheduler:
+    """Runs a PhaseGraph, starting each phase as soon as it is ready."""
+
+    def __init__(self, graph: PhaseGraph, slots: Optional[dict[str, int]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            graph: Phases to run
+            slots: Concurrency limit per slot name; phases in unlisted slots are unbounded
+        """
+        graph.validate()
+        self.graph = graph
+        self._limits = {name: max(1, limit) for name, limit in (slots or {}).items()}
+        self._semaphores = {name: asyncio.Semaphore(limit) for name, limit in self._limits.items()}
+        self._claims = dict.fromkeys(self._limits, 0)  # Phases started per slot, running or queued
+        self.report: Optional[ScheduleReport] = None  # Also set when run() raises
+        self._failed = False
+        self._released: dict[str, tuple[str, float]] = {}  # Slot -> (phase, time) of last release
+
+    async def run(self) -> ScheduleReport:
+        """Run every phase; raise the first phase error after running phases finish."""
+        report = self.report = ScheduleReport(started_at=time.monotonic())
+        provided: dict[str, float] = {}  # Artifact -> time it was provided
+        pending = dict(self.graph.phases)
+        running: dict[asyncio.Task, Phase] = {}
+        error: Optional[BaseException] = None
+
+        try:
+            while True:
+                if error is None:
+                    self._start_ready(pending, provided, running, report)
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    phase = running.pop(task)
+                    timing = report.timings[phase.name]
+                    timing.ended_at = time.monotonic()
+                    exc = task.exception()
+                    if exc is not None:
+                        timing.status = PHASE_FAILED
+                        logger.error(f"Phase {phase.name} failed: {exc!r}")
+                        if error is None:
+                            error = exc
+                        continue
+                    for artifact in phase.provides:
+                        provided[artifact] = timing.ended_at
+        finally:
+            # Cancelled from outside: take running phases down with us
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            report.ended_at = time.monotonic()
+
+        if error is not None:
+            raise error
+        return report
+
+    def _start_ready(
+        self,
+        pending: dict[str, Phase],
+        provided: dict[str, float],
+        running: dict[asyncio.Task, Phase],
+        report: ScheduleReport,
+    ) -> None:
+        """Start every pending phase whose requirements are provided."""
+        for name, phase in list(pending.items()):
+            if not all(artifact in provided for artifact in phase.requires):
+                continue
+            del pending[name]
+
+            timing = report.timings[name] = PhaseTiming(name=name, ready_at=time.monotonic())
+            if phase.requires:
+                last = max(phase.requires, key=lambda a: provided[a])
+                timing.blocked_by = self.graph.providers[last]
+            queued = False
+            if phase.slot in self._limits:
+                queued = self._claims[phase.slot] >= self._limits[phase.slot]
+                self._claims[phase.slot] += 1
+            running[asyncio.create_task(self._run_phase(phase, timing, queued))] = phase
+
+    async def _run_phase(self, phase: Phase, timing: PhaseTiming, queued: bool) -> None:
+        """Run one phase inside its slot, unless skipped or a phase has failed."""
+        semaphore = self._semaphores.get(phase.slot) if phase.slot else None
+        if semaphore is None:
+            await self._start_phase(phase, timing, queued)
+            return
+        async with semaphore:
+            # Waited for the slot past its requirements: the slot's last holder blocked it
+            released = self._released.get(phase.slot)
+            if released is not None and released[1] > timing.ready_at:
+                timing.blocked_by = released[0]
+            try:
+                await self._start_phase(phase, timing, queued)
+            finally:
+                self._released[phase.slot] = (phase.name, time.monotonic())
+                self._claims[phase.slot] -= 1
+
+    async def _start_phase(self, phase: Phase, timing: PhaseTiming, queued: bool) -> None:
+        """Check the phase may still run, then run it."""
+        if queued and self._failed:
+            timing.status = PHASE_NOT_RUN
+        elif phase.when is not None and not phase.when():
+            timing.status = PHASE_SKIPPED
+        else:
+            timing.started_at = time.monotonic()
+            try:
+                await phase.run()
+            except BaseException:
+                # Before the slot is released, so queued phases see it
+                self._failed = True
+                raise
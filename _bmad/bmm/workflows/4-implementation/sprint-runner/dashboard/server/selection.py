@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Story selection strategies for orchestration cycles (Step 1).
+
+Every strategy starts from the same candidate list: stories in
+development_status that are not done or blocked, whose dependencies are
+done, in numeric order. The strategies then differ in which stories join
+the first one in a cycle:
+
+- pair: the first story plus the next one from its epic (the original rule)
+- epic: up to max_stories stories from the first story's epic
+- fair: up to max_stories stories, round-robin across epics, so one long
+  epic cannot starve the others. The selector counts the stories it has
+  selected per epic over the batch. Each cycle is led by the least-served
+  epic with a candidate, and ties go to numeric order
+
+A cycle runs one phase for all its stories, chosen from the first story's
+status, so epic and fair only group stories in the same phase (backlog
+stories go through create-story, everything else goes to dev). Create-story
+prompts carry a single epic id, so a fair create cycle takes its stories
+from the lead epic only; fairness then comes from rotating the lead epic
+across cycles.
+
+Dependencies are optional and read from sprint-status.yaml:
+
+    story_dependencies:
+      2-3-api-endpoints: [2-1-schema, 1-4-auth]
+
+Dependencies on keys missing from development_status are ignored.
+
+Usage:
+    from .selection import get_selector
+
+    selector = get_selector("fair", max_stories=4)   # Keep one per batch
+    story_keys = selector.select(status)   # Parsed sprint-status.yaml
+    selector.select(status, record=False)  # Speculative: leaves fair's counts alone
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter, OrderedDict
+from typing import Any, Iterable
+
+SELECTION_PAIR = "pair"
+SELECTION_EPIC = "epic"
+SELECTION_FAIR = "fair"
+SELECTION_STRATEGIES = (SELECTION_PAIR, SELECTION_EPIC, SELECTION_FAIR)
+
+# Statuses never selected
+FINISHED_STATUSES = frozenset({"done", "blocked"})
+
+# Story keys: digit + optional letter + optional letter-suffix, then dash + story number
+# Examples: "2a-1", "5-sr-3", "2a-1-some-name"
+_EPIC_RE = re.compile(r"^(\d+[a-z]?(?:-[a-z]+)?)-\d+")
+_SORT_RE = re.compile(r"^(\d+)([a-z]?(?:-[a-z]+)?)-(\d+)")
+
+
+def extract_epic(story_key: str) -> str:
+    """
+    Extract epic prefix from story key.
+
+    Examples:
+        "2a-1" -> "2a"
+        "2a-1-first" -> "2a"
+        "3b-2" -> "3b"
+        "5-sr-3" -> "5-sr"
+        "5-sr-3-python-orchestrator" -> "5-sr"
+    """
+    match = _EPIC_RE.match(story_key)
+    if match:
+        return match.group(1)
+    # Fallback: split on last dash
+    parts = story_key.rsplit("-", 1)
+    return parts[0] if len(parts) > 1 else story_key
+
+
+def story_sort_key(key: str) -> tuple:
+    """Sort key for numeric story ordering."""
+    # Patterns: 1-1, 2-3, 2a-1, 3b-2, 5-sr-3
+    match = _SORT_RE.match(key)
+    if match:
+        return (int(match.group(1)), match.group(2) or "", int(match.group(3)))
+    return (999, "", 999)
+
+
+def story_phase(story_status: str) -> str:
+    """The cycle phase a story starts in: 'create' for backlog, else 'dev'."""
+    return "create" if story_status == "backlog" else "dev"
+
+
+def available_stories(status: dict[str, Any]) -> list[str]:
+    """
+    Selectable stories in numeric order.
+
+    Excludes epic-* and *-retrospective entries, done and blocked stories,
+    and stories with a dependency that is not done.
+    """
+    dev_status: dict[str, str] = status.get("development_status") or {}
+    dependencies: dict[str, Any] = status.get("story_dependencies") or {}
+
+    available = []
+    for key, story_status in dev_status.items():
+        if key.startswith("epic-") or key.endswith("-retrospective"):
+            continue
+        if story_status in FINISHED_STATUSES:
+            continue
+        if dependencies and not _dependencies_done(dependencies.get(key), dev_status):
+            continue
+        available.append(key)
+
+    available.sort(key=story_sort_key)
+    return available
+
+
+def _dependencies_done(depends_on: Any, dev_status: dict[str, str]) -> bool:
+    """True if every known dependency is done (a single key or a list of keys)."""
+    if not depends_on:
+        return True
+    if isinstance(depends_on, str):
+        depends_on = [depends_on]
+    return all(dev_status.get(dep, "done") == "done" for dep in depends_on)
+
+
+class StorySelector:
+    """Picks the stories for one cycle; subclasses choose who joins the first story."""
+
+    name = ""
+
+    def __init__(self, max_stories: int = 2):
+        """
+        Initialize the selector.
+
+        Args:
+            max_stories: Most stories selected per cycle
+        """
+        self.max_stories = max(1, max_stories)
+
+    def select(self, status: dict[str, Any], record: bool = True) -> list[str]:
+        """
+        Select the story keys for the next cycle (empty when nothing is left).
+
+        Args:
+            status: Parsed sprint-status.yaml
+            record: Count the selection as served (False for speculative picks)
+        """
+        available = available_stories(status)
+        if not available:
+            return []
+        selected = self.pick(available, status.get("development_status") or {})
+        if record:
+            self.record(selected)
+        return selected
+
+    def pick(self, available: list[str], dev_status: dict[str, str]) -> list[str]:
+        """Choose from the non-empty, ordered candidates."""
+        raise NotImplementedError
+
+    def record(self, selected: list[str]) -> None:
+        """Note a cycle's selection (only stateful strategies use it)."""
+
+    def _same_phase(self, available: list[str], dev_status: dict[str, str]) -> Iterable[str]:
+        """Candidates that can share a cycle with the first one."""
+        phase = story_phase(dev_status.get(available[0], "backlog"))
+        return (key for key in available if story_phase(dev_status.get(key, "backlog")) == phase)
+
+
+class PairSelector(StorySelector):
+    """First available story plus at most one more from the same epic."""
+
+    name = SELECTION_PAIR
+
+    def pick(self, available: list[str], dev_status: dict[str, str]) -> list[str]:
+        first = available[0]
+        if self.max_stories < 2:
+            return [first]
+        first_epic = extract_epic(first)
+        for story in available[1:]:
+            if extract_epic(story) == first_epic:
+                return [first, story]
+        return [first]
+
+
+class EpicSelector(StorySelector):
+    """Up to max_stories stories from the first story's epic."""
+
+    name = SELECTION_EPIC
+
+    def pick(self, available: list[str], dev_status: dict[str, str]) -> list[str]:
+        first_epic = extract_epic(available[0])
+        selected = []
+        for story in self._same_phase(available, dev_status):
+            if extract_epic(story) == first_epic:
+                selected.append(story)
+                if len(selected) == self.max_stories:
+                    break
+        return selected
+
+
+class FairSelector(StorySelector):
+    """Up to max_stories stories taken round-robin across epics, least-served epic first."""
+
+    name = SELECTION_FAIR
+
+    def __init__(self, max_stories: int = 2):
+        super().__init__(max_stories)
+        self.served: Counter[str] = Counter()  # Stories selected per epic this batch
+
+    def record(self, selected: list[str]) -> None:
+        self.served.update(extract_epic(story) for story in selected)
+
+    def pick(self, available: list[str], dev_status: dict[str, str]) -> list[str]:
+        # Least-served epic leads; the sort is stable, so ties keep numeric order
+        by_epic: OrderedDict[str, list[str]] = OrderedDict()
+        for story in available:
+            by_epic.setdefault(extract_epic(story), []).append(story)
+        epics = sorted(by_epic, key=lambda epic: self.served[epic])
+        phase = story_phase(dev_status.get(by_epic[epics[0]][0], "backlog"))
+
+        def in_phase(stories: list[str]) -> list[str]:
+            return [s for s in stories if story_phase(dev_status.get(s, "backlog")) == phase]
+
+        if phase == "create":
+            return in_phase(by_epic[epics[0]])[: self.max_stories]
+
+        # Per-epic queues in lead order
+        queues: OrderedDict[str, list[str]] = OrderedDict()
+        for epic in epics:
+            stories = in_phase(by_epic[epic])
+            if stories:
+                queues[epic] = stories
+
+        selected = []
+        depth = 0
+        while len(selected) < self.max_stories and queues:
+            for epic in list(queues):
+                stories = queues[epic]
+                if depth >= len(stories):
+                    del queues[epic]
+                    continue
+                selected.append(stories[depth])
+                if len(selected) == self.max_stories:
+                    break
+            depth += 1
+        return selected
+
+
+STRATEGIES: dict[str, type[StorySelector]] = {
+    SELECTION_PAIR: PairSelector,
+    SELECTION_EPIC: EpicSelector,
+    SELECTION_FAIR: FairSelector,
+}
+
+
+def get_selector(strategy: str, max_stories: int = 2) -> StorySelector:
+    """Create the selector for a strategy name."""
+    try:
+        return STRATEGIES[strategy](max_stories)
+    except KeyError:
+        raise ValueError(
+            f"Unknown story selection strategy {strategy!r} "
+            f"(expected one of {', '.join(SELECTION_STRATEGIES)})"
+        ) from None
@@ -24,7 +24,6 @@ WebSocket: ws://localhost:8080/ws
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import re
 import sys
@@ -36,9 +35,23 @@ from typing import Any, Optional
 import yaml
 from aiohttp import web, WSMsgType
 
+from . import codec
+from .client_outbox import ClientOutbox, OutboxStats, coalesce_key
+from .event_buffer import RecentEventBuffer
+from .event_bus import BusEvent, event_bus
 from .shared import PROJECT_ROOT, ARTIFACTS_DIR, FRONTEND_DIR
 from .settings import get_settings
 
+# =============================================================================
+# JSON Responses
+# =============================================================================
+
+
+def json_response(data: Any, **kwargs: Any) -> web.Response:
+    """web.json_response() encoded with the fast JSON codec."""
+    return web.json_response(data, dumps=codec.dumps, **kwargs)
+
+
 # =============================================================================
 # WebSocket Connection Management (AC: #2, #5)
 # =============================================================================
@@ -49,21 +62,66 @@ connected_clients: set[web.WebSocketResponse] = set()
 # Lock for thread-safe client set modifications
 _clients_lock = asyncio.Lock()
 
+# Recent normalized events of the current batch, replayed on init
+recent_events = RecentEventBuffer()
+
+# Per-client bounded send queues, and delivery counters summed over clients
+_outboxes: dict[web.WebSocketResponse, ClientOutbox] = {}
+broadcast_stats = OutboxStats()
+
+
+def _open_outbox(ws: web.WebSocketResponse, paused: bool = False) -> ClientOutbox:
+    """Create the send queue for a client using current settings."""
+    settings = get_settings()
+    outbox = ClientOutbox(
+        ws,
+        maxsize=settings.websocket_send_queue_size,
+        policy=settings.websocket_overflow_policy,
+        stats=broadcast_stats,
+        on_close=_on_outbox_closed,
+        paused=paused,
+    )
+    _outboxes[ws] = outbox
+    return outbox
+
 
-async def add_client(ws: web.WebSocketResponse) -> None:
-    """Add a WebSocket client to the tracking set."""
+def _on_outbox_closed(outbox: ClientOutbox) -> None:
+    """Stop tracking a client whose send queue closed (failure or overflow)."""
+    _outboxes.pop(outbox.ws, None)
+    if outbox.ws in connected_clients:
+        connected_clients.discard(outbox.ws)
+        print(f"Removed client after send failure or overflow. Total clients: {len(connected_clients)}")
+
+
+async def add_client(ws: web.WebSocketResponse, paused: bool = False) -> ClientOutbox:
+    """
+    Add a WebSocket client to the tracking set.
+
+    With paused=True, events are queued for the client but not sent until
+    its outbox is resumed (after the init frame).
+    """
     async with _clients_lock:
         connected_clients.add(ws)
+        outbox = _open_outbox(ws, paused=paused)
         print(f"WebSocket client connected. Total clients: {len(connected_clients)}")
+        return outbox
 
 
 async def remove_client(ws: web.WebSocketResponse) -> None:
     """Remove a WebSocket client from the tracking set."""
     async with _clients_lock:
         connected_clients.discard(ws)
+        outbox = _outboxes.pop(ws, None)
+        if outbox is not None:
+            outbox.close()
         print(f"WebSocket client disconnected. Total clients: {len(connected_clients)}")
 
 
+async def flush_clients() -> None:
+    """Wait until every client's queued messages have been sent."""
+    await asyncio.gather(*(outbox.join() for outbox in list(_outboxes.values())))
+
+
 # =============================================================================
 # Event Types and Validation (AC: #3)
 # =============================================================================
@@ -150,6 +208,31 @@ def validate_payload(event_type: str, payload: dict[str, Any]) -> bool:
 # =============================================================================
 
 
+def publish_event(event: BusEvent) -> None:
+    """
+    Deliver an event to all connected WebSocket clients.
+
+    Subscribed to the event bus on startup, so orchestrator events arrive
+    here as structured objects. The frame is encoded once (event.frame) and
+    queued on each client's ClientOutbox; this returns without waiting for
+    any client to receive it, so a slow client never delays the others.
+    Failed connections are removed from the tracking set by their writer
+    task. Every event is also recorded in recent_events, even with no
+    clients connected.
+    """
+    recent_events.append(event.to_dict())
+
+    if not connected_clients:
+        return
+
+    key = coalesce_key(event.type, event.payload)
+    for ws in list(connected_clients):
+        if ws.closed:
+            continue
+        outbox = _outboxes.get(ws) or _open_outbox(ws)
+        outbox.put(event.type, event.frame, key)
+
+
 async def broadcast(event: dict[str, Any]) -> None:
     """
     Broadcast event to all connected WebSocket clients.
@@ -157,56 +240,21 @@ async def broadcast(event: dict[str, Any]) -> None:
     Args:
         event: Event dictionary with 'type' and 'payload' keys
 
-    Events are delivered in parallel to all clients. Failed connections
-    are automatically removed from the tracking set.
+    Adds a timestamp if missing, then delivers via publish_event().
     """
-    if not connected_clients:
-        return
-
     # Add timestamp if not present
     if "timestamp" not in event:
         event["timestamp"] = int(time.time() * 1000)
 
-    message = json.dumps(event)
-
-    # Send to all clients in parallel, collect failures
-    async with _clients_lock:
-        if not connected_clients:
-            return
-
-        clients_snapshot = list(connected_clients)
-
-    tasks = []
-    client_list = []
-
-    for ws in clients_snapshot:
-        if not ws.closed:
-            tasks.append(ws.send_str(message))
-            client_list.append(ws)
-
-    if not tasks:
-        return
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Remove failed connections
-    failed = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            failed.append(client_list[i])
-
-    if failed:
-        async with _clients_lock:
-            for ws in failed:
-                connected_clients.discard(ws)
-        print(f"Removed {len(failed)} failed connections")
+    publish_event(BusEvent.from_dict(event))
 
 
 def emit_event(event_type: str | EventType, payload: dict[str, Any]) -> None:
     """
     Emit WebSocket event to all connected clients.
 
-    This is a synchronous wrapper that schedules the broadcast.
+    Synchronous: the event is queued on every client's send queue before
+    this returns, without creating a task per event.
 
     Args:
         event_type: Event type (string or EventType enum)
@@ -222,16 +270,10 @@ def emit_event(event_type: str | EventType, payload: dict[str, Any]) -> None:
             file=sys.stderr,
         )
 
-    event = {
-        "type": event_type,
-        "payload": payload,
-        "timestamp": int(time.time() * 1000),
-    }
-
     try:
-        asyncio.create_task(broadcast(event))
+        publish_event(BusEvent(event_type, payload))
     except RuntimeError as e:
-        # No event loop running - log for debugging
+        # No event loop running (writer tasks need one) - log for debugging
         print(f"Warning: Event '{event_type}' not sent (no event loop): {e}", file=sys.stderr)
 
 
@@ -264,13 +306,13 @@ def normalize_db_event_to_ws(event: dict[str, Any]) -> dict[str, Any]:
     # Prefer stored payload_json if available (complete reconstruction)
     if event.get("payload_json"):
         try:
-            payload = json.loads(event["payload_json"])
+            payload = codec.loads(event["payload_json"])
             return {
                 "type": event_type,
                 "timestamp": event.get("timestamp", 0),
                 "payload": payload,
             }
-        except json.JSONDecodeError:
+        except codec.DecodeError:
             pass  # Fall through to manual extraction
 
     # Build payload from DB fields based on event type (legacy fallback)
@@ -322,24 +364,30 @@ async def get_initial_state() -> dict[str, Any]:
     Returns:
         Dict with 'batch' (current batch or None) and 'events' (recent events)
 
-    Events are filtered to the current batch if one exists, and normalized
-    to WebSocket event format for frontend consistency.
+    Events are filtered to the current batch if one exists, and served from
+    the recent_events ring buffer. On a miss the buffer is warmed once from
+    the DB tail, normalized to WebSocket event format.
     """
     try:
-        from .db import get_active_batch, get_events_by_batch
-
-        batch = get_active_batch()
+        from . import aiodb
 
-        # Filter events by current batch for relevant initial state
-        if batch:
-            db_events = get_events_by_batch(batch["id"])
-            # Limit to last 50 events, most recent first for display
-            db_events = list(reversed(db_events[-50:]))
-        else:
-            db_events = []
-
-        # Normalize DB events to WebSocket format
-        events = [normalize_db_event_to_ws(e) for e in db_events]
+        batch = await aiodb.get_active_batch()
+        if not batch:
+            return {"batch": batch, "events": []}
+
+        # Apply buffer size changes from the settings API
+        size = get_settings().recent_events_buffer_size
+        if recent_events.maxlen != size:
+            recent_events.resize(size)
+
+        events = recent_events.recent(batch["id"])
+        if events is None:
+            # Not buffered yet (e.g. buffer was cleared) - warm from the DB tail
+            db_events = await aiodb.get_recent_events_by_batch(batch["id"], size)
+            events = [normalize_db_event_to_ws(e) for e in db_events]
+            if not recent_events.seed(batch["id"], reversed(events)):
+                # Live events started buffering during the query and win over the DB tail
+                events = recent_events.recent(batch["id"]) or events
 
         return {"batch": batch, "events": events}
     except ImportError:
@@ -359,8 +407,9 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
     """
     Handle WebSocket connections.
 
-    - Adds client to tracking set on connect
-    - Sends initial state immediately
+    - Adds client to tracking set on connect, with its send queue paused
+    - Sends initial state, then releases events published meanwhile (those
+      already in the init snapshot are not sent again)
     - Handles incoming messages (for future extensions)
     - Removes client from tracking set on disconnect
     """
@@ -368,25 +417,26 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
     ws = web.WebSocketResponse(heartbeat=float(settings.websocket_heartbeat_seconds))
     await ws.prepare(request)
 
-    # Add to tracking set
-    await add_client(ws)
+    # Add to tracking set; events queue up but nothing is sent before init
+    outbox = await add_client(ws, paused=True)
 
     try:
         # Send initial state
         initial_state = await get_initial_state()
-        await ws.send_json({"type": "init", "payload": initial_state})
+        await ws.send_json({"type": "init", "payload": initial_state}, dumps=codec.dumps)
+        outbox.resume(skip=(BusEvent.from_dict(event).frame for event in initial_state["events"]))
 
         # Handle incoming messages
         async for msg in ws:
             if msg.type == WSMsgType.TEXT:
                 # Handle client messages if needed (future extension)
                 try:
-                    data = json.loads(msg.data)
+                    data = codec.loads(msg.data)
                     # Currently no client->server messages defined
                     # Could add: ping, subscribe to specific events, etc.
                     if data.get("type") == "ping":
-                        await ws.send_json({"type": "pong"})
-                except json.JSONDecodeError:
+                        await ws.send_json({"type": "pong"}, dumps=codec.dumps)
+                except codec.DecodeError:
                     pass
             elif msg.type == WSMsgType.ERROR:
                 print(f"WebSocket error: {ws.exception()}", file=sys.stderr)
@@ -447,9 +497,45 @@ async def heartbeat_task() -> None:
             async with _clients_lock:
                 for ws in dead_connections:
                     connected_clients.discard(ws)
+                    outbox = _outboxes.pop(ws, None)
+                    if outbox is not None:
+                        outbox.close()
             print(f"Cleaned up {len(dead_connections)} dead connections")
 
 
+# =============================================================================
+# WAL Checkpoint Task
+# =============================================================================
+
+
+async def checkpoint_task() -> None:
+    """
+    Periodically checkpoint the SQLite write-ahead log.
+
+    Keeps the -wal file from growing without bound during long
+    batch_mode="all" runs. Uses PASSIVE checkpoints, escalating to
+    TRUNCATE once the -wal file passes the size threshold in db.py.
+    """
+    try:
+        from . import aiodb
+    except ImportError:
+        return
+
+    while True:
+        await asyncio.sleep(get_settings().wal_checkpoint_seconds)
+
+        try:
+            result = await aiodb.checkpoint_wal()
+            if result["busy"]:
+                print(
+                    f"WAL checkpoint ({result['mode']}) incomplete: "
+                    f"{result['checkpointed_frames']}/{result['log_frames']} frames",
+                    file=sys.stderr,
+                )
+        except Exception as e:
+            print(f"Warning: WAL checkpoint failed: {e}", file=sys.stderr)
+
+
 # =============================================================================
 # Story Description Scanning
 # =============================================================================
@@ -540,7 +626,7 @@ async def index_handler(request: web.Request) -> web.Response:
 async def story_descriptions_handler(request: web.Request) -> web.Response:
     """Generate and send story descriptions JSON"""
     descriptions = await scan_artifacts()
-    return web.json_response(
+    return json_response(
         descriptions, headers={"Access-Control-Allow-Origin": "*"}
     )
 
@@ -564,8 +650,8 @@ async def orchestrator_start_handler(request: web.Request) -> web.Response:
     global _orchestrator_instance, _orchestrator_task
 
     try:
-        data = await request.json()
-    except json.JSONDecodeError:
+        data = await request.json(loads=codec.loads)
+    except codec.DecodeError:
         return web.Response(status=400, text="Invalid JSON body")
 
     batch_size = data.get("batch_size", 2)
@@ -591,7 +677,7 @@ async def orchestrator_start_handler(request: web.Request) -> web.Response:
         # Start orchestrator in background
         _orchestrator_task = asyncio.create_task(_orchestrator_instance.start())
 
-        return web.json_response(
+        return json_response(
             {"status": "started", "batch_size": batch_size},
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -616,16 +702,16 @@ async def orchestrator_stop_handler(request: web.Request) -> web.Response:
     if not _orchestrator_instance or _orchestrator_instance.state.value == "idle":
         # Check if database has a stale active batch that needs cleanup
         try:
-            from .db import get_active_batch, update_batch
-            batch = get_active_batch()
+            from . import aiodb
+            batch = await aiodb.get_active_batch()
             if batch:
-                update_batch(
+                await aiodb.update_batch(
                     batch_id=batch['id'],
                     status='stopped',
                     ended_at=int(time.time() * 1000)
                 )
                 print(f"Cleaned up stale batch {batch['id']} via stop handler")
-                return web.json_response(
+                return json_response(
                     {"status": "cleaned", "batch_id": batch['id']},
                     headers={"Access-Control-Allow-Origin": "*"},
                 )
@@ -636,7 +722,7 @@ async def orchestrator_stop_handler(request: web.Request) -> web.Response:
 
     try:
         await _orchestrator_instance.stop()
-        return web.json_response(
+        return json_response(
             {"status": "stopping"},
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -644,6 +730,29 @@ async def orchestrator_stop_handler(request: web.Request) -> web.Response:
         return web.Response(status=500, text=f"Failed to stop orchestrator: {e}")
 
 
+async def websocket_stats_handler(request: web.Request) -> web.Response:
+    """
+    Get WebSocket delivery counters.
+
+    GET /api/websocket/stats
+
+    Returns totals over all clients since server start (sent, dropped,
+    coalesced, delayed, disconnected) and each live client's queue depth.
+    """
+    return json_response(
+        {
+            "clients": len(connected_clients),
+            "overflow_policy": get_settings().websocket_overflow_policy,
+            "totals": broadcast_stats.to_dict(),
+            "queues": [
+                {"pending": outbox.pending_count, **outbox.stats.to_dict()}
+                for outbox in list(_outboxes.values())
+            ],
+        },
+        headers={"Access-Control-Allow-Origin": "*"},
+    )
+
+
 async def orchestrator_status_handler(request: web.Request) -> web.Response:
     """
     Get current orchestrator status.
@@ -653,7 +762,7 @@ async def orchestrator_status_handler(request: web.Request) -> web.Response:
     global _orchestrator_instance
 
     if not _orchestrator_instance:
-        return web.json_response(
+        return json_response(
             {
                 "status": "idle",
                 "batch_id": None,
@@ -663,7 +772,7 @@ async def orchestrator_status_handler(request: web.Request) -> web.Response:
             headers={"Access-Control-Allow-Origin": "*"},
         )
 
-    return web.json_response(
+    return json_response(
         {
             "status": _orchestrator_instance.state.value,
             "batch_id": _orchestrator_instance.current_batch_id,
@@ -686,7 +795,7 @@ async def sprint_status_handler(request: web.Request) -> web.Response:
     try:
         status_path = ARTIFACTS_DIR / "sprint-status.yaml"
         if not status_path.exists():
-            return web.json_response(
+            return json_response(
                 {"error": "sprint-status.yaml not found"},
                 status=404,
                 headers={"Access-Control-Allow-Origin": "*"},
@@ -702,7 +811,7 @@ async def sprint_status_handler(request: web.Request) -> web.Response:
             raise TypeError(f"Type {type(obj)} not serializable")
 
         return web.Response(
-            text=json.dumps(data, default=json_serial),
+            text=codec.dumps(data, default=json_serial),
             content_type="application/json",
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -721,7 +830,7 @@ async def orchestrator_activity_handler(request: web.Request) -> web.Response:
     try:
         activity_path = ARTIFACTS_DIR / "orchestrator.md"
         if not activity_path.exists():
-            return web.json_response(
+            return json_response(
                 {"activities": [], "raw": ""},
                 headers={"Access-Control-Allow-Origin": "*"},
             )
@@ -736,7 +845,7 @@ async def orchestrator_activity_handler(request: web.Request) -> web.Response:
             if line.strip() and not line.startswith('#'):
                 activities.append(line.strip())
 
-        return web.json_response(
+        return json_response(
             {"activities": activities, "raw": content},
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -772,49 +881,16 @@ async def batches_list_handler(request: web.Request) -> web.Response:
         offset = 0
 
     try:
-        from .db import get_connection
-
-        with get_connection() as conn:
-            # Get total count
-            cursor = conn.execute("SELECT COUNT(*) FROM batches")
-            total = cursor.fetchone()[0]
-
-            # Get batches with pagination (newest first)
-            cursor = conn.execute(
-                """
-                SELECT
-                    b.id,
-                    b.started_at,
-                    b.ended_at,
-                    b.max_cycles,
-                    b.cycles_completed,
-                    b.status,
-                    (SELECT COUNT(*) FROM stories WHERE batch_id = b.id) as story_count
-                FROM batches b
-                ORDER BY b.id DESC
-                LIMIT ? OFFSET ?
-                """,
-                (limit, offset)
-            )
-            rows = cursor.fetchall()
-
-            batches = []
-            for row in rows:
-                batch = dict(row)
-                # Calculate duration if ended
-                if batch["ended_at"] and batch["started_at"]:
-                    duration_ms = batch["ended_at"] - batch["started_at"]
-                    batch["duration_seconds"] = duration_ms / 1000
-                else:
-                    batch["duration_seconds"] = None
-                batches.append(batch)
-
-        return web.json_response(
-            {"batches": batches, "total": total},
+        from . import aiodb
+
+        result = await aiodb.list_batches(limit, offset)
+
+        return json_response(
+            {"batches": result["batches"], "total": result["total"]},
             headers={"Access-Control-Allow-Origin": "*"},
         )
     except ImportError:
-        return web.json_response(
+        return json_response(
             {"batches": [], "total": 0, "error": "Database module not available"},
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -840,19 +916,19 @@ async def batch_detail_handler(request: web.Request) -> web.Response:
         return web.Response(status=400, text="Invalid batch ID")
 
     try:
-        from .db import get_batch, get_stories_by_batch, get_commands_by_story, get_events_by_batch
+        from . import aiodb
 
-        batch = get_batch(batch_id)
-        if not batch:
+        # Batch, stories and commands in one round trip (no per-story queries)
+        tree = await aiodb.get_batch_tree(batch_id)
+        if not tree:
             return web.Response(status=404, text="Batch not found")
 
-        # Get stories for this batch
-        stories_raw = get_stories_by_batch(batch_id)
+        batch = tree["batch"]
         stories = []
         total_commands = 0
 
-        for story in stories_raw:
-            commands = get_commands_by_story(story["id"])
+        for story in tree["stories"]:
+            commands = story["commands"]
             total_commands += len(commands)
 
             # Calculate story duration
@@ -898,7 +974,7 @@ async def batch_detail_handler(request: web.Request) -> web.Response:
             "stories_in_progress": sum(1 for s in stories if s["status"] == "in-progress"),
         }
 
-        return web.json_response(
+        return json_response(
             {"batch": batch, "stories": stories, "stats": stats},
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -994,13 +1070,13 @@ async def serve_file_handler(request: web.Request) -> web.Response:
 # =============================================================================
 
 
-def cleanup_stale_batches() -> None:
+async def cleanup_stale_batches() -> None:
     """Mark any 'running' batches as 'stopped' on server start."""
     try:
-        from .db import get_active_batch, update_batch
-        batch = get_active_batch()
+        from . import aiodb
+        batch = await aiodb.get_active_batch()
         if batch:
-            update_batch(
+            await aiodb.update_batch(
                 batch_id=batch['id'],
                 status='stopped',
                 ended_at=int(time.time() * 1000)
@@ -1013,15 +1089,26 @@ def cleanup_stale_batches() -> None:
 async def on_startup(app: web.Application) -> None:
     """Called on application startup."""
     # Clean up stale batches from previous server sessions
-    cleanup_stale_batches()
+    await cleanup_stale_batches()
+
+    # Deliver orchestrator events published on the in-process event bus
+    app["event_bus_unsubscribe"] = event_bus.subscribe(publish_event)
 
     # Start heartbeat task
     app["heartbeat_task"] = asyncio.create_task(heartbeat_task())
     print("Started heartbeat task")
 
+    # Start WAL checkpoint task
+    app["checkpoint_task"] = asyncio.create_task(checkpoint_task())
+    print("Started WAL checkpoint task")
+
 
 async def on_cleanup(app: web.Application) -> None:
     """Called on application cleanup."""
+    # Stop receiving event bus events
+    if "event_bus_unsubscribe" in app:
+        app["event_bus_unsubscribe"]()
+
     # Cancel heartbeat task
     if "heartbeat_task" in app:
         app["heartbeat_task"].cancel()
@@ -1031,6 +1118,15 @@ async def on_cleanup(app: web.Application) -> None:
             pass
         print("Stopped heartbeat task")
 
+    # Cancel WAL checkpoint task
+    if "checkpoint_task" in app:
+        app["checkpoint_task"].cancel()
+        try:
+            await app["checkpoint_task"]
+        except asyncio.CancelledError:
+            pass
+        print("Stopped WAL checkpoint task")
+
     # Close all WebSocket connections
     async with _clients_lock:
         for ws in list(connected_clients):
@@ -1041,6 +1137,14 @@ async def on_cleanup(app: web.Application) -> None:
         connected_clients.clear()
     print("Closed all WebSocket connections")
 
+    # Drain database threads and close pooled connections
+    try:
+        from . import aiodb
+        await aiodb.shutdown()
+        print("Closed database connections")
+    except ImportError:
+        pass
+
 
 async def cors_preflight_handler(request: web.Request) -> web.Response:
     """Handle CORS preflight requests for API endpoints."""
@@ -1063,7 +1167,7 @@ async def settings_get_handler(request: web.Request) -> web.Response:
     """GET /api/settings - Retrieve all settings."""
     from .settings import get_settings
     settings = get_settings()
-    return web.json_response(
+    return json_response(
         settings.to_dict(),
         headers={"Access-Control-Allow-Origin": "*"},
     )
@@ -1073,9 +1177,9 @@ async def settings_update_handler(request: web.Request) -> web.Response:
     """PUT /api/settings - Update settings."""
     from .settings import update_settings
     try:
-        data = await request.json()
+        data = await request.json(loads=codec.loads)
         settings = update_settings(**data)
-        return web.json_response(
+        return json_response(
             settings.to_dict(),
             headers={"Access-Control-Allow-Origin": "*"},
         )
@@ -1085,7 +1189,7 @@ async def settings_update_handler(request: web.Request) -> web.Response:
             text=str(e),
             headers={"Access-Control-Allow-Origin": "*"},
         )
-    except json.JSONDecodeError:
+    except codec.DecodeError:
         return web.Response(
             status=400,
             text="Invalid JSON",
@@ -1099,6 +1203,7 @@ def create_app() -> web.Application:
 
     # Add routes
     app.router.add_get("/ws", websocket_handler)
+    app.router.add_get("/api/websocket/stats", websocket_stats_handler)
     app.router.add_get("/", index_handler)
     app.router.add_get("/story-descriptions.json", story_descriptions_handler)
 
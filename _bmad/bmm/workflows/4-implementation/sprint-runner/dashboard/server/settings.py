@@ -9,10 +9,13 @@ API endpoints allow runtime modification.
 from __future__ import annotations
 import json
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Any, Optional
 
+from .client_outbox import OVERFLOW_POLICIES
+from .selection import SELECTION_STRATEGIES
+
 # Settings file location (same directory as this module)
 SETTINGS_FILE = Path(__file__).parent / "settings.json"
 
@@ -27,14 +30,41 @@ class Settings:
     project_context_max_age_hours: int = 24
     injection_warning_kb: int = 100
     injection_error_kb: int = 150
+    injection_cache_entries: int = 32
+    injection_cache_files: int = 256
+    # The file flag is unverified against the claude CLI, so the file transport is opt-in
+    injection_file_transport: bool = False
+    injection_inline_max_kb: int = 120
+    injection_token_budget: int = 0
     default_max_cycles: int = 2
     max_code_review_attempts: int = 10
     haiku_after_review: int = 2
+    max_parallel_stories: int = 1
+    max_stories_per_cycle: int = 2
+    story_selection_strategy: str = "pair"
+    pipeline_cycles: bool = False
+    subagent_output_buffer_kb: int = 1024
+    subagent_stderr_buffer_kb: int = 64
+    # Time limits are opt-in: a long dev-story or a quiet tool call must not be killed by default
+    subagent_timeout_seconds: int = 0
+    subagent_timeout_overrides: dict[str, int] = field(default_factory=dict)
+    subagent_idle_timeout_seconds: int = 0
+    subagent_kill_grace_seconds: int = 10
+    subagent_memory_limit_mb: int = 0
+    subagent_cpu_limit_seconds: int = 0
+    warm_pool_size: int = 0
+    warm_pool_max_age_seconds: int = 300
+    warm_pool_max_variants: int = 4
+    claude_command: str = "claude"
 
     # From server.py
     server_port: int = 8080
     websocket_heartbeat_seconds: int = 30
     default_batch_list_limit: int = 20
+    wal_checkpoint_seconds: int = 60
+    recent_events_buffer_size: int = 50
+    websocket_send_queue_size: int = 1000
+    websocket_overflow_policy: str = "drop-oldest"
 
     def to_dict(self) -> dict[str, Any]:
         """Convert settings to dictionary."""
@@ -58,7 +88,7 @@ def _load_settings() -> Settings:
         try:
             with open(SETTINGS_FILE, 'r') as f:
                 data = json.load(f)
-            return Settings.from_dict(data)
+            return Settings.from_dict(_drop_invalid(data))
         except json.JSONDecodeError as e:
             logger.warning(
                 f"Corrupt settings.json detected: {e}. Using defaults. "
@@ -83,13 +113,34 @@ def get_settings() -> Settings:
     return _settings
 
 
+def _drop_invalid(data: dict[str, Any]) -> dict[str, Any]:
+    """Remove values that fail validation (hand-edited settings.json) so defaults apply."""
+    valid = {}
+    for key, value in data.items():
+        try:
+            _validate_setting(key, value)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid value in settings.json, using default: {e}")
+            continue
+        valid[key] = value
+    return valid
+
+
 def _validate_setting(key: str, value: Any) -> None:
     """Validate setting value type and range."""
     # Type validation
     int_fields = {
         'project_context_max_age_hours', 'injection_warning_kb', 'injection_error_kb',
+        'injection_cache_entries', 'injection_cache_files', 'injection_inline_max_kb',
+        'injection_token_budget',
         'default_max_cycles', 'max_code_review_attempts', 'haiku_after_review',
-        'server_port', 'websocket_heartbeat_seconds', 'default_batch_list_limit'
+        'max_parallel_stories', 'max_stories_per_cycle',
+        'subagent_output_buffer_kb', 'subagent_stderr_buffer_kb', 'subagent_timeout_seconds',
+        'subagent_idle_timeout_seconds', 'subagent_kill_grace_seconds',
+        'subagent_memory_limit_mb', 'subagent_cpu_limit_seconds',
+        'warm_pool_size', 'warm_pool_max_age_seconds', 'warm_pool_max_variants',
+        'server_port', 'websocket_heartbeat_seconds', 'default_batch_list_limit',
+        'wal_checkpoint_seconds', 'recent_events_buffer_size', 'websocket_send_queue_size',
     }
 
     if key in int_fields:
@@ -107,6 +158,54 @@ def _validate_setting(key: str, value: Any) -> None:
             raise ValueError(f"Setting 'injection_warning_kb' must be at least 1")
         if key == 'injection_error_kb' and value < 1:
             raise ValueError(f"Setting 'injection_error_kb' must be at least 1")
+        if key == 'injection_inline_max_kb' and value >= 128:
+            raise ValueError(f"Setting 'injection_inline_max_kb' must be below 128 (Linux argument limit)")
+        if key == 'injection_cache_entries' and value < 1:
+            raise ValueError(f"Setting 'injection_cache_entries' must be at least 1")
+        if key == 'injection_cache_files' and value < 1:
+            raise ValueError(f"Setting 'injection_cache_files' must be at least 1")
+        if key == 'max_parallel_stories' and value < 1:
+            raise ValueError(f"Setting 'max_parallel_stories' must be at least 1")
+        if key == 'max_stories_per_cycle' and value < 1:
+            raise ValueError(f"Setting 'max_stories_per_cycle' must be at least 1")
+        if key == 'subagent_output_buffer_kb' and value < 1:
+            raise ValueError(f"Setting 'subagent_output_buffer_kb' must be at least 1")
+        if key == 'subagent_stderr_buffer_kb' and value < 1:
+            raise ValueError(f"Setting 'subagent_stderr_buffer_kb' must be at least 1")
+        if key == 'warm_pool_max_variants' and value < 1:
+            raise ValueError(f"Setting 'warm_pool_max_variants' must be at least 1")
+        if key == 'wal_checkpoint_seconds' and value < 1:
+            raise ValueError(f"Setting 'wal_checkpoint_seconds' must be at least 1")
+        if key == 'recent_events_buffer_size' and value < 1:
+            raise ValueError(f"Setting 'recent_events_buffer_size' must be at least 1")
+        if key == 'websocket_send_queue_size' and value < 1:
+            raise ValueError(f"Setting 'websocket_send_queue_size' must be at least 1")
+
+    if key in ('pipeline_cycles', 'injection_file_transport') and not isinstance(value, bool):
+        raise ValueError(f"Setting '{key}' must be a boolean, got {type(value).__name__}")
+
+    if key == 'subagent_timeout_overrides':
+        if not isinstance(value, dict):
+            raise ValueError(f"Setting '{key}' must be an object, got {type(value).__name__}")
+        for command, seconds in value.items():
+            if not isinstance(seconds, int) or seconds < 0:
+                raise ValueError(
+                    f"Setting '{key}' must map command names to non-negative integers, "
+                    f"got {command!r}: {seconds!r}"
+                )
+
+    if key == 'claude_command' and (not isinstance(value, str) or not value.strip()):
+        raise ValueError(f"Setting '{key}' must be a non-empty command line, got {value!r}")
+
+    if key == 'story_selection_strategy' and value not in SELECTION_STRATEGIES:
+        raise ValueError(
+            f"Setting 'story_selection_strategy' must be one of {', '.join(SELECTION_STRATEGIES)}, got {value!r}"
+        )
+
+    if key == 'websocket_overflow_policy' and value not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"Setting 'websocket_overflow_policy' must be one of {', '.join(OVERFLOW_POLICIES)}, got {value!r}"
+        )
 
 
 def update_settings(**kwargs: Any) -> Settings:
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Incremental consumers for subagent stream-json output.
+
+spawn_subagent() feeds every parsed event to a SubagentOutput instead of
+keeping the event list and concatenating the full assistant text. Marker
+scanners (critical issues, review severity, tech-spec decisions) see all of
+the text as it streams past, in one Aho-Corasick pass per text block, while
+the text itself is kept in a bounded ChunkedTextBuffer holding only the most
+recent output. Memory per subagent stays flat however long the run is.
+
+Callers can react while the subagent is still running by passing a
+MarkerScanner with an on_match callback to spawn_subagent(consumers=...).
+
+Usage:
+    from .stream_consumers import SubagentOutput
+
+    output = SubagentOutput(max_text_chars=1024 * 1024)
+    async for event in stream:
+        output.feed_event(event)
+
+    output.highest_severity             # "ZERO", "CRITICAL", ..., "UNKNOWN"
+    output.has_critical_issues
+    output.tech_spec_decisions(["2a-1", "2a-2"])
+    output.stdout                       # Most recent assistant text (bounded)
+
+    early = MarkerScanner(CRITICAL_MARKERS, on_match=lambda marker: ...)
+    await orchestrator.spawn_subagent(prompt, name, consumers=[early])
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .marker_matcher import MarkerMatcher
+
+logger = logging.getLogger(__name__)
+
+# Default cap for retained assistant text, in characters
+DEFAULT_MAX_TEXT_CHARS = 1024 * 1024
+
+# Review markers, in severity precedence order (first seen wins)
+SEVERITY_MARKERS = (
+    ("ZERO ISSUES", "ZERO"),
+    ("HIGHEST SEVERITY: CRITICAL", "CRITICAL"),
+    ("HIGHEST SEVERITY: HIGH", "HIGH"),
+    ("HIGHEST SEVERITY: MEDIUM", "MEDIUM"),
+    ("HIGHEST SEVERITY: LOW", "LOW"),
+)
+
+# Critical-issue markers: code-review, and story-review / tech-spec-review
+CRITICAL_MARKERS = ("HIGHEST SEVERITY: CRITICAL", "[CRITICAL-ISSUES-FOUND: YES]")
+
+# One decision per story, in story order, any case (CRITICAL #1)
+TECH_SPEC_DECISION_MARKERS = {
+    "[TECH-SPEC-DECISION: REQUIRED]": "REQUIRED",
+    "[TECH-SPEC-DECISION: SKIP]": "SKIP",
+}
+
+# Every marker SubagentOutput scans for
+ALL_MARKERS = (
+    tuple(marker for marker, _ in SEVERITY_MARKERS)
+    + CRITICAL_MARKERS
+    + tuple(TECH_SPEC_DECISION_MARKERS)
+)
+
+
+def assistant_text(event: dict[str, Any]) -> Iterator[str]:
+    """Yield the text blocks of an assistant stream-json event."""
+    if event.get("type") != "assistant":
+        return
+    for block in event.get("message", {}).get("content", []):
+        if block.get("type") == "text":
+            yield block.get("text", "")
+
+
+class StreamConsumer:
+    """Base class for incremental consumers of subagent output."""
+
+    def feed_event(self, event: dict[str, Any]) -> None:
+        """Consume one parsed stream-json event (default: its assistant text)."""
+        for text in assistant_text(event):
+            self.feed(text)
+
+    def feed(self, text: str) -> None:
+        """Consume the next piece of assistant text."""
+        raise NotImplementedError
+
+
+# =============================================================================
+# Text Buffer
+# =============================================================================
+
+
+class ChunkedTextBuffer(StreamConsumer):
+    """Keeps the most recent max_chars of text as a list of chunks (no concatenation)."""
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_TEXT_CHARS):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_chars: Characters retained; older text is dropped
+        """
+        self.max_chars = max_chars
+        self.dropped_chars = 0
+        self._chunks: deque[str] = deque()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def feed(self, text: str) -> None:
+        """Append text, dropping the oldest text beyond max_chars."""
+        if not text:
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+
+        while self._size > self.max_chars:
+            excess = self._size - self.max_chars
+            head = self._chunks[0]
+            if len(head) <= excess:
+                self._chunks.popleft()
+                self._size -= len(head)
+                self.dropped_chars += len(head)
+            else:
+                self._chunks[0] = head[excess:]
+                self._size -= excess
+                self.dropped_chars += excess
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any text has been dropped."""
+        return self.dropped_chars > 0
+
+    def getvalue(self) -> str:
+        """The retained text."""
+        return "".join(self._chunks)
+
+
+# =============================================================================
+# Scanners
+# =============================================================================
+
+
+class MarkerScanner(StreamConsumer):
+    """Records markers in the order they appear, even when split across pieces."""
+
+    def __init__(
+        self,
+        markers: Iterable[str],
+        on_match: Optional[Callable[[str], None]] = None,
+        ignore_case: Iterable[str] = (),
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            markers: Substrings to look for
+            on_match: Called with each marker as soon as it is found
+            ignore_case: Markers matched regardless of ASCII case
+        """
+        self.matcher = MarkerMatcher(markers, ignore_case)
+        self.on_match = on_match
+        self.matches: list[str] = []
+        self.seen: set[str] = set()
+        # Errors raised by on_match; recorded, never propagated into the stream loop
+        self.errors: list[Exception] = []
+
+    def feed(self, text: str) -> None:
+        """Scan the next piece of text."""
+        for marker in self.matcher.feed(text):
+            self.matches.append(marker)
+            self.seen.add(marker)
+            if self.on_match is not None:
+                try:
+                    self.on_match(marker)
+                except Exception as e:
+                    self.errors.append(e)
+                    logger.warning(f"Marker callback for {marker!r} failed: {e!r}")
+
+
+# =============================================================================
+# Subagent Output
+# =============================================================================
+
+
+class SubagentOutput(StreamConsumer):
+    """Everything the orchestrator needs from one subagent run, gathered incrementally."""
+
+    def __init__(
+        self,
+        max_text_chars: int = DEFAULT_MAX_TEXT_CHARS,
+        consumers: Optional[Iterable[StreamConsumer]] = None,
+    ):
+        """
+        Initialize with the standard scanners.
+
+        Args:
+            max_text_chars: Cap for the retained assistant text
+            consumers: Extra consumers fed with every event
+        """
+        self.text = ChunkedTextBuffer(max_text_chars)
+        self.markers = MarkerScanner(ALL_MARKERS, ignore_case=TECH_SPEC_DECISION_MARKERS)
+        self.consumers: list[StreamConsumer] = list(consumers or [])
+
+    @classmethod
+    def from_text(cls, text: str) -> "SubagentOutput":
+        """Scan complete output text in one piece."""
+        output = cls(max_text_chars=max(len(text), 1))
+        output.feed(text)
+        return output
+
+    def feed_event(self, event: dict[str, Any]) -> None:
+        """Consume one parsed stream-json event."""
+        super().feed_event(event)
+        for consumer in self.consumers:
+            consumer.feed_event(event)
+
+    def feed(self, text: str) -> None:
+        """Consume the next piece of assistant text."""
+        self.text.feed(text)
+        self.markers.feed(text)
+
+    @property
+    def stdout(self) -> str:
+        """The retained (most recent) assistant text."""
+        return self.text.getvalue()
+
+    @property
+    def has_critical_issues(self) -> bool:
+        """Whether a review reported critical issues."""
+        return any(marker in self.markers.seen for marker in CRITICAL_MARKERS)
+
+    @property
+    def highest_severity(self) -> str:
+        """Highest code-review severity, or "UNKNOWN" if none was reported."""
+        for marker, severity in SEVERITY_MARKERS:
+            if marker in self.markers.seen:
+                return severity
+        return "UNKNOWN"
+
+    def tech_spec_decisions(self, story_keys: list[str]) -> dict[str, str]:
+        """Map story keys to tech-spec decisions in output order (default REQUIRED)."""
+        decisions = [
+            TECH_SPEC_DECISION_MARKERS[marker]
+            for marker in self.markers.matches
+            if marker in TECH_SPEC_DECISION_MARKERS
+        ]
+        return {
+            story_key: decisions[i] if i < len(decisions) else "REQUIRED"
+            for i, story_key in enumerate(story_keys)
+        }
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the aiodb async database facade.
+
+Run with: cd dashboard && pytest -v server/test_aiodb.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server import aiodb
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Create a temporary database for testing."""
+    from server import db
+
+    with patch.object(db, 'DB_PATH', tmp_path / 'test-sprint-runner.db'):
+        db.init_db()
+        yield db
+
+
+# =============================================================================
+# Test: Awaitable API
+# =============================================================================
+
+
+class TestAwaitableApi:
+    @pytest.mark.asyncio
+    async def test_write_then_read_round_trip(self, temp_db):
+        """Awaitable writes should be visible to awaitable reads."""
+        batch_id = await aiodb.create_batch(max_cycles=2)
+        story_id = await aiodb.create_story(batch_id, "2a-1", "2a")
+
+        batch = await aiodb.get_batch(batch_id)
+        stories = await aiodb.get_stories_by_batch(batch_id)
+
+        assert batch["max_cycles"] == 2
+        assert stories[0]["id"] == story_id
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self, temp_db):
+        """Exceptions raised in db functions should surface to the awaiter."""
+        with pytest.raises(ValueError, match="Invalid fields"):
+            await aiodb.update_batch(1, bogus=1)
+
+    def test_every_public_db_function_is_wrapped(self):
+        """Each public db operation should have an awaitable counterpart."""
+        from server import db
+
+        skipped = {'get_connection', 'close_connections'}
+        public = {
+            name for name, value in vars(db).items()
+            if callable(value) and not name.startswith('_')
+            and getattr(value, '__module__', None) == db.__name__
+            and name not in skipped
+        }
+        missing = {name for name in public if not asyncio.iscoroutinefunction(getattr(aiodb, name, None))}
+
+        assert missing == set()
+
+    @pytest.mark.asyncio
+    async def test_patched_db_function_is_honoured(self):
+        """Wrappers should resolve db.<name> at call time."""
+        with patch('server.db.get_active_batch', return_value={"id": 7}):
+            assert await aiodb.get_active_batch() == {"id": 7}
+
+
+# =============================================================================
+# Test: Threading
+# =============================================================================
+
+
+class TestThreading:
+    @pytest.mark.asyncio
+    async def test_calls_run_off_the_event_loop_thread(self):
+        """Reads and writes should not run on the loop's thread."""
+        loop_thread = threading.current_thread().name
+
+        read_thread = await aiodb.run_read(lambda: threading.current_thread().name)
+        write_thread = await aiodb.run_write(lambda: threading.current_thread().name)
+
+        assert read_thread != loop_thread
+        assert read_thread.startswith("db-reader")
+        assert write_thread.startswith("db-writer")
+
+    @pytest.mark.asyncio
+    async def test_writes_are_serialized_on_one_thread(self):
+        """All writes should run on the single writer thread."""
+        names = await asyncio.gather(*[
+            aiodb.run_write(lambda: threading.current_thread().name)
+            for _ in range(20)
+        ])
+
+        assert len(set(names)) == 1
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive_during_slow_query(self):
+        """A slow query should not block other coroutines."""
+        import time
+
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(aiodb.run_read(time.sleep, 0.1), ticker())
+
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.1
+
+    @pytest.mark.asyncio
+    async def test_shutdown_then_reuse(self, temp_db):
+        """shutdown() should drain executors; later calls recreate them."""
+        batch_id = await aiodb.create_batch(max_cycles=1)
+
+        await aiodb.shutdown()
+        await aiodb.shutdown()
+
+        assert (await aiodb.get_batch(batch_id))["id"] == batch_id
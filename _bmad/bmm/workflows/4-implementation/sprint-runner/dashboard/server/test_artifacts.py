@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the implementation-artifacts index.
+
+Run with: cd dashboard && pytest -v server/test_artifacts.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.artifacts import (
+    KIND_DISCOVERY,
+    KIND_STORY,
+    KIND_TECH_SPEC,
+    ArtifactIndex,
+    classify,
+)
+
+
+def settle(directory: Path) -> None:
+    """Backdate the directory mtime so the next scan is not provisional."""
+    old = time.time() - 60
+    os.utime(directory, (old, old))
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    """An artifacts directory with files for stories 2a-1 and 2a-2."""
+    for name in (
+        "sprint-2a-1-story.md",
+        "sprint-2A-1-discovery-story.md",
+        "sprint-2a-1-tech-spec.md",
+        "sprint-2a-2-story.md",
+        "sprint-status.yaml",
+    ):
+        (tmp_path / name).write_text(name)
+    (tmp_path / "2a-1-notes").mkdir()
+    settle(tmp_path)
+    return tmp_path
+
+
+# =============================================================================
+# Test: Classification
+# =============================================================================
+
+
+class TestClassify:
+    @pytest.mark.parametrize("name, kind", [
+        ("sprint-2a-1-story.md", KIND_STORY),
+        ("sprint-2a-1-Discovery-story.md", KIND_DISCOVERY),
+        ("sprint-2a-1-tech-spec.md", KIND_TECH_SPEC),
+        ("tech-spec-discovery-2a-1.md", KIND_DISCOVERY),
+    ])
+    def test_kind_from_name(self, name, kind):
+        """Discovery wins over tech-spec; anything else is a story file."""
+        assert classify(name) == kind
+
+
+# =============================================================================
+# Test: ArtifactIndex
+# =============================================================================
+
+
+class TestArtifactIndex:
+    def test_lookup_groups_by_kind(self, artifacts):
+        """Matching is a case-insensitive substring; directories are skipped."""
+        found = ArtifactIndex(artifacts).lookup(["2a-1"])
+
+        assert [p.name for p in found.story] == ["sprint-2a-1-story.md"]
+        assert [p.name for p in found.discovery] == ["sprint-2A-1-discovery-story.md"]
+        assert [p.name for p in found.tech_spec] == ["sprint-2a-1-tech-spec.md"]
+
+    def test_multiple_keys_deduplicated_and_sorted(self, artifacts):
+        """Files matched by several keys appear once, sorted by lowercase name."""
+        found = ArtifactIndex(artifacts).lookup(["2a-2", "2a", "2a-1"])
+
+        assert [p.name for p in found.all()] == [
+            "sprint-2A-1-discovery-story.md",
+            "sprint-2a-1-story.md",
+            "sprint-2a-1-tech-spec.md",
+            "sprint-2a-2-story.md",
+        ]
+        assert len(found.story) == 2
+
+    def test_repeated_lookups_scan_once(self, artifacts):
+        """An unchanged directory is listed only once."""
+        index = ArtifactIndex(artifacts)
+        for _ in range(5):
+            index.lookup(["2a-1", "2a-2"])
+
+        assert index.scans == 1
+
+    def test_added_and_removed_files_are_seen(self, artifacts):
+        """Creating or deleting a file changes the directory mtime and triggers a rescan."""
+        index = ArtifactIndex(artifacts)
+        assert len(index.lookup(["2a-3"]).all()) == 0
+
+        (artifacts / "sprint-2a-3-story.md").write_text("new")
+        assert [p.name for p in index.lookup(["2a-3"]).story] == ["sprint-2a-3-story.md"]
+
+        (artifacts / "sprint-2a-3-story.md").unlink()
+        assert index.lookup(["2a-3"]).all() == []
+
+    def test_recent_scan_is_provisional(self, tmp_path):
+        """A scan right after a change is repeated, in case a same-tick change was missed."""
+        (tmp_path / "sprint-1-1-story.md").write_text("x")
+        index = ArtifactIndex(tmp_path)
+
+        index.lookup(["1-1"])
+        index.lookup(["1-1"])
+
+        assert index.scans == 2
+
+    def test_invalidate_forces_rescan(self, artifacts):
+        """invalidate() rescans even if the directory mtime looks unchanged."""
+        index = ArtifactIndex(artifacts)
+        index.lookup(["2a-1"])
+        index.invalidate()
+
+        assert index.refresh() is True
+
+    def test_missing_directory(self, tmp_path):
+        """A directory that does not exist yet matches nothing, then is picked up."""
+        directory = tmp_path / "implementation-artifacts"
+        index = ArtifactIndex(directory)
+        assert index.lookup(["1-1"]).all() == []
+
+        directory.mkdir()
+        (directory / "sprint-1-1-story.md").write_text("x")
+        assert len(index.lookup(["1-1"]).story) == 1
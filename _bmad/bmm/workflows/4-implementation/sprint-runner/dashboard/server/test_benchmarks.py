@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the benchmark suite.
+
+Runs every benchmark at a tiny size so they keep working as the code they
+measure changes. Timings are not asserted.
+
+Run with: cd dashboard && pytest -v server/test_benchmarks.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server import benchmarks, db
+
+
+# =============================================================================
+# Test: Harness
+# =============================================================================
+
+
+class TestHarness:
+    def test_format_table(self):
+        """format_table should align columns and format floats."""
+        table = benchmarks.format_table([{"name": "a", "ms": 1.234}, {"name": "bb", "ms": 10.0}])
+        lines = table.splitlines()
+
+        assert lines[0].split() == ["name", "ms"]
+        assert lines[2].split() == ["a", "1.23"]
+        assert lines[3].split() == ["bb", "10.00"]
+
+    def test_temporary_database_restores_path(self):
+        """Benchmarks must never touch the real sprint-runner.db."""
+        original = db.DB_PATH
+        with benchmarks.temporary_database() as path:
+            assert path != original
+            assert db.DB_PATH == path
+        assert db.DB_PATH == original
+
+    def test_cli_list(self, capsys):
+        """--list should print every registered benchmark."""
+        assert benchmarks.main(["--list"]) == 0
+        out = capsys.readouterr().out
+        for name in benchmarks.BENCHMARKS:
+            assert name in out
+
+
+# =============================================================================
+# Test: Benchmarks
+# =============================================================================
+
+
+class TestBenchmarks:
+    def test_batch_tree(self):
+        """batch-tree should report one row per story count."""
+        rows = benchmarks.bench_batch_tree(story_counts=(3, 5), commands_per_story=2, repeat=1)
+
+        assert [row["stories"] for row in rows] == [3, 5]
+        assert [row["commands"] for row in rows] == [6, 10]
+
+    def test_db_connection(self):
+        """db-connection should time reads and writes through both connection paths."""
+        rows = benchmarks.bench_db_connection(calls=5, repeat=1)
+
+        assert [row["operation"] for row in rows] == ["read", "write"]
+        assert all(row["unpooled_us"] > 0 and row["pooled_us"] > 0 for row in rows)
+
+    def test_event_writes(self):
+        """event-writes should persist every event through both paths, batched by the writer."""
+        rows = benchmarks.bench_event_writes(event_counts=(20,), repeat=1)
+
+        assert rows[0]["events"] == 20
+        assert rows[0]["flushes"] >= 1
+        assert rows[0]["per_event_ev_s"] > 0 and rows[0]["event_writer_ev_s"] > 0
+
+    def test_json_codec(self):
+        """json-codec should report one row per installed backend."""
+        from server import codec
+
+        rows = benchmarks.bench_json_codec(tool_result_kb=1, rounds=1, repeat=1)
+
+        assert len(rows) == len(codec.available_backends())
+        assert any(row["backend"].endswith("(active)") for row in rows)
+
+    def test_stream_json_samples_are_ndjson(self):
+        """Samples should be newline-terminated JSON lines with a task log line."""
+        import json
+
+        lines = benchmarks.stream_json_samples(tool_result_kb=1)
+
+        assert all(line.endswith(b"\n") and b"\n" not in line[:-1] for line in lines)
+        assert any(json.loads(line)["type"] == "tool_result" for line in lines)
+
+    def test_ndjson_stream(self):
+        """ndjson-stream should parse lines past readline()'s limit with the chunked reader."""
+        rows = benchmarks.bench_ndjson_stream(tool_result_kbs=(1, 128), stream_mb=1, repeat=1)
+
+        assert rows[0]["readline_mb_s"] > 0
+        assert rows[1]["readline_mb_s"] == "ValueError"
+        assert rows[1]["chunked_mb_s"] > 0
+
+    def test_subagent_output(self):
+        """subagent-output should keep streaming memory bounded by the text cap."""
+        rows = benchmarks.bench_subagent_output(event_counts=(50, 500), text_chars=256, max_text_chars=4096)
+
+        assert [row["events"] for row in rows] == [50, 500]
+        assert rows[1]["streaming_peak_mb"] < rows[1]["list_concat_peak_mb"]
+
+    def test_story_selection(self):
+        """story-selection should agree with the previous rule and honour dependencies."""
+        rows = benchmarks.bench_story_selection(entries=200, epics=5, max_stories=4, repeat=1)
+        by_name = {(row["strategy"], row["dependencies"]): row for row in rows}
+
+        assert by_name[("pair", False)]["selected"] == by_name[("previous", False)]["selected"]
+        assert by_name[("fair", False)]["epics"] == 4
+        assert by_name[("epic", True)]["selected"] == 1  # Each epic's stories form a chain
+
+    def test_artifact_index(self):
+        """artifact-index should find the same files with a single directory scan."""
+        rows = benchmarks.bench_artifact_index(stories=(30,), lookups=5, repeat=1)
+
+        assert rows[0]["files"] == 90
+        assert rows[0]["matched"] == 6
+        assert rows[0]["index_scans"] == 1
+
+    def test_injection_cache(self):
+        """injection-cache should read and render each unchanged injection once."""
+        rows = benchmarks.bench_injection_cache(file_kb=(1,), files=2, builds=3, repeat=2)
+
+        assert rows[0]["file_reads"] == 2
+        assert rows[0]["renders"] == 1
+
+    def test_batch_e2e(self):
+        """batch-e2e should run a whole batch offline and finish every story."""
+        rows = benchmarks.bench_batch_e2e(stories=(2,), warm_pool=(0,), speed=1000.0)
+
+        assert rows[0]["done"] == 2
+        assert rows[0]["cycles"] == 1
+        assert rows[0]["subagents"] == 8  # create, discovery, review, 2x dev, 2x code-review, commit
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for child process I/O management.
+
+Run with: cd dashboard && pytest -v server/test_child_io.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.child_io import ByteRing, ChildIO
+from server.ndjson import iter_lines
+
+
+async def spawn_python(script: str) -> asyncio.subprocess.Process:
+    """Run a Python snippet with all three pipes, like spawn_subagent does."""
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-c", script,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+
+# =============================================================================
+# Test: ByteRing
+# =============================================================================
+
+
+class TestByteRing:
+    def test_keeps_most_recent_bytes(self):
+        """Beyond the cap, the oldest bytes should be dropped."""
+        ring = ByteRing(max_bytes=6)
+        for chunk in (b"abc", b"defg", b"hi"):
+            ring.write(chunk)
+
+        assert ring.getvalue() == b"defghi"
+        assert ring.dropped_bytes == 3
+
+    def test_oversized_write_keeps_tail(self):
+        """A single write larger than the cap should keep its tail."""
+        ring = ByteRing(max_bytes=4)
+        ring.write(b"0123456789")
+
+        assert ring.getvalue() == b"6789"
+        assert len(ring) == 4
+
+
+# =============================================================================
+# Test: ChildIO
+# =============================================================================
+
+
+class TestChildIO:
+    @pytest.mark.asyncio
+    async def test_heavy_stderr_does_not_block_child(self):
+        """A child writing far more than a pipe buffer to stderr should still finish."""
+        process = await spawn_python(
+            "import sys\n"
+            "for n in range(2000):\n"
+            "    sys.stderr.write('warning %d ' % n + 'x' * 500 + '\\n')\n"
+            "sys.stderr.write('last line\\n')\n"
+            "print('{\"type\": \"result\"}')\n"
+        )
+        child = ChildIO(process, "test", stderr_limit=4096)
+        child.start()
+        process.stdin.close()
+
+        lines = [bytes(line) async for line in iter_lines(child.stdout)]
+        await asyncio.wait_for(process.wait(), timeout=10)
+        await child.close()
+
+        assert lines == [b'{"type": "result"}']
+        stats = child.stats()
+        assert stats["stderr_bytes"] > 1_000_000
+        assert stats["stdout_bytes"] == len(b'{"type": "result"}\n')
+        assert stats["stderr_dropped_bytes"] == stats["stderr_bytes"] - 4096
+        assert child.stderr_tail().endswith("last line\n")
+
+    @pytest.mark.asyncio
+    async def test_stderr_tail_replaces_invalid_utf8(self):
+        """Undecodable stderr should still produce a readable tail."""
+        process = await spawn_python("import sys; sys.stderr.buffer.write(b'bad \\xff byte')")
+        child = ChildIO(process, "test")
+        child.start()
+        process.stdin.close()
+        await process.wait()
+        await child.close()
+
+        assert child.stderr_tail() == "bad \ufffd byte"
+
+    @pytest.mark.asyncio
+    async def test_close_abandons_drain_after_timeout(self):
+        """close() should not hang when stderr never reaches EOF."""
+        stream = asyncio.StreamReader()  # Never fed EOF
+
+        class FakeProcess:
+            stdout = None
+            stderr = stream
+
+        child = ChildIO(FakeProcess(), "test")  # type: ignore[arg-type]
+        child.start()
+        await child.close(timeout=0.05)
+
+        await asyncio.sleep(0)
+        assert child._drain_task.cancelled()
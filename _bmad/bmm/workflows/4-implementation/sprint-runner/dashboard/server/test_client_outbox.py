@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for per-client WebSocket send queues.
+
+Run with: cd dashboard && pytest -v server/test_client_outbox.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.client_outbox import ClientOutbox, OutboxStats, coalesce_key
+
+
+def make_ws() -> MagicMock:
+    """Create a mock WebSocket that records sent frames."""
+    ws = MagicMock()
+    ws.send_str = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+def progress(task_id: str, message: str) -> tuple[str, str, tuple]:
+    """Build put() arguments for a command:progress event."""
+    payload = {"story_key": "1-1", "command": "dev", "task_id": task_id}
+    return "command:progress", message, coalesce_key("command:progress", payload)
+
+
+def sent(ws: MagicMock) -> list[str]:
+    """Frames sent to a mock WebSocket, in order."""
+    return [c.args[0] for c in ws.send_str.call_args_list]
+
+
+# =============================================================================
+# Test: Delivery
+# =============================================================================
+
+
+class TestDelivery:
+    @pytest.mark.asyncio
+    async def test_messages_sent_in_order(self):
+        """Queued messages should be sent in FIFO order by the writer task."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws)
+
+        for n in range(5):
+            assert outbox.put("test", str(n)) is True
+        await outbox.join()
+
+        assert sent(ws) == ["0", "1", "2", "3", "4"]
+        assert outbox.stats.sent == 5
+
+    @pytest.mark.asyncio
+    async def test_paused_outbox_sends_after_resume_without_skipped(self):
+        """A paused outbox queues only; resume() sends the rest, minus frames already delivered."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws, paused=True)
+
+        for n in range(4):
+            outbox.put("test", str(n))
+        await asyncio.sleep(0)
+        assert sent(ws) == []
+
+        outbox.resume(skip={"0", "2"})
+        await outbox.join()
+
+        assert sent(ws) == ["1", "3"]
+
+    @pytest.mark.asyncio
+    async def test_send_failure_closes_outbox(self):
+        """A failed send should close the outbox and notify on_close once."""
+        ws = make_ws()
+        ws.send_str.side_effect = ConnectionResetError("gone")
+        on_close = MagicMock()
+        outbox = ClientOutbox(ws, on_close=on_close)
+
+        outbox.put("test", "a")
+        outbox.put("test", "b")
+        await outbox.join()
+
+        assert outbox.closed
+        assert outbox.put("test", "c") is False
+        on_close.assert_called_once_with(outbox)
+
+    @pytest.mark.asyncio
+    async def test_delayed_messages_counted(self, monkeypatch):
+        """Messages that waited past the threshold should count as delayed."""
+        from server import client_outbox
+
+        monkeypatch.setattr(client_outbox, "DELAYED_THRESHOLD_SECONDS", 0.0)
+        totals = OutboxStats()
+        outbox = ClientOutbox(make_ws(), stats=totals)
+
+        outbox.put("test", "a")
+        await outbox.join()
+
+        assert outbox.stats.delayed == 1
+        assert totals.delayed == 1
+
+    def test_unknown_policy_rejected(self):
+        """Invalid policies should fail fast."""
+        with pytest.raises(ValueError, match="Unknown overflow policy"):
+            ClientOutbox(make_ws(), policy="block")
+
+
+# =============================================================================
+# Test: Overflow policies
+# =============================================================================
+
+
+class TestOverflowPolicies:
+    @pytest.mark.asyncio
+    async def test_drop_oldest_drops_progress_only(self):
+        """drop-oldest should evict the oldest progress event, keeping others."""
+        ws = make_ws()
+        totals = OutboxStats()
+        outbox = ClientOutbox(ws, maxsize=3, policy="drop-oldest", stats=totals)
+
+        outbox.put("batch:start", "start")
+        outbox.put(*progress("a", "p1"))
+        outbox.put(*progress("a", "p2"))
+        outbox.put(*progress("a", "p3"))
+        await outbox.join()
+
+        assert sent(ws) == ["start", "p2", "p3"]
+        assert totals.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_replaces_same_key(self):
+        """coalesce should replace a queued progress event for the same task in place."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws, maxsize=2, policy="coalesce")
+
+        outbox.put(*progress("a", "a1"))
+        outbox.put(*progress("b", "b1"))
+        outbox.put(*progress("a", "a2"))
+        await outbox.join()
+
+        assert sent(ws) == ["a2", "b1"]
+        assert outbox.stats.coalesced == 1
+        assert outbox.stats.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_coalesce_end_replaces_queued_start(self):
+        """A task's command:end should take its queued command:start's place."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws, maxsize=2, policy="coalesce")
+        task = {"story_key": "1-1", "command": "dev", "task_id": "setup"}
+
+        outbox.put("command:start", "setup start", coalesce_key("command:start", task))
+        outbox.put("cycle:start", "cycle")
+        outbox.put("command:end", "setup end", coalesce_key("command:end", task))
+        await outbox.join()
+
+        assert sent(ws) == ["setup end", "cycle"]
+        assert outbox.stats.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_falls_back_to_drop(self):
+        """Without a matching key, coalesce should drop the oldest progress event."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws, maxsize=1, policy="coalesce")
+
+        outbox.put(*progress("a", "a1"))
+        outbox.put(*progress("b", "b1"))
+        await outbox.join()
+
+        assert sent(ws) == ["b1"]
+        assert outbox.stats.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_client(self):
+        """disconnect should close the WebSocket on overflow."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws, maxsize=1, policy="disconnect")
+
+        outbox.put(*progress("a", "a1"))
+        assert outbox.put(*progress("a", "a2")) is False
+        await asyncio.sleep(0)
+
+        assert outbox.closed
+        assert outbox.stats.disconnected == 1
+        ws.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_nothing_droppable_disconnects(self):
+        """If only lossless events are queued, any policy should disconnect."""
+        ws = make_ws()
+        outbox = ClientOutbox(ws, maxsize=1, policy="drop-oldest")
+
+        outbox.put("batch:start", "start")
+        assert outbox.put("batch:end", "end") is False
+
+        assert outbox.closed
+        assert outbox.stats.disconnected == 1
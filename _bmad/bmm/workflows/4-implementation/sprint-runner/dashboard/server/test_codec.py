@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable JSON codec.
+
+Every test runs against each installed backend so that swapping backends
+never changes behaviour.
+
+Run with: cd dashboard && pytest -v server/test_codec.py
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server import codec
+
+BACKENDS = list(codec.available_backends().values())
+
+
+@pytest.fixture(params=BACKENDS, ids=[b.name for b in BACKENDS])
+def backend(request) -> codec.Backend:
+    return request.param
+
+
+# =============================================================================
+# Test: Backend selection
+# =============================================================================
+
+
+class TestSelection:
+    def test_stdlib_always_available(self):
+        """The json module backend should always be present as a fallback."""
+        assert "json" in codec.available_backends()
+        assert codec.select_backend("json").name == "json"
+
+    def test_default_is_first_available(self):
+        """Without a name, the most preferred installed backend should win."""
+        assert codec.select_backend().name == next(iter(codec.available_backends()))
+
+    def test_unknown_backend_raises(self):
+        """Unknown backend names should raise ValueError."""
+        with pytest.raises(ValueError):
+            codec.select_backend("bogus")
+
+    def test_module_functions_match_backend(self):
+        """Module-level functions should come from the active backend."""
+        assert codec.BACKEND in codec.available_backends()
+        assert codec.loads(codec.dumps({"a": 1})) == {"a": 1}
+
+
+# =============================================================================
+# Test: Encoding and decoding
+# =============================================================================
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, lambda b: b.decode()])
+    def test_loads_accepts_bytes_like_and_str(self, backend, wrap):
+        """loads should accept every input type the stream parser produces."""
+        line = b'{"type":"assistant","message":{"content":[{"type":"text","text":"hi \xe2\x9c\x93"}]}}\n'
+        assert backend.loads(wrap(line)) == json.loads(line)
+
+    def test_dumps_is_compact_str(self, backend):
+        """dumps should return compact text that keeps non-ASCII characters."""
+        result = backend.dumps({"a": [1, 2], "b": "✓"})
+
+        assert isinstance(result, str)
+        assert result == '{"a":[1,2],"b":"✓"}'
+
+    def test_dumpb_is_utf8_bytes(self, backend):
+        """dumpb should return the UTF-8 encoding of dumps."""
+        obj = {"story_key": "1-1", "message": 'say "hi" ✓'}
+        assert backend.dumpb(obj) == backend.dumps(obj).encode()
+
+    def test_default_hook(self, backend):
+        """Unsupported types should go through default=."""
+        moment = datetime(2026, 1, 1, 12, 0, 0)
+        result = backend.dumps({"at": moment}, default=lambda o: o.isoformat())
+        assert json.loads(result) == {"at": "2026-01-01T12:00:00"}
+
+
+class TestDecodeErrors:
+    @pytest.mark.parametrize("data", [b"{not json", b"", b'{"a": 1', b'"\xff\xfe"'])
+    def test_malformed_input_raises_decode_error(self, backend, data):
+        """Malformed JSON and invalid UTF-8 should raise the backend's DecodeError."""
+        with pytest.raises(backend.decode_error):
+            backend.loads(data)
+
+    def test_decode_error_is_value_error(self, backend):
+        """Callers catching ValueError should keep working with any backend."""
+        assert issubclass(backend.decode_error, ValueError)
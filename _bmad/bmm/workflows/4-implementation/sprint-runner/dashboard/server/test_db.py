@@ -6,6 +6,7 @@ Run with: cd dashboard && pytest -v server/test_db.py
 """
 
 from __future__ import annotations
+import json
 import sys
 import time
 from pathlib import Path
@@ -110,6 +111,194 @@ class TestDatabaseInit:
             )
 
 
+# =============================================================================
+# Test: Connection pool
+# =============================================================================
+
+
+class TestConnectionPool:
+    def test_connection_reused_across_calls(self, temp_db):
+        """Successive calls on one thread should share a pooled connection."""
+        with temp_db.get_connection() as first:
+            pass
+        with temp_db.get_connection() as second:
+            pass
+
+        assert first is second
+
+    def test_foreign_keys_enabled_on_pooled_connection(self, temp_db):
+        """Reused connections keep the foreign_keys pragma."""
+        for _ in range(3):
+            with temp_db.get_connection() as conn:
+                assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_commit_visible_to_other_threads(self, temp_db, sample_batch):
+        """Writes committed on one thread are visible on another thread's connection."""
+        import threading
+
+        temp_db.update_batch(sample_batch, cycles_completed=2)
+        seen = {}
+
+        def reader():
+            with temp_db.get_connection() as conn:
+                seen['conn'] = conn
+            seen['batch'] = temp_db.get_batch(sample_batch)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join()
+
+        with temp_db.get_connection() as conn:
+            assert seen['conn'] is not conn
+        assert seen['batch']['cycles_completed'] == 2
+
+    def test_rollback_discards_uncommitted_writes(self, temp_db, sample_batch):
+        """An exception inside the context should roll back its writes."""
+        with pytest.raises(RuntimeError):
+            with temp_db.get_connection() as conn:
+                conn.execute(
+                    "UPDATE batches SET status = 'failed' WHERE id = ?",
+                    (sample_batch,)
+                )
+                raise RuntimeError("boom")
+
+        assert temp_db.get_batch(sample_batch)['status'] == 'running'
+
+    def test_nested_contexts_share_outer_transaction(self, temp_db, sample_batch):
+        """Inner contexts should not commit the outer transaction early."""
+        with pytest.raises(RuntimeError):
+            with temp_db.get_connection() as conn:
+                conn.execute(
+                    "UPDATE batches SET status = 'failed' WHERE id = ?",
+                    (sample_batch,)
+                )
+                with temp_db.get_connection() as inner:
+                    inner.execute("SELECT 1")
+                raise RuntimeError("boom")
+
+        assert temp_db.get_batch(sample_batch)['status'] == 'running'
+
+    def test_caught_inner_error_undoes_only_inner_writes(self, temp_db, sample_batch):
+        """A failed nested block rolls back to its savepoint; the outer block still commits."""
+        with temp_db.get_connection() as conn:
+            conn.execute("UPDATE batches SET cycles_completed = 1 WHERE id = ?", (sample_batch,))
+            try:
+                with temp_db.get_connection() as inner:
+                    inner.execute("UPDATE batches SET status = 'failed' WHERE id = ?", (sample_batch,))
+                    raise RuntimeError("inner failure")
+            except RuntimeError:
+                pass
+
+        batch = temp_db.get_batch(sample_batch)
+        assert batch['cycles_completed'] == 1
+        assert batch['status'] == 'running'
+
+    def test_nested_writes_wait_for_outer_commit(self, temp_db, sample_batch):
+        """A nested block opened before any outer write does not commit on its own."""
+        with pytest.raises(RuntimeError):
+            with temp_db.get_connection():
+                temp_db.update_batch(sample_batch, status='failed')
+                raise RuntimeError("boom")
+
+        assert temp_db.get_batch(sample_batch)['status'] == 'running'
+
+    def test_nested_block_keeps_outer_connection(self, temp_db, tmp_path):
+        """Re-pointing DB_PATH inside an open block does not switch or reset it."""
+        with temp_db.get_connection() as outer:
+            with patch.object(temp_db, 'DB_PATH', tmp_path / 'other.db'):
+                with temp_db.get_connection() as inner:
+                    assert inner is outer
+            assert temp_db._local.depth == 1
+        assert temp_db._local.depth == 0
+
+    def test_db_path_change_opens_new_connection(self, temp_db, tmp_path):
+        """Re-pointing DB_PATH should switch to a connection on the new file."""
+        with temp_db.get_connection() as original:
+            pass
+
+        other_path = tmp_path / 'other.db'
+        with patch.object(temp_db, 'DB_PATH', other_path):
+            temp_db.init_db()
+            with temp_db.get_connection() as other:
+                assert other is not original
+            assert temp_db.get_active_batch() is None
+
+    def test_close_connections_then_reopen(self, temp_db, sample_batch):
+        """close_connections should close the pool and later calls reconnect."""
+        with temp_db.get_connection() as before:
+            pass
+
+        assert temp_db.close_connections() >= 1
+        assert temp_db.close_connections() == 0
+
+        assert temp_db.get_batch(sample_batch) is not None
+        with temp_db.get_connection() as after:
+            assert after is not before
+
+
+# =============================================================================
+# Test: WAL storage profile
+# =============================================================================
+
+
+class TestWalStorage:
+    def test_init_enables_wal_journal(self, temp_db):
+        """init_db should switch the database to WAL journal mode."""
+        with temp_db.get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode.lower() == 'wal'
+
+    def test_connection_pragmas_applied(self, temp_db):
+        """Pooled connections should carry the tuned pragmas."""
+        with temp_db.get_connection() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+    def test_reader_not_blocked_by_open_write(self, temp_db, sample_batch):
+        """Readers on another thread should see committed data during a write."""
+        import threading
+
+        result = {}
+
+        def reader():
+            result['batch'] = temp_db.get_batch(sample_batch)
+
+        with temp_db.get_connection() as conn:
+            conn.execute(
+                "UPDATE batches SET status = 'completed' WHERE id = ?",
+                (sample_batch,)
+            )
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(timeout=5)
+
+        assert result['batch']['status'] == 'running'
+
+    def test_checkpoint_wal_passive_by_default(self, temp_db, sample_batch):
+        """checkpoint_wal should run a PASSIVE checkpoint for a small -wal file."""
+        result = temp_db.checkpoint_wal()
+
+        assert result['mode'] == 'PASSIVE'
+        assert result['busy'] == 0
+        assert result['checkpointed_frames'] == result['log_frames']
+
+    def test_checkpoint_wal_truncates_large_wal(self, temp_db, sample_batch):
+        """checkpoint_wal should escalate to TRUNCATE past the size threshold."""
+        with patch.object(temp_db, 'WAL_TRUNCATE_THRESHOLD_BYTES', 0):
+            result = temp_db.checkpoint_wal()
+
+        assert result['mode'] == 'TRUNCATE'
+        wal_path = Path(f"{temp_db.DB_PATH}-wal")
+        assert not wal_path.exists() or wal_path.stat().st_size == 0
+
+    def test_checkpoint_wal_rejects_invalid_mode(self, temp_db):
+        """Unknown checkpoint modes should raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid checkpoint mode"):
+            temp_db.checkpoint_wal('EVERYTHING')
+
+
 # =============================================================================
 # Test: Batch CRUD operations (8.2)
 # =============================================================================
@@ -182,6 +371,64 @@ class TestBatchOperations:
         active = temp_db.get_active_batch()
         assert active['id'] == batch2
 
+    def test_list_batches_newest_first_with_counts(self, temp_db):
+        """list_batches should page newest first with story counts and totals."""
+        batch1 = temp_db.create_batch(max_cycles=1)
+        batch2 = temp_db.create_batch(max_cycles=2)
+        temp_db.create_story(batch1, "1-1", "1")
+        temp_db.create_story(batch1, "1-2", "1")
+        temp_db.update_batch(batch1, started_at=1000, ended_at=3500)
+
+        result = temp_db.list_batches(limit=10)
+        assert result['total'] == 2
+        assert [b['id'] for b in result['batches']] == [batch2, batch1]
+        assert result['batches'][1]['story_count'] == 2
+        assert result['batches'][1]['duration_seconds'] == 2.5
+        assert result['batches'][0]['duration_seconds'] is None
+
+        page = temp_db.list_batches(limit=1, offset=1)
+        assert [b['id'] for b in page['batches']] == [batch1]
+        assert page['total'] == 2
+
+    def test_get_batch_tree_nests_commands_under_stories(self, temp_db):
+        """get_batch_tree should return the batch with stories and their commands."""
+        batch_id = temp_db.create_batch(max_cycles=1)
+        story1 = temp_db.create_story(batch_id, "1-1", "1")
+        story2 = temp_db.create_story(batch_id, "1-2", "1")
+        temp_db.create_story(batch_id, "1-3", "1")
+        cmd1 = temp_db.create_command(story1, "create-story", "setup")
+        cmd2 = temp_db.create_command(story1, "dev-story", "implement")
+        cmd3 = temp_db.create_command(story2, "dev-story", "implement")
+
+        # Commands of another batch must not leak in
+        other = temp_db.create_batch(max_cycles=1)
+        temp_db.create_command(temp_db.create_story(other, "2-1", "2"), "dev-story", "x")
+
+        tree = temp_db.get_batch_tree(batch_id)
+        assert tree['batch']['id'] == batch_id
+        assert [s['story_key'] for s in tree['stories']] == ["1-1", "1-2", "1-3"]
+        assert [c['id'] for c in tree['stories'][0]['commands']] == [cmd1, cmd2]
+        assert [c['id'] for c in tree['stories'][1]['commands']] == [cmd3]
+        assert tree['stories'][2]['commands'] == []
+
+    def test_get_batch_tree_matches_per_story_queries(self, temp_db):
+        """get_batch_tree should return the same rows as the per-story getters."""
+        batch_id = temp_db.create_batch(max_cycles=1)
+        for n in range(5):
+            story_id = temp_db.create_story(batch_id, f"1-{n}", "1")
+            for m in range(n):
+                temp_db.create_command(story_id, f"cmd-{m}", "task")
+
+        tree = temp_db.get_batch_tree(batch_id)
+        for story in tree['stories']:
+            commands = story.pop('commands')
+            assert commands == temp_db.get_commands_by_story(story['id'])
+        assert tree['stories'] == temp_db.get_stories_by_batch(batch_id)
+
+    def test_get_batch_tree_missing_batch(self, temp_db):
+        """get_batch_tree should return None for an unknown batch."""
+        assert temp_db.get_batch_tree(99999) is None
+
     def test_update_batch_rejects_invalid_fields(self, temp_db, sample_batch):
         """update_batch should raise ValueError for invalid fields."""
         import pytest
@@ -516,6 +763,41 @@ class TestEventOperations:
         """get_events_by_batch should return empty list for batch with no events."""
         assert temp_db.get_events_by_batch(sample_batch) == []
 
+    def test_get_recent_events_by_batch_newest_first(self, temp_db, sample_batch):
+        """get_recent_events_by_batch should return the last N events, newest first."""
+        other = temp_db.create_batch(max_cycles=1)
+        temp_db.create_events([
+            {'batch_id': sample_batch, 'story_id': None, 'command_id': None,
+             'event_type': 'info', 'epic_id': '1', 'story_key': '1-1', 'command': 'cmd',
+             'task_id': 'task', 'status': 'progress', 'message': f"Event {n}",
+             'timestamp': 1000 + n // 2}
+            for n in range(10)
+        ])
+        temp_db.create_event(other, None, None, "info", "2", "2-1", "cmd", "task", "start", "Other")
+
+        events = temp_db.get_recent_events_by_batch(sample_batch, limit=3)
+        # Equal timestamps fall back to insertion order
+        assert [e['message'] for e in events] == ["Event 9", "Event 8", "Event 7"]
+
+        all_events = temp_db.get_recent_events_by_batch(sample_batch, limit=50)
+        assert all_events == list(reversed(temp_db.get_events_by_batch(sample_batch)))
+
+    def test_get_recent_events_by_batch_uses_index(self, temp_db, sample_batch):
+        """The tail query should be served by idx_events_batch_recent without sorting."""
+        with temp_db.get_connection() as conn:
+            plan = " ".join(
+                row[3] for row in conn.execute(
+                    """
+                    EXPLAIN QUERY PLAN
+                    SELECT * FROM events WHERE batch_id = ?
+                    ORDER BY timestamp DESC, id DESC LIMIT ?
+                    """,
+                    (sample_batch, 50)
+                )
+            )
+        assert "idx_events_batch_recent" in plan
+        assert "TEMP B-TREE" not in plan
+
     def test_event_foreign_key_story_constraint(self, temp_db, sample_batch):
         """create_event should fail with non-existent story_id."""
         import sqlite3
@@ -551,6 +833,51 @@ class TestEventOperations:
             )
 
 
+    def test_create_events_bulk_insert(self, temp_db, sample_batch):
+        """create_events should insert all rows with payloads and timestamps."""
+        rows = [
+            {
+                "batch_id": sample_batch,
+                "event_type": "command:start",
+                "epic_id": "2a",
+                "story_key": "2a-1",
+                "command": "dev-story",
+                "task_id": "setup",
+                "status": "start",
+                "message": f"Event {i}",
+                "payload": {"i": i},
+                "timestamp": 1000 + i,
+            }
+            for i in range(3)
+        ]
+
+        assert temp_db.create_events(rows) == 3
+
+        events = temp_db.get_events_by_batch(sample_batch)
+        assert [e['timestamp'] for e in events] == [1000, 1001, 1002]
+        assert json.loads(events[2]['payload_json']) == {"i": 2}
+        assert events[0]['story_id'] is None
+
+    def test_create_events_empty(self, temp_db):
+        """create_events with no rows should be a no-op."""
+        assert temp_db.create_events([]) == 0
+
+    def test_create_events_is_atomic(self, temp_db, sample_batch):
+        """A bad row should roll back the whole batch."""
+        import sqlite3
+        good = {
+            "batch_id": sample_batch, "event_type": "info", "epic_id": "1",
+            "story_key": "1-1", "command": "cmd", "task_id": "task",
+            "status": "start", "message": "ok",
+        }
+        bad = dict(good, command_id=99999)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            temp_db.create_events([good, bad])
+
+        assert temp_db.get_events_by_batch(sample_batch) == []
+
+
 # =============================================================================
 # Test: Background task operations (8.6)
 # =============================================================================
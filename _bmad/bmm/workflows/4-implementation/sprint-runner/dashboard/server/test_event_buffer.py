@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the recent WebSocket event ring buffer.
+
+Run with: cd dashboard && pytest -v server/test_event_buffer.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.event_buffer import RecentEventBuffer
+
+
+def make_event(event_type: str = "command:progress", n: int = 0, **payload) -> dict:
+    """Build a WebSocket-format event."""
+    return {"type": event_type, "payload": payload, "timestamp": n}
+
+
+# =============================================================================
+# Test: Buffering
+# =============================================================================
+
+
+class TestRecentEventBuffer:
+    def test_batch_start_opens_buffer(self):
+        """Events should be buffered under the batch announced by batch:start."""
+        buffer = RecentEventBuffer(maxlen=10)
+        buffer.append(make_event("batch:start", 1, batch_id=3))
+        buffer.append(make_event("command:start", 2))
+
+        assert buffer.current_batch_id == 3
+        assert [e["timestamp"] for e in buffer.recent(3)] == [2, 1]
+
+    def test_events_before_any_batch_are_ignored(self):
+        """Without a known batch there is nothing to replay."""
+        buffer = RecentEventBuffer()
+        buffer.append(make_event("command:start"))
+
+        assert buffer.current_batch_id is None
+        assert buffer.recent(1) is None
+
+    def test_ring_buffer_keeps_newest(self):
+        """Only the last maxlen events should be kept."""
+        buffer = RecentEventBuffer(maxlen=3)
+        buffer.start_batch(1)
+        for n in range(10):
+            buffer.append(make_event(n=n))
+
+        assert [e["timestamp"] for e in buffer.recent(1)] == [9, 8, 7]
+
+    def test_new_batch_replaces_previous(self):
+        """A new batch:start should drop the previous batch's events."""
+        buffer = RecentEventBuffer()
+        buffer.append(make_event("batch:start", 1, batch_id=1))
+        buffer.append(make_event("batch:start", 2, batch_id=2))
+
+        assert buffer.recent(1) is None
+        assert [e["timestamp"] for e in buffer.recent(2)] == [2]
+
+    def test_pong_is_not_buffered(self):
+        """Connection-health replies should never be replayed."""
+        buffer = RecentEventBuffer()
+        buffer.start_batch(1)
+        buffer.append({"type": "pong"})
+
+        assert buffer.recent(1) == []
+
+
+# =============================================================================
+# Test: Warm-up and sizing
+# =============================================================================
+
+
+class TestRecentEventBufferWarmup:
+    def test_seed_fills_unbuffered_batch(self):
+        """seed() should load events (oldest first) for an unbuffered batch."""
+        buffer = RecentEventBuffer()
+
+        assert buffer.seed(4, [make_event(n=1), make_event(n=2)]) is True
+        assert [e["timestamp"] for e in buffer.recent(4)] == [2, 1]
+
+    def test_seed_does_not_clobber_live_events(self):
+        """A DB snapshot should not overwrite events buffered live."""
+        buffer = RecentEventBuffer()
+        buffer.append(make_event("batch:start", 5, batch_id=4))
+
+        assert buffer.seed(4, [make_event(n=1)]) is False
+        assert [e["timestamp"] for e in buffer.recent(4)] == [5]
+
+    def test_resize_keeps_newest(self):
+        """Shrinking should keep the newest events; growing should keep all."""
+        buffer = RecentEventBuffer(maxlen=5)
+        buffer.start_batch(1, [make_event(n=n) for n in range(5)])
+
+        buffer.resize(2)
+        assert [e["timestamp"] for e in buffer.recent(1)] == [4, 3]
+
+        buffer.resize(10)
+        buffer.append(make_event(n=5))
+        assert [e["timestamp"] for e in buffer.recent(1)] == [5, 4, 3]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process event bus.
+
+Run with: cd dashboard && pytest -v server/test_event_bus.py
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server import codec
+from server.event_bus import BusEvent, EventBus
+
+
+# =============================================================================
+# Test: BusEvent encoding
+# =============================================================================
+
+
+class TestBusEvent:
+    def test_frame_matches_dict_encoding(self):
+        """The spliced frame should decode to the same event as to_dict()."""
+        event = BusEvent("command:end", {"story_key": "1-1", "message": 'say "hi" ✓'}, 1234)
+
+        assert json.loads(event.frame) == event.to_dict()
+        assert json.loads(event.payload_json) == event.payload
+
+    def test_payload_encoded_once(self):
+        """payload_json and frame should share a single payload encoding."""
+        event = BusEvent("command:start", {"story_key": "1-1"})
+
+        with patch("server.event_bus.codec.dumps", wraps=codec.dumps) as mock_dumps:
+            payload_json = event.payload_json
+            event.frame
+            event.frame
+            event.payload_json
+
+        payload_calls = [c for c in mock_dumps.call_args_list if isinstance(c.args[0], dict)]
+        assert len(payload_calls) == 1
+        assert payload_json in event.frame
+
+    def test_timestamp_defaults_to_now(self):
+        """Events without a timestamp should get one in milliseconds."""
+        event = BusEvent("test", {})
+        assert event.timestamp > 1_000_000_000_000
+
+    def test_from_dict(self):
+        """from_dict should keep type, payload and timestamp."""
+        event = BusEvent.from_dict({"type": "test", "payload": {"a": 1}, "timestamp": 5})
+        assert event.to_dict() == {"type": "test", "payload": {"a": 1}, "timestamp": 5}
+
+
+# =============================================================================
+# Test: EventBus
+# =============================================================================
+
+
+class TestEventBus:
+    def test_publish_reaches_subscribers_in_order(self):
+        """Every subscriber should receive the same event object."""
+        bus = EventBus()
+        first, second = [], []
+        bus.subscribe(first.append)
+        bus.subscribe(second.append)
+
+        event = BusEvent("test", {})
+        bus.publish(event)
+
+        assert first == [event]
+        assert second[0] is event
+
+    def test_unsubscribe(self):
+        """Unsubscribed handlers should stop receiving events."""
+        bus = EventBus()
+        received = []
+        unsubscribe = bus.subscribe(received.append)
+
+        unsubscribe()
+        unsubscribe()  # Idempotent
+        bus.publish(BusEvent("test", {}))
+
+        assert received == []
+        assert bus.subscriber_count == 0
+
+    def test_failing_handler_does_not_block_others(self):
+        """A raising subscriber should not stop delivery or reach the publisher."""
+        bus = EventBus()
+        received = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe(broken)
+        bus.subscribe(received.append)
+        bus.publish(BusEvent("test", {}))
+
+        assert len(received) == 1
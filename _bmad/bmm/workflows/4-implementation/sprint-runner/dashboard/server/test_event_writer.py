@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind EventWriter.
+
+Run with: cd dashboard && pytest -v server/test_event_writer.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.event_writer import EventWriter
+
+
+def make_event(n: int = 0) -> dict:
+    """Build event kwargs in create_event() shape."""
+    return {
+        "batch_id": 1,
+        "story_id": None,
+        "command_id": None,
+        "event_type": "command:start",
+        "epic_id": "2a",
+        "story_key": "2a-1",
+        "command": "dev-story",
+        "task_id": "setup",
+        "status": "start",
+        "message": f"event {n}",
+        "payload": {"n": n},
+    }
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Create a temporary database with one batch."""
+    from server import db
+
+    with patch.object(db, 'DB_PATH', tmp_path / 'test-sprint-runner.db'):
+        db.init_db()
+        db.create_batch(max_cycles=1)
+        yield db
+
+
+# =============================================================================
+# Test: Batching
+# =============================================================================
+
+
+class TestEventWriterBatching:
+    @pytest.mark.asyncio
+    async def test_write_is_buffered_until_flush_window(self):
+        """write() should not hit the database synchronously."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn, flush_interval=10)
+
+        writer.write(**make_event())
+
+        assert writer.pending_count == 1
+        write_fn.assert_not_called()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_flush_window_writes_one_batch(self):
+        """Events written within one window should be flushed in a single call."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn, flush_interval=0.01)
+
+        for n in range(50):
+            writer.write(**make_event(n))
+        await asyncio.sleep(0.1)
+
+        assert write_fn.call_count == 1
+        assert len(write_fn.call_args.args[0]) == 50
+        assert writer.events_written == 50
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_flush(self):
+        """Reaching max_batch_size should flush without waiting for the interval."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn, flush_interval=10, max_batch_size=5)
+
+        for n in range(5):
+            writer.write(**make_event(n))
+        await asyncio.sleep(0.05)
+
+        assert writer.events_written == 5
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_timestamp_captured_at_write(self):
+        """Events should keep the time they were queued, not flushed."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn, flush_interval=10)
+
+        writer.write(**make_event(), timestamp=1234)
+        await writer.flush()
+
+        assert write_fn.call_args.args[0][0]["timestamp"] == 1234
+        await writer.stop()
+
+    def test_write_without_loop_is_synchronous(self):
+        """Outside an event loop, write() should write through immediately."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn)
+
+        writer.write(**make_event())
+
+        write_fn.assert_called_once()
+        assert writer.pending_count == 0
+
+
+# =============================================================================
+# Test: Durability
+# =============================================================================
+
+
+class TestEventWriterDurability:
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self):
+        """stop() should persist everything still buffered."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn, flush_interval=10)
+
+        for n in range(3):
+            writer.write(**make_event(n))
+        await writer.stop()
+
+        assert writer.events_written == 3
+        assert writer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_while_writer_thread_busy_keeps_events(self):
+        """stop() during a flush queued behind a busy writer thread loses nothing."""
+        import threading
+        from server.aiodb import run_write
+
+        release = threading.Event()
+        blocker = asyncio.ensure_future(run_write(release.wait, 5))
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn, flush_interval=0.01)
+
+        for n in range(10):
+            writer.write(**make_event(n))
+        await asyncio.sleep(0.1)  # The background flush is now queued behind the blocker
+        assert writer.pending_count == 0
+
+        stop = asyncio.ensure_future(writer.stop())
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.wait_for(stop, 5)
+        await blocker
+
+        assert writer.events_written == 10
+        assert writer.pending_count == 0
+
+    def test_flush_sync_for_exit_path(self):
+        """flush_sync() should drain the buffer on the calling thread."""
+        write_fn = MagicMock(side_effect=lambda rows: len(rows))
+        writer = EventWriter(write_fn)
+        writer._pending = [make_event(1), make_event(2)]
+
+        assert writer.flush_sync() == 2
+        assert writer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_bad_row_does_not_lose_window(self):
+        """A failing batch should be retried row-by-row, dropping only bad rows."""
+        def write_fn(rows):
+            if any(row["message"] == "event 2" for row in rows):
+                raise ValueError("bad row")
+            return len(rows)
+
+        writer = EventWriter(write_fn, flush_interval=10)
+        for n in range(4):
+            writer.write(**make_event(n))
+        await writer.flush()
+
+        assert writer.events_written == 3
+        assert writer.events_dropped == 1
+        await writer.stop()
+
+
+# =============================================================================
+# Test: Database integration
+# =============================================================================
+
+
+class TestEventWriterDatabase:
+    @pytest.mark.asyncio
+    async def test_events_reach_database_in_order(self, temp_db):
+        """Flushed events should be stored with payloads, in write order."""
+        writer = EventWriter(temp_db.create_events, flush_interval=0.01)
+
+        for n in range(200):
+            writer.write(**make_event(n))
+        await writer.stop()
+
+        events = temp_db.get_events_by_batch(1)
+        assert len(events) == 200
+        assert [e["message"] for e in events[:3]] == ["event 0", "event 1", "event 2"]
+        assert json.loads(events[-1]["payload_json"]) == {"n": 199}
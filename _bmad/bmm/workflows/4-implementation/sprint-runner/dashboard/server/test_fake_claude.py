@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Tests for the fake claude CLI simulator.
+
+The simulator runs as a child process, exactly as spawn_subagent() runs it,
+and its output is checked with the orchestrator's own parsers.
+
+Run with: cd dashboard && pytest -v server/test_fake_claude.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.fake_claude import (
+    PHASE_CODE_REVIEW,
+    PHASE_CONTEXT,
+    PHASE_DEV,
+    PHASE_REVIEW,
+    PHASE_STORY,
+    classify_prompt,
+    severity_for,
+)
+from server.orchestrator import CLAUDE_COMMAND_ENV_VAR, Orchestrator
+from server.stream_consumers import StreamConsumer, SubagentOutput
+
+FAKE_CLAUDE = Path(__file__).parent / "fake_claude.py"
+
+# Fast runs: no startup or tool latency, small outputs
+FAST = ["--sim-speed", "1000", "--sim-tokens", "80", "--sim-line-kb", "0.5"]
+
+
+def run_fake(prompt: str, *args: str) -> tuple[int, list[dict], str]:
+    """Run the simulator like spawn_subagent does; return exit code, events, stderr."""
+    result = subprocess.run(
+        [sys.executable, str(FAKE_CLAUDE), "-p", "--output-format", "stream-json", *FAST, *args],
+        input=prompt,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    events = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    return result.returncode, events, result.stderr
+
+
+def output_of(events: list[dict]) -> SubagentOutput:
+    """Feed events through the orchestrator's output consumer."""
+    output = SubagentOutput()
+    for event in events:
+        output.feed_event(event)
+    return output
+
+
+# =============================================================================
+# Test: Prompt classification
+# =============================================================================
+
+
+class TestClassifyPrompt:
+    def test_orchestrator_prompts(self):
+        """Every prompt shape the orchestrator sends maps to its phase."""
+        cases = {
+            "Story keys: 2a-1-a,2a-2-b\nEpic ID: 2a": (PHASE_STORY, ["2a-1-a", "2a-2-b"], 0),
+            "Story keys: 2a-1-a\nEpic ID: 2a\nReview attempt: 1": (PHASE_REVIEW, ["2a-1-a"], 1),
+            "Story keys: 2a-1-a\nEpic ID: 2a\nReview attempt: 2\nBackground chain: true": (
+                PHASE_REVIEW, ["2a-1-a"], 2,
+            ),
+            "Story key: 2a-1-a\nEpic ID: 2a": (PHASE_DEV, ["2a-1-a"], 0),
+            "Story key: 2a-1-a\nEpic ID: 2a\nReview attempt: 3": (PHASE_CODE_REVIEW, ["2a-1-a"], 3),
+        }
+        for prompt, (phase, story_keys, attempt) in cases.items():
+            classified = classify_prompt(prompt)
+            assert (classified.phase, classified.story_keys, classified.attempt) == (phase, story_keys, attempt)
+            assert classified.epic_id == "2a"
+
+    def test_context_prompt(self, tmp_path):
+        """The project-context prompt has no story fields."""
+        prompt = Orchestrator(project_root=tmp_path)._generate_context_prompt()
+
+        assert classify_prompt(prompt).phase == PHASE_CONTEXT
+
+    def test_severity_schedule_repeats_last(self):
+        """Attempts past the schedule keep its last severity."""
+        schedule = ["HIGH", "LOW", "ZERO"]
+
+        assert [severity_for(schedule, n) for n in (1, 2, 3, 7)] == ["HIGH", "LOW", "ZERO", "ZERO"]
+
+
+# =============================================================================
+# Test: Synthetic runs
+# =============================================================================
+
+
+class TestSynthetic:
+    def test_code_review_severity_per_attempt(self):
+        """The orchestrator reads the scheduled severity for each attempt."""
+        for attempt, expected in ((1, "HIGH"), (2, "ZERO")):
+            code, events, _ = run_fake(
+                f"Story key: 2a-1-a\nEpic ID: 2a\nReview attempt: {attempt}", "--sim-severity", "HIGH,ZERO"
+            )
+
+            assert code == 0
+            assert output_of(events).highest_severity == expected
+
+    def test_tech_spec_decision_per_story(self):
+        """create-story output carries one decision per story key."""
+        _, events, _ = run_fake("Story keys: 2a-1-a,2a-2-b\nEpic ID: 2a", "--sim-tech-spec", "REQUIRED")
+
+        assert output_of(events).tech_spec_decisions(["2a-1-a", "2a-2-b"]) == {
+            "2a-1-a": "REQUIRED", "2a-2-b": "REQUIRED",
+        }
+
+    def test_critical_story_review(self):
+        """--sim-critical flags the first story review only, not the chain."""
+        _, first, _ = run_fake("Story keys: 2a-1-a\nEpic ID: 2a\nReview attempt: 1", "--sim-critical")
+        _, chain, _ = run_fake("Story keys: 2a-1-a\nEpic ID: 2a\nReview attempt: 2", "--sim-critical")
+
+        assert output_of(first).has_critical_issues
+        assert not output_of(chain).has_critical_issues
+
+    def test_filler_has_no_markers(self):
+        """Dev-story output reports nothing the orchestrator would act on."""
+        _, events, _ = run_fake("Story key: 2a-1-a\nEpic ID: 2a", "--sim-tokens", "2000")
+        output = output_of(events)
+
+        assert output.highest_severity == "UNKNOWN"
+        assert not output.has_critical_issues
+
+    def test_tool_results_carry_sprint_log_lines(self, tmp_path):
+        """The first and last tool_result parse as command start and end."""
+        orchestrator = Orchestrator(project_root=tmp_path)
+        _, events, _ = run_fake("Story key: 2a-1-a\nEpic ID: 2a", "--sim-tool-results", "3")
+
+        tasks = [orchestrator._extract_task_event(e) for e in events if e["type"] == "tool_result"]
+
+        assert [task and task["status"] for task in tasks] == ["start", None, "end"]
+        assert tasks[0]["story_id"] == "2a-1-a"
+        assert tasks[0]["command"] == "sprint-dev-story"
+
+    def test_line_size(self):
+        """tool_result content is padded to --sim-line-kb."""
+        _, events, _ = run_fake("Story key: 2a-1-a\nEpic ID: 2a", "--sim-line-kb", "4")
+
+        sizes = [len(e["content"]) for e in events if e["type"] == "tool_result"]
+        assert sizes and all(size == 4096 for size in sizes)
+
+    def test_same_seed_same_output(self):
+        """Runs are repeatable."""
+        prompt = "Story key: 2a-1-a\nEpic ID: 2a"
+        first = [e for e in run_fake(prompt)[1] if e["type"] == "assistant"]
+        second = [e for e in run_fake(prompt)[1] if e["type"] == "assistant"]
+
+        assert first == second
+
+    def test_exit_code_and_unreadable_injection_file(self, tmp_path):
+        """Failures are simulated, and a missing injection file fails like the CLI."""
+        code, events, _ = run_fake("Story key: 2a-1-a", "--sim-exit-code", "3")
+        assert code == 3
+        assert events[-1]["is_error"] is True
+
+        code, _, stderr = run_fake("Story key: 2a-1-a", "--prompt-system-append-file", str(tmp_path / "missing"))
+        assert code == 1
+        assert "prompt-system-append-file" in stderr
+
+
+# =============================================================================
+# Test: Replay
+# =============================================================================
+
+
+class TestReplay:
+    def test_replays_phase_transcript_with_placeholders(self, tmp_path):
+        """A directory replays <phase>-<attempt>.ndjson before <phase>.ndjson."""
+        recorded = [
+            {"type": "tool_result", "content": '{{timestamp}},{{epic_id}},{{story_key}},sprint-code-review,x,start,"m"'},
+            {"type": "assistant", "message": {"content": [{"type": "text", "text": "HIGHEST SEVERITY: MEDIUM"}]}},
+        ]
+        (tmp_path / "code-review-1.ndjson").write_text("\n".join(json.dumps(e) for e in recorded) + "\n")
+        (tmp_path / "code-review.ndjson").write_text(json.dumps(
+            {"type": "assistant", "message": {"content": [{"type": "text", "text": "ZERO ISSUES"}]}}
+        ) + "\n")
+
+        _, first, _ = run_fake("Story key: 2a-1-a\nEpic ID: 2a\nReview attempt: 1", "--sim-replay", str(tmp_path))
+        _, second, _ = run_fake("Story key: 2a-1-a\nEpic ID: 2a\nReview attempt: 2", "--sim-replay", str(tmp_path))
+
+        task = Orchestrator(project_root=tmp_path)._extract_task_event(first[1])
+        assert (task["epic_id"], task["story_id"]) == ("2a", "2a-1-a")
+        assert output_of(first).highest_severity == "MEDIUM"
+        assert output_of(second).highest_severity == "ZERO"
+
+    def test_missing_transcript(self, tmp_path):
+        """A directory without a matching transcript is an error."""
+        code, _, stderr = run_fake("Story key: 2a-1-a\nEpic ID: 2a", "--sim-replay", str(tmp_path))
+
+        assert code == 2
+        assert "no transcript" in stderr
+
+
+# =============================================================================
+# Test: Orchestrator integration
+# =============================================================================
+
+
+class TestOrchestratorCommand:
+    def test_default_command_is_claude(self, tmp_path):
+        """Without the env var the claude_command setting is used."""
+        with patch.dict(os.environ):
+            os.environ.pop(CLAUDE_COMMAND_ENV_VAR, None)
+            assert Orchestrator(project_root=tmp_path)._claude_command() == ["claude"]
+
+    @pytest.mark.asyncio
+    async def test_spawn_subagent_runs_simulator(self, tmp_path):
+        """SPRINT_RUNNER_CLAUDE points spawn_subagent at the simulator."""
+        command = shlex.join([sys.executable, str(FAKE_CLAUDE), *FAST, "--sim-severity", "LOW"])
+        orchestrator = Orchestrator(project_root=tmp_path)
+        try:
+            with patch.dict(os.environ, {CLAUDE_COMMAND_ENV_VAR: command}):
+                result = await orchestrator.spawn_subagent(
+                    "Story key: 2a-1-a\nEpic ID: 2a\nReview attempt: 1",
+                    "sprint-code-review-1",
+                    model="haiku",
+                    prompt_system_append="<file_injections></file_injections>",
+                )
+        finally:
+            await orchestrator.event_writer.stop()
+
+        assert result["status"] == "completed"
+        assert result["output"].highest_severity == "LOW"
+
+    @pytest.mark.asyncio
+    async def test_failing_consumer_kills_child(self, tmp_path):
+        """A consumer error mid-stream kills and reaps the still-running child."""
+        processes = []
+        spawn = asyncio.subprocess.create_subprocess_exec
+
+        async def tracked_spawn(*args, **kwargs):
+            processes.append(await spawn(*args, **kwargs))
+            return processes[-1]
+
+        class Failing(StreamConsumer):
+            def feed(self, text):
+                raise RuntimeError("consumer failed")
+
+        # Slow enough that the child is still streaming when the consumer fails
+        command = shlex.join([sys.executable, str(FAKE_CLAUDE), "--sim-startup-ms", "0", "--sim-tokens", "6000"])
+        orchestrator = Orchestrator(project_root=tmp_path)
+        try:
+            with patch.dict(os.environ, {CLAUDE_COMMAND_ENV_VAR: command}), \
+                    patch("asyncio.subprocess.create_subprocess_exec", tracked_spawn):
+                with pytest.raises(RuntimeError, match="consumer failed"):
+                    await orchestrator.spawn_subagent(
+                        "Story key: 2a-1-a\nEpic ID: 2a", "sprint-dev-story", consumers=[Failing()]
+                    )
+        finally:
+            await orchestrator.event_writer.stop()
+
+        assert processes[0].returncode is not None
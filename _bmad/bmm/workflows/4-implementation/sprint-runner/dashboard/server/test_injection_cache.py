@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed injection cache.
+
+Run with: cd dashboard && pytest -v server/test_injection_cache.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.injection_cache import InjectionCache, render_xml
+
+
+def write_settled(path: Path, content: str) -> Path:
+    """Write a file and backdate its mtime so its fingerprint is trusted."""
+    path.write_text(content)
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return path
+
+
+@pytest.fixture
+def story(tmp_path):
+    return write_settled(tmp_path / "sprint-1-1-story.md", "# Story 1-1")
+
+
+# =============================================================================
+# Test: File reads
+# =============================================================================
+
+
+class TestRead:
+    def test_unchanged_file_is_read_once(self, story):
+        """A file with an unchanged fingerprint is served from memory."""
+        cache = InjectionCache()
+        cache.read(story)
+
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("re-read")):
+            assert cache.read(story).content == "# Story 1-1"
+
+        assert (cache.file_misses, cache.file_hits) == (1, 1)
+
+    def test_changed_file_is_read_again(self, story):
+        """A new size or mtime invalidates the cached content."""
+        cache = InjectionCache()
+        first = cache.read(story)
+        write_settled(story, "# Story 1-1, revised")
+        os.utime(story, (time.time() - 30, time.time() - 30))
+
+        second = cache.read(story)
+
+        assert second.content == "# Story 1-1, revised"
+        assert second.digest != first.digest
+
+    def test_recently_written_file_is_not_trusted(self, tmp_path):
+        """A file written within the racy window is re-read on the next call."""
+        path = tmp_path / "fresh.md"
+        path.write_text("v1")
+        cache = InjectionCache()
+        cache.read(path)
+
+        assert cache.read(path).content == "v1"
+        assert cache.file_misses == 2
+
+    def test_missing_and_unreadable_files(self, tmp_path):
+        """Missing paths, directories and undecodable files return None."""
+        binary = tmp_path / "image.png"
+        binary.write_bytes(b"\x89PNG\xff\xfe")
+        cache = InjectionCache()
+
+        assert cache.read(tmp_path / "missing.md") is None
+        assert cache.read(tmp_path) is None
+        assert cache.read(binary) is None
+
+    def test_file_lru_eviction(self, tmp_path):
+        """The least recently used file is evicted past max_files."""
+        paths = [write_settled(tmp_path / f"{n}.md", str(n)) for n in range(3)]
+        cache = InjectionCache(max_files=2)
+        for path in paths:
+            cache.read(path)
+
+        cache.read(paths[0])
+
+        assert cache.stats()["files"] == 2
+        assert cache.file_misses == 4
+
+
+# =============================================================================
+# Test: Rendering
+# =============================================================================
+
+
+class TestRender:
+    def test_xml_format(self):
+        """Each file becomes a <file> element; quotes in paths are escaped."""
+        assert render_xml([('a"b.md', "text")]) == (
+            '<file_injections rule="DO NOT read these files - content already provided">\n'
+            '  <file path="a&quot;b.md">\n'
+            'text\n'
+            '  </file>\n'
+            '</file_injections>'
+        )
+
+    def test_identical_content_reuses_injection(self, story):
+        """The same file set with the same contents is rendered once."""
+        cache = InjectionCache()
+        first = cache.render([("story.md", cache.read(story))])
+        second = cache.render([("story.md", cache.read(story))])
+
+        assert second is first
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert first.size_bytes == len(first.xml.encode("utf-8"))
+
+    def test_changed_content_or_order_renders_again(self, tmp_path, story):
+        """A different digest or file order is a different injection."""
+        other = write_settled(tmp_path / "other.md", "other")
+        cache = InjectionCache()
+        a, b = cache.read(story), cache.read(other)
+
+        cache.render([("s", a), ("o", b)])
+        cache.render([("o", b), ("s", a)])
+
+        assert cache.misses == 2
+
+    def test_injection_lru_eviction(self, story):
+        """The least recently used injection is evicted past max_injections."""
+        cache = InjectionCache(max_injections=1)
+        file = cache.read(story)
+        cache.render([("a", file)])
+        cache.render([("b", file)])
+        cache.render([("a", file)])
+
+        assert cache.misses == 3
+        assert cache.stats()["injections"] == 1
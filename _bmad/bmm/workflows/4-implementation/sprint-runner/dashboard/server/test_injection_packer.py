@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-budget injection packer.
+
+Run with: cd dashboard && pytest -v server/test_injection_packer.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.injection_cache import render_xml
+from server.injection_packer import (
+    LEVEL_FULL,
+    LEVEL_OMITTED,
+    LEVEL_OUTLINE,
+    LEVEL_SUMMARY,
+    estimate_tokens,
+    outline,
+    pack,
+    summarize,
+)
+
+STORY = """# Story 2a.1: Parser
+
+## Story
+
+As a developer, I want a parser,
+so that input is validated.
+
+More detail that only the full file keeps.
+
+## Tasks
+
+- [ ] Task 1
+- [ ] Task 2
+
+```python
+# not a heading
+print("code")
+```
+
+## Dev Notes
+
+Notes paragraph.
+"""
+
+
+def files_of(*sizes: int) -> list[tuple[str, str, None]]:
+    """Markdown files of roughly the given byte sizes, in priority order."""
+    return [
+        (f"file-{n}.md", f"# File {n}\n\nFirst paragraph.\n\n" + "body line\n" * (size // 10), None)
+        for n, size in enumerate(sizes)
+    ]
+
+
+# =============================================================================
+# Test: Degradation levels
+# =============================================================================
+
+
+class TestDegrade:
+    def test_summary_keeps_headings_and_first_paragraphs(self):
+        """Summaries keep each heading and the paragraph right after it."""
+        summary = summarize(STORY)
+
+        assert "As a developer, I want a parser,\nso that input is validated." in summary
+        assert "More detail" not in summary
+        assert "- [ ] Task 1" in summary
+        assert "- [ ] Task 2" in summary
+        assert "Notes paragraph." in summary
+        assert "print" not in summary
+
+    def test_outline_skips_code_fences(self):
+        """Outlines keep Markdown headings only, never comments inside code."""
+        assert outline(STORY).splitlines() == [
+            "# Story 2a.1: Parser", "## Story", "## Tasks", "## Dev Notes",
+        ]
+
+    def test_summary_without_headings_keeps_leading_lines(self):
+        """Non-Markdown files (e.g. YAML) keep their first lines."""
+        yaml_text = "\n".join(f"key{n}: value" for n in range(50))
+
+        assert summarize(yaml_text).splitlines() == [f"key{n}: value" for n in range(20)]
+
+
+# =============================================================================
+# Test: Packing
+# =============================================================================
+
+
+class TestPack:
+    def test_fits_unchanged(self):
+        """Everything under budget is packed in full."""
+        result = pack(files_of(400, 400), budget_tokens=10_000)
+
+        assert result.trimmed == []
+        assert [f.level for f in result.files] == [LEVEL_FULL, LEVEL_FULL]
+
+    def test_trims_lowest_priority_first(self):
+        """The last file is degraded before any earlier one is touched."""
+        files = files_of(2000, 2000, 2000)
+        full = pack(files, budget_tokens=10_000).tokens
+
+        result = pack(files, budget_tokens=full - 100)
+
+        assert [f.level for f in result.files] == [LEVEL_FULL, LEVEL_FULL, LEVEL_SUMMARY]
+        assert result.tokens <= full - 100
+
+    def test_degrades_through_outline_to_omitted(self):
+        """A tight budget walks files down every level, from the back."""
+        files = files_of(4000, 4000, 4000)
+
+        result = pack(files, budget_tokens=1100)
+
+        assert [f.level for f in result.files] == [LEVEL_FULL, LEVEL_OUTLINE, LEVEL_OMITTED]
+        assert result.tokens <= 1100
+
+    def test_estimate_bounds_rendered_bytes(self):
+        """Packed token estimates cover the real XML, so byte limits hold."""
+        files = [("ünïcode.md", "é" * 3000, None), ("a\"b.md", STORY, None)]
+        result = pack(files, budget_tokens=800)
+
+        xml = render_xml([(f.path, f.content) for f in result.files])
+
+        assert len(xml.encode("utf-8")) <= result.tokens * 4
+        assert result.tokens <= 800
+
+    def test_trimmed_files_carry_a_note(self):
+        """Trimmed content tells the agent to read the file for the rest."""
+        result = pack([("story.md", STORY * 20, None)], budget_tokens=200)
+
+        assert result.files[0].level != LEVEL_FULL
+        assert "read this file" in result.files[0].content
+
+    def test_estimate_tokens_rounds_up(self):
+        """Partial tokens count as whole ones."""
+        assert estimate_tokens(0) == 0
+        assert estimate_tokens(1) == 1
+        assert estimate_tokens(8) == 2
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the prompt injection transport.
+
+Run with: cd dashboard && pytest -v server/test_injection_transport.py
+"""
+
+from __future__ import annotations
+
+import stat
+import sys
+from pathlib import Path
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.injection_transport import FILE_FLAG, INLINE_FLAG, MAX_ARG_STRLEN, InjectionFiles
+from server.settings import Settings
+
+
+class TestInjectionFiles:
+    def test_file_transport_disabled_by_default(self):
+        """The unverified file flag must never be emitted unless opted in."""
+        assert Settings().injection_file_transport is False
+
+    def test_disabled_transport_always_inline(self, tmp_path):
+        """Without a threshold every injection is passed inline and no file is written."""
+        files = InjectionFiles(inline_max_bytes=None, directory=tmp_path)
+
+        for size in (0, 1024, MAX_ARG_STRLEN, 2 * MAX_ARG_STRLEN):
+            assert FILE_FLAG not in files.args("x" * size)
+        assert files.written == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_opted_in_only_files_what_argv_cannot_hold(self, tmp_path):
+        """With the default threshold the file flag is used only near MAX_ARG_STRLEN."""
+        files = InjectionFiles(Settings().injection_inline_max_kb * 1024, directory=tmp_path)
+
+        assert files.args("x" * 100 * 1024)[0] == INLINE_FLAG
+        assert files.args("x" * MAX_ARG_STRLEN)[0] == FILE_FLAG
+
+    def test_small_injection_is_inline(self, tmp_path):
+        """Injections up to the limit keep the original inline argument."""
+        files = InjectionFiles(inline_max_bytes=16, directory=tmp_path)
+
+        assert files.args("<x>small</x>") == [INLINE_FLAG, "<x>small</x>"]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_limit_counts_utf8_bytes(self, tmp_path):
+        """Multi-byte characters count by their encoded size."""
+        files = InjectionFiles(inline_max_bytes=10, directory=tmp_path)
+
+        assert files.args("é" * 6)[0] == FILE_FLAG
+
+    def test_large_injection_goes_to_private_file(self, tmp_path):
+        """Larger injections are written once and passed by path."""
+        files = InjectionFiles(inline_max_bytes=4, directory=tmp_path)
+
+        flag, path = files.args("<file_injections>ünïcode</file_injections>")
+
+        assert flag == FILE_FLAG
+        assert Path(path).read_text(encoding="utf-8") == "<file_injections>ünïcode</file_injections>"
+        assert stat.S_IMODE(Path(path).stat().st_mode) == 0o600
+
+    def test_identical_injections_share_a_file(self, tmp_path):
+        """The file name is content-addressed, so repeats reuse it."""
+        files = InjectionFiles(inline_max_bytes=0, directory=tmp_path)
+
+        first = files.args("same")
+        second = files.args("same")
+        other = files.args("other")
+
+        assert first == second
+        assert other != first
+        assert (files.written, files.reused) == (2, 1)
+
+    def test_cleanup_removes_files_and_owned_directory(self):
+        """At batch end the files and the private temp dir are removed."""
+        files = InjectionFiles(inline_max_bytes=0)
+        path = Path(files.args("content")[1])
+        directory = files.directory
+
+        assert files.cleanup() == 1
+        assert not path.exists()
+        assert not directory.exists()
+
+    def test_cleanup_keeps_given_directory(self, tmp_path):
+        """A caller-provided directory is emptied but not removed."""
+        files = InjectionFiles(inline_max_bytes=0, directory=tmp_path)
+        files.args("content")
+
+        files.cleanup()
+
+        assert tmp_path.exists()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rewritten_after_external_deletion(self, tmp_path):
+        """A file removed behind our back is written again."""
+        files = InjectionFiles(inline_max_bytes=0, directory=tmp_path)
+        path = Path(files.args("content")[1])
+        path.unlink()
+
+        assert files.args("content")[1] == str(path)
+        assert path.read_text() == "content"
@@ -126,10 +126,12 @@ def temp_db_path(tmp_path):
 
 @pytest.fixture
 def clear_websocket_clients():
-    """Clear WebSocket clients before and after each test."""
+    """Clear WebSocket clients and their send queues before and after each test."""
     server.connected_clients.clear()
+    server._outboxes.clear()
     yield
     server.connected_clients.clear()
+    server._outboxes.clear()
 
 
 # =============================================================================
@@ -222,6 +224,38 @@ class TestWebSocketConnection:
         # Note: cleanup may be async, so connection count might take time to update
 
 
+    @pytest.mark.asyncio
+    async def test_events_during_initial_state_follow_init_once(
+        self, aiohttp_client, clear_websocket_clients
+    ):
+        """Events published while init is built arrive after it, and are not repeated."""
+        from server import aiodb
+
+        server.recent_events.clear()
+        server.emit_event("batch:start", {"batch_id": 7, "max_cycles": 1})
+
+        async def active_batch():
+            # Published while the init snapshot is being built
+            server.emit_event("cycle:start", {"cycle_number": 1})
+            await asyncio.sleep(0)
+            return {"id": 7, "status": "running"}
+
+        app = server.create_app()
+        client = await aiohttp_client(app)
+        try:
+            with patch.object(aiodb, "get_active_batch", side_effect=active_batch):
+                async with client.ws_connect("/ws") as ws:
+                    init = await asyncio.wait_for(ws.receive_json(), timeout=5)
+                    assert init["type"] == "init"
+                    assert [e["type"] for e in init["payload"]["events"]] == ["cycle:start", "batch:start"]
+
+                    server.emit_event("cycle:end", {"cycle_number": 1})
+                    following = await asyncio.wait_for(ws.receive_json(), timeout=5)
+                    assert following["type"] == "cycle:end"
+        finally:
+            server.recent_events.clear()
+
+
 # =============================================================================
 # Test: Orchestrator Control Endpoints (AC: 1.4)
 # =============================================================================
@@ -341,6 +375,7 @@ class TestEventStreaming:
         # Emit event without timestamp
         test_event = {"type": "test", "payload": {"data": "value"}}
         await server.broadcast(test_event)
+        await server.flush_clients()
 
         # Check that timestamp was added
         mock_ws.send_str.assert_called_once()
@@ -375,7 +410,7 @@ class TestSprintStatusUpdates:
             orch.current_batch_id = 1
 
             # Update story status
-            orch.update_sprint_status("1-2-second-story", "in-progress")
+            await orch.update_sprint_status("1-2-second-story", "in-progress")
 
             # Read back and verify
             import yaml
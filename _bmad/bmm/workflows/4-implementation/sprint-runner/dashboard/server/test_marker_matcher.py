@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming Aho-Corasick marker matcher.
+
+Run with: cd dashboard && pytest -v server/test_marker_matcher.py
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.marker_matcher import MarkerMatcher
+
+
+def naive_ends(text: str, markers: list[str]) -> list[tuple[int, str]]:
+    """Every (end offset, marker) occurrence, found by brute force."""
+    found = []
+    for marker in markers:
+        start = text.find(marker)
+        while start != -1:
+            found.append((start + len(marker), marker))
+            start = text.find(marker, start + 1)
+    return found
+
+
+# =============================================================================
+# Test: Matching
+# =============================================================================
+
+
+class TestMarkerMatcher:
+    def test_overlapping_and_nested_markers(self):
+        """All occurrences should be reported, including overlapping ones."""
+        matcher = MarkerMatcher(["he", "she", "his", "hers"])
+        assert matcher.feed("ushers") == ["she", "he", "hers"]
+
+    def test_marker_split_across_feeds(self):
+        """State should carry over between pieces."""
+        matcher = MarkerMatcher(["HIGHEST SEVERITY: HIGH"])
+
+        assert matcher.feed("done. HIGHEST SEV") == []
+        assert matcher.feed("ERITY: HI") == []
+        assert matcher.feed("GH!") == ["HIGHEST SEVERITY: HIGH"]
+
+    def test_exact_markers_are_case_sensitive(self):
+        """Markers not listed in ignore_case should only match exactly."""
+        matcher = MarkerMatcher(["ZERO ISSUES"])
+        assert matcher.feed("zero issues ZERO issues") == []
+        assert matcher.feed("ZERO ISSUES") == ["ZERO ISSUES"]
+
+    def test_ignore_case_markers(self):
+        """ignore_case markers should match any ASCII case, split or not."""
+        marker = "[TECH-SPEC-DECISION: SKIP]"
+        matcher = MarkerMatcher([marker, "ZERO ISSUES"], ignore_case=[marker])
+
+        assert matcher.feed("[tech-spec-") == []
+        assert matcher.feed("Decision: Skip] zero issues") == [marker]
+
+    def test_non_ascii_text(self):
+        """Non-ASCII text around markers should not shift match positions."""
+        matcher = MarkerMatcher(["ZERO ISSUES"])
+        assert matcher.feed("İİ ✓ ZERO ISSUES ✓") == ["ZERO ISSUES"]
+
+    def test_matches_brute_force_on_random_text(self):
+        """Streaming results should equal brute-force search over the whole text."""
+        rng = random.Random(1234)
+        markers = ["ab", "abab", "bab", "ba", "aaa"]
+        for _ in range(50):
+            text = "".join(rng.choice("abx") for _ in range(200))
+            matcher = MarkerMatcher(markers)
+            found, pos = [], 0
+            while pos < len(text):
+                piece = text[pos:pos + rng.randint(1, 7)]
+                found.extend(matcher.feed(piece))
+                pos += len(piece)
+
+            expected = [marker for _, marker in sorted(
+                naive_ends(text, markers), key=lambda m: (m[0], -len(m[1]))
+            )]
+            assert sorted(found) == sorted(expected)
+
+    def test_reset(self):
+        """reset() should drop a partial match."""
+        matcher = MarkerMatcher(["ZERO ISSUES"])
+        matcher.feed("ZERO IS")
+        matcher.reset()
+        assert matcher.feed("SUES") == []
+
+    def test_rejects_empty_markers(self):
+        """Empty marker sets or markers should be rejected."""
+        with pytest.raises(ValueError):
+            MarkerMatcher([])
+        with pytest.raises(ValueError):
+            MarkerMatcher(["ok", ""])
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the chunked NDJSON line reader.
+
+Run with: cd dashboard && pytest -v server/test_ndjson.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.ndjson import iter_lines
+
+
+def make_stream(*chunks: bytes) -> asyncio.StreamReader:
+    """A StreamReader pre-fed with chunks and closed."""
+    stream = asyncio.StreamReader()
+    for chunk in chunks:
+        stream.feed_data(chunk)
+    stream.feed_eof()
+    return stream
+
+
+async def collect(stream: asyncio.StreamReader, chunk_size: int = 4) -> list[bytes]:
+    """Copy every yielded line (views are only valid until the next iteration)."""
+    return [bytes(line) async for line in iter_lines(stream, chunk_size)]
+
+
+# =============================================================================
+# Test: Line splitting
+# =============================================================================
+
+
+class TestIterLines:
+    @pytest.mark.asyncio
+    async def test_splits_lines_across_chunks(self):
+        """Lines split over many small reads should be reassembled."""
+        stream = make_stream(b'{"a":1}\n{"b"', b':2}\n{"c":3}\n')
+        assert await collect(stream) == [b'{"a":1}', b'{"b":2}', b'{"c":3}']
+
+    @pytest.mark.asyncio
+    async def test_skips_empty_lines(self):
+        """Blank lines should not be yielded."""
+        stream = make_stream(b"\n\na\n\n\nb\n")
+        assert await collect(stream) == [b"a", b"b"]
+
+    @pytest.mark.asyncio
+    async def test_yields_final_line_without_newline(self):
+        """A trailing line without newline should be yielded at EOF."""
+        stream = make_stream(b"a\nlast")
+        assert await collect(stream) == [b"a", b"last"]
+
+    @pytest.mark.asyncio
+    async def test_empty_stream(self):
+        """An empty stream should yield nothing."""
+        assert await collect(make_stream()) == []
+
+    @pytest.mark.asyncio
+    async def test_line_longer_than_stream_limit(self):
+        """Lines beyond StreamReader's 64 KiB readline() limit should be read whole."""
+        big = b'{"content":"' + b"x" * (1024 * 1024) + b'"}'
+        stream = make_stream(big + b"\n" + b'{"after":true}\n')
+
+        lines = await collect(stream, chunk_size=64 * 1024)
+
+        assert lines == [big, b'{"after":true}']
+
+    @pytest.mark.asyncio
+    async def test_yields_memoryviews(self):
+        """Lines should be memoryview slices, not copies."""
+        async for line in iter_lines(make_stream(b"abc\n")):
+            assert isinstance(line, memoryview)
+            assert line.tobytes() == b"abc"
+
+    @pytest.mark.asyncio
+    async def test_view_released_after_next_iteration(self):
+        """Views kept past their iteration should be released, not silently reused."""
+        kept = []
+        async for line in iter_lines(make_stream(b"one\ntwo\n"), chunk_size=4):
+            kept.append(line)
+
+        with pytest.raises(ValueError):
+            kept[0].tobytes()
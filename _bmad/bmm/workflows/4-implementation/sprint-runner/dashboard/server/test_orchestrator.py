@@ -21,6 +21,7 @@ import json
 import os
 import sys
 import tempfile
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
@@ -195,6 +196,18 @@ class TestStorySelection:
         result = orchestrator.select_stories(status)
         assert result == []
 
+    def test_fair_selection_state_spans_cycles(self, orchestrator):
+        """The fair selector lives for the batch; speculative picks do not count."""
+        from server.settings import Settings
+
+        status = {"development_status": {"1-1-a": "ready-for-dev", "1-2-b": "ready-for-dev", "2-1-c": "ready-for-dev"}}
+        settings = Settings(story_selection_strategy="fair", max_stories_per_cycle=1)
+        with patch("server.orchestrator.get_settings", return_value=settings):
+            assert orchestrator.select_stories(status) == ["1-1-a"]
+            status["development_status"]["1-1-a"] = "done"
+            assert orchestrator.select_stories(status, record=False) == ["2-1-c"]
+            assert orchestrator.select_stories(status) == ["2-1-c"]
+
 
 # =============================================================================
 # Test Epic Extraction
@@ -457,9 +470,10 @@ class TestCriticalIssuesDetection:
 class TestSprintStatusUpdates:
     """Tests for sprint-status.yaml updates."""
 
-    def test_update_sprint_status(self, orchestrator, project_root):
+    @pytest.mark.asyncio
+    async def test_update_sprint_status(self, orchestrator, project_root):
         """Should update story status in sprint-status.yaml."""
-        orchestrator.update_sprint_status("1-2-second-story", "done")
+        await orchestrator.update_sprint_status("1-2-second-story", "done")
 
         # Read back and verify
         import yaml
@@ -472,6 +486,29 @@ class TestSprintStatusUpdates:
 
         assert status["development_status"]["1-2-second-story"] == "done"
 
+    @pytest.mark.asyncio
+    async def test_update_sprint_status_db_calls_run_on_writer_thread(self, orchestrator, project_root):
+        """The story lookup and update must not block the event loop."""
+        import threading
+
+        threads = []
+
+        def lookup(**kwargs):
+            threads.append(threading.current_thread().name)
+            return {"id": 7}
+
+        def update(**kwargs):
+            threads.append(threading.current_thread().name)
+
+        with patch("server.orchestrator.get_story_by_key", side_effect=lookup), \
+                patch("server.orchestrator.update_story", side_effect=update) as mock_update:
+            await orchestrator.update_sprint_status("1-2-second-story", "blocked")
+
+        assert len(threads) == 2
+        assert all(name.startswith("db-writer") for name in threads)
+        assert mock_update.call_args.kwargs["status"] == "blocked"
+        assert mock_update.call_args.kwargs["ended_at"] is not None
+
     def test_get_story_status(self, orchestrator, project_root):
         """Should get current story status."""
         status = orchestrator._get_story_status("1-2-second-story")
@@ -538,10 +575,25 @@ class TestWebSocketEmission:
 
     def test_emit_event_handles_broadcast_failure(self, orchestrator):
         """Should handle broadcast failures gracefully."""
-        with patch("server.orchestrator.asyncio.create_task", side_effect=RuntimeError("No event loop")):
+        with patch("server.orchestrator.event_bus.publish", side_effect=RuntimeError("No event loop")):
             # Should not raise - failures are caught silently
             orchestrator.emit_event("test:event", {"data": "value"})
 
+    def test_emit_event_publishes_structured_event(self, orchestrator):
+        """Events should reach bus subscribers as objects, not JSON strings."""
+        from server.event_bus import event_bus
+
+        received = []
+        unsubscribe = event_bus.subscribe(received.append)
+        try:
+            orchestrator.emit_event("batch:start", {"batch_id": 1})
+        finally:
+            unsubscribe()
+
+        assert len(received) == 1
+        assert received[0].type == "batch:start"
+        assert received[0].payload == {"batch_id": 1}
+
 
 # =============================================================================
 # Test Extract Task Event
@@ -577,6 +629,197 @@ class TestExtractTaskEvent:
         assert result is None
 
 
+# =============================================================================
+# Test NDJSON Stream Parsing
+# =============================================================================
+
+
+class TestParseNdjsonStream:
+    """Tests for parsing claude stream-json output."""
+
+    @pytest.mark.asyncio
+    async def test_parses_lines_longer_than_stream_limit(self, orchestrator):
+        """Should parse tool_result lines beyond the 64 KiB readline() limit."""
+        big = {"type": "tool_result", "content": "x" * (512 * 1024)}
+        stream = asyncio.StreamReader()
+        stream.feed_data(json.dumps(big).encode() + b"\n" + b'{"type":"result"}\n')
+        stream.feed_eof()
+        events = [event async for event in orchestrator._parse_ndjson_stream(stream)]
+
+        assert events == [big, {"type": "result"}]
+
+    @pytest.mark.asyncio
+    async def test_skips_blank_and_malformed_lines(self, orchestrator):
+        """Should skip whitespace-only and malformed lines."""
+        stream = asyncio.StreamReader()
+        stream.feed_data(b'{"a":1}\r\n   \n{not json\n{"b":2}')
+        stream.feed_eof()
+        events = [event async for event in orchestrator._parse_ndjson_stream(stream)]
+
+        assert events == [{"a": 1}, {"b": 2}]
+
+
+class TestSpawnSubagentStreaming:
+    """Tests for spawn_subagent() consuming output incrementally."""
+
+    @staticmethod
+    def _mock_process(*events: dict) -> AsyncMock:
+        stream = asyncio.StreamReader()
+        for event in events:
+            stream.feed_data(json.dumps(event).encode() + b"\n")
+        stream.feed_eof()
+        process = AsyncMock()
+        process.stdin = MagicMock()
+        process.stdin.drain = AsyncMock()
+        process.stdout = stream
+        process.stderr = None
+        process.returncode = 0
+        return process
+
+    @staticmethod
+    def _assistant(text: str) -> dict:
+        return {"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}}
+
+    @pytest.mark.asyncio
+    async def test_scans_markers_split_across_events(self, orchestrator):
+        """Markers split over text blocks should be found by the streamed output."""
+        process = self._mock_process(
+            self._assistant("Review done. HIGHEST SEVER"),
+            self._assistant("ITY: HIGH"),
+        )
+        with patch("asyncio.subprocess.create_subprocess_exec", return_value=process):
+            result = await orchestrator.spawn_subagent("test prompt", "test-command")
+
+        assert result["stdout"] == "Review done. HIGHEST SEVERITY: HIGH"
+        assert orchestrator._subagent_output(result).highest_severity == "HIGH"
+
+    @pytest.mark.asyncio
+    async def test_events_not_kept_unless_debugging(self, orchestrator):
+        """Raw events should only be retained with debug logging enabled."""
+        process = self._mock_process(self._assistant("hi"), {"type": "result"})
+        with patch("asyncio.subprocess.create_subprocess_exec", return_value=process):
+            result = await orchestrator.spawn_subagent("test prompt", "test-command")
+
+        assert result["events"] == []
+
+    @pytest.mark.asyncio
+    async def test_extra_consumers_fed(self, orchestrator):
+        """Consumers passed by the caller should receive every event."""
+        from server.stream_consumers import MarkerScanner
+
+        scanner = MarkerScanner(["DONE"])
+        process = self._mock_process(self._assistant("all DONE"))
+        with patch("asyncio.subprocess.create_subprocess_exec", return_value=process):
+            await orchestrator.spawn_subagent("test prompt", "test-command", consumers=[scanner])
+
+        assert scanner.seen == {"DONE"}
+
+
+class TestSpawnSubagentChildIO:
+    """Tests for spawn_subagent() draining stderr (real child processes)."""
+
+    @staticmethod
+    def _run_python(script: str):
+        """Patch create_subprocess_exec to run a Python snippet instead of claude."""
+        real_exec = asyncio.create_subprocess_exec
+
+        async def run(*args, **kwargs):
+            return await real_exec(sys.executable, "-c", script, **kwargs)
+
+        return patch("asyncio.subprocess.create_subprocess_exec", new=run)
+
+    @pytest.mark.asyncio
+    async def test_verbose_failing_child_reports_stderr(self, orchestrator):
+        """Heavy stderr should not hang the child; failures surface the stderr tail."""
+        script = (
+            "import sys\n"
+            "sys.stdin.read()\n"
+            "for n in range(1000):\n"
+            "    sys.stderr.write('debug ' + 'x' * 500 + '\\n')\n"
+            "sys.stderr.write('Error: API key invalid\\n')\n"
+            "print('{\"type\": \"result\"}')\n"
+            "sys.exit(3)\n"
+        )
+        with self._run_python(script), patch.object(orchestrator, "emit_event") as mock_emit:
+            result = await asyncio.wait_for(
+                orchestrator.spawn_subagent("test prompt", "sprint-dev-story"), timeout=10
+            )
+
+        assert result["exit_code"] == 3
+        assert result["stderr"].endswith("Error: API key invalid\n")
+        assert result["io"]["stderr_bytes"] > 500_000
+        assert len(result["stderr"]) <= 64 * 1024
+
+        error_calls = [c for c in mock_emit.call_args_list if c.args[0] == "error"]
+        assert len(error_calls) == 1
+        payload = error_calls[0].args[1]
+        assert payload["command"] == "sprint-dev-story"
+        assert payload["exit_code"] == 3
+        assert "API key invalid" in payload["stderr"]
+
+    @pytest.mark.asyncio
+    async def test_successful_child_emits_no_error(self, orchestrator):
+        """A zero exit code should not be reported, even with stderr output."""
+        script = "import sys; sys.stdin.read(); sys.stderr.write('warning\\n')"
+        with self._run_python(script), patch.object(orchestrator, "emit_event") as mock_emit:
+            result = await orchestrator.spawn_subagent("test prompt", "test-command")
+
+        assert result["exit_code"] == 0
+        assert result["stderr"] == "warning\n"
+        assert not [c for c in mock_emit.call_args_list if c.args[0] == "error"]
+
+    @pytest.mark.asyncio
+    async def test_idle_child_is_killed_and_recorded_as_timeout(self, orchestrator):
+        """A silent child should be terminated; with no task in flight it is reported as an error."""
+        from server.watchdog import WatchdogLimits
+
+        script = "import sys, time; sys.stdin.read(); time.sleep(30)"
+        limits = WatchdogLimits(idle_seconds=0.3, kill_grace_seconds=1)
+        with self._run_python(script), \
+                patch("server.orchestrator.WatchdogLimits.for_command", return_value=limits), \
+                patch("server.orchestrator.event_bus.publish") as mock_publish, \
+                patch.object(orchestrator, "emit_event") as mock_emit:
+            result = await asyncio.wait_for(
+                orchestrator.spawn_subagent("test prompt", "sprint-dev-story"), timeout=10
+            )
+
+        assert result["status"] == "timeout"
+        assert result["timed_out"] == "idle"
+        assert not [c for c in mock_publish.call_args_list if c.args[0].type == "command:end"]
+
+        errors = [c.args[1] for c in mock_emit.call_args_list if c.args[0] == "error"]
+        assert len(errors) == 1
+        assert (errors[0]["type"], errors[0]["command"]) == ("subagent_timeout", "sprint-dev-story")
+
+    @pytest.mark.asyncio
+    async def test_timeout_closes_in_flight_task(self, orchestrator):
+        """The task running when the watchdog fires ends as 'timeout' under its own task_id."""
+        from server.watchdog import WatchdogLimits
+
+        script = (
+            "import json, sys, time\n"
+            "sys.stdin.read()\n"
+            "now = int(time.time())\n"
+            "for task, status in (('setup', 'start'), ('setup', 'end'), ('implement', 'start')):\n"
+            "    line = f'{now},1,1-1-a,sprint-dev-story,{task},{status},\"m\"'\n"
+            "    print(json.dumps({'type': 'tool_result', 'content': line}), flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        limits = WatchdogLimits(idle_seconds=0.5, kill_grace_seconds=1)
+        orchestrator.event_writer.write = MagicMock()
+        with self._run_python(script), \
+                patch("server.orchestrator.WatchdogLimits.for_command", return_value=limits), \
+                patch("server.orchestrator.event_bus.publish") as mock_publish:
+            result = await asyncio.wait_for(
+                orchestrator.spawn_subagent("test prompt", "sprint-dev-story"), timeout=10
+            )
+
+        assert result["status"] == "timeout"
+        ends = [c.args[0].payload for c in mock_publish.call_args_list if c.args[0].type == "command:end"]
+        assert [(e["task_id"], e.get("status")) for e in ends] == [("setup", "end"), ("implement", "timeout")]
+        assert ends[-1]["story_key"] == "1-1-a"
+
+
 # =============================================================================
 # Integration Tests (Mocked Subprocess)
 # =============================================================================
@@ -1035,6 +1278,304 @@ class TestReviewStatusHandler:
                                         mock_create.assert_not_called()
 
 
+# =============================================================================
+# Test Parallel Dev Phase
+# =============================================================================
+
+
+class TestParallelDevPhase:
+    """Tests for running the dev phase of several stories concurrently."""
+
+    STORIES = ["1-1-a", "1-2-b", "1-3-c"]
+
+    @staticmethod
+    def _settings(max_parallel_stories: int):
+        from server.settings import Settings
+
+        return patch(
+            "server.orchestrator.get_settings",
+            return_value=Settings(max_parallel_stories=max_parallel_stories),
+        )
+
+    @staticmethod
+    def _tracking_dev_phase(orchestrator, log: list):
+        """A dev phase stub recording concurrency and the story keys it sees."""
+        running = {"now": 0, "max": 0}
+
+        async def dev_phase(story_key):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            log.append((story_key, list(orchestrator.current_story_keys)))
+            running["now"] -= 1
+
+        return dev_phase, running
+
+    @pytest.mark.asyncio
+    async def test_default_runs_stories_sequentially(self, orchestrator):
+        """With max_parallel_stories=1 stories should run one at a time, in order."""
+        log: list = []
+        dev_phase, running = self._tracking_dev_phase(orchestrator, log)
+        with self._settings(1), patch.object(orchestrator, "_execute_dev_phase", new=dev_phase):
+            await orchestrator._run_cycle_phases(self.STORIES, "ready-for-dev")
+
+        assert running["max"] == 1
+        assert [key for key, _ in log] == self.STORIES
+
+    @pytest.mark.asyncio
+    async def test_runs_up_to_limit_concurrently(self, orchestrator):
+        """Stories should overlap, bounded by max_parallel_stories."""
+        log: list = []
+        dev_phase, running = self._tracking_dev_phase(orchestrator, log)
+        with self._settings(2), patch.object(orchestrator, "_execute_dev_phase", new=dev_phase):
+            await orchestrator._run_cycle_phases(self.STORIES, "ready-for-dev")
+
+        assert running["max"] == 2
+        assert sorted(key for key, _ in log) == self.STORIES
+
+    @pytest.mark.asyncio
+    async def test_each_story_sees_its_own_story_keys(self, orchestrator):
+        """current_story_keys should be scoped to the story inside its dev phase."""
+        orchestrator.current_story_keys = self.STORIES
+        log: list = []
+        dev_phase, _ = self._tracking_dev_phase(orchestrator, log)
+        with self._settings(3), patch.object(orchestrator, "_execute_dev_phase", new=dev_phase):
+            await orchestrator._run_cycle_phases(self.STORIES, "ready-for-dev")
+
+        assert all(keys == [key] for key, keys in log)
+        assert orchestrator.current_story_keys == self.STORIES
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_abandon_other_stories(self, orchestrator):
+        """One failing story should not stop the others; the error is raised after."""
+        finished = []
+
+        async def dev_phase(story_key):
+            await asyncio.sleep(0.01)
+            if story_key == "1-1-a":
+                raise RuntimeError("boom")
+            finished.append(story_key)
+
+        with self._settings(3), patch.object(orchestrator, "_execute_dev_phase", new=dev_phase):
+            with pytest.raises(RuntimeError, match="boom"):
+                await orchestrator._run_cycle_phases(self.STORIES, "ready-for-dev")
+
+        assert sorted(finished) == ["1-2-b", "1-3-c"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_failure_stops_remaining_stories(self, orchestrator):
+        """With one dev slot a failing story should stop the stories after it."""
+        started = []
+
+        async def dev_phase(story_key):
+            started.append(story_key)
+            raise RuntimeError("boom")
+
+        with self._settings(1), patch.object(orchestrator, "_execute_dev_phase", new=dev_phase):
+            with pytest.raises(RuntimeError, match="boom"):
+                await orchestrator._run_cycle_phases(self.STORIES, "ready-for-dev")
+
+        assert started == ["1-1-a"]
+
+    @pytest.mark.asyncio
+    async def test_backlog_cycle_phase_order_and_critical_path(self, orchestrator):
+        """Backlog cycles run create/review phases before dev; skipped tech-spec is not on the path."""
+        calls = []
+
+        def phase(name):
+            async def run(*args):
+                calls.append(name)
+            return run
+
+        orchestrator.tech_spec_needed = False
+        with self._settings(2), \
+                patch.object(orchestrator, "_execute_create_story_phase", new=phase("create")), \
+                patch.object(orchestrator, "_execute_story_review_phase", new=phase("review")), \
+                patch.object(orchestrator, "_execute_tech_spec_phase", new=phase("tech-spec")), \
+                patch.object(orchestrator, "_execute_dev_phase", new=phase("dev")), \
+                patch.object(orchestrator, "_execute_batch_commit", new=phase("commit")), \
+                patch.object(orchestrator, "_get_story_status", return_value="done"):
+            report = await orchestrator._run_cycle_phases(self.STORIES[:2], "backlog")
+
+        assert calls == ["create", "review", "dev", "dev", "commit"]
+        path = [timing.name for timing in report.critical_path()]
+        assert path[:2] == ["create-story", "story-review"]
+        assert path[-1] == "batch-commit"
+        assert "tech-spec" not in path
+
+    @pytest.mark.asyncio
+    async def test_state_waits_until_last_child_exits(self, orchestrator):
+        """State should stay WAITING_CHILD while any concurrent child is running."""
+        orchestrator._enter_child()
+        orchestrator._enter_child()
+        orchestrator._leave_child()
+        assert orchestrator.state == OrchestratorState.WAITING_CHILD
+
+        orchestrator._leave_child()
+        assert orchestrator.state == OrchestratorState.RUNNING_CYCLE
+
+
+# =============================================================================
+# Test Cross-Cycle Pipelining
+# =============================================================================
+
+
+class TestCyclePipelining:
+    """Tests for preparing the next cycle's stories during the dev phase."""
+
+    STATUS = {
+        "development_status": {
+            "1-1-a": "in-progress",
+            "1-2-b": "backlog",
+            "1-3-c": "backlog",
+        }
+    }
+
+    @staticmethod
+    def _settings(**overrides):
+        from server.settings import Settings
+
+        return patch("server.orchestrator.get_settings", return_value=Settings(**overrides))
+
+    @pytest.mark.asyncio
+    async def test_next_cycle_created_during_dev(self, orchestrator):
+        """create-story for the next stories should run while the current story is in dev."""
+        from server.orchestrator import PreparedStories
+
+        log = []
+
+        async def dev_phase(story_key):
+            log.append(f"dev start {story_key}")
+            await asyncio.sleep(0.02)
+            log.append(f"dev end {story_key}")
+
+        async def create_phase(story_keys):
+            log.append(f"create {','.join(story_keys)}")
+            assert orchestrator.current_story_keys == story_keys
+            orchestrator.tech_spec_needed = True
+            orchestrator.tech_spec_decisions = {"1-2-b": "REQUIRED", "1-3-c": "SKIP"}
+
+        orchestrator.tech_spec_needed = False
+        with self._settings(pipeline_cycles=True), \
+                patch.object(orchestrator, "read_sprint_status", return_value=self.STATUS), \
+                patch.object(orchestrator, "_execute_dev_phase", new=dev_phase), \
+                patch.object(orchestrator, "_execute_create_story_phase", new=create_phase):
+            await orchestrator._run_cycle_phases(["1-1-a"], "in-progress")
+
+        assert log == ["dev start 1-1-a", "create 1-2-b,1-3-c", "dev end 1-1-a"]
+        assert orchestrator._prepared == PreparedStories(
+            ["1-2-b", "1-3-c"], {"1-2-b": "REQUIRED", "1-3-c": "SKIP"}
+        )
+        assert orchestrator.tech_spec_needed is False  # Current cycle's state untouched
+
+    @pytest.mark.asyncio
+    async def test_batch_commit_waits_for_preparation(self, orchestrator):
+        """The commit must not run while the next cycle's story files are being written."""
+        log = []
+
+        async def create_phase(story_keys):
+            log.append("create start")
+            await asyncio.sleep(0.05)
+            log.append("create end")
+
+        async def commit(story_keys):
+            log.append("commit")
+
+        with self._settings(pipeline_cycles=True), \
+                patch.object(orchestrator, "read_sprint_status", return_value=self.STATUS), \
+                patch.object(orchestrator, "_execute_dev_phase", new_callable=AsyncMock), \
+                patch.object(orchestrator, "_execute_create_story_phase", new=create_phase), \
+                patch.object(orchestrator, "_execute_batch_commit", new=commit), \
+                patch.object(orchestrator, "_get_story_status", return_value="done"):
+            await orchestrator._run_cycle_phases(["1-1-a"], "in-progress")
+
+        assert log == ["create start", "create end", "commit"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, orchestrator):
+        """Without pipeline_cycles nothing should be prepared."""
+        with self._settings(), \
+                patch.object(orchestrator, "read_sprint_status", return_value=self.STATUS), \
+                patch.object(orchestrator, "_execute_dev_phase", new_callable=AsyncMock), \
+                patch.object(orchestrator, "_execute_create_story_phase", new_callable=AsyncMock) as mock_create:
+            await orchestrator._run_cycle_phases(["1-1-a"], "in-progress")
+
+        mock_create.assert_not_called()
+        assert orchestrator._prepared is None
+
+    @pytest.mark.asyncio
+    async def test_not_prepared_on_last_fixed_cycle(self, orchestrator):
+        """The last cycle of a fixed batch has no next cycle to prepare."""
+        orchestrator.batch_mode = "fixed"
+        orchestrator.max_cycles = 1
+        with self._settings(pipeline_cycles=True), \
+                patch.object(orchestrator, "read_sprint_status", return_value=self.STATUS), \
+                patch.object(orchestrator, "_execute_dev_phase", new_callable=AsyncMock), \
+                patch.object(orchestrator, "_execute_create_story_phase", new_callable=AsyncMock) as mock_create:
+            await orchestrator._run_cycle_phases(["1-1-a"], "in-progress")
+
+        mock_create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_prepare_failure_does_not_fail_cycle(self, orchestrator):
+        """Speculative work failing should leave the cycle and the next selection alone."""
+        with self._settings(pipeline_cycles=True), \
+                patch.object(orchestrator, "read_sprint_status", return_value=self.STATUS), \
+                patch.object(orchestrator, "_execute_dev_phase", new_callable=AsyncMock) as mock_dev, \
+                patch.object(
+                    orchestrator, "_execute_create_story_phase",
+                    new_callable=AsyncMock, side_effect=RuntimeError("API down"),
+                ):
+            await orchestrator._run_cycle_phases(["1-1-a"], "in-progress")
+
+        mock_dev.assert_awaited_once_with("1-1-a")
+        assert orchestrator._prepared is None
+
+    @pytest.mark.asyncio
+    async def test_prepared_cycle_skips_create_story_only(self, orchestrator):
+        """A prepared cycle restores create-story's decisions and runs the remaining phases."""
+        from server.orchestrator import PreparedStories
+
+        prepared = PreparedStories(["1-2-b"], {"1-2-b": "REQUIRED"})
+        with self._settings(), \
+                patch.object(orchestrator, "_execute_create_story_phase", new_callable=AsyncMock) as mock_create, \
+                patch.object(orchestrator, "_execute_story_review_phase", new_callable=AsyncMock) as mock_review, \
+                patch.object(orchestrator, "_execute_tech_spec_phase", new_callable=AsyncMock) as mock_spec, \
+                patch.object(orchestrator, "_execute_tech_spec_review_phase", new_callable=AsyncMock), \
+                patch.object(orchestrator, "_execute_dev_phase", new_callable=AsyncMock), \
+                patch.object(orchestrator, "_get_story_status", return_value="review"):
+            await orchestrator._run_cycle_phases(["1-2-b"], "backlog", prepared)
+
+        mock_create.assert_not_called()
+        mock_review.assert_awaited_once_with(["1-2-b"])
+        mock_spec.assert_awaited_once_with(["1-2-b"])
+
+    def test_reconcile_adopts_matching_or_shrunk_selection(self, orchestrator):
+        """Selections within the prepared stories reuse the preparation."""
+        from server.orchestrator import PreparedStories
+
+        orchestrator._prepared = PreparedStories(["1-2-b", "1-3-c"], {"1-2-b": "SKIP", "1-3-c": "REQUIRED"})
+
+        taken = orchestrator._take_prepared(["1-2-b"])
+
+        assert taken == PreparedStories(["1-2-b"], {"1-2-b": "SKIP"})
+        assert orchestrator._prepared is None
+
+    def test_reconcile_discards_changed_selection(self, orchestrator):
+        """If the previous cycle's outcome changed the selection, the preparation is dropped."""
+        from server.orchestrator import PreparedStories
+
+        orchestrator._prepared = PreparedStories(["1-2-b", "1-3-c"])
+
+        with patch.object(orchestrator, "emit_event") as mock_emit:
+            assert orchestrator._take_prepared(["1-1-a", "1-2-b"]) is None
+
+        assert orchestrator._prepared is None
+        event_type, payload = mock_emit.call_args.args
+        assert event_type == "batch:warning"
+        assert payload["warning_type"] == "preparation_discarded"
+
+
 # =============================================================================
 # Test Graceful Shutdown (Story 5-SR-3, HIGH #2)
 # =============================================================================
@@ -1080,6 +1621,97 @@ class TestGracefulShutdown:
             assert len(emit_calls) >= 1
 
 
+# =============================================================================
+# Test Buffered Stream Event Logging
+# =============================================================================
+
+
+class TestBufferedEventLogging:
+    """Tests for write-behind logging of stream events."""
+
+    @pytest.mark.asyncio
+    async def test_stream_event_is_buffered(self, orchestrator):
+        """Parsed CSV log lines should be queued, not written synchronously."""
+        import time
+        now = int(time.time())
+        event = {
+            "type": "tool_result",
+            "content": f'{now},2a,2a-1,dev-story,setup,start,"Starting"',
+        }
+
+        with patch.object(orchestrator.event_writer, "_write_fn") as mock_write:
+            orchestrator._handle_stream_event(event)
+
+            assert orchestrator.event_writer.pending_count == 1
+            mock_write.assert_not_called()
+            pending = orchestrator.event_writer._pending[0]
+            assert pending["event_type"] == "command:start"
+            assert pending["story_key"] == "2a-1"
+            assert json.loads(pending["payload_json"])["command"] == "dev-story"
+
+            await orchestrator.event_writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stream_event_payload_encoded_once(self, orchestrator):
+        """The DB payload_json and WebSocket frame should share one encoding."""
+        import time
+        from server import codec
+        from server.event_bus import event_bus
+
+        now = int(time.time())
+        event = {
+            "type": "tool_result",
+            "content": f'{now},2a,2a-1,dev-story,setup,start,"Starting"',
+        }
+
+        published = []
+        unsubscribe = event_bus.subscribe(published.append)
+        try:
+            with patch("server.event_bus.codec.dumps", wraps=codec.dumps) as mock_dumps:
+                orchestrator._handle_stream_event(event)
+                frame = published[0].frame
+        finally:
+            unsubscribe()
+
+        pending = orchestrator.event_writer._pending[0]
+        assert pending["payload_json"] is published[0].payload_json
+        assert pending["payload_json"] in frame
+        assert json.loads(frame)["payload"]["task_id"] == "setup"
+        payload_encodings = [c for c in mock_dumps.call_args_list if isinstance(c.args[0], dict)]
+        assert len(payload_encodings) == 1
+
+        await orchestrator.event_writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_event_writer(self, orchestrator):
+        """stop() should persist buffered events before returning."""
+        with patch.object(
+            orchestrator.event_writer, "flush", new_callable=AsyncMock
+        ) as mock_flush:
+            await orchestrator.stop()
+
+        mock_flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_start_flushes_event_writer_on_crash(self, orchestrator):
+        """start() should stop (and flush) the writer even if a cycle raises."""
+        with patch("server.orchestrator.init_db"), patch(
+            "server.orchestrator.create_batch", return_value=1
+        ), patch("server.orchestrator.update_batch"), patch.object(
+            orchestrator, "check_project_context", new_callable=AsyncMock
+        ), patch.object(
+            orchestrator, "copy_project_context", return_value=True
+        ), patch.object(
+            orchestrator, "run_cycle", new_callable=AsyncMock, side_effect=RuntimeError("boom")
+        ), patch.object(
+            orchestrator.event_writer, "stop", new_callable=AsyncMock
+        ) as mock_stop:
+            with pytest.raises(RuntimeError):
+                await orchestrator.start()
+
+        mock_stop.assert_awaited_once()
+
+
 # =============================================================================
 # Test Timestamp Validation (Story 5-SR-3, MEDIUM #2)
 # =============================================================================
@@ -1167,7 +1799,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1186,7 +1819,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1211,7 +1845,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1236,7 +1871,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1268,7 +1904,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1294,7 +1931,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1317,7 +1955,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1339,7 +1978,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1372,7 +2012,8 @@ class TestSpawnSubagentPromptSystemAppend:
             mock_process.stdin.write.return_value = None
             mock_process.stdin.drain = AsyncMock()
             mock_process.stdin.close.return_value = None
-            mock_process.stdout.readline = AsyncMock(return_value=b"")
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
             mock_process.wait = AsyncMock()
             mock_process.returncode = 0
             mock_create.return_value = mock_process
@@ -1394,6 +2035,54 @@ class TestSpawnSubagentPromptSystemAppend:
             assert call_args[4:6] == ["--model", "haiku"]
             assert call_args[6:8] == ["--prompt-system-append", "<content>test</content>"]
 
+    @pytest.mark.asyncio
+    async def test_spawn_subagent_default_never_uses_file_flag(self, orchestrator):
+        """By default even a large injection is passed inline (the file flag is opt-in)."""
+        large_content = "<file_injections>" + "x" * 200 * 1024 + "</file_injections>"
+        with patch("asyncio.subprocess.create_subprocess_exec") as mock_create:
+            mock_process = AsyncMock()
+            mock_process.stdin.write.return_value = None
+            mock_process.stdin.drain = AsyncMock()
+            mock_process.stdin.close.return_value = None
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
+            mock_process.wait = AsyncMock()
+            mock_process.returncode = 0
+            mock_create.return_value = mock_process
+
+            await orchestrator.spawn_subagent("test prompt", prompt_system_append=large_content)
+
+            call_args = list(mock_create.call_args[0])
+            assert "--prompt-system-append-file" not in call_args
+            idx = call_args.index("--prompt-system-append")
+            assert call_args[idx + 1] == large_content
+
+    @pytest.mark.asyncio
+    async def test_spawn_subagent_passes_large_append_by_file(self, orchestrator):
+        """With injection_file_transport, injections above the threshold go through a file."""
+        orchestrator.injection_files.inline_max_bytes = 64
+        large_content = "<file_injections>" + "x" * 1000 + "</file_injections>"
+        with patch("asyncio.subprocess.create_subprocess_exec") as mock_create:
+            mock_process = AsyncMock()
+            mock_process.stdin.write.return_value = None
+            mock_process.stdin.drain = AsyncMock()
+            mock_process.stdin.close.return_value = None
+            mock_process.stdout.read = AsyncMock(return_value=b"")
+            mock_process.stderr.read = AsyncMock(return_value=b"")
+            mock_process.wait = AsyncMock()
+            mock_process.returncode = 0
+            mock_create.return_value = mock_process
+
+            await orchestrator.spawn_subagent("test prompt", prompt_system_append=large_content)
+
+            call_args = list(mock_create.call_args[0])
+            assert "--prompt-system-append" not in call_args
+            idx = call_args.index("--prompt-system-append-file")
+            assert Path(call_args[idx + 1]).read_text() == large_content
+
+        orchestrator.injection_files.cleanup()
+        assert not Path(call_args[idx + 1]).exists()
+
 
 # =============================================================================
 # Test Copy Project Context (Story A-3)
@@ -2252,6 +2941,36 @@ class TestPhaseMethodsWithPromptSystemAppend:
                 assert chain_calls[0].kwargs.get("model") == "haiku"
                 assert chain_calls[0].kwargs.get("prompt_system_append") is not None
 
+    @pytest.mark.asyncio
+    async def test_review_chain_starts_mid_stream_once(self, orchestrator, project_root):
+        """The chain should start when the marker streams past, not again after exit."""
+        chain_started_before_exit = []
+
+        async def fake_spawn(prompt, prompt_name, **kwargs):
+            if kwargs.get("is_background"):
+                return {}
+            for consumer in kwargs.get("consumers") or []:
+                consumer.feed_event({"type": "assistant", "message": {"content": [
+                    {"type": "text", "text": "Found: [CRITICAL-ISSUES-FOUND: YES]"},
+                ]}})
+            chain_started_before_exit.append(
+                any(c.kwargs.get("is_background") for c in mock_spawn.call_args_list)
+            )
+            return {"exit_code": 0, "stdout": "Found: [CRITICAL-ISSUES-FOUND: YES]", "events": []}
+
+        with patch.object(
+            orchestrator, "spawn_subagent", new_callable=AsyncMock, side_effect=fake_spawn
+        ) as mock_spawn:
+            with patch.object(orchestrator, "build_prompt_system_append") as mock_build:
+                mock_build.return_value = "<file_injections></file_injections>"
+
+                await orchestrator._execute_story_review_phase(["2a-1"])
+
+        chain_calls = [c for c in mock_spawn.call_args_list if c.kwargs.get("is_background")]
+        assert chain_started_before_exit == [True]
+        assert len(chain_calls) == 1
+        assert chain_calls[0].args[1] == "sprint-story-review-chain"
+
     @pytest.mark.asyncio
     async def test_tech_spec_phase_uses_sprint_create_tech_spec_command(
         self, orchestrator, project_root
@@ -2522,5 +3241,92 @@ class TestPhaseMethodsPromptFormat:
                     assert "Review attempt: 1" in prompt
 
 
+
+# =============================================================================
+# Test Injection Cache and Packing
+# =============================================================================
+
+
+class TestInjectionCache:
+    """build_prompt_system_append() reuses unchanged reads and rendered XML, and packs to budget."""
+
+    @staticmethod
+    def _write_old(path: Path, content: str) -> None:
+        path.write_text(content)
+        old = time.time() - 60
+        os.utime(path, (old, old))
+
+    def test_repeated_builds_read_and_render_once(self, orchestrator, project_root):
+        """A code-review style rebuild of the same injection is a cache hit."""
+        artifacts = project_root / "_bmad-output/implementation-artifacts"
+        self._write_old(artifacts / "sprint-2a-1-story.md", "# Story")
+        self._write_old(artifacts / "sprint-2a-1-discovery-story.md", "# Discovery")
+
+        first = orchestrator.build_prompt_system_append("sprint-code-review", ["2a-1"], include_discovery=True)
+        second = orchestrator.build_prompt_system_append("sprint-code-review", ["2a-1"], include_discovery=True)
+
+        assert second is first
+        stats = orchestrator.injection_cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert (stats["file_hits"], stats["file_misses"]) == (2, 2)
+
+    def test_changed_file_is_reinjected(self, orchestrator, project_root):
+        """Edits between builds (e.g. by a dev agent) show up in the next injection."""
+        story = project_root / "_bmad-output/implementation-artifacts/sprint-2a-1-story.md"
+        self._write_old(story, "# Story v1")
+        orchestrator.build_prompt_system_append("sprint-code-review", ["2a-1"])
+
+        story.write_text("# Story v2, with review fixes")
+        result = orchestrator.build_prompt_system_append("sprint-code-review", ["2a-1"])
+
+        assert "# Story v2, with review fixes" in result
+        assert "# Story v1" not in result
+
+    def test_over_budget_injection_is_packed_not_rejected(self, orchestrator, project_root):
+        """Over the token budget, lower-priority files are trimmed and reported."""
+        artifacts = project_root / "_bmad-output/implementation-artifacts"
+        self._write_old(artifacts / "sprint-2a-1-story.md", "# Story\n\nKeep me.\n")
+        self._write_old(
+            artifacts / "sprint-2a-1-tech-spec.md",
+            "# Tech Spec\n\nSummary line.\n\n" + "detail line\n" * 2000,
+        )
+
+        with patch.object(orchestrator, "_get_injection_token_budget", return_value=500), \
+                patch.object(orchestrator, "emit_event") as mock_emit:
+            result = orchestrator.build_prompt_system_append(
+                "sprint-dev-story", ["2a-1"], include_tech_spec=True
+            )
+
+        assert "Keep me." in result
+        assert "Summary line." in result
+        assert "detail line" not in result
+        packed = [c.args[1] for c in mock_emit.call_args_list if c.args[0] == "injection:packed"]
+        assert len(packed) == 1
+        assert [(t["path"], t["level"]) for t in packed[0]["trimmed"]] == [
+            ("_bmad-output/implementation-artifacts/sprint-2a-1-tech-spec.md", "summary")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_commit_packs_room_for_git_status(self, orchestrator, project_root):
+        """Story files just under the limit are packed so the appended git status still fits."""
+        artifacts = project_root / "_bmad-output/implementation-artifacts"
+        self._write_old(artifacts / "sprint-2a-1-story.md", "# Story 1\n\nFile List: a.py\n")
+        self._write_old(
+            artifacts / "sprint-2a-2-story.md",
+            "# Story 2\n\nSummary line.\n\n" + "detail line\n" * 1500,
+        )
+        git_status = "\n".join(f" M src/module_{i}.py" for i in range(100))
+
+        with patch.object(orchestrator, "_get_injection_error_threshold", return_value=20000), \
+                patch.object(orchestrator, "_capture_git_status", return_value=git_status), \
+                patch.object(orchestrator, "spawn_subagent", new_callable=AsyncMock) as mock_spawn, \
+                patch.object(orchestrator, "emit_event"):
+            await orchestrator._execute_batch_commit(["2a-1", "2a-2"])
+
+        injection = mock_spawn.call_args.kwargs["prompt_system_append"]
+        assert len(injection.encode("utf-8")) <= 20000
+        assert git_status in injection
+        assert "File List: a.py" in injection
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
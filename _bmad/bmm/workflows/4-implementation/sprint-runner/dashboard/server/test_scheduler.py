@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for the phase graph scheduler.
+
+Run with: cd dashboard && pytest -v server/test_scheduler.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.scheduler import (
+    PHASE_NOT_RUN,
+    PHASE_SKIPPED,
+    Phase,
+    PhaseGraph,
+    Scheduler,
+)
+
+
+def sleeper(log: list, name: str, seconds: float = 0.0):
+    """A phase body that records start/end around a sleep."""
+    async def run():
+        log.append(f"start {name}")
+        await asyncio.sleep(seconds)
+        log.append(f"end {name}")
+    return run
+
+
+# =============================================================================
+# Test: PhaseGraph
+# =============================================================================
+
+
+class TestPhaseGraph:
+    def test_rejects_duplicate_provider(self):
+        """Each artifact has exactly one provider."""
+        graph = PhaseGraph([Phase("a", sleeper([], "a"), provides=("x",))])
+
+        with pytest.raises(ValueError, match="provided by both"):
+            graph.add(Phase("b", sleeper([], "b"), provides=("x",)))
+
+    def test_rejects_unknown_requirement(self):
+        """A requirement nobody provides would never become ready."""
+        graph = PhaseGraph([Phase("a", sleeper([], "a"), requires=("x",))])
+
+        with pytest.raises(ValueError, match="unknown artifact"):
+            graph.validate()
+
+    def test_rejects_cycle(self):
+        """Phases waiting on each other would deadlock."""
+        graph = PhaseGraph([
+            Phase("a", sleeper([], "a"), requires=("y",), provides=("x",)),
+            Phase("b", sleeper([], "b"), requires=("x",), provides=("y",)),
+        ])
+
+        with pytest.raises(ValueError, match="cycle"):
+            graph.validate()
+
+
+# =============================================================================
+# Test: Scheduler
+# =============================================================================
+
+
+class TestScheduler:
+    @pytest.mark.asyncio
+    async def test_ready_phases_run_concurrently(self):
+        """Independent phases should overlap; dependents wait for their inputs."""
+        log: list = []
+        graph = PhaseGraph([
+            Phase("a", sleeper(log, "a", 0.02), provides=("x",)),
+            Phase("b", sleeper(log, "b", 0.01)),
+            Phase("c", sleeper(log, "c"), requires=("x",)),
+        ])
+
+        await Scheduler(graph).run()
+
+        assert log[:2] == ["start a", "start b"]
+        assert log.index("start c") > log.index("end a")
+
+    @pytest.mark.asyncio
+    async def test_slots_bound_concurrency(self):
+        """No more than the slot limit should run at once."""
+        running = {"now": 0, "max": 0}
+
+        async def run():
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+
+        graph = PhaseGraph(Phase(f"p{n}", run, slot="dev") for n in range(5))
+        await Scheduler(graph, slots={"dev": 2}).run()
+
+        assert running["max"] == 2
+
+    @pytest.mark.asyncio
+    async def test_skipped_phase_unblocks_dependents(self):
+        """A phase whose `when` is false is skipped but still provides its outputs."""
+        log: list = []
+        graph = PhaseGraph([
+            Phase("optional", sleeper(log, "optional"), provides=("x",), when=lambda: False),
+            Phase("next", sleeper(log, "next"), requires=("x",)),
+        ])
+
+        report = await Scheduler(graph).run()
+
+        assert log == ["start next", "end next"]
+        assert report.timings["optional"].status == PHASE_SKIPPED
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_new_phases(self):
+        """After a failure, running phases finish, queued ones never start, the error is raised."""
+        log: list = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        graph = PhaseGraph([
+            Phase("fails", fail, provides=("x",)),
+            Phase("running", sleeper(log, "running", 0.02)),
+            Phase("dependent", sleeper(log, "dependent"), requires=("x",)),
+        ])
+        scheduler = Scheduler(graph)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await scheduler.run()
+
+        assert log == ["start running", "end running"]
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_slot_queue(self):
+        """Phases queued for a slot should not start after a failure."""
+        log: list = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        graph = PhaseGraph([Phase("fails", fail, slot="dev"), Phase("queued", sleeper(log, "queued"), slot="dev")])
+        scheduler = Scheduler(graph, slots={"dev": 1})
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run()
+
+        assert log == []
+
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_slowest_chain(self):
+        """The critical path should follow the last-finishing requirement."""
+        graph = PhaseGraph([
+            Phase("create", sleeper([], "create", 0.01), provides=("story",)),
+            Phase("fast", sleeper([], "fast", 0.0), requires=("story",), provides=("a",)),
+            Phase("slow", sleeper([], "slow", 0.05), requires=("story",), provides=("b",)),
+            Phase("commit", sleeper([], "commit"), requires=("a", "b")),
+        ])
+
+        report = await Scheduler(graph).run()
+
+        assert [t.name for t in report.critical_path()] == ["create", "slow", "commit"]
+        assert report.wall_seconds >= 0.06
+
+    @pytest.mark.asyncio
+    async def test_critical_path_includes_slot_wait(self):
+        """A phase queued for a slot is blocked by the slot's previous holder."""
+        graph = PhaseGraph([
+            Phase("first", sleeper([], "first", 0.03), slot="dev"),
+            Phase("second", sleeper([], "second", 0.01), slot="dev"),
+        ])
+
+        report = await Scheduler(graph, slots={"dev": 1}).run()
+
+        assert [t.name for t in report.critical_path()] == ["first", "second"]
+        assert report.timings["second"].waited >= 0.02
+
+    @pytest.mark.asyncio
+    async def test_not_run_status_after_failure(self):
+        """Phases that never started after a failure are reported as not run."""
+        async def fail():
+            raise RuntimeError("boom")
+
+        graph = PhaseGraph([Phase("fails", fail, slot="dev"), Phase("queued", sleeper([], "q"), slot="dev")])
+        scheduler = Scheduler(graph, slots={"dev": 1})
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run()
+
+        assert scheduler.report.timings["queued"].status == PHASE_NOT_RUN
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for story selection strategies.
+
+Run with: cd dashboard && pytest -v server/test_selection.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.selection import (
+    SELECTION_STRATEGIES,
+    available_stories,
+    extract_epic,
+    get_selector,
+)
+
+
+def status_of(**entries: str) -> dict:
+    """A parsed sprint-status.yaml; underscores in keys become dashes."""
+    return {"development_status": {k.replace("_", "-"): v for k, v in entries.items()}}
+
+
+# =============================================================================
+# Test: Candidates
+# =============================================================================
+
+
+class TestAvailableStories:
+    def test_filters_and_orders_numerically(self):
+        """Epics, retrospectives, done and blocked stories are skipped; order is numeric."""
+        status = status_of(**{
+            "epic_1": "in-progress",
+            "1_10": "backlog",
+            "1_2": "backlog",
+            "1_3": "done",
+            "1_4": "blocked",
+            "epic_1_retrospective": "optional",
+        })
+
+        assert available_stories(status) == ["1-2", "1-10"]
+
+    def test_dependencies_must_be_done(self):
+        """A story waits until every listed dependency is done."""
+        status = status_of(**{"1_1": "done", "1_2": "backlog", "2_1": "backlog", "2_2": "backlog"})
+        status["story_dependencies"] = {"2-1": ["1-1", "1-2"], "2-2": "1-1"}
+
+        assert available_stories(status) == ["1-2", "2-2"]
+
+    def test_unknown_dependencies_are_ignored(self):
+        """Dependencies on keys missing from development_status do not block."""
+        status = status_of(**{"1_1": "backlog"})
+        status["story_dependencies"] = {"1-1": ["9-9"]}
+
+        assert available_stories(status) == ["1-1"]
+
+
+# =============================================================================
+# Test: Strategies
+# =============================================================================
+
+
+class TestStrategies:
+    STATUS = status_of(**{
+        "1_1": "ready-for-dev",
+        "1_2": "ready-for-dev",
+        "1_3": "ready-for-dev",
+        "1_4": "ready-for-dev",
+        "2_1": "ready-for-dev",
+        "2_2": "backlog",
+        "3_1": "review",
+    })
+
+    def test_pair_matches_original_rule(self):
+        """pair: first story plus the next one from its epic, regardless of the limit."""
+        assert get_selector("pair", max_stories=5).select(self.STATUS) == ["1-1", "1-2"]
+        assert get_selector("pair").select(status_of(**{"1_1": "backlog", "2_1": "backlog"})) == ["1-1"]
+
+    def test_epic_fills_from_first_epic(self):
+        """epic: up to max_stories from the first story's epic."""
+        assert get_selector("epic", max_stories=3).select(self.STATUS) == ["1-1", "1-2", "1-3"]
+
+    def test_fair_round_robins_across_epics(self):
+        """fair: one story per epic before a second from any epic, same phase only."""
+        selected = get_selector("fair", max_stories=4).select(self.STATUS)
+
+        assert selected == ["1-1", "2-1", "3-1", "1-2"]
+        assert "2-2" not in get_selector("fair", max_stories=10).select(self.STATUS)
+
+    def test_fair_stays_in_one_epic_for_create_cycles(self):
+        """Create-story cycles carry one epic id, so fair does not cross epics there."""
+        status = status_of(**{"1_1": "backlog", "1_2": "backlog", "2_1": "backlog"})
+
+        assert get_selector("fair", max_stories=3).select(status) == ["1-1", "1-2"]
+
+    def test_fair_alternates_epics_across_cycles(self):
+        """fair: the least-served epic leads each cycle, so a long epic cannot hog the batch."""
+        dev_status = {"1-1": "ready-for-dev", "1-2": "ready-for-dev", "1-3": "ready-for-dev",
+                      "1-4": "ready-for-dev", "2-1": "ready-for-dev", "2-2": "ready-for-dev"}
+        selector = get_selector("fair", max_stories=1)
+
+        cycles = []
+        while selected := selector.select({"development_status": dev_status}):
+            cycles.append(selected[0])
+            dev_status[selected[0]] = "done"
+
+        assert cycles == ["1-1", "2-1", "1-2", "2-2", "1-3", "1-4"]
+
+    def test_fair_rotates_epics_for_create_cycles(self):
+        """Create cycles stay in one epic each, but consecutive cycles change epic."""
+        dev_status = {"1-1": "backlog", "1-2": "backlog", "1-3": "backlog", "2-1": "backlog", "2-2": "backlog"}
+        selector = get_selector("fair", max_stories=2)
+
+        first = selector.select({"development_status": dev_status})
+        dev_status.update(dict.fromkeys(first, "ready-for-dev"))
+        second = selector.select({"development_status": dev_status}, record=False)
+
+        assert first == ["1-1", "1-2"]
+        # Epic 2 has been served less, so its backlog leads (a create cycle)
+        assert second == ["2-1", "2-2"]
+        assert selector.select({"development_status": dev_status}) == second
+
+    @pytest.mark.parametrize("strategy", SELECTION_STRATEGIES)
+    def test_max_stories_one_selects_first(self, strategy):
+        """Every strategy honours a limit of one story."""
+        assert get_selector(strategy, max_stories=1).select(self.STATUS) == ["1-1"]
+
+    @pytest.mark.parametrize("strategy", SELECTION_STRATEGIES)
+    def test_nothing_left(self, strategy):
+        """Every strategy returns an empty list when all stories are finished."""
+        assert get_selector(strategy).select(status_of(**{"1_1": "done"})) == []
+
+    def test_unknown_strategy(self):
+        """An unknown strategy name is rejected."""
+        with pytest.raises(ValueError, match="Unknown story selection strategy"):
+            get_selector("random")
+
+
+class TestExtractEpic:
+    @pytest.mark.parametrize("key, epic", [
+        ("2a-1", "2a"), ("2a-1-first", "2a"), ("5-sr-3", "5-sr"), ("5-sr-3-python", "5-sr"),
+    ])
+    def test_epic_prefix(self, key, epic):
+        """The epic is the prefix before the story number."""
+        assert extract_epic(key) == epic
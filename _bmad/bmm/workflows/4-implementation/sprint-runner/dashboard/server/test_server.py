@@ -182,10 +182,12 @@ class TestBroadcast:
 
     @pytest.fixture(autouse=True)
     def clear_clients_sync(self):
-        """Clear connected clients before and after each test (sync)."""
+        """Clear connected clients and their send queues before and after each test."""
         server.connected_clients.clear()
+        server._outboxes.clear()
         yield
         server.connected_clients.clear()
+        server._outboxes.clear()
 
     @pytest.mark.asyncio
     async def test_broadcast_no_clients(self):
@@ -194,6 +196,19 @@ class TestBroadcast:
         event = {"type": "test", "payload": {}}
         # Should not raise
         await server.broadcast(event)
+        await server.flush_clients()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_records_recent_events_without_clients(self):
+        """broadcast should feed the recent events buffer even with no clients."""
+        server.recent_events.clear()
+        await server.broadcast({"type": "batch:start", "payload": {"batch_id": 5, "max_cycles": 1}})
+        await server.broadcast({"type": "command:start", "payload": {"story_key": "1-1"}})
+
+        events = server.recent_events.recent(5)
+        assert [e["type"] for e in events] == ["command:start", "batch:start"]
+        assert all("timestamp" in e for e in events)
+        server.recent_events.clear()
 
     @pytest.mark.asyncio
     async def test_broadcast_single_client(self, mock_ws):
@@ -203,6 +218,7 @@ class TestBroadcast:
 
         event = {"type": "batch:start", "payload": {"batch_id": 1, "max_cycles": 3}}
         await server.broadcast(event)
+        await server.flush_clients()
 
         mock_ws.send_str.assert_called_once()
         sent_data = json.loads(mock_ws.send_str.call_args[0][0])
@@ -223,6 +239,7 @@ class TestBroadcast:
 
         event = {"type": "test", "payload": {"data": "value"}}
         await server.broadcast(event)
+        await server.flush_clients()
 
         for ws in clients:
             ws.send_str.assert_called_once()
@@ -236,6 +253,7 @@ class TestBroadcast:
         event = {"type": "test", "payload": {}}
         before = int(time.time() * 1000)
         await server.broadcast(event)
+        await server.flush_clients()
         after = int(time.time() * 1000)
 
         sent_data = json.loads(mock_ws.send_str.call_args[0][0])
@@ -251,6 +269,7 @@ class TestBroadcast:
         existing_ts = 1234567890000
         event = {"type": "test", "payload": {}, "timestamp": existing_ts}
         await server.broadcast(event)
+        await server.flush_clients()
 
         sent_data = json.loads(mock_ws.send_str.call_args[0][0])
         assert sent_data["timestamp"] == existing_ts
@@ -273,6 +292,7 @@ class TestBroadcast:
 
         event = {"type": "test", "payload": {}}
         await server.broadcast(event)
+        await server.flush_clients()
 
         # Bad client should be removed
         assert len(server.connected_clients) == 1
@@ -292,11 +312,103 @@ class TestBroadcast:
 
         event = {"type": "test", "payload": {}}
         await server.broadcast(event)
+        await server.flush_clients()
 
         # Only open connection should receive message
         mock_ws.send_str.assert_called_once()
         closed_ws.send_str.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self, mock_ws):
+        """A stalled client should not hold up delivery to other clients."""
+        release = asyncio.Event()
+
+        async def stalled_send(data):
+            await release.wait()
+
+        slow_ws = MagicMock(spec=web.WebSocketResponse)
+        slow_ws.closed = False
+        slow_ws.send_str = AsyncMock(side_effect=stalled_send)
+
+        await server.add_client(slow_ws)
+        await server.add_client(mock_ws)
+
+        for n in range(3):
+            await asyncio.wait_for(server.broadcast({"type": "test", "payload": {"n": n}}), 0.1)
+        await asyncio.wait_for(server._outboxes[mock_ws].join(), 0.1)
+
+        assert mock_ws.send_str.call_count == 3
+        assert server._outboxes[slow_ws].pending_count == 2
+
+        release.set()
+        await server.flush_clients()
+        assert slow_ws.send_str.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_broadcast_overflow_counts_dropped(self, mock_ws):
+        """Overflowing a client's queue should drop progress events and count them."""
+        server._open_outbox(mock_ws).maxsize = 2
+        server.connected_clients.add(mock_ws)
+        dropped_before = server.broadcast_stats.dropped
+
+        for n in range(5):
+            await server.broadcast({
+                "type": "command:progress",
+                "payload": {"story_key": "1-1", "command": "dev-story", "task_id": "t", "message": str(n)},
+            })
+        await server.flush_clients()
+
+        sent = [json.loads(c.args[0])["payload"]["message"] for c in mock_ws.send_str.call_args_list]
+        assert sent == ["3", "4"]
+        assert server.broadcast_stats.dropped - dropped_before == 3
+
+    @pytest.mark.parametrize("policy", ["drop-oldest", "coalesce"])
+    @pytest.mark.asyncio
+    async def test_orchestrator_stream_flood_keeps_slow_client(self, policy, tmp_path):
+        """A flood of subagent command events sheds load instead of disconnecting."""
+        from server.event_bus import event_bus
+        from server.orchestrator import Orchestrator
+        from server.settings import Settings
+
+        release = asyncio.Event()
+
+        async def stalled_send(data):
+            await release.wait()
+
+        slow_ws = MagicMock(spec=web.WebSocketResponse)
+        slow_ws.closed = False
+        slow_ws.send_str = AsyncMock(side_effect=stalled_send)
+        orchestrator = Orchestrator(project_root=tmp_path)
+        orchestrator.event_writer.write = MagicMock()
+        now = int(time.time())
+
+        settings = Settings(websocket_send_queue_size=10, websocket_overflow_policy=policy)
+        unsubscribe = event_bus.subscribe(server.publish_event)
+        try:
+            with patch("server.server.get_settings", return_value=settings):
+                await server.add_client(slow_ws)
+                orchestrator.emit_event("cycle:start", {"cycle_number": 1, "story_keys": ["1-1"]})
+                for n in range(100):
+                    for status in ("start", "end"):
+                        orchestrator._handle_stream_event({
+                            "type": "tool_result",
+                            "content": f'{now},1,1-1,sprint-dev-story,t{n},{status},"step {n}"',
+                        })
+        finally:
+            unsubscribe()
+
+        outbox = server._outboxes[slow_ws]
+        assert not outbox.closed
+        assert slow_ws in server.connected_clients
+        assert outbox.pending_count <= 10
+        assert outbox.stats.disconnected == 0
+
+        release.set()
+        await server.flush_clients()
+        frames = [json.loads(c.args[0]) for c in slow_ws.send_str.call_args_list]
+        assert frames[0]["type"] == "cycle:start"
+        assert (frames[-1]["type"], frames[-1]["payload"]["task_id"]) == ("command:end", "t99")
+
 
 # =============================================================================
 # Test: emit_event Function (AC: #3)
@@ -312,51 +424,47 @@ class TestEmitEvent:
         server.connected_clients.clear()
 
     @pytest.mark.asyncio
-    async def test_emit_event_creates_task(self):
-        """emit_event should create async task for broadcast."""
+    async def test_emit_event_publishes_without_task(self):
+        """emit_event should deliver the event without scheduling a task."""
         server.connected_clients.clear()  # Extra clear for safety
-        with patch.object(server, "broadcast", new_callable=AsyncMock) as mock_broadcast:
+        with patch.object(server, "publish_event") as mock_publish:
             server.emit_event("batch:start", {"batch_id": 1, "max_cycles": 3})
-            # Allow task to run
-            await asyncio.sleep(0.01)
-            mock_broadcast.assert_called_once()
+            # Delivered synchronously - no task to wait for
+            mock_publish.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_emit_event_accepts_enum(self):
         """emit_event should accept EventType enum."""
         server.connected_clients.clear()  # Extra clear for safety
-        with patch.object(server, "broadcast", new_callable=AsyncMock) as mock_broadcast:
+        with patch.object(server, "publish_event") as mock_publish:
             server.emit_event(
                 server.EventType.BATCH_START, {"batch_id": 1, "max_cycles": 3}
             )
-            await asyncio.sleep(0.01)
 
-            call_args = mock_broadcast.call_args[0][0]
-            assert call_args["type"] == "batch:start"
+            call_args = mock_publish.call_args[0][0]
+            assert call_args.type == "batch:start"
 
     @pytest.mark.asyncio
     async def test_emit_event_accepts_string(self):
         """emit_event should accept string event type."""
         server.connected_clients.clear()  # Extra clear for safety
-        with patch.object(server, "broadcast", new_callable=AsyncMock) as mock_broadcast:
+        with patch.object(server, "publish_event") as mock_publish:
             server.emit_event("custom:event", {"data": "value"})
-            await asyncio.sleep(0.01)
 
-            call_args = mock_broadcast.call_args[0][0]
-            assert call_args["type"] == "custom:event"
+            call_args = mock_publish.call_args[0][0]
+            assert call_args.type == "custom:event"
 
     @pytest.mark.asyncio
     async def test_emit_event_adds_timestamp(self):
         """emit_event should add timestamp to event."""
         server.connected_clients.clear()  # Extra clear for safety
-        with patch.object(server, "broadcast", new_callable=AsyncMock) as mock_broadcast:
+        with patch.object(server, "publish_event") as mock_publish:
             before = int(time.time() * 1000)
             server.emit_event("test", {})
-            await asyncio.sleep(0.01)
             after = int(time.time() * 1000)
 
-            call_args = mock_broadcast.call_args[0][0]
-            assert before <= call_args["timestamp"] <= after
+            call_args = mock_publish.call_args[0][0]
+            assert before <= call_args.timestamp <= after
 
 
 # =============================================================================
@@ -365,6 +473,13 @@ class TestEmitEvent:
 
 
 class TestInitialState:
+    @pytest.fixture(autouse=True)
+    def clear_recent_events(self):
+        """Start each test with an empty recent events buffer."""
+        server.recent_events.clear()
+        yield
+        server.recent_events.clear()
+
     @pytest.mark.asyncio
     async def test_get_initial_state_no_db(self):
         """get_initial_state should handle db exceptions gracefully."""
@@ -394,6 +509,54 @@ class TestInitialState:
         # Restore
         importlib.reload(server)
 
+    @pytest.mark.asyncio
+    async def test_get_initial_state_reads_event_tail(self):
+        """get_initial_state should fetch only the last 50 events, newest first."""
+        tail = [
+            {"id": 2, "event_type": "command:end", "timestamp": 2000, "epic_id": "1",
+             "story_key": "1-1", "command": "dev-story", "task_id": "t", "status": "end", "message": "b"},
+            {"id": 1, "event_type": "command:start", "timestamp": 1000, "epic_id": "1",
+             "story_key": "1-1", "command": "dev-story", "task_id": "t", "status": "start", "message": "a"},
+        ]
+        with patch('server.db.get_active_batch', return_value={"id": 7}), \
+             patch('server.db.get_recent_events_by_batch', return_value=tail) as mock_tail, \
+             patch('server.db.get_events_by_batch') as mock_all:
+            state = await server.get_initial_state()
+
+        mock_tail.assert_called_once_with(7, 50)
+        mock_all.assert_not_called()
+        assert [e["timestamp"] for e in state["events"]] == [2000, 1000]
+
+    @pytest.mark.asyncio
+    async def test_get_initial_state_served_from_buffer(self):
+        """Buffered batches should be served without reading events from the DB."""
+        server.recent_events.append({"type": "batch:start", "payload": {"batch_id": 7}, "timestamp": 1})
+        server.recent_events.append({"type": "command:start", "payload": {"story_key": "1-1"}, "timestamp": 2})
+
+        with patch('server.db.get_active_batch', return_value={"id": 7}), \
+             patch('server.db.get_recent_events_by_batch') as mock_tail, \
+             patch('server.server.normalize_db_event_to_ws') as mock_normalize:
+            state = await server.get_initial_state()
+
+        mock_tail.assert_not_called()
+        mock_normalize.assert_not_called()
+        assert [e["timestamp"] for e in state["events"]] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_get_initial_state_warms_buffer_once(self):
+        """A buffer miss should read the DB tail once, then serve from memory."""
+        tail = [{"id": 1, "event_type": "command:start", "timestamp": 1000,
+                 "payload_json": '{"story_key": "1-1"}'}]
+        with patch('server.db.get_active_batch', return_value={"id": 7}), \
+             patch('server.db.get_recent_events_by_batch', return_value=tail) as mock_tail:
+            first = await server.get_initial_state()
+            await server.broadcast({"type": "command:end", "payload": {"story_key": "1-1"}, "timestamp": 2000})
+            second = await server.get_initial_state()
+
+        mock_tail.assert_called_once()
+        assert [e["timestamp"] for e in first["events"]] == [1000]
+        assert [e["timestamp"] for e in second["events"]] == [2000, 1000]
+
     @pytest.mark.asyncio
     async def test_get_initial_state_handles_exception(self):
         """get_initial_state should handle db exceptions gracefully."""
@@ -502,6 +665,15 @@ class TestHTTPRoutes(AioHTTPTestCase):
         resp = await self.client.request("GET", "/nonexistent-file.xyz")
         assert resp.status == 404
 
+    @unittest_run_loop
+    async def test_websocket_stats_route(self):
+        """/api/websocket/stats should report delivery counters."""
+        resp = await self.client.request("GET", "/api/websocket/stats")
+        assert resp.status == 200
+        data = await resp.json()
+        assert set(data["totals"]) == {"sent", "dropped", "coalesced", "delayed", "disconnected"}
+        assert data["overflow_policy"] in ("drop-oldest", "coalesce", "disconnect")
+
 
 # =============================================================================
 # Test: Application Lifecycle
@@ -536,11 +708,19 @@ class TestAppLifecycle:
         assert isinstance(app["heartbeat_task"], asyncio.Task)
 
         # Cleanup
-        app["heartbeat_task"].cancel()
-        try:
-            await app["heartbeat_task"]
-        except asyncio.CancelledError:
-            pass
+        await server.on_cleanup(app)
+
+    @pytest.mark.asyncio
+    async def test_on_startup_creates_checkpoint_task(self):
+        """on_startup should create the WAL checkpoint task."""
+        app = web.Application()
+        await server.on_startup(app)
+
+        assert "checkpoint_task" in app
+        assert isinstance(app["checkpoint_task"], asyncio.Task)
+
+        await server.on_cleanup(app)
+        assert app["checkpoint_task"].cancelled()
 
     @pytest.mark.asyncio
     async def test_on_cleanup_cancels_heartbeat_task(self):
@@ -554,6 +734,77 @@ class TestAppLifecycle:
         await server.on_cleanup(app)
         assert task.cancelled()
 
+    @pytest.mark.asyncio
+    async def test_on_cleanup_closes_db_connections(self):
+        """on_cleanup should close pooled database connections."""
+        app = web.Application()
+        await server.on_startup(app)
+
+        with patch("server.db.close_connections", return_value=1) as mock_close:
+            await server.on_cleanup(app)
+
+        mock_close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_event_bus_subscription_follows_app_lifecycle(self):
+        """Bus events should reach publish_event only between startup and cleanup."""
+        from server.event_bus import BusEvent, event_bus
+
+        app = web.Application()
+        with patch.object(server, "publish_event") as mock_publish:
+            await server.on_startup(app)
+            event_bus.publish(BusEvent("batch:start", {"batch_id": 1}))
+            await server.on_cleanup(app)
+            event_bus.publish(BusEvent("batch:end", {"batch_id": 1}))
+
+        assert [c.args[0].type for c in mock_publish.call_args_list] == ["batch:start"]
+
+
+# =============================================================================
+# Test: WAL Checkpoint Task
+# =============================================================================
+
+
+class TestCheckpointTask:
+    @pytest.mark.asyncio
+    async def test_checkpoint_task_checkpoints_periodically(self):
+        """checkpoint_task should call checkpoint_wal after each interval."""
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) > 2:
+                raise asyncio.CancelledError()
+
+        result = {"mode": "PASSIVE", "busy": 0, "log_frames": 0, "checkpointed_frames": 0}
+        with patch("server.server.asyncio.sleep", side_effect=fake_sleep):
+            with patch("server.db.checkpoint_wal", return_value=result) as mock_checkpoint:
+                with pytest.raises(asyncio.CancelledError):
+                    await server.checkpoint_task()
+
+        assert mock_checkpoint.call_count == 2
+        assert sleeps[0] == server.get_settings().wal_checkpoint_seconds
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_task_survives_errors(self):
+        """A failing checkpoint should not stop the task."""
+        calls = []
+
+        async def fake_sleep(seconds):
+            if len(calls) >= 2:
+                raise asyncio.CancelledError()
+
+        def failing_checkpoint():
+            calls.append(1)
+            raise RuntimeError("database is locked")
+
+        with patch("server.server.asyncio.sleep", side_effect=fake_sleep):
+            with patch("server.db.checkpoint_wal", side_effect=failing_checkpoint):
+                with pytest.raises(asyncio.CancelledError):
+                    await server.checkpoint_task()
+
+        assert len(calls) == 2
+
 
 # =============================================================================
 # Test: WebSocket Handler (Integration)
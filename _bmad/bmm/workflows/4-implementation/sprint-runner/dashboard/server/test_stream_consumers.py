@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental subagent output consumers.
+
+Run with: cd dashboard && pytest -v server/test_stream_consumers.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.stream_consumers import (
+    ChunkedTextBuffer,
+    MarkerScanner,
+    StreamConsumer,
+    SubagentOutput,
+    TECH_SPEC_DECISION_MARKERS,
+)
+
+
+def assistant(*texts: str) -> dict:
+    """An assistant stream-json event with one text block per text."""
+    return {
+        "type": "assistant",
+        "message": {"content": [{"type": "text", "text": t} for t in texts]},
+    }
+
+
+def feed_in_pieces(consumer: StreamConsumer, text: str, size: int) -> None:
+    """Feed text in fixed-size pieces to exercise boundary handling."""
+    for i in range(0, len(text), size):
+        consumer.feed(text[i:i + size])
+
+
+# =============================================================================
+# Test: ChunkedTextBuffer
+# =============================================================================
+
+
+class TestChunkedTextBuffer:
+    def test_keeps_all_text_under_limit(self):
+        """Text under the cap should be kept whole."""
+        buffer = ChunkedTextBuffer(max_chars=100)
+        buffer.feed("hello ")
+        buffer.feed("world")
+
+        assert buffer.getvalue() == "hello world"
+        assert not buffer.truncated
+
+    def test_keeps_most_recent_text(self):
+        """Beyond the cap, the oldest text should be dropped."""
+        buffer = ChunkedTextBuffer(max_chars=8)
+        for piece in ("abc", "defg", "hijkl"):
+            buffer.feed(piece)
+
+        assert buffer.getvalue() == "efghijkl"
+        assert len(buffer) == 8
+        assert buffer.dropped_chars == 4
+
+    def test_single_piece_larger_than_cap(self):
+        """A single oversized piece should be trimmed to its tail."""
+        buffer = ChunkedTextBuffer(max_chars=3)
+        buffer.feed("abcdef")
+
+        assert buffer.getvalue() == "def"
+
+    def test_size_stays_bounded(self):
+        """Retained size should never exceed the cap on long runs."""
+        buffer = ChunkedTextBuffer(max_chars=1000)
+        for n in range(10_000):
+            buffer.feed(f"line {n}\n")
+            assert len(buffer) <= 1000
+
+
+# =============================================================================
+# Test: Scanners
+# =============================================================================
+
+
+class TestMarkerScanner:
+    def test_finds_marker_split_across_pieces(self):
+        """Markers split over several pieces should still be seen."""
+        scanner = MarkerScanner(["HIGHEST SEVERITY: HIGH", "ZERO ISSUES"])
+        feed_in_pieces(scanner, "review done. HIGHEST SEVERITY: HIGH. bye", 3)
+
+        assert scanner.seen == {"HIGHEST SEVERITY: HIGH"}
+
+    def test_no_false_positive(self):
+        """Markers that never appear should not be reported."""
+        scanner = MarkerScanner(["ZERO ISSUES"])
+        feed_in_pieces(scanner, "ZERO ISSUE", 4)
+
+        assert scanner.seen == set()
+
+    def test_records_matches_in_order(self):
+        """Matches should be recorded once each, in order, across boundaries."""
+        scanner = MarkerScanner(TECH_SPEC_DECISION_MARKERS, ignore_case=TECH_SPEC_DECISION_MARKERS)
+        text = "[TECH-SPEC-DECISION: SKIP] then [tech-spec-decision: required] [TECH-SPEC-DECISION: SKIP]"
+
+        feed_in_pieces(scanner, text, 5)
+
+        assert scanner.matches == [
+            "[TECH-SPEC-DECISION: SKIP]",
+            "[TECH-SPEC-DECISION: REQUIRED]",
+            "[TECH-SPEC-DECISION: SKIP]",
+        ]
+
+    def test_on_match_called_while_streaming(self):
+        """on_match should fire as soon as the marker's last piece arrives."""
+        calls = []
+        scanner = MarkerScanner(["[CRITICAL-ISSUES-FOUND: YES]"], on_match=calls.append)
+
+        scanner.feed("Review: [CRITICAL-ISSUES")
+        assert calls == []
+        scanner.feed("-FOUND: YES] more text follows")
+        assert calls == ["[CRITICAL-ISSUES-FOUND: YES]"]
+
+    def test_on_match_error_is_recorded_not_raised(self):
+        """A failing callback must not break the stream it is scanning."""
+        def fail(marker):
+            raise ValueError("injection too large")
+
+        scanner = MarkerScanner(["ZERO ISSUES"], on_match=fail)
+        scanner.feed("ZERO ISSUES and more")
+
+        assert scanner.matches == ["ZERO ISSUES"]
+        assert [str(e) for e in scanner.errors] == ["injection too large"]
+
+
+# =============================================================================
+# Test: SubagentOutput
+# =============================================================================
+
+
+class TestSubagentOutput:
+    def test_severity_precedence(self):
+        """ZERO ISSUES should win, then the highest reported severity."""
+        assert SubagentOutput.from_text("HIGHEST SEVERITY: LOW").highest_severity == "LOW"
+        assert SubagentOutput.from_text(
+            "HIGHEST SEVERITY: HIGH ... HIGHEST SEVERITY: CRITICAL"
+        ).highest_severity == "CRITICAL"
+        assert SubagentOutput.from_text("ZERO ISSUES HIGHEST SEVERITY: HIGH").highest_severity == "ZERO"
+        assert SubagentOutput.from_text("nothing").highest_severity == "UNKNOWN"
+        assert SubagentOutput.from_text("zero issues").highest_severity == "UNKNOWN"
+
+    def test_tech_spec_decisions_any_case(self):
+        """Decisions should map to story keys in order, case-insensitively."""
+        output = SubagentOutput.from_text("[tech-spec-decision: skip] [TECH-SPEC-DECISION: Required]")
+
+        assert output.tech_spec_decisions(["1-1", "1-2", "1-3"]) == {
+            "1-1": "SKIP", "1-2": "REQUIRED", "1-3": "REQUIRED",
+        }
+
+    def test_critical_issue_markers(self):
+        """Both critical-issue marker formats should be recognised."""
+        assert SubagentOutput.from_text("[CRITICAL-ISSUES-FOUND: YES]").has_critical_issues
+        assert SubagentOutput.from_text("HIGHEST SEVERITY: CRITICAL").has_critical_issues
+        assert not SubagentOutput.from_text("[CRITICAL-ISSUES-FOUND: NO]").has_critical_issues
+
+    def test_markers_survive_text_truncation(self):
+        """Markers scrolled out of the text buffer should still count."""
+        output = SubagentOutput(max_text_chars=50)
+        output.feed_event(assistant("[TECH-SPEC-DECISION: SKIP]", "[CRITICAL-ISSUES-FOUND: YES]"))
+        output.feed_event(assistant("x" * 1000))
+
+        assert output.stdout == "x" * 50
+        assert output.has_critical_issues
+        assert output.tech_spec_decisions(["1-1", "1-2"]) == {"1-1": "SKIP", "1-2": "REQUIRED"}
+
+    def test_ignores_non_assistant_events(self):
+        """Only assistant text blocks should be consumed."""
+        output = SubagentOutput()
+        output.feed_event({"type": "tool_result", "content": "ZERO ISSUES"})
+        output.feed_event({"type": "assistant", "message": {"content": [
+            {"type": "tool_use", "input": {"text": "ZERO ISSUES"}},
+        ]}})
+
+        assert output.highest_severity == "UNKNOWN"
+        assert output.stdout == ""
+
+    def test_extra_consumers_receive_events(self):
+        """Extra consumers should see every event."""
+        seen = []
+
+        class Recorder(StreamConsumer):
+            def feed_event(self, event):
+                seen.append(event["type"])
+
+        output = SubagentOutput(consumers=[Recorder()])
+        output.feed_event(assistant("hi"))
+        output.feed_event({"type": "result"})
+
+        assert seen == ["assistant", "result"]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the warm pool of pre-started claude children.
+
+The children are a fake `claude` script that reads the prompt from stdin and
+answers with one stream-json line, like `claude -p --output-format stream-json`.
+
+Run with: cd dashboard && pytest -v server/test_warm_pool.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.warm_pool import WarmPool
+
+FAKE_CLAUDE = f"""#!{sys.executable}
+import json, os, sys
+if os.environ.get("FAKE_CLAUDE_EXIT"):
+    sys.exit(int(os.environ["FAKE_CLAUDE_EXIT"]))
+prompt = sys.stdin.read()
+text = "pid=%d args=%s prompt=%s" % (os.getpid(), " ".join(sys.argv[1:]), prompt)
+print(json.dumps({{"type": "assistant", "message": {{"content": [{{"type": "text", "text": text}}]}}}}))
+"""
+
+
+@pytest.fixture
+def fake_claude(tmp_path):
+    """Directory with an executable fake `claude`."""
+    script = tmp_path / "claude"
+    script.write_text(FAKE_CLAUDE)
+    script.chmod(0o755)
+    return script
+
+
+def spawner(fake_claude: Path, *args: str, env: dict | None = None):
+    """A spawn callable like the orchestrator's, for the fake binary."""
+    return functools.partial(
+        asyncio.create_subprocess_exec,
+        str(fake_claude), *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, **(env or {})},
+    )
+
+
+async def run_prompt(process: asyncio.subprocess.Process, prompt: str) -> str:
+    """Send a prompt and return the assistant text."""
+    stdout, _ = await process.communicate(prompt.encode())
+    return json.loads(stdout)["message"]["content"][0]["text"]
+
+
+async def settle(pool: WarmPool, key, count: int = 1) -> None:
+    """Wait for the background refill to start `count` children."""
+    for _ in range(200):
+        if pool.idle_count(key) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("refill did not complete")
+
+
+# =============================================================================
+# Test: WarmPool
+# =============================================================================
+
+
+class TestWarmPool:
+    @pytest.mark.asyncio
+    async def test_first_spawn_is_cold_then_warm(self, fake_claude):
+        """A miss starts a refill; the next acquire gets a pre-started child."""
+        pool = WarmPool(size=1, max_age_seconds=60)
+        spawn = spawner(fake_claude, "--model", "haiku")
+        try:
+            assert pool.acquire("haiku", spawn) is None
+            await settle(pool, "haiku")
+
+            process = pool.acquire("haiku", spawn)
+
+            assert process is not None
+            assert "args=--model haiku prompt=review 2a-1" in await run_prompt(process, "review 2a-1")
+            assert (pool.hits, pool.misses) == (1, 1)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_variants_are_separate(self, fake_claude):
+        """A child started for one command line is never handed to another."""
+        pool = WarmPool(size=1, max_age_seconds=60)
+        try:
+            pool.acquire("haiku", spawner(fake_claude, "--model", "haiku"))
+            await settle(pool, "haiku")
+
+            assert pool.acquire("sonnet", spawner(fake_claude)) is None
+            assert pool.idle_count("haiku") == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_exited_idle_child_is_not_handed_out(self, fake_claude):
+        """Health check: a child that died while idle is discarded."""
+        pool = WarmPool(size=1, max_age_seconds=60)
+        spawn = spawner(fake_claude, env={"FAKE_CLAUDE_EXIT": "3"})
+        try:
+            pool.acquire("broken", spawn)
+            await settle(pool, "broken")
+            idle = pool._idle["broken"][0].process
+            await asyncio.wait_for(idle.wait(), 5)
+
+            assert pool.acquire("broken", spawn) is None
+            assert pool.unhealthy == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_children_are_recycled_after_max_age(self, fake_claude):
+        """Children idle past max age are killed and not replaced."""
+        pool = WarmPool(size=2, max_age_seconds=0.2)
+        try:
+            pool.acquire("haiku", spawner(fake_claude))
+            await settle(pool, "haiku", 2)
+            children = [child.process for child in pool._idle["haiku"]]
+
+            await asyncio.sleep(0.4)
+
+            assert pool.idle_count() == 0
+            assert pool.recycled == 2
+            assert all(process.returncode is not None for process in children)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_variant_is_dropped(self, fake_claude):
+        """Past max_variants, the oldest variant's children are killed."""
+        pool = WarmPool(size=1, max_age_seconds=60, max_variants=1)
+        try:
+            pool.acquire("a", spawner(fake_claude))
+            await settle(pool, "a")
+            child = pool._idle["a"][0].process
+
+            pool.acquire("b", spawner(fake_claude))
+            await settle(pool, "b")
+
+            assert pool.idle_count("a") == 0
+            await asyncio.wait_for(child.wait(), 5)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_kills_idle_children(self, fake_claude):
+        """close() leaves no child running and stops handing out."""
+        pool = WarmPool(size=2, max_age_seconds=60)
+        spawn = spawner(fake_claude)
+        pool.acquire("haiku", spawn)
+        await settle(pool, "haiku", 2)
+        children = [child.process for child in pool._idle["haiku"]]
+
+        await pool.close()
+
+        assert all(process.returncode is not None for process in children)
+        assert pool.acquire("haiku", spawn) is None
+
+
+# =============================================================================
+# Test: Orchestrator integration
+# =============================================================================
+
+
+class TestOrchestratorWarmPool:
+    @pytest.mark.asyncio
+    async def test_repeated_spawn_uses_prestarted_child(self, fake_claude, tmp_path):
+        """spawn_subagent() hands identical command lines to warm children."""
+        from server.orchestrator import Orchestrator
+
+        orchestrator = Orchestrator(batch_mode="fixed", max_cycles=1, project_root=tmp_path)
+        orchestrator.warm_pool = WarmPool(size=1, max_age_seconds=60)
+        path = f"{fake_claude.parent}{os.pathsep}{os.environ.get('PATH', '')}"
+        try:
+            with patch.dict(os.environ, {"PATH": path}):
+                first = await orchestrator.spawn_subagent("first", "sprint-code-review-2", model="haiku")
+                await settle(orchestrator.warm_pool, next(iter(orchestrator.warm_pool._idle)))
+                second = await orchestrator.spawn_subagent("second", "sprint-code-review-3", model="haiku")
+
+            assert "prompt=first" in first["stdout"]
+            assert "args=-p --output-format stream-json --model haiku prompt=second" in second["stdout"]
+            assert second["status"] == "completed"
+            assert orchestrator.warm_pool.hits == 1
+        finally:
+            await orchestrator.warm_pool.close()
+            await orchestrator.event_writer.stop()
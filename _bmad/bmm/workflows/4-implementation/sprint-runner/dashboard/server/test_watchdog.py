@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Tests for the subagent watchdog.
+
+Uses real child processes with sub-second limits.
+
+Run with: cd dashboard && pytest -v server/test_watchdog.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add dashboard/ to path so we can import server package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.settings import Settings
+from server.watchdog import Watchdog, WatchdogLimits, apply_rlimits
+
+
+async def spawn_python(script: str, **kwargs) -> asyncio.subprocess.Process:
+    """Run a Python snippet with a stdout pipe."""
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-c", script, stdout=asyncio.subprocess.PIPE, **kwargs
+    )
+
+
+async def supervise(process: asyncio.subprocess.Process, limits: WatchdogLimits) -> Watchdog:
+    """Read stdout lines under a watchdog, like spawn_subagent does."""
+    watchdog = Watchdog(process, "test", limits)
+    watchdog.start()
+    try:
+        async for _ in process.stdout:
+            watchdog.touch()
+        await watchdog.wait()
+    finally:
+        await watchdog.stop()
+    return watchdog
+
+
+# =============================================================================
+# Test: Limits
+# =============================================================================
+
+
+class TestWatchdogLimits:
+    def test_longest_prefix_override_wins(self):
+        """Per-command overrides should match by longest command name prefix."""
+        settings = Settings(
+            subagent_timeout_seconds=100,
+            subagent_timeout_overrides={"sprint-code-review": 50, "sprint-code-review-chain": 20},
+        )
+
+        assert WatchdogLimits.for_command("sprint-dev-story", settings).total_seconds == 100
+        assert WatchdogLimits.for_command("sprint-code-review-3", settings).total_seconds == 50
+        assert WatchdogLimits.for_command("sprint-code-review-chain", settings).total_seconds == 20
+
+    def test_time_limits_disabled_by_default(self):
+        """Default settings should never time a subagent out."""
+        for command in ("sprint-dev-story", "sprint-commit", "sprint-code-review-2"):
+            limits = WatchdogLimits.for_command(command, Settings())
+
+            assert (limits.total_seconds, limits.idle_seconds) == (0, 0)
+
+    def test_other_limits_come_from_settings(self):
+        """Idle, grace and resource limits should be taken from settings."""
+        settings = Settings(
+            subagent_idle_timeout_seconds=7,
+            subagent_kill_grace_seconds=3,
+            subagent_memory_limit_mb=512,
+            subagent_cpu_limit_seconds=60,
+        )
+        limits = WatchdogLimits.for_command("x", settings)
+
+        assert (limits.idle_seconds, limits.kill_grace_seconds) == (7, 3)
+        assert (limits.memory_limit_mb, limits.cpu_limit_seconds) == (512, 60)
+
+    def test_negative_limits_rejected(self, tmp_path, monkeypatch):
+        """Negative limits are refused by the API and ignored in settings.json."""
+        import json
+
+        from server import settings as settings_module
+
+        settings_file = tmp_path / "settings.json"
+        monkeypatch.setattr(settings_module, "SETTINGS_FILE", settings_file)
+        monkeypatch.setattr(settings_module, "_settings", None)
+        keys = (
+            "subagent_timeout_seconds", "subagent_idle_timeout_seconds", "subagent_kill_grace_seconds",
+            "subagent_memory_limit_mb", "subagent_cpu_limit_seconds",
+        )
+        for key in keys:
+            with pytest.raises(ValueError, match=key):
+                settings_module.update_settings(**{key: -1})
+
+        settings_file.write_text(json.dumps({**{key: -5 for key in keys}, "subagent_cpu_limit_seconds": 60}))
+        monkeypatch.setattr(settings_module, "_settings", None)
+        loaded = settings_module.get_settings()
+
+        assert (loaded.subagent_timeout_seconds, loaded.subagent_kill_grace_seconds) == (0, 10)
+        assert loaded.subagent_cpu_limit_seconds == 60
+
+    def test_no_rlimits_without_resource_limits(self):
+        """Nothing should be applied unless a resource limit is set."""
+        assert apply_rlimits(0, WatchdogLimits()) is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="prlimit(2) is Linux-only")
+    async def test_rlimits_applied_to_running_child(self):
+        """RLIMIT_CPU should be set on the child after spawn, before it reads its prompt."""
+        process = await spawn_python(
+            "import resource, sys; sys.stdin.read(); print(resource.getrlimit(resource.RLIMIT_CPU)[0])",
+            stdin=asyncio.subprocess.PIPE,
+        )
+
+        assert apply_rlimits(process.pid, WatchdogLimits(cpu_limit_seconds=120)) is True
+        stdout, _ = await process.communicate(b"prompt")
+
+        assert stdout.strip() == b"120"
+
+
+# =============================================================================
+# Test: Watchdog
+# =============================================================================
+
+
+class TestWatchdog:
+    @pytest.mark.asyncio
+    async def test_idle_child_is_terminated(self):
+        """A child producing no output should be stopped after the idle limit."""
+        process = await spawn_python("import time; time.sleep(30)")
+
+        watchdog = await asyncio.wait_for(
+            supervise(process, WatchdogLimits(idle_seconds=0.2, kill_grace_seconds=5)), timeout=10
+        )
+
+        assert watchdog.timed_out == "idle"
+        assert process.returncode == -signal.SIGTERM
+
+    @pytest.mark.asyncio
+    async def test_total_limit_despite_activity(self):
+        """Steady output should not extend the total limit."""
+        process = await spawn_python(
+            "import time\nwhile True:\n    print('tick', flush=True)\n    time.sleep(0.02)\n"
+        )
+
+        watchdog = await asyncio.wait_for(
+            supervise(process, WatchdogLimits(total_seconds=0.3, idle_seconds=5)), timeout=10
+        )
+
+        assert watchdog.timed_out == "total"
+
+    @pytest.mark.asyncio
+    async def test_activity_resets_idle_limit(self):
+        """Output more frequent than the idle limit should keep the child alive."""
+        process = await spawn_python(
+            "import time\nfor _ in range(10):\n    print('tick', flush=True)\n    time.sleep(0.05)\n"
+        )
+
+        watchdog = await asyncio.wait_for(
+            supervise(process, WatchdogLimits(idle_seconds=0.3)), timeout=10
+        )
+
+        assert watchdog.timed_out is None
+        assert process.returncode == 0
+
+    @pytest.mark.asyncio
+    async def test_escalates_to_sigkill(self):
+        """A child ignoring SIGTERM should be killed after the grace period."""
+        process = await spawn_python(
+            "import signal, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "print('ready', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+
+        watchdog = await asyncio.wait_for(
+            supervise(process, WatchdogLimits(total_seconds=0.3, kill_grace_seconds=0.2)),
+            timeout=10,
+        )
+
+        assert watchdog.timed_out == "total"
+        assert process.returncode == -signal.SIGKILL
+
+    @pytest.mark.asyncio
+    async def test_grandchild_holding_stdout_does_not_block_reader(self):
+        """The reader should be released even if a grandchild keeps the pipe open."""
+        process = await spawn_python(
+            "import subprocess, sys, time\n"
+            "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(1)'])\n"
+            "time.sleep(30)\n"
+        )
+
+        watchdog = await asyncio.wait_for(
+            supervise(process, WatchdogLimits(total_seconds=0.3)), timeout=0.9
+        )
+
+        assert watchdog.timed_out == "total"
+        assert process.returncode == -signal.SIGTERM
+        await asyncio.sleep(1)  # Let the grandchild exit so the pipe transport closes
+
+    @pytest.mark.asyncio
+    async def test_no_limits_no_task(self):
+        """With every limit disabled the watchdog should not run."""
+        process = await spawn_python("print('done')")
+
+        watchdog = await supervise(process, WatchdogLimits())
+
+        assert watchdog._task is None
+        assert watchdog.timed_out is None
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Warm pool of pre-started claude CLI children.
+
+Every subagent pays the CLI's startup (Node runtime boot, config load)
+before its first token; for short haiku review chains that dominates. The
+pool keeps up to `size` idle children per variant, already started and
+blocked reading the prompt from stdin, and hands one out instead of a cold
+start.
+
+A child's argv is fixed at exec, so a variant is the exact command line
+(model, injection flag or content-addressed injection file) plus the
+resource limits applied at fork. Variants are learned on demand: the first
+spawn of a variant is cold and starts a background refill, so the next
+identical spawn (a review chain, a code-review retry with unchanged files,
+a haiku attempt) is warm. At most `max_variants` variants are kept, least
+recently used first out.
+
+Idle children are health-checked on hand-out (a child that exited while
+idle is discarded) and recycled after `max_age_seconds`, so a variant that
+is not used again does not hold processes for long. close() kills every
+idle child.
+
+Usage:
+    from .warm_pool import WarmPool
+
+    pool = WarmPool(size=1, max_age_seconds=300, max_variants=4)
+    spawn = functools.partial(asyncio.create_subprocess_exec, *args, stdin=PIPE, ...)
+    process = pool.acquire(key, spawn) or await spawn()
+    ...
+    await pool.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+Spawn = Callable[[], Awaitable[asyncio.subprocess.Process]]
+
+# Seconds to wait for a killed idle child to exit
+REAP_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class IdleChild:
+    """A pre-started child waiting for its prompt."""
+
+    process: asyncio.subprocess.Process
+    started_at: float
+    expiry: Optional[asyncio.TimerHandle] = None
+
+
+class WarmPool:
+    """Idle pre-started children per variant, refilled in the background."""
+
+    def __init__(self, size: int, max_age_seconds: float, max_variants: int = 4):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Idle children kept per variant
+            max_age_seconds: Idle children older than this are killed (0 disables)
+            max_variants: Variants kept; the least recently used is dropped
+        """
+        self.size = max(1, size)
+        self.max_age_seconds = max_age_seconds
+        self.max_variants = max(1, max_variants)
+        self._idle: OrderedDict[Hashable, list[IdleChild]] = OrderedDict()
+        self._refills: dict[Hashable, asyncio.Task] = {}
+        self._reaping: set[asyncio.Task] = set()
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.spawned = 0
+        self.recycled = 0
+        self.unhealthy = 0
+
+    def acquire(self, key: Hashable, spawn: Spawn) -> Optional[asyncio.subprocess.Process]:
+        """
+        Take a healthy idle child for the variant, or None for a cold start.
+
+        Either way a background refill for the variant is started with `spawn`.
+        """
+        if self._closed:
+            return None
+
+        process = None
+        idle = self._idle.get(key, [])
+        while idle:
+            child = idle.pop(0)
+            if child.expiry is not None:
+                child.expiry.cancel()
+            if child.process.returncode is None:
+                process = child.process
+                break
+            # Exited while idle (crash, OOM, bad flag): never hand it out
+            self.unhealthy += 1
+            logger.warning(f"Warm child {child.process.pid} exited with {child.process.returncode} while idle")
+            self._reap(child.process)
+
+        if process is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        self._idle[key] = idle
+        self._idle.move_to_end(key)
+        self._evict_variants()
+        self._start_refill(key, spawn)
+        return process
+
+    def _start_refill(self, key: Hashable, spawn: Spawn) -> None:
+        """Refill a variant in the background (one refill task per variant)."""
+        task = self._refills.get(key)
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(self._refill(key, spawn))
+        self._refills[key] = task
+
+    async def _refill(self, key: Hashable, spawn: Spawn) -> None:
+        """Start children until the variant has `size` idle ones."""
+        while not self._closed and key in self._idle and len(self._idle[key]) < self.size:
+            try:
+                process = await spawn()
+            except Exception as e:
+                logger.warning(f"Warm pool refill failed: {e!r}")
+                return
+            self.spawned += 1
+            if self._closed or key not in self._idle:
+                # Closed or evicted while starting
+                self._reap(process)
+                return
+            child = IdleChild(process=process, started_at=time.monotonic())
+            if self.max_age_seconds:
+                child.expiry = asyncio.get_running_loop().call_later(
+                    self.max_age_seconds, self._expire, key, child
+                )
+            self._idle[key].append(child)
+
+    def _expire(self, key: Hashable, child: IdleChild) -> None:
+        """Recycle an idle child that reached max age (no refill: the variant went cold)."""
+        idle = self._idle.get(key)
+        if idle is not None and child in idle:
+            idle.remove(child)
+            self.recycled += 1
+            self._reap(child.process)
+
+    def _evict_variants(self) -> None:
+        """Drop the least recently used variants over max_variants."""
+        while len(self._idle) > self.max_variants:
+            # A refill still running for it reaps what it starts
+            key, idle = self._idle.popitem(last=False)
+            self._refills.pop(key, None)
+            for child in idle:
+                if child.expiry is not None:
+                    child.expiry.cancel()
+                self.recycled += 1
+                self._reap(child.process)
+
+    def _reap(self, process: asyncio.subprocess.Process) -> None:
+        """Kill a child that will not be used and wait for it in the background."""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        task = asyncio.create_task(self._wait_exit(process))
+        self._reaping.add(task)
+        task.add_done_callback(self._reaping.discard)
+
+    @staticmethod
+    async def _wait_exit(process: asyncio.subprocess.Process) -> None:
+        """Wait for a killed child, closing its stdin so the transport can close."""
+        if process.stdin is not None:
+            process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), REAP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm child {process.pid} did not exit after SIGKILL")
+
+    def idle_count(self, key: Optional[Hashable] = None) -> int:
+        """Idle children for one variant, or in total."""
+        if key is not None:
+            return len(self._idle.get(key, []))
+        return sum(len(idle) for idle in self._idle.values())
+
+    async def close(self) -> None:
+        """Stop refilling and kill every idle child."""
+        self._closed = True
+        # Not cancelled: a cancelled spawn could leak its child; refills reap what they start
+        refills = [task for task in self._refills.values() if not task.done()]
+        if refills:
+            await asyncio.gather(*refills, return_exceptions=True)
+        self._refills.clear()
+        for idle in self._idle.values():
+            for child in idle:
+                if child.expiry is not None:
+                    child.expiry.cancel()
+                self._reap(child.process)
+        self._idle.clear()
+        if self._reaping:
+            await asyncio.gather(*list(self._reaping), return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss and lifecycle counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "spawned": self.spawned,
+            "recycled": self.recycled,
+            "unhealthy": self.unhealthy,
+            "idle": self.idle_count(),
+        }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Watchdog for spawned claude subagents.
+
+Enforces a wall-clock limit on the whole run and an idle limit on the time
+since the last NDJSON line. Optional RLIMIT_AS / RLIMIT_CPU caps are applied
+to the child right after spawn with prlimit(2). A preexec_fn would not be
+safe here: the server runs threads (the aiodb executors), and a forked
+child can deadlock on a lock one of them held at fork time. A child that hits a limit gets SIGTERM, then
+SIGKILL if it has not exited after a grace period. Its stdout is then closed
+so the stream parser returns even if a grandchild still holds the pipe.
+
+Limits come from Settings. subagent_timeout_overrides maps a command name
+prefix (e.g. "sprint-dev-story") to its own total limit; the longest
+matching prefix wins.
+
+Usage:
+    from .watchdog import Watchdog, WatchdogLimits, apply_rlimits
+
+    limits = WatchdogLimits.for_command("sprint-code-review-2")
+    process = await create_subprocess_exec(...)
+    apply_rlimits(process.pid, limits)   # Before sending the prompt
+    watchdog = Watchdog(process, "sprint-code-review-2", limits)
+    watchdog.start()
+    async for event in stream:
+        watchdog.touch()
+    await watchdog.wait()      # Instead of process.wait()
+    await watchdog.stop()
+    watchdog.timed_out     # None, "total" or "idle"
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .settings import Settings, get_settings
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Reasons reported in Watchdog.timed_out
+TIMEOUT_TOTAL = "total"
+TIMEOUT_IDLE = "idle"
+
+# Poll interval while waiting for a terminated child to exit
+EXIT_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class WatchdogLimits:
+    """Limits for one subagent run (0 disables a limit)."""
+
+    total_seconds: int = 0
+    idle_seconds: int = 0
+    kill_grace_seconds: int = 10
+    memory_limit_mb: int = 0
+    cpu_limit_seconds: int = 0
+
+    @classmethod
+    def for_command(cls, command: str, settings: Optional[Settings] = None) -> "WatchdogLimits":
+        """Get the limits for a command name from settings."""
+        settings = settings or get_settings()
+        total = settings.subagent_timeout_seconds
+        matches = [p for p in settings.subagent_timeout_overrides if command.startswith(p)]
+        if matches:
+            total = settings.subagent_timeout_overrides[max(matches, key=len)]
+        return cls(
+            total_seconds=total,
+            idle_seconds=settings.subagent_idle_timeout_seconds,
+            kill_grace_seconds=settings.subagent_kill_grace_seconds,
+            memory_limit_mb=settings.subagent_memory_limit_mb,
+            cpu_limit_seconds=settings.subagent_cpu_limit_seconds,
+        )
+
+
+def apply_rlimits(pid: int, limits: WatchdogLimits) -> bool:
+    """
+    Apply the resource limits to a running child; True if any were applied.
+
+    Call right after spawn, before the child is given work (it blocks on
+    stdin until the prompt arrives). Needs prlimit(2), i.e. Linux; elsewhere
+    the limits are skipped with a warning.
+    """
+    if not (limits.memory_limit_mb or limits.cpu_limit_seconds):
+        return False
+    if resource is None or not hasattr(resource, "prlimit"):
+        logger.warning("Subagent resource limits need prlimit (Linux); not applied")
+        return False
+
+    try:
+        if limits.memory_limit_mb:
+            memory_bytes = limits.memory_limit_mb * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        if limits.cpu_limit_seconds:
+            # Soft limit sends SIGXCPU; the hard limit a few seconds later SIGKILLs
+            cpu_seconds = limits.cpu_limit_seconds
+            resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+    except ProcessLookupError:
+        return False  # Already exited
+    return True
+
+
+class Watchdog:
+    """Terminates a child that exceeds its total or idle time limit."""
+
+    def __init__(self, process: asyncio.subprocess.Process, name: str, limits: WatchdogLimits):
+        """
+        Initialize for a running process.
+
+        Args:
+            process: The child to supervise
+            name: Name for logging (e.g. the prompt name)
+            limits: Time limits and kill grace period
+        """
+        self.process = process
+        self.name = name
+        self.limits = limits
+        self.started_at = time.monotonic()
+        self.last_activity = self.started_at
+        self.timed_out: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start supervising (no-op if no time limit is set)."""
+        if self._task is None and (self.limits.total_seconds or self.limits.idle_seconds):
+            self._task = asyncio.create_task(self._run())
+
+    def touch(self) -> None:
+        """Record output activity (an NDJSON line)."""
+        self.last_activity = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the child started."""
+        return time.monotonic() - self.started_at
+
+    def _next_deadline(self) -> tuple[float, str]:
+        """The earliest active deadline and its reason."""
+        deadlines = []
+        if self.limits.total_seconds:
+            deadlines.append((self.started_at + self.limits.total_seconds, TIMEOUT_TOTAL))
+        if self.limits.idle_seconds:
+            deadlines.append((self.last_activity + self.limits.idle_seconds, TIMEOUT_IDLE))
+        return min(deadlines)
+
+    async def _run(self) -> None:
+        """Sleep until a deadline passes, then terminate the child."""
+        while self.process.returncode is None:
+            deadline, reason = self._next_deadline()
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                # Activity may move the idle deadline while we sleep; re-check on wake
+                await asyncio.sleep(remaining)
+                continue
+
+            self.timed_out = reason
+            logger.warning(
+                f"{self.name}: {reason} timeout after {self.elapsed:.0f}s, terminating"
+            )
+            await self._terminate()
+            return
+
+    async def _wait_exit(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the child itself to exit; True if it did within timeout.
+
+        Polls returncode because process.wait() also waits for the pipes to
+        close, which a grandchild holding them can delay indefinitely.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.process.returncode is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(EXIT_POLL_SECONDS)
+        return True
+
+    async def _terminate(self) -> None:
+        """SIGTERM, then SIGKILL after the grace period, then release stdout."""
+        try:
+            self.process.terminate()
+            if not await self._wait_exit(self.limits.kill_grace_seconds):
+                logger.warning(f"{self.name}: still running after SIGTERM, sending SIGKILL")
+                self.process.kill()
+                await self._wait_exit()
+        except ProcessLookupError:
+            pass  # Already exited
+
+        # Grandchildren can keep the pipe open after the child is gone
+        stdout = self.process.stdout
+        if stdout is not None and not stdout.at_eof():
+            stdout.feed_eof()
+
+    async def wait(self) -> Optional[int]:
+        """
+        Wait for the child to exit, like process.wait().
+
+        After a timeout this returns once the child is dead, without waiting
+        for grandchildren to release its pipes.
+        """
+        if self._task is None:
+            return await self.process.wait()
+
+        exited = asyncio.ensure_future(self.process.wait())
+        try:
+            await asyncio.wait({exited, self._task}, return_when=asyncio.FIRST_COMPLETED)
+            if not exited.done() and self.timed_out:
+                await self._task
+                exited.cancel()
+                return self.process.returncode
+            return await exited
+        except BaseException:
+            exited.cancel()
+            raise
+
+    async def stop(self) -> None:
+        """Stop supervising (the child has exited normally or been handled)."""
+        if self._task is None:
+            return
+        # Once a timeout fired, let the SIGTERM/SIGKILL escalation finish
+        if self.timed_out is None and not self._task.done():
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass